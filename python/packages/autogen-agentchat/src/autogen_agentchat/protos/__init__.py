@@ -0,0 +1,3 @@
+"""
+The :mod:`autogen_agentchat.protos` module provides Google Protobuf classes for agentchat messages and group chat events
+"""
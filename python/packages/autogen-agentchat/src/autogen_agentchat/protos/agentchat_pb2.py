@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: agentchat.proto
+# Protobuf Python Version: 4.25.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0f\x61gentchat.proto\x12\tagentchat\"@\n\x0cRequestUsage\x12\x15\n\rprompt_tokens\x18\x01 \x01(\x05\x12\x19\n\x11\x63ompletion_tokens\x18\x02 \x01(\x05\";\n\x0c\x46unctionCall\x12\n\n\x02id\x18\x01 \x01(\t\x12\x11\n\targuments\x18\x02 \x01(\t\x12\x0c\n\x04name\x18\x03 \x01(\t\";\n\x17\x46unctionExecutionResult\x12\x0f\n\x07\x63ontent\x18\x01 \x01(\t\x12\x0f\n\x07\x63\x61ll_id\x18\x02 \x01(\t\"\x15\n\x05Image\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\"N\n\x11MultiModalContent\x12\x0e\n\x04text\x18\x01 \x01(\tH\x00\x12!\n\x05image\x18\x02 \x01(\x0b\x32\x10.agentchat.ImageH\x00\x42\x06\n\x04item\"]\n\x0bTextMessage\x12\x0e\n\x06source\x18\x01 \x01(\t\x12-\n\x0cmodels_usage\x18\x02 \x01(\x0b\x32\x17.agentchat.RequestUsage\x12\x0f\n\x07\x63ontent\x18\x03 \x01(\t\"\x81\x01\n\x11MultiModalMessage\x12\x0e\n\x06source\x18\x01 \x01(\t\x12-\n\x0cmodels_usage\x18\x02 \x01(\x0b\x32\x17.agentchat.RequestUsage\x12-\n\x07\x63ontent\x18\x03 \x03(\x0b\x32\x1c.agentchat.MultiModalContent\"]\n\x0bStopMessage\x12\x0e\n\x06source\x18\x01 \x01(\t\x12-\n\x0cmodels_usage\x18\x02 \x01(\x0b\x32\x17.agentchat.RequestUsage\x12\x0f\n\x07\x63ontent\x18\x03 \x01(\t\"p\n\x0eHandoffMessage\x12\x0e\n\x06source\x18\x01 \x01(\t\x12-\n\x0cmodels_usage\x18\x02 \x01(\x0b\x32\x17.agentchat.RequestUsage\x12\x0e\n\x06target\x18\x03 \x01(\t\x12\x0f\n\x07\x63ontent\x18\x04 \x01(\t\"\x7f\n\x14ToolCallRequestEvent\x12\x0e\n\x06source\x18\x01 \x01(\t\x12-\n\x0cmodels_usage\x18\x02 \x01(\x0b\x32\x17.agentchat.RequestUsage\x12(\n\x07\x63ontent\x18\x03 \x03(\x0b\x32\x17.agentchat.FunctionCall\"\x8c\x01\n\x16ToolCallExecutionEvent\x12\x0e\n\x06source\x18\x01 \x01(\t\x12-\n\x0cmodels_usage\x18\x02 \x01(\x0b\x32\x17.agentchat.RequestUsage\x12\x33\n\x07\x63ontent\x18\x03 \x03(\x0b\x32\".agentchat.FunctionExecutionResult\"h\n\x16ToolCallSummaryMessage\x12\x0e\n\x06source\x18\x01 \x01(\t\x12-\n\x0cmodels_usage\x18\x02 \x01(\x0b\x32\x17.agentchat.RequestUsage\x12\x0f\n\x07\x63ontent\x18\x03 \x01(\t\"l\n\x17UserInputRequestedEvent\x12\x0e\n\x06source\x18\x01 \x01(\t\x12-\n\x0cmodels_usage\x18\x02 \x01(\x0b\x32\x17.agentchat.RequestUsage\x12\x12\n\nrequest_id\x18\x03 \x01(\t\"\x8e\x04\n\x10\x41gentChatMessage\x12.\n\x0ctext_message\x18\x01 \x01(\x0b\x32\x16.agentchat.TextMessageH\x00\x12;\n\x13multi_modal_message\x18\x02 \x01(\x0b\x32\x1c.agentchat.MultiModalMessageH\x00\x12.\n\x0cstop_message\x18\x03 \x01(\x0b\x32\x16.agentchat.StopMessageH\x00\x12\x34\n\x0fhandoff_message\x18\x04 \x01(\x0b\x32\x19.agentchat.HandoffMessageH\x00\x12\x42\n\x17tool_call_request_event\x18\x05 \x01(\x0b\x32\x1f.agentchat.ToolCallRequestEventH\x00\x12\x46\n\x19tool_call_execution_event\x18\x06 \x01(\x0b\x32!.agentchat.ToolCallExecutionEventH\x00\x12\x46\n\x19tool_call_summary_message\x18\x07 \x01(\x0b\x32!.agentchat.ToolCallSummaryMessageH\x00\x12H\n\x1auser_input_requested_event\x18\x08 \x01(\x0b\x32\".agentchat.UserInputRequestedEventH\x00\x42\t\n\x07message\"E\n\x14\x41gentChatMessageList\x12-\n\x08messages\x18\x01 \x03(\x0b\x32\x1b.agentchat.AgentChatMessage\"v\n\x08Response\x12\x31\n\x0c\x63hat_message\x18\x01 \x01(\x0b\x32\x1b.agentchat.AgentChatMessage\x12\x37\n\x0einner_messages\x18\x02 \x01(\x0b\x32\x1f.agentchat.AgentChatMessageList\"C\n\x0eGroupChatStart\x12\x31\n\x08messages\x18\x01 \x01(\x0b\x32\x1f.agentchat.AgentChatMessageList\"E\n\x16GroupChatAgentResponse\x12+\n\x0e\x61gent_response\x18\x01 \x01(\x0b\x32\x13.agentchat.Response\"\x19\n\x17GroupChatRequestPublish\"@\n\x10GroupChatMessage\x12,\n\x07message\x18\x01 \x01(\x0b\x32\x1b.agentchat.AgentChatMessage\"?\n\x14GroupChatTermination\x12\'\n\x07message\x18\x01 \x01(\x0b\x32\x16.agentchat.StopMessage\"\x10\n\x0eGroupChatResetb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'agentchat_pb2', _globals)
+if _descriptor._USE_C_DESCRIPTORS == False:
+  DESCRIPTOR._options = None
+  _globals['_REQUESTUSAGE']._serialized_start=30
+  _globals['_REQUESTUSAGE']._serialized_end=94
+  _globals['_FUNCTIONCALL']._serialized_start=96
+  _globals['_FUNCTIONCALL']._serialized_end=155
+  _globals['_FUNCTIONEXECUTIONRESULT']._serialized_start=157
+  _globals['_FUNCTIONEXECUTIONRESULT']._serialized_end=216
+  _globals['_IMAGE']._serialized_start=218
+  _globals['_IMAGE']._serialized_end=239
+  _globals['_MULTIMODALCONTENT']._serialized_start=241
+  _globals['_MULTIMODALCONTENT']._serialized_end=319
+  _globals['_TEXTMESSAGE']._serialized_start=321
+  _globals['_TEXTMESSAGE']._serialized_end=414
+  _globals['_MULTIMODALMESSAGE']._serialized_start=417
+  _globals['_MULTIMODALMESSAGE']._serialized_end=546
+  _globals['_STOPMESSAGE']._serialized_start=548
+  _globals['_STOPMESSAGE']._serialized_end=641
+  _globals['_HANDOFFMESSAGE']._serialized_start=643
+  _globals['_HANDOFFMESSAGE']._serialized_end=755
+  _globals['_TOOLCALLREQUESTEVENT']._serialized_start=757
+  _globals['_TOOLCALLREQUESTEVENT']._serialized_end=884
+  _globals['_TOOLCALLEXECUTIONEVENT']._serialized_start=887
+  _globals['_TOOLCALLEXECUTIONEVENT']._serialized_end=1027
+  _globals['_TOOLCALLSUMMARYMESSAGE']._serialized_start=1029
+  _globals['_TOOLCALLSUMMARYMESSAGE']._serialized_end=1133
+  _globals['_USERINPUTREQUESTEDEVENT']._serialized_start=1135
+  _globals['_USERINPUTREQUESTEDEVENT']._serialized_end=1243
+  _globals['_AGENTCHATMESSAGE']._serialized_start=1246
+  _globals['_AGENTCHATMESSAGE']._serialized_end=1772
+  _globals['_AGENTCHATMESSAGELIST']._serialized_start=1774
+  _globals['_AGENTCHATMESSAGELIST']._serialized_end=1843
+  _globals['_RESPONSE']._serialized_start=1845
+  _globals['_RESPONSE']._serialized_end=1963
+  _globals['_GROUPCHATSTART']._serialized_start=1965
+  _globals['_GROUPCHATSTART']._serialized_end=2032
+  _globals['_GROUPCHATAGENTRESPONSE']._serialized_start=2034
+  _globals['_GROUPCHATAGENTRESPONSE']._serialized_end=2103
+  _globals['_GROUPCHATREQUESTPUBLISH']._serialized_start=2105
+  _globals['_GROUPCHATREQUESTPUBLISH']._serialized_end=2130
+  _globals['_GROUPCHATMESSAGE']._serialized_start=2132
+  _globals['_GROUPCHATMESSAGE']._serialized_end=2196
+  _globals['_GROUPCHATTERMINATION']._serialized_start=2198
+  _globals['_GROUPCHATTERMINATION']._serialized_end=2261
+  _globals['_GROUPCHATRESET']._serialized_start=2263
+  _globals['_GROUPCHATRESET']._serialized_end=2279
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,474 @@
+"""
+@generated by mypy-protobuf.  Do not edit manually!
+isort:skip_file
+The wire format of the messages of autogen_agentchat.messages and of the events that group chat teams exchange.
+Each message has the name of the Python class it maps to.
+"""
+
+import builtins
+import collections.abc
+import google.protobuf.descriptor
+import google.protobuf.internal.containers
+import google.protobuf.message
+import typing
+
+DESCRIPTOR: google.protobuf.descriptor.FileDescriptor
+
+@typing.final
+class RequestUsage(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    PROMPT_TOKENS_FIELD_NUMBER: builtins.int
+    COMPLETION_TOKENS_FIELD_NUMBER: builtins.int
+    prompt_tokens: builtins.int
+    completion_tokens: builtins.int
+    def __init__(
+        self,
+        *,
+        prompt_tokens: builtins.int = ...,
+        completion_tokens: builtins.int = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["completion_tokens", b"completion_tokens", "prompt_tokens", b"prompt_tokens"]) -> None: ...
+
+global___RequestUsage = RequestUsage
+
+@typing.final
+class FunctionCall(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    ID_FIELD_NUMBER: builtins.int
+    ARGUMENTS_FIELD_NUMBER: builtins.int
+    NAME_FIELD_NUMBER: builtins.int
+    id: builtins.str
+    arguments: builtins.str
+    name: builtins.str
+    def __init__(
+        self,
+        *,
+        id: builtins.str = ...,
+        arguments: builtins.str = ...,
+        name: builtins.str = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["arguments", b"arguments", "id", b"id", "name", b"name"]) -> None: ...
+
+global___FunctionCall = FunctionCall
+
+@typing.final
+class FunctionExecutionResult(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    CONTENT_FIELD_NUMBER: builtins.int
+    CALL_ID_FIELD_NUMBER: builtins.int
+    content: builtins.str
+    call_id: builtins.str
+    def __init__(
+        self,
+        *,
+        content: builtins.str = ...,
+        call_id: builtins.str = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["call_id", b"call_id", "content", b"content"]) -> None: ...
+
+global___FunctionExecutionResult = FunctionExecutionResult
+
+@typing.final
+class Image(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    DATA_FIELD_NUMBER: builtins.int
+    data: builtins.bytes
+    """The image encoded as PNG."""
+    def __init__(
+        self,
+        *,
+        data: builtins.bytes = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["data", b"data"]) -> None: ...
+
+global___Image = Image
+
+@typing.final
+class MultiModalContent(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    TEXT_FIELD_NUMBER: builtins.int
+    IMAGE_FIELD_NUMBER: builtins.int
+    text: builtins.str
+    @property
+    def image(self) -> global___Image: ...
+    def __init__(
+        self,
+        *,
+        text: builtins.str = ...,
+        image: global___Image | None = ...,
+    ) -> None: ...
+    def HasField(self, field_name: typing.Literal["image", b"image", "item", b"item", "text", b"text"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["image", b"image", "item", b"item", "text", b"text"]) -> None: ...
+    def WhichOneof(self, oneof_group: typing.Literal["item", b"item"]) -> typing.Literal["text", "image"] | None: ...
+
+global___MultiModalContent = MultiModalContent
+
+@typing.final
+class TextMessage(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    SOURCE_FIELD_NUMBER: builtins.int
+    MODELS_USAGE_FIELD_NUMBER: builtins.int
+    CONTENT_FIELD_NUMBER: builtins.int
+    source: builtins.str
+    content: builtins.str
+    @property
+    def models_usage(self) -> global___RequestUsage: ...
+    def __init__(
+        self,
+        *,
+        source: builtins.str = ...,
+        models_usage: global___RequestUsage | None = ...,
+        content: builtins.str = ...,
+    ) -> None: ...
+    def HasField(self, field_name: typing.Literal["models_usage", b"models_usage"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["content", b"content", "models_usage", b"models_usage", "source", b"source"]) -> None: ...
+
+global___TextMessage = TextMessage
+
+@typing.final
+class MultiModalMessage(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    SOURCE_FIELD_NUMBER: builtins.int
+    MODELS_USAGE_FIELD_NUMBER: builtins.int
+    CONTENT_FIELD_NUMBER: builtins.int
+    source: builtins.str
+    @property
+    def models_usage(self) -> global___RequestUsage: ...
+    @property
+    def content(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___MultiModalContent]: ...
+    def __init__(
+        self,
+        *,
+        source: builtins.str = ...,
+        models_usage: global___RequestUsage | None = ...,
+        content: collections.abc.Iterable[global___MultiModalContent] | None = ...,
+    ) -> None: ...
+    def HasField(self, field_name: typing.Literal["models_usage", b"models_usage"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["content", b"content", "models_usage", b"models_usage", "source", b"source"]) -> None: ...
+
+global___MultiModalMessage = MultiModalMessage
+
+@typing.final
+class StopMessage(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    SOURCE_FIELD_NUMBER: builtins.int
+    MODELS_USAGE_FIELD_NUMBER: builtins.int
+    CONTENT_FIELD_NUMBER: builtins.int
+    source: builtins.str
+    content: builtins.str
+    @property
+    def models_usage(self) -> global___RequestUsage: ...
+    def __init__(
+        self,
+        *,
+        source: builtins.str = ...,
+        models_usage: global___RequestUsage | None = ...,
+        content: builtins.str = ...,
+    ) -> None: ...
+    def HasField(self, field_name: typing.Literal["models_usage", b"models_usage"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["content", b"content", "models_usage", b"models_usage", "source", b"source"]) -> None: ...
+
+global___StopMessage = StopMessage
+
+@typing.final
+class HandoffMessage(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    SOURCE_FIELD_NUMBER: builtins.int
+    MODELS_USAGE_FIELD_NUMBER: builtins.int
+    TARGET_FIELD_NUMBER: builtins.int
+    CONTENT_FIELD_NUMBER: builtins.int
+    source: builtins.str
+    target: builtins.str
+    content: builtins.str
+    @property
+    def models_usage(self) -> global___RequestUsage: ...
+    def __init__(
+        self,
+        *,
+        source: builtins.str = ...,
+        models_usage: global___RequestUsage | None = ...,
+        target: builtins.str = ...,
+        content: builtins.str = ...,
+    ) -> None: ...
+    def HasField(self, field_name: typing.Literal["models_usage", b"models_usage"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["content", b"content", "models_usage", b"models_usage", "source", b"source", "target", b"target"]) -> None: ...
+
+global___HandoffMessage = HandoffMessage
+
+@typing.final
+class ToolCallRequestEvent(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    SOURCE_FIELD_NUMBER: builtins.int
+    MODELS_USAGE_FIELD_NUMBER: builtins.int
+    CONTENT_FIELD_NUMBER: builtins.int
+    source: builtins.str
+    @property
+    def models_usage(self) -> global___RequestUsage: ...
+    @property
+    def content(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___FunctionCall]: ...
+    def __init__(
+        self,
+        *,
+        source: builtins.str = ...,
+        models_usage: global___RequestUsage | None = ...,
+        content: collections.abc.Iterable[global___FunctionCall] | None = ...,
+    ) -> None: ...
+    def HasField(self, field_name: typing.Literal["models_usage", b"models_usage"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["content", b"content", "models_usage", b"models_usage", "source", b"source"]) -> None: ...
+
+global___ToolCallRequestEvent = ToolCallRequestEvent
+
+@typing.final
+class ToolCallExecutionEvent(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    SOURCE_FIELD_NUMBER: builtins.int
+    MODELS_USAGE_FIELD_NUMBER: builtins.int
+    CONTENT_FIELD_NUMBER: builtins.int
+    source: builtins.str
+    @property
+    def models_usage(self) -> global___RequestUsage: ...
+    @property
+    def content(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___FunctionExecutionResult]: ...
+    def __init__(
+        self,
+        *,
+        source: builtins.str = ...,
+        models_usage: global___RequestUsage | None = ...,
+        content: collections.abc.Iterable[global___FunctionExecutionResult] | None = ...,
+    ) -> None: ...
+    def HasField(self, field_name: typing.Literal["models_usage", b"models_usage"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["content", b"content", "models_usage", b"models_usage", "source", b"source"]) -> None: ...
+
+global___ToolCallExecutionEvent = ToolCallExecutionEvent
+
+@typing.final
+class ToolCallSummaryMessage(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    SOURCE_FIELD_NUMBER: builtins.int
+    MODELS_USAGE_FIELD_NUMBER: builtins.int
+    CONTENT_FIELD_NUMBER: builtins.int
+    source: builtins.str
+    content: builtins.str
+    @property
+    def models_usage(self) -> global___RequestUsage: ...
+    def __init__(
+        self,
+        *,
+        source: builtins.str = ...,
+        models_usage: global___RequestUsage | None = ...,
+        content: builtins.str = ...,
+    ) -> None: ...
+    def HasField(self, field_name: typing.Literal["models_usage", b"models_usage"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["content", b"content", "models_usage", b"models_usage", "source", b"source"]) -> None: ...
+
+global___ToolCallSummaryMessage = ToolCallSummaryMessage
+
+@typing.final
+class UserInputRequestedEvent(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    SOURCE_FIELD_NUMBER: builtins.int
+    MODELS_USAGE_FIELD_NUMBER: builtins.int
+    REQUEST_ID_FIELD_NUMBER: builtins.int
+    source: builtins.str
+    request_id: builtins.str
+    @property
+    def models_usage(self) -> global___RequestUsage: ...
+    def __init__(
+        self,
+        *,
+        source: builtins.str = ...,
+        models_usage: global___RequestUsage | None = ...,
+        request_id: builtins.str = ...,
+    ) -> None: ...
+    def HasField(self, field_name: typing.Literal["models_usage", b"models_usage"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["models_usage", b"models_usage", "request_id", b"request_id", "source", b"source"]) -> None: ...
+
+global___UserInputRequestedEvent = UserInputRequestedEvent
+
+@typing.final
+class AgentChatMessage(google.protobuf.message.Message):
+    """Any chat message or agent event."""
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    TEXT_MESSAGE_FIELD_NUMBER: builtins.int
+    MULTI_MODAL_MESSAGE_FIELD_NUMBER: builtins.int
+    STOP_MESSAGE_FIELD_NUMBER: builtins.int
+    HANDOFF_MESSAGE_FIELD_NUMBER: builtins.int
+    TOOL_CALL_REQUEST_EVENT_FIELD_NUMBER: builtins.int
+    TOOL_CALL_EXECUTION_EVENT_FIELD_NUMBER: builtins.int
+    TOOL_CALL_SUMMARY_MESSAGE_FIELD_NUMBER: builtins.int
+    USER_INPUT_REQUESTED_EVENT_FIELD_NUMBER: builtins.int
+    @property
+    def text_message(self) -> global___TextMessage: ...
+    @property
+    def multi_modal_message(self) -> global___MultiModalMessage: ...
+    @property
+    def stop_message(self) -> global___StopMessage: ...
+    @property
+    def handoff_message(self) -> global___HandoffMessage: ...
+    @property
+    def tool_call_request_event(self) -> global___ToolCallRequestEvent: ...
+    @property
+    def tool_call_execution_event(self) -> global___ToolCallExecutionEvent: ...
+    @property
+    def tool_call_summary_message(self) -> global___ToolCallSummaryMessage: ...
+    @property
+    def user_input_requested_event(self) -> global___UserInputRequestedEvent: ...
+    def __init__(
+        self,
+        *,
+        text_message: global___TextMessage | None = ...,
+        multi_modal_message: global___MultiModalMessage | None = ...,
+        stop_message: global___StopMessage | None = ...,
+        handoff_message: global___HandoffMessage | None = ...,
+        tool_call_request_event: global___ToolCallRequestEvent | None = ...,
+        tool_call_execution_event: global___ToolCallExecutionEvent | None = ...,
+        tool_call_summary_message: global___ToolCallSummaryMessage | None = ...,
+        user_input_requested_event: global___UserInputRequestedEvent | None = ...,
+    ) -> None: ...
+    def HasField(self, field_name: typing.Literal["handoff_message", b"handoff_message", "message", b"message", "multi_modal_message", b"multi_modal_message", "stop_message", b"stop_message", "text_message", b"text_message", "tool_call_execution_event", b"tool_call_execution_event", "tool_call_request_event", b"tool_call_request_event", "tool_call_summary_message", b"tool_call_summary_message", "user_input_requested_event", b"user_input_requested_event"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["handoff_message", b"handoff_message", "message", b"message", "multi_modal_message", b"multi_modal_message", "stop_message", b"stop_message", "text_message", b"text_message", "tool_call_execution_event", b"tool_call_execution_event", "tool_call_request_event", b"tool_call_request_event", "tool_call_summary_message", b"tool_call_summary_message", "user_input_requested_event", b"user_input_requested_event"]) -> None: ...
+    def WhichOneof(self, oneof_group: typing.Literal["message", b"message"]) -> typing.Literal["text_message", "multi_modal_message", "stop_message", "handoff_message", "tool_call_request_event", "tool_call_execution_event", "tool_call_summary_message", "user_input_requested_event"] | None: ...
+
+global___AgentChatMessage = AgentChatMessage
+
+@typing.final
+class AgentChatMessageList(google.protobuf.message.Message):
+    """A list that can be told apart from no list."""
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    MESSAGES_FIELD_NUMBER: builtins.int
+    @property
+    def messages(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___AgentChatMessage]: ...
+    def __init__(
+        self,
+        *,
+        messages: collections.abc.Iterable[global___AgentChatMessage] | None = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["messages", b"messages"]) -> None: ...
+
+global___AgentChatMessageList = AgentChatMessageList
+
+@typing.final
+class Response(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    CHAT_MESSAGE_FIELD_NUMBER: builtins.int
+    INNER_MESSAGES_FIELD_NUMBER: builtins.int
+    @property
+    def chat_message(self) -> global___AgentChatMessage: ...
+    @property
+    def inner_messages(self) -> global___AgentChatMessageList: ...
+    def __init__(
+        self,
+        *,
+        chat_message: global___AgentChatMessage | None = ...,
+        inner_messages: global___AgentChatMessageList | None = ...,
+    ) -> None: ...
+    def HasField(self, field_name: typing.Literal["chat_message", b"chat_message", "inner_messages", b"inner_messages"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["chat_message", b"chat_message", "inner_messages", b"inner_messages"]) -> None: ...
+
+global___Response = Response
+
+@typing.final
+class GroupChatStart(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    MESSAGES_FIELD_NUMBER: builtins.int
+    @property
+    def messages(self) -> global___AgentChatMessageList: ...
+    def __init__(
+        self,
+        *,
+        messages: global___AgentChatMessageList | None = ...,
+    ) -> None: ...
+    def HasField(self, field_name: typing.Literal["messages", b"messages"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["messages", b"messages"]) -> None: ...
+
+global___GroupChatStart = GroupChatStart
+
+@typing.final
+class GroupChatAgentResponse(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    AGENT_RESPONSE_FIELD_NUMBER: builtins.int
+    @property
+    def agent_response(self) -> global___Response: ...
+    def __init__(
+        self,
+        *,
+        agent_response: global___Response | None = ...,
+    ) -> None: ...
+    def HasField(self, field_name: typing.Literal["agent_response", b"agent_response"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["agent_response", b"agent_response"]) -> None: ...
+
+global___GroupChatAgentResponse = GroupChatAgentResponse
+
+@typing.final
+class GroupChatRequestPublish(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    def __init__(
+        self,
+    ) -> None: ...
+
+global___GroupChatRequestPublish = GroupChatRequestPublish
+
+@typing.final
+class GroupChatMessage(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    MESSAGE_FIELD_NUMBER: builtins.int
+    @property
+    def message(self) -> global___AgentChatMessage: ...
+    def __init__(
+        self,
+        *,
+        message: global___AgentChatMessage | None = ...,
+    ) -> None: ...
+    def HasField(self, field_name: typing.Literal["message", b"message"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["message", b"message"]) -> None: ...
+
+global___GroupChatMessage = GroupChatMessage
+
+@typing.final
+class GroupChatTermination(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    MESSAGE_FIELD_NUMBER: builtins.int
+    @property
+    def message(self) -> global___StopMessage: ...
+    def __init__(
+        self,
+        *,
+        message: global___StopMessage | None = ...,
+    ) -> None: ...
+    def HasField(self, field_name: typing.Literal["message", b"message"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["message", b"message"]) -> None: ...
+
+global___GroupChatTermination = GroupChatTermination
+
+@typing.final
+class GroupChatReset(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    def __init__(
+        self,
+    ) -> None: ...
+
+global___GroupChatReset = GroupChatReset
@@ -0,0 +1,390 @@
+"""
+This module provides Protobuf serializers for the messages in :mod:`autogen_agentchat.messages` and for the
+events that group chat teams exchange, so that they travel in a binary format on a distributed runtime.
+"""
+
+from typing import Any, Callable, Dict, List, Sequence, TypeVar
+
+from autogen_core import PROTOBUF_DATA_CONTENT_TYPE, FunctionCall, Image, MessageSerializer
+from autogen_core._serialization import ProtobufMessageSerializer
+from autogen_core.models import FunctionExecutionResult, RequestUsage
+from google.protobuf.message import Message
+
+from .base import Response
+from .messages import (
+    AgentEvent,
+    ChatMessage,
+    HandoffMessage,
+    MultiModalMessage,
+    StopMessage,
+    TextMessage,
+    ToolCallExecutionEvent,
+    ToolCallRequestEvent,
+    ToolCallSummaryMessage,
+    UserInputRequestedEvent,
+)
+from .protos import agentchat_pb2
+from .teams._group_chat._events import (
+    GroupChatAgentResponse,
+    GroupChatMessage,
+    GroupChatRequestPublish,
+    GroupChatReset,
+    GroupChatStart,
+    GroupChatTermination,
+)
+
+T = TypeVar("T")
+
+
+# The ``_write_*`` functions fill in an empty Protobuf message in place. Passing sub-messages to a Protobuf
+# constructor copies them, which costs more than the rest of the serialization.
+
+
+def _write_usage(usage: RequestUsage | None, proto: Any) -> None:
+    if usage is not None:
+        proto.models_usage.prompt_tokens = usage.prompt_tokens
+        proto.models_usage.completion_tokens = usage.completion_tokens
+        proto.models_usage.SetInParent()
+
+
+def _usage_from_proto(proto: Any) -> RequestUsage | None:
+    if not proto.HasField("models_usage"):
+        return None
+    return RequestUsage(
+        prompt_tokens=proto.models_usage.prompt_tokens, completion_tokens=proto.models_usage.completion_tokens
+    )
+
+
+def _write_text_message(message: TextMessage, proto: agentchat_pb2.TextMessage) -> None:
+    proto.source = message.source
+    _write_usage(message.models_usage, proto)
+    proto.content = message.content
+
+
+def _text_message_from_proto(proto: agentchat_pb2.TextMessage) -> TextMessage:
+    return TextMessage(source=proto.source, models_usage=_usage_from_proto(proto), content=proto.content)
+
+
+def _write_multi_modal_message(message: MultiModalMessage, proto: agentchat_pb2.MultiModalMessage) -> None:
+    proto.source = message.source
+    _write_usage(message.models_usage, proto)
+    add = proto.content.add
+    for item in message.content:
+        if isinstance(item, str):
+            add(text=item)
+        else:
+            add().image.data = item.to_bytes()
+
+
+def _multi_modal_message_from_proto(proto: agentchat_pb2.MultiModalMessage) -> MultiModalMessage:
+    return MultiModalMessage(
+        source=proto.source,
+        models_usage=_usage_from_proto(proto),
+        content=[
+            item.text if item.WhichOneof("item") == "text" else Image.from_bytes(item.image.data)
+            for item in proto.content
+        ],
+    )
+
+
+def _write_stop_message(message: StopMessage, proto: agentchat_pb2.StopMessage) -> None:
+    proto.source = message.source
+    _write_usage(message.models_usage, proto)
+    proto.content = message.content
+
+
+def _stop_message_from_proto(proto: agentchat_pb2.StopMessage) -> StopMessage:
+    return StopMessage(source=proto.source, models_usage=_usage_from_proto(proto), content=proto.content)
+
+
+def _write_handoff_message(message: HandoffMessage, proto: agentchat_pb2.HandoffMessage) -> None:
+    proto.source = message.source
+    _write_usage(message.models_usage, proto)
+    proto.target = message.target
+    proto.content = message.content
+
+
+def _handoff_message_from_proto(proto: agentchat_pb2.HandoffMessage) -> HandoffMessage:
+    return HandoffMessage(
+        source=proto.source, models_usage=_usage_from_proto(proto), target=proto.target, content=proto.content
+    )
+
+
+def _write_tool_call_request_event(message: ToolCallRequestEvent, proto: agentchat_pb2.ToolCallRequestEvent) -> None:
+    proto.source = message.source
+    _write_usage(message.models_usage, proto)
+    add = proto.content.add
+    for call in message.content:
+        add(id=call.id, arguments=call.arguments, name=call.name)
+
+
+def _tool_call_request_event_from_proto(proto: agentchat_pb2.ToolCallRequestEvent) -> ToolCallRequestEvent:
+    return ToolCallRequestEvent(
+        source=proto.source,
+        models_usage=_usage_from_proto(proto),
+        content=[FunctionCall(id=call.id, arguments=call.arguments, name=call.name) for call in proto.content],
+    )
+
+
+def _write_tool_call_execution_event(
+    message: ToolCallExecutionEvent, proto: agentchat_pb2.ToolCallExecutionEvent
+) -> None:
+    proto.source = message.source
+    _write_usage(message.models_usage, proto)
+    add = proto.content.add
+    for result in message.content:
+        add(content=result.content, call_id=result.call_id)
+
+
+def _tool_call_execution_event_from_proto(proto: agentchat_pb2.ToolCallExecutionEvent) -> ToolCallExecutionEvent:
+    return ToolCallExecutionEvent(
+        source=proto.source,
+        models_usage=_usage_from_proto(proto),
+        content=[FunctionExecutionResult(content=result.content, call_id=result.call_id) for result in proto.content],
+    )
+
+
+def _write_tool_call_summary_message(
+    message: ToolCallSummaryMessage, proto: agentchat_pb2.ToolCallSummaryMessage
+) -> None:
+    proto.source = message.source
+    _write_usage(message.models_usage, proto)
+    proto.content = message.content
+
+
+def _tool_call_summary_message_from_proto(proto: agentchat_pb2.ToolCallSummaryMessage) -> ToolCallSummaryMessage:
+    return ToolCallSummaryMessage(source=proto.source, models_usage=_usage_from_proto(proto), content=proto.content)
+
+
+def _write_user_input_requested_event(
+    message: UserInputRequestedEvent, proto: agentchat_pb2.UserInputRequestedEvent
+) -> None:
+    proto.source = message.source
+    _write_usage(message.models_usage, proto)
+    proto.request_id = message.request_id
+
+
+def _user_input_requested_event_from_proto(
+    proto: agentchat_pb2.UserInputRequestedEvent,
+) -> UserInputRequestedEvent:
+    return UserInputRequestedEvent(
+        source=proto.source, models_usage=_usage_from_proto(proto), request_id=proto.request_id
+    )
+
+
+# Message class -> the field of AgentChatMessage that holds it, and its conversions to and from Protobuf.
+_AGENT_CHAT_MESSAGE_FIELDS: Dict[type, tuple[str, Callable[[Any, Any], None], Callable[[Any], Any]]] = {
+    TextMessage: ("text_message", _write_text_message, _text_message_from_proto),
+    MultiModalMessage: ("multi_modal_message", _write_multi_modal_message, _multi_modal_message_from_proto),
+    StopMessage: ("stop_message", _write_stop_message, _stop_message_from_proto),
+    HandoffMessage: ("handoff_message", _write_handoff_message, _handoff_message_from_proto),
+    ToolCallRequestEvent: (
+        "tool_call_request_event",
+        _write_tool_call_request_event,
+        _tool_call_request_event_from_proto,
+    ),
+    ToolCallExecutionEvent: (
+        "tool_call_execution_event",
+        _write_tool_call_execution_event,
+        _tool_call_execution_event_from_proto,
+    ),
+    ToolCallSummaryMessage: (
+        "tool_call_summary_message",
+        _write_tool_call_summary_message,
+        _tool_call_summary_message_from_proto,
+    ),
+    UserInputRequestedEvent: (
+        "user_input_requested_event",
+        _write_user_input_requested_event,
+        _user_input_requested_event_from_proto,
+    ),
+}
+_FROM_AGENT_CHAT_MESSAGE_FIELD: Dict[str, Callable[[Any], Any]] = {
+    field: from_proto for field, _, from_proto in _AGENT_CHAT_MESSAGE_FIELDS.values()
+}
+
+
+def _write_agent_chat_message(message: AgentEvent | ChatMessage, proto: agentchat_pb2.AgentChatMessage) -> None:
+    field, write, _ = _AGENT_CHAT_MESSAGE_FIELDS[type(message)]
+    inner = getattr(proto, field)
+    # Selects the field of the oneof even if the message has only default values.
+    inner.SetInParent()
+    write(message, inner)
+
+
+def _agent_chat_message_from_proto(proto: agentchat_pb2.AgentChatMessage) -> Any:
+    field = proto.WhichOneof("message")
+    if field is None:
+        raise ValueError("The message is empty.")
+    return _FROM_AGENT_CHAT_MESSAGE_FIELD[field](getattr(proto, field))
+
+
+def _write_message_list(
+    messages: Sequence[AgentEvent | ChatMessage], proto: agentchat_pb2.AgentChatMessageList
+) -> None:
+    proto.SetInParent()
+    add = proto.messages.add
+    for message in messages:
+        _write_agent_chat_message(message, add())
+
+
+def _message_list_from_proto(proto: Any, field: str) -> List[Any] | None:
+    if not proto.HasField(field):
+        return None
+    return [_agent_chat_message_from_proto(message) for message in getattr(proto, field).messages]
+
+
+def _write_group_chat_start(message: GroupChatStart, proto: agentchat_pb2.GroupChatStart) -> None:
+    if message.messages is not None:
+        _write_message_list(message.messages, proto.messages)
+
+
+def _group_chat_start_from_proto(proto: agentchat_pb2.GroupChatStart) -> GroupChatStart:
+    return GroupChatStart(messages=_message_list_from_proto(proto, "messages"))
+
+
+def _write_group_chat_agent_response(
+    message: GroupChatAgentResponse, proto: agentchat_pb2.GroupChatAgentResponse
+) -> None:
+    response = message.agent_response
+    _write_agent_chat_message(response.chat_message, proto.agent_response.chat_message)
+    if response.inner_messages is not None:
+        _write_message_list(response.inner_messages, proto.agent_response.inner_messages)
+
+
+def _group_chat_agent_response_from_proto(proto: agentchat_pb2.GroupChatAgentResponse) -> GroupChatAgentResponse:
+    response = proto.agent_response
+    return GroupChatAgentResponse(
+        agent_response=Response(
+            chat_message=_agent_chat_message_from_proto(response.chat_message),
+            inner_messages=_message_list_from_proto(response, "inner_messages"),
+        )
+    )
+
+
+def _write_group_chat_message(message: GroupChatMessage, proto: agentchat_pb2.GroupChatMessage) -> None:
+    _write_agent_chat_message(message.message, proto.message)
+
+
+def _group_chat_message_from_proto(proto: agentchat_pb2.GroupChatMessage) -> GroupChatMessage:
+    return GroupChatMessage(message=_agent_chat_message_from_proto(proto.message))
+
+
+def _write_group_chat_termination(message: GroupChatTermination, proto: agentchat_pb2.GroupChatTermination) -> None:
+    proto.message.SetInParent()
+    _write_stop_message(message.message, proto.message)
+
+
+def _group_chat_termination_from_proto(proto: agentchat_pb2.GroupChatTermination) -> GroupChatTermination:
+    return GroupChatTermination(message=_stop_message_from_proto(proto.message))
+
+
+def _write_nothing(message: Any, proto: Any) -> None:
+    pass
+
+
+class AgentChatProtobufSerializer(MessageSerializer[T]):
+    """Serializes an agentchat message class as the Protobuf message of the same name in ``agentchat.proto``,
+    packed in a ``google.protobuf.Any`` like the runtime's own Protobuf serializer.
+
+    Args:
+        cls (type[T]): The message class.
+        proto_cls (type[Message]): The Protobuf message class.
+        write (Callable[[T, Any], None]): Fills in an empty Protobuf message from a message.
+        from_proto (Callable[[Any], T]): Converts a Protobuf message back.
+    """
+
+    def __init__(
+        self,
+        cls: type[T],
+        proto_cls: type[Message],
+        write: Callable[[T, Any], None],
+        from_proto: Callable[[Any], T],
+    ) -> None:
+        self._type_name = cls.__name__
+        self._proto_cls = proto_cls
+        self._proto_serializer = ProtobufMessageSerializer(proto_cls)
+        self._write = write
+        self._from_proto = from_proto
+
+    @property
+    def data_content_type(self) -> str:
+        return PROTOBUF_DATA_CONTENT_TYPE
+
+    @property
+    def type_name(self) -> str:
+        return self._type_name
+
+    def deserialize(self, payload: bytes) -> T:
+        return self._from_proto(self._proto_serializer.deserialize(payload))
+
+    def serialize(self, message: T) -> bytes:
+        proto = self._proto_cls()
+        self._write(message, proto)
+        return self._proto_serializer.serialize(proto)
+
+
+def get_protobuf_serializers() -> List[MessageSerializer[Any]]:
+    """Returns Protobuf serializers for every message in :mod:`autogen_agentchat.messages` and for the events that
+    group chat teams exchange.
+
+    Add them to a distributed runtime to send these messages as Protobuf instead of JSON.
+
+    Example:
+
+        .. code-block:: python
+
+            from autogen_agentchat.serialization import get_protobuf_serializers
+            from autogen_core import PROTOBUF_DATA_CONTENT_TYPE
+            from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntime
+
+            runtime = GrpcWorkerAgentRuntime(
+                host_address="localhost:50051",
+                payload_serialization_format=PROTOBUF_DATA_CONTENT_TYPE,
+                preferred_content_types=[PROTOBUF_DATA_CONTENT_TYPE],
+            )
+            runtime.add_message_serializer(get_protobuf_serializers())
+    """
+    serializers: List[MessageSerializer[Any]] = [
+        AgentChatProtobufSerializer(cls, getattr(agentchat_pb2, cls.__name__), write, from_proto)
+        for cls, (_, write, from_proto) in _AGENT_CHAT_MESSAGE_FIELDS.items()
+    ]
+    serializers += [
+        AgentChatProtobufSerializer(
+            GroupChatStart, agentchat_pb2.GroupChatStart, _write_group_chat_start, _group_chat_start_from_proto
+        ),
+        AgentChatProtobufSerializer(
+            GroupChatAgentResponse,
+            agentchat_pb2.GroupChatAgentResponse,
+            _write_group_chat_agent_response,
+            _group_chat_agent_response_from_proto,
+        ),
+        AgentChatProtobufSerializer(
+            GroupChatRequestPublish,
+            agentchat_pb2.GroupChatRequestPublish,
+            _write_nothing,
+            lambda _: GroupChatRequestPublish(),
+        ),
+        AgentChatProtobufSerializer(
+            GroupChatMessage,
+            agentchat_pb2.GroupChatMessage,
+            _write_group_chat_message,
+            _group_chat_message_from_proto,
+        ),
+        AgentChatProtobufSerializer(
+            GroupChatTermination,
+            agentchat_pb2.GroupChatTermination,
+            _write_group_chat_termination,
+            _group_chat_termination_from_proto,
+        ),
+        AgentChatProtobufSerializer(
+            GroupChatReset,
+            agentchat_pb2.GroupChatReset,
+            _write_nothing,
+            lambda _: GroupChatReset(),
+        ),
+    ]
+    return serializers
+
+
+__all__ = ["AgentChatProtobufSerializer", "get_protobuf_serializers"]
@@ -0,0 +1,86 @@
+from typing import Any, List
+
+import pytest
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import (
+    HandoffMessage,
+    MultiModalMessage,
+    StopMessage,
+    TextMessage,
+    ToolCallExecutionEvent,
+    ToolCallRequestEvent,
+    ToolCallSummaryMessage,
+    UserInputRequestedEvent,
+)
+from autogen_agentchat.serialization import get_protobuf_serializers
+from autogen_agentchat.teams._group_chat._events import (
+    GroupChatAgentResponse,
+    GroupChatMessage,
+    GroupChatRequestPublish,
+    GroupChatReset,
+    GroupChatStart,
+    GroupChatTermination,
+)
+from autogen_core import PROTOBUF_DATA_CONTENT_TYPE, FunctionCall, Image
+from autogen_core._serialization import SerializationRegistry
+from autogen_core.models import FunctionExecutionResult, RequestUsage
+from PIL import Image as PILImage
+
+usage = RequestUsage(prompt_tokens=10, completion_tokens=5)
+image = Image.from_pil(PILImage.new("RGB", (4, 4), color=(255, 0, 0)))
+inner_messages: List[Any] = [
+    ToolCallRequestEvent(source="assistant", content=[FunctionCall(id="1", arguments='{"a": 1}', name="add")]),
+    ToolCallExecutionEvent(source="assistant", content=[FunctionExecutionResult(content="2", call_id="1")]),
+]
+
+messages: List[Any] = [
+    TextMessage(source="user", content="Hello"),
+    TextMessage(source="assistant", content="", models_usage=usage),
+    MultiModalMessage(source="user", content=["Describe this image", image]),
+    StopMessage(source="assistant", content="Done", models_usage=usage),
+    HandoffMessage(source="assistant", target="planner", content="Over to you"),
+    *inner_messages,
+    ToolCallSummaryMessage(source="assistant", content="2"),
+    UserInputRequestedEvent(source="user_proxy", request_id="42"),
+    GroupChatStart(messages=None),
+    GroupChatStart(messages=[]),
+    GroupChatStart(
+        messages=[TextMessage(source="user", content="Hello"), MultiModalMessage(source="user", content=[image])]
+    ),
+    GroupChatAgentResponse(agent_response=Response(chat_message=TextMessage(source="assistant", content="Hi"))),
+    GroupChatAgentResponse(
+        agent_response=Response(
+            chat_message=ToolCallSummaryMessage(source="assistant", content="2", models_usage=usage),
+            inner_messages=inner_messages,
+        )
+    ),
+    GroupChatAgentResponse(
+        agent_response=Response(chat_message=TextMessage(source="assistant", content="Hi"), inner_messages=[])
+    ),
+    GroupChatRequestPublish(),
+    GroupChatMessage(message=HandoffMessage(source="assistant", target="planner", content="Over to you")),
+    GroupChatTermination(message=StopMessage(source="termination", content="Maximum number of messages reached")),
+    GroupChatReset(),
+]
+
+
+@pytest.mark.parametrize("message", messages, ids=lambda message: type(message).__name__)
+def test_protobuf_round_trip(message: Any) -> None:
+    registry = SerializationRegistry()
+    registry.add_serializer(get_protobuf_serializers())
+    type_name = registry.type_name(message)
+    assert type_name == type(message).__name__
+    assert registry.is_registered(type_name, PROTOBUF_DATA_CONTENT_TYPE)
+
+    payload = registry.serialize(message, type_name=type_name, data_content_type=PROTOBUF_DATA_CONTENT_TYPE)
+    result = registry.deserialize(payload, type_name=type_name, data_content_type=PROTOBUF_DATA_CONTENT_TYPE)
+
+    # Image does not compare by value, so compare the JSON of the messages.
+    assert type(result) is type(message)
+    assert result.model_dump_json() == message.model_dump_json()
+
+
+def test_protobuf_serializers_cover_all_messages() -> None:
+    type_names = {serializer.type_name for serializer in get_protobuf_serializers()}
+    assert type_names == {type(message).__name__ for message in messages}
+    assert {serializer.data_content_type for serializer in get_protobuf_serializers()} == {PROTOBUF_DATA_CONTENT_TYPE}
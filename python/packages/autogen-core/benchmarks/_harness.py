@@ -0,0 +1,66 @@
+"""Helpers shared by the runtime benchmarks in this directory."""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Sequence
+
+
+@dataclass
+class BenchmarkResult:
+    """The timing of a single benchmark case."""
+
+    name: str
+    iterations: int
+    seconds: float
+    params: Dict[str, Any] = field(default_factory=dict)
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def ops_per_second(self) -> float:
+        return self.iterations / self.seconds if self.seconds > 0 else float("inf")
+
+    @property
+    def microseconds_per_op(self) -> float:
+        return self.seconds / self.iterations * 1e6 if self.iterations > 0 else 0.0
+
+
+def measure(name: str, func: Callable[[], Any], iterations: int, **params: Any) -> BenchmarkResult:
+    """Time ``iterations`` calls of ``func``."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return BenchmarkResult(name=name, iterations=iterations, seconds=time.perf_counter() - start, params=params)
+
+
+def parser(description: str) -> argparse.ArgumentParser:
+    result = argparse.ArgumentParser(description=description)
+    result.add_argument("--json", metavar="PATH", help="Also write the results as JSON to PATH.")
+    return result
+
+
+def report(results: Sequence[BenchmarkResult], json_path: str | None = None) -> None:
+    """Print the results as a table and optionally write them as JSON."""
+    rows: List[Dict[str, Any]] = []
+    for result in results:
+        params = " ".join(f"{key}={value}" for key, value in result.params.items())
+        extra = " ".join(f"{key}={value}" for key, value in result.extra.items())
+        print(
+            f"{result.name:<40} {params:<40} {result.ops_per_second:>14,.0f} ops/s "
+            f"{result.microseconds_per_op:>10.2f} us/op {extra}"
+        )
+        row = asdict(result)
+        row["ops_per_second"] = result.ops_per_second
+        row["microseconds_per_op"] = result.microseconds_per_op
+        rows.append(row)
+    if json_path is not None:
+        document = {
+            "python": sys.version,
+            "platform": platform.platform(),
+            "results": rows,
+        }
+        with open(json_path, "w") as f:
+            json.dump(document, f, indent=2)
@@ -0,0 +1,105 @@
+"""Measures the construction of agents with an expensive asynchronous factory.
+
+The ``burst`` case publishes many messages at once to agents that do not exist yet and counts how many times the
+factory runs. The ``prewarm`` cases instantiate the agents before any message is sent, one ``get`` at a time or
+with one ``get_many`` call.
+
+Run with ``python benchmarks/agent_activation.py``.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import List
+
+from _harness import BenchmarkResult, parser, report
+from autogen_core import (
+    AgentType,
+    DefaultTopicId,
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    TypeSubscription,
+    message_handler,
+)
+
+
+@dataclass
+class Ping:
+    pass
+
+
+class ExpensiveAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Takes a while to construct, like an agent that opens a browser.")
+
+    @message_handler
+    async def on_ping(self, message: Ping, ctx: MessageContext) -> None:
+        pass
+
+
+async def make_runtime(agent_types: int, construction_delay: float) -> tuple[SingleThreadedAgentRuntime, List[int]]:
+    runtime = SingleThreadedAgentRuntime()
+    constructions = [0]
+
+    async def agent_factory() -> ExpensiveAgent:
+        constructions[0] += 1
+        await asyncio.sleep(construction_delay)
+        return ExpensiveAgent()
+
+    for i in range(agent_types):
+        await runtime.register_factory(f"agent{i}", agent_factory, expected_class=ExpensiveAgent)
+        await runtime.add_subscription(TypeSubscription("default", f"agent{i}"))
+    return runtime, constructions
+
+
+async def run_burst(agent_types: int, messages: int, construction_delay: float) -> BenchmarkResult:
+    runtime, constructions = await make_runtime(agent_types, construction_delay)
+    runtime.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(runtime.publish_message(Ping(), DefaultTopicId()) for _ in range(messages)))
+    await runtime.stop_when_idle()
+    return BenchmarkResult(
+        name="burst",
+        iterations=messages,
+        seconds=time.perf_counter() - start,
+        params={"agents": agent_types},
+        extra={"constructions": constructions[0]},
+    )
+
+
+async def run_prewarm(mode: str, agents: int, construction_delay: float) -> BenchmarkResult:
+    runtime, constructions = await make_runtime(1, construction_delay)
+    keys = [f"key{i}" for i in range(agents)]
+    start = time.perf_counter()
+    if mode == "get":
+        for key in keys:
+            await runtime.get(AgentType("agent0"), key, lazy=False)
+    else:
+        await runtime.get_many(AgentType("agent0"), keys, lazy=False)
+    return BenchmarkResult(
+        name="prewarm",
+        iterations=agents,
+        seconds=time.perf_counter() - start,
+        params={"mode": mode},
+        extra={"constructions": constructions[0]},
+    )
+
+
+async def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--agents", type=int, default=100)
+    arg_parser.add_argument("--messages", type=int, default=50, help="Messages published in the burst.")
+    arg_parser.add_argument("--delay", type=float, default=0.01, help="Seconds each construction takes.")
+    args = arg_parser.parse_args()
+
+    results = [
+        await run_burst(args.agents, args.messages, args.delay),
+        await run_prewarm("get", args.agents, args.delay),
+        await run_prewarm("get_many", args.agents, args.delay),
+    ]
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,96 @@
+"""Measures how per-agent concurrency limits affect a mix of one hot agent and many cold agents.
+
+The hot agent receives a burst of messages while each cold agent receives a few. Every handler awaits a short
+sleep, like a call to a model or a tool. Reports the total throughput, the latency of the cold agents' messages,
+and the largest number of handlers the hot agent ran at once.
+
+Run with ``python benchmarks/agent_mailboxes.py``.
+"""
+
+import asyncio
+import statistics
+import time
+from dataclasses import dataclass
+from typing import List
+
+from _harness import BenchmarkResult, parser, report
+from autogen_core import AgentId, MessageContext, RoutedAgent, SingleThreadedAgentRuntime, message_handler
+
+
+@dataclass
+class Job:
+    delay: float
+
+
+class WorkerAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Simulates an I/O bound handler.")
+        self.active = 0
+        self.max_active = 0
+
+    @message_handler
+    async def on_job(self, message: Job, ctx: MessageContext) -> None:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(message.delay)
+        self.active -= 1
+
+
+async def run_case(
+    max_concurrency: int | None, hot_messages: int, cold_agents: int, cold_messages: int, delay: float
+) -> BenchmarkResult:
+    runtime = SingleThreadedAgentRuntime()
+    await WorkerAgent.register(runtime, "worker", WorkerAgent, max_concurrency=max_concurrency)
+    runtime.start()
+    hot = AgentId("worker", "hot")
+    cold = [AgentId("worker", f"cold{i}") for i in range(cold_agents)]
+    cold_latencies: List[float] = []
+
+    async def send_cold(recipient: AgentId) -> None:
+        for _ in range(cold_messages):
+            start = time.perf_counter()
+            await runtime.send_message(Job(delay=delay), recipient)
+            cold_latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(runtime.send_message(Job(delay=delay), hot) for _ in range(hot_messages)),
+        *(send_cold(recipient) for recipient in cold),
+    )
+    seconds = time.perf_counter() - start
+    await runtime.stop_when_idle()
+
+    hot_agent = await runtime.try_get_underlying_agent_instance(hot, type=WorkerAgent)
+    cold_latencies.sort()
+    return BenchmarkResult(
+        name="hot_and_cold",
+        iterations=hot_messages + cold_agents * cold_messages,
+        seconds=seconds,
+        params={"max_concurrency": max_concurrency},
+        extra={
+            "cold_p50_ms": round(statistics.median(cold_latencies) * 1000, 2),
+            "cold_p99_ms": round(cold_latencies[int(len(cold_latencies) * 0.99) - 1] * 1000, 2),
+            "hot_max_active": hot_agent.max_active,
+        },
+    )
+
+
+async def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--hot-messages", type=int, default=5_000)
+    arg_parser.add_argument("--cold-agents", type=int, default=50)
+    arg_parser.add_argument("--cold-messages", type=int, default=10, help="Messages sent to each cold agent.")
+    arg_parser.add_argument("--delay", type=float, default=0.001, help="Seconds each handler sleeps.")
+    arg_parser.add_argument("--max-concurrency", type=int, nargs="+", default=[0, 1, 8, 64], help="0 means no limit.")
+    args = arg_parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    for max_concurrency in args.max_concurrency:
+        results.append(
+            await run_case(max_concurrency or None, args.hot_messages, args.cold_agents, args.cold_messages, args.delay)
+        )
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
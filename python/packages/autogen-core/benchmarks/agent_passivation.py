@@ -0,0 +1,124 @@
+"""Measures memory and latency of per-session agents with and without passivation.
+
+Every session has its own agent that keeps a growing history, like a model context, and holds a buffer that stands
+in for resources that are not part of its state, like clients and caches. Messages go to sessions picked
+from a skewed distribution, so a few sessions are hot and most are rarely used. Reports the memory still allocated
+at the end of the run, the message latency and the passivation counters.
+
+Run with ``python benchmarks/agent_passivation.py``.
+"""
+
+import asyncio
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, List, Mapping
+
+from _harness import BenchmarkResult, parser, report
+from autogen_core import AgentId, MessageContext, RoutedAgent, SingleThreadedAgentRuntime, message_handler
+
+
+@dataclass
+class Turn:
+    text: str
+
+
+class SessionAgent(RoutedAgent):
+    def __init__(self, instance_size: int) -> None:
+        super().__init__("Keeps the history of a session.")
+        self.history: List[str] = []
+        self.resources = bytearray(instance_size)
+
+    @message_handler
+    async def on_turn(self, message: Turn, ctx: MessageContext) -> int:
+        self.history.append(message.text)
+        return len(self.history)
+
+    async def save_state(self) -> Mapping[str, Any]:
+        return {"history": self.history}
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        self.history = list(state["history"])
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+async def run_sessions(
+    runtime: SingleThreadedAgentRuntime, keys: List[str], turn_size: int, instance_size: int
+) -> List[float]:
+    await SessionAgent.register(runtime, "session", lambda: SessionAgent(instance_size))
+    runtime.start()
+    latencies: List[float] = []
+    for i, key in enumerate(keys):
+        text = f"{i:>{turn_size}}"
+        sent_at = time.perf_counter()
+        await runtime.send_message(Turn(text=text), AgentId("session", key))
+        latencies.append(time.perf_counter() - sent_at)
+    await runtime.stop_when_idle()
+    return latencies
+
+
+async def run_case(
+    max_active_agents: int, sessions: int, num_messages: int, turn_size: int, instance_size: int
+) -> BenchmarkResult:
+    rng = random.Random(0)
+    # Cubing a uniform sample skews it towards zero: a few sessions get most of the messages.
+    keys = [f"session{int(sessions * rng.random() ** 3)}" for _ in range(num_messages)]
+
+    runtime = SingleThreadedAgentRuntime(max_active_agents=max_active_agents)
+    start = time.perf_counter()
+    latencies = await run_sessions(runtime, keys, turn_size, instance_size)
+    seconds = time.perf_counter() - start
+    stats = runtime.passivation_stats
+
+    # Tracing allocations slows everything down, so memory is measured in a separate run.
+    tracemalloc.start()
+    runtime = SingleThreadedAgentRuntime(max_active_agents=max_active_agents)
+    await run_sessions(runtime, keys, turn_size, instance_size)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del runtime
+
+    latencies.sort()
+    return BenchmarkResult(
+        name="sessions",
+        iterations=num_messages,
+        seconds=seconds,
+        params={"max_active_agents": max_active_agents},
+        extra={
+            "memory_mib": round(memory / 2**20, 1),
+            "p50_us": round(percentile(latencies, 0.5) * 1e6, 1),
+            "p99_us": round(percentile(latencies, 0.99) * 1e6, 1),
+            "active_agents": stats.active_agents,
+            "passivations": stats.passivations,
+            "reactivations": stats.reactivations,
+        },
+    )
+
+
+async def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--sessions", type=int, default=10_000)
+    arg_parser.add_argument("--messages", type=int, default=10_000)
+    arg_parser.add_argument("--turn-size", type=int, default=200, help="Characters added to the history per turn.")
+    arg_parser.add_argument(
+        "--instance-size", type=int, default=20_000, help="Bytes each agent holds outside of its state."
+    )
+    arg_parser.add_argument(
+        "--max-active-agents", type=int, nargs="+", default=[0, 1_000, 100], help="0 means no passivation."
+    )
+    args = arg_parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    for max_active_agents in args.max_active_agents:
+        results.append(
+            await run_case(max_active_agents, args.sessions, args.messages, args.turn_size, args.instance_size)
+        )
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""Measures the cost of serializing and deserializing agentchat messages as JSON, MessagePack and Protobuf.
+
+Each case round-trips a message from ``autogen_agentchat`` through the ``SerializationRegistry``, the way the gRPC
+worker runtime does. The messages are a ``TextMessage``, a ``MultiModalMessage`` with an image, a
+``ToolCallRequestEvent`` with several calls, and a ``GroupChatAgentResponse`` with inner messages, which is what a
+group chat manager receives after each turn. Every message is measured with the pydantic JSON serializer, the
+MessagePack one if ``msgpack`` is installed, and the Protobuf one from
+``autogen_agentchat.serialization.get_protobuf_serializers``. Reports the time per round trip and the size of the
+payload, and the time of ``serialize_message`` and ``deserialize`` on their own.
+
+Requires ``autogen-agentchat``. Run with ``python benchmarks/agentchat_serialization.py``.
+"""
+
+from typing import Any, Dict, List
+
+from _harness import BenchmarkResult, measure, parser, report
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import (
+    MultiModalMessage,
+    TextMessage,
+    ToolCallExecutionEvent,
+    ToolCallRequestEvent,
+    ToolCallSummaryMessage,
+)
+from autogen_agentchat.serialization import get_protobuf_serializers
+from autogen_agentchat.teams._group_chat._events import GroupChatAgentResponse
+from autogen_core import FunctionCall, Image, try_get_known_serializers_for_type
+from autogen_core._serialization import SerializationRegistry
+from autogen_core.models import FunctionExecutionResult, RequestUsage
+from PIL import Image as PILImage
+from serialization import round_trip
+
+
+def messages(calls: int, image_size: int) -> Dict[str, Any]:
+    usage = RequestUsage(prompt_tokens=512, completion_tokens=128)
+    function_calls = [
+        FunctionCall(id=f"call_{i}", arguments='{"query": "' + "x" * 64 + '"}', name="search") for i in range(calls)
+    ]
+    return {
+        "text": TextMessage(source="assistant", content="x" * 256, models_usage=usage),
+        "multimodal": MultiModalMessage(
+            source="user",
+            # Noise does not compress, like a photo.
+            content=["Describe this image.", Image(PILImage.effect_noise((image_size, image_size), 64))],
+        ),
+        "tool_call_request": ToolCallRequestEvent(source="assistant", content=function_calls, models_usage=usage),
+        "agent_response": GroupChatAgentResponse(
+            agent_response=Response(
+                chat_message=ToolCallSummaryMessage(source="assistant", content="x" * 256),
+                inner_messages=[
+                    ToolCallRequestEvent(source="assistant", content=function_calls, models_usage=usage),
+                    ToolCallExecutionEvent(
+                        source="assistant",
+                        content=[FunctionExecutionResult(content="x" * 64, call_id=call.id) for call in function_calls],
+                    ),
+                ],
+            )
+        ),
+    }
+
+
+def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--iterations", type=int, default=20_000)
+    arg_parser.add_argument("--calls", type=int, default=5, help="Function calls in the tool call messages.")
+    arg_parser.add_argument("--image-size", type=int, default=256, help="Width and height of the image in pixels.")
+    args = arg_parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    for kind, message in messages(args.calls, args.image_size).items():
+        serializers = try_get_known_serializers_for_type(type(message))
+        serializers.extend(
+            serializer for serializer in get_protobuf_serializers() if serializer.type_name == type(message).__name__
+        )
+        registry = SerializationRegistry()
+        registry.add_serializer(serializers)
+        # Encoding an image to PNG takes milliseconds, so run those cases less often.
+        iterations = args.iterations // 100 if kind == "multimodal" else args.iterations
+        for serializer in serializers:
+            content_type = serializer.data_content_type
+            params = {"message": kind, "content_type": content_type.rpartition("/")[2]}
+            call, size = round_trip(registry, message, serializer)
+            result = measure("round_trip", call, iterations, **params)
+            result.extra["payload_bytes"] = size
+            results.append(result)
+
+            type_name, payload = registry.serialize_message(message, data_content_type=content_type)
+            results.append(
+                measure(
+                    "serialize",
+                    lambda: registry.serialize_message(message, data_content_type=content_type),  # noqa: B023
+                    iterations,
+                    **params,
+                )
+            )
+            results.append(
+                measure(
+                    "deserialize",
+                    lambda: registry.deserialize(payload, type_name=type_name, data_content_type=content_type),  # noqa: B023
+                    iterations,
+                    **params,
+                )
+            )
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    main()
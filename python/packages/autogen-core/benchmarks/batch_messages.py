@@ -0,0 +1,89 @@
+"""Compares sending and publishing messages one at a time with the ``send_messages``/``publish_messages`` batch APIs.
+
+Messages are produced in batches. The ``single`` cases call ``send_message``/``publish_message`` once per message of
+a batch, the ``batch`` cases hand the whole batch to the runtime in one call.
+
+Run with ``python benchmarks/batch_messages.py``.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import List
+
+from _harness import BenchmarkResult, parser, report
+from autogen_core import (
+    AgentId,
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    TopicId,
+    TypeSubscription,
+    message_handler,
+)
+
+
+@dataclass
+class Item:
+    index: int
+
+
+class EchoAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An echo agent.")
+
+    @message_handler
+    async def on_item(self, message: Item, ctx: MessageContext) -> Item:
+        return message
+
+
+async def run_case(kind: str, mode: str, num_messages: int, batch_size: int) -> BenchmarkResult:
+    runtime = SingleThreadedAgentRuntime()
+    await EchoAgent.register(runtime, "echo", EchoAgent)
+    await runtime.add_subscription(TypeSubscription("bench", "echo"))
+    runtime.start()
+    recipient = AgentId("echo", "default")
+    topic_id = TopicId("bench", "default")
+    batches = [
+        [Item(index=i) for i in range(start, min(start + batch_size, num_messages))]
+        for start in range(0, num_messages, batch_size)
+    ]
+
+    start = time.perf_counter()
+    for batch in batches:
+        if kind == "send" and mode == "single":
+            await asyncio.gather(*(runtime.send_message(item, recipient) for item in batch))
+        elif kind == "send":
+            await runtime.send_messages(batch, recipient)
+        elif mode == "single":
+            for item in batch:
+                await runtime.publish_message(item, topic_id)
+        else:
+            await runtime.publish_messages(batch, topic_id)
+    await runtime.stop_when_idle()
+    seconds = time.perf_counter() - start
+
+    return BenchmarkResult(
+        name=kind,
+        iterations=num_messages,
+        seconds=seconds,
+        params={"mode": mode, "batch_size": batch_size},
+    )
+
+
+async def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--messages", type=int, default=20_000)
+    arg_parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100])
+    args = arg_parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    for kind in ("send", "publish"):
+        for batch_size in args.batch_sizes:
+            for mode in ("single", "batch"):
+                results.append(await run_case(kind, mode, args.messages, batch_size))
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,64 @@
+"""Measures a long-lived :class:`CancellationToken` that is linked to many short-lived futures.
+
+This is what happens to the token passed to a team's ``run_stream`` or to a streaming model call: every streamed
+item links a new future to the same token. Reports the time per linked future and the memory the token still
+holds once all of the futures are done, and the cost of ``is_cancelled``.
+
+Run with ``python benchmarks/cancellation_token.py``.
+"""
+
+import asyncio
+import time
+import tracemalloc
+from typing import List
+
+from _harness import BenchmarkResult, measure, parser, report
+from autogen_core import CancellationToken
+
+
+async def link_futures(token: CancellationToken, num_futures: int, batch: int) -> None:
+    loop = asyncio.get_running_loop()
+    for _ in range(num_futures // batch):
+        futures: List[asyncio.Future[None]] = [token.link_future(loop.create_future()) for _ in range(batch)]
+        for future in futures:
+            future.set_result(None)
+        del futures
+        await asyncio.sleep(0)
+
+
+async def run_link(num_futures: int, batch: int) -> BenchmarkResult:
+    token = CancellationToken()
+    start = time.perf_counter()
+    await link_futures(token, num_futures, batch)
+    seconds = time.perf_counter() - start
+
+    # Tracing allocations slows everything down, so memory is measured in a separate run.
+    token = CancellationToken()
+    tracemalloc.start()
+    await link_futures(token, num_futures, batch)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return BenchmarkResult(
+        name="link_future",
+        iterations=num_futures,
+        seconds=seconds,
+        extra={"retained_kib": round(memory / 1024), "callbacks": len(token._callbacks)},  # type: ignore[reportPrivateUsage]
+    )
+
+
+async def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--futures", type=int, default=100_000)
+    arg_parser.add_argument("--batch", type=int, default=1_000, help="Futures linked per event loop iteration.")
+    args = arg_parser.parse_args()
+
+    results = [
+        await run_link(args.futures, args.batch),
+        measure("is_cancelled", CancellationToken().is_cancelled, 1_000_000),
+    ]
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
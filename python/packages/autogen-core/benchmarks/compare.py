@@ -0,0 +1,64 @@
+"""Compares two sets of benchmark results and reports the cases that got slower.
+
+Takes two JSON files written with ``--json``, or two directories written by ``run_all.py``. Cases are matched by
+benchmark, name and parameters, and compared by their time per operation. Exits with status 1 if a case got slower
+by more than the threshold, so that it can gate a CI job.
+
+Run with ``python benchmarks/compare.py results/main results/branch``.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+Key = Tuple[str, str, str]
+
+
+def load(path: Path) -> Dict[Key, float]:
+    """Returns the microseconds per operation of each case in a result file or directory."""
+    files = sorted(path.glob("*.json")) if path.is_dir() else [path]
+    cases: Dict[Key, float] = {}
+    for file in files:
+        with open(file) as f:
+            document: Dict[str, Any] = json.load(f)
+        for row in document["results"]:
+            params = " ".join(f"{key}={value}" for key, value in row["params"].items())
+            cases[(file.stem, row["name"], params)] = row["microseconds_per_op"]
+    return cases
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("baseline", type=Path)
+    arg_parser.add_argument("current", type=Path)
+    arg_parser.add_argument(
+        "--threshold", type=float, default=0.1, help="The relative slowdown that counts as a regression."
+    )
+    args = arg_parser.parse_args()
+
+    baseline = load(args.baseline)
+    current = load(args.current)
+    regressions = 0
+    for key in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[key], current[key]
+        change = after / before - 1 if before > 0 else 0.0
+        marker = ""
+        if change > args.threshold:
+            marker = "  REGRESSION"
+            regressions += 1
+        benchmark, name, params = key
+        print(
+            f"{benchmark + ':' + name:<48} {params:<32} {before:>10.2f} -> {after:>10.2f} us/op {change:>+8.1%}{marker}"
+        )
+    for key in sorted(baseline.keys() ^ current.keys()):
+        print(f"{':'.join(key[:2]):<48} {key[2]:<32} only in {'baseline' if key in baseline else 'current'}")
+
+    if regressions:
+        print(f"{regressions} case(s) got slower by more than {args.threshold:.0%}.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Measures the throughput of short message handlers with and without eager tasks.
+
+Sends RPCs and publishes messages to agents whose handlers return right away, with the default task per message
+and with ``eager_tasks=True``. On Python 3.12 and later eager tasks run a handler inside the dispatch loop until
+it first waits, so compare the results across Python versions.
+
+Run with ``python benchmarks/eager_tasks.py``.
+"""
+
+import asyncio
+import sys
+import time
+from dataclasses import dataclass
+from typing import List
+
+from _harness import BenchmarkResult, parser, report
+from autogen_core import (
+    AgentId,
+    DefaultTopicId,
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    default_subscription,
+    message_handler,
+)
+
+
+@dataclass
+class Ping:
+    index: int
+
+
+@default_subscription
+class QuickAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Answers right away.")
+
+    @message_handler
+    async def on_ping(self, message: Ping, ctx: MessageContext) -> Ping:
+        return message
+
+
+async def run_case(kind: str, eager: bool, num_messages: int, concurrency: int) -> BenchmarkResult:
+    runtime = SingleThreadedAgentRuntime(eager_tasks=eager)
+    await QuickAgent.register(runtime, "quick", QuickAgent)
+    runtime.start()
+    recipient = AgentId("quick", "default")
+
+    async def sender(count: int) -> None:
+        for index in range(count):
+            if kind == "send":
+                await runtime.send_message(Ping(index), recipient)
+            else:
+                await runtime.publish_message(Ping(index), DefaultTopicId())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(sender(num_messages // concurrency) for _ in range(concurrency)))
+    await runtime.stop_when_idle()
+    seconds = time.perf_counter() - start
+    await runtime.close()
+    return BenchmarkResult(
+        name=kind,
+        iterations=num_messages // concurrency * concurrency,
+        seconds=seconds,
+        params={"eager_tasks": eager, "python": f"{sys.version_info.major}.{sys.version_info.minor}"},
+    )
+
+
+async def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--messages", type=int, default=20_000)
+    arg_parser.add_argument("--concurrency", type=int, default=10, help="Senders that run at the same time.")
+    args = arg_parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    for kind in ("send", "publish"):
+        for eager in (False, True):
+            results.append(await run_case(kind, eager, args.messages, args.concurrency))
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
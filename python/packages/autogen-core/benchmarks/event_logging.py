@@ -0,0 +1,131 @@
+"""Measures message throughput of ``SingleThreadedAgentRuntime`` with event logging on and off.
+
+Published messages fan out to a number of subscribers. The events of one message share its serialization, so
+formatting the events of more subscribers costs less than serializing the message for each of them.
+
+Run with ``python benchmarks/event_logging.py``.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import List
+
+from _harness import BenchmarkResult, parser, report
+from autogen_core import (
+    EVENT_LOGGER_NAME,
+    AgentId,
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    TopicId,
+    TypeSubscription,
+    message_handler,
+    try_get_known_serializers_for_type,
+)
+
+
+@dataclass
+class Payload:
+    content: str
+    values: List[int]
+
+
+class EchoAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An echo agent.")
+
+    @message_handler
+    async def on_payload(self, message: Payload, ctx: MessageContext) -> Payload:
+        return message
+
+
+class _FormattingHandler(logging.Handler):
+    """Formats every record, like a file or stream handler would, but discards the output."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.format(record)
+
+
+class _DiscardingHandler(logging.Handler):
+    """Receives every record without formatting it."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        pass
+
+
+async def run_case(mode: str, num_messages: int, fanouts: List[int]) -> List[BenchmarkResult]:
+    event_logger = logging.getLogger(EVENT_LOGGER_NAME)
+    handler: logging.Handler | None = None
+    if mode == "formatted":
+        handler = _FormattingHandler()
+    elif mode == "unformatted":
+        handler = _DiscardingHandler()
+    if handler is not None:
+        event_logger.addHandler(handler)
+        event_logger.setLevel(logging.INFO)
+    else:
+        event_logger.setLevel(logging.WARNING)
+
+    runtime = SingleThreadedAgentRuntime(log_events=mode != "log_events_off")
+    runtime.add_message_serializer(try_get_known_serializers_for_type(Payload))
+    for index in range(max(fanouts)):
+        await EchoAgent.register(runtime, f"echo{index}", EchoAgent)
+    for subscribers in fanouts:
+        for index in range(subscribers):
+            await runtime.add_subscription(TypeSubscription(f"bench{subscribers}", f"echo{index}"))
+    message = Payload(content="x" * 256, values=list(range(64)))
+    results: List[BenchmarkResult] = []
+    runtime.start()
+    try:
+        recipient = AgentId("echo0", "default")
+        start = time.perf_counter()
+        for _ in range(num_messages):
+            await runtime.send_message(message, recipient)
+        results.append(
+            BenchmarkResult(
+                name="send_message",
+                iterations=num_messages,
+                seconds=time.perf_counter() - start,
+                params={"events": mode},
+            )
+        )
+        await runtime.stop_when_idle()
+
+        for subscribers in fanouts:
+            topic_id = TopicId(f"bench{subscribers}", "default")
+            runtime.start()
+            start = time.perf_counter()
+            for _ in range(num_messages):
+                await runtime.publish_message(message, topic_id)
+            await runtime.stop_when_idle()
+            results.append(
+                BenchmarkResult(
+                    name="publish_message",
+                    iterations=num_messages,
+                    seconds=time.perf_counter() - start,
+                    params={"events": mode, "subscribers": subscribers},
+                )
+            )
+    finally:
+        if handler is not None:
+            event_logger.removeHandler(handler)
+        await runtime.close()
+    return results
+
+
+async def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--messages", type=int, default=5_000)
+    arg_parser.add_argument("--subscribers", type=int, nargs="+", default=[1, 10])
+    args = arg_parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    for mode in ["formatted", "unformatted", "logger_disabled", "log_events_off"]:
+        results.extend(await run_case(mode, args.messages, args.subscribers))
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,164 @@
+"""Measures ``GrpcWorkerAgentRuntime`` against an in-process ``GrpcWorkerAgentRuntimeHost``.
+
+Starts a host on localhost and two workers. One worker hosts an echo agent, the other sends and publishes to it, so
+every message crosses the host. Reports the latency of one ``send_message`` at a time, the throughput of concurrent
+``send_message`` calls, and the throughput of published messages until the echo agent has handled them all. Each
+case runs with JSON payloads and, if ``msgpack`` is installed, with MessagePack payloads, which the echo agent's
+worker prefers and the sender negotiates. Each case also runs with the host and the workers sending every message on
+its own, batching the messages that are already queued (the default), and waiting up to ``--max-delay`` seconds to
+fill a batch.
+
+Requires ``autogen-ext[grpc]``. Run with ``python benchmarks/grpc_runtime.py``.
+"""
+
+import asyncio
+import importlib.util
+import time
+from dataclasses import dataclass
+from typing import Dict, List
+
+from _harness import BenchmarkResult, parser, report
+from autogen_core import (
+    JSON_DATA_CONTENT_TYPE,
+    MSGPACK_DATA_CONTENT_TYPE,
+    AgentId,
+    AgentType,
+    MessageContext,
+    RoutedAgent,
+    TopicId,
+    TypeSubscription,
+    message_handler,
+    try_get_known_serializers_for_type,
+)
+from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntime, GrpcWorkerAgentRuntimeHost, MessageBatchingConfig
+from runtime_hot_paths import percentiles
+
+
+@dataclass
+class Payload:
+    content: str
+
+
+class EchoAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An echo agent.")
+        self.received = 0
+        self.expected = 0
+        self.done = asyncio.Event()
+
+    @message_handler
+    async def on_payload(self, message: Payload, ctx: MessageContext) -> Payload:
+        self.received += 1
+        if self.received == self.expected:
+            self.done.set()
+        return message
+
+
+async def run(
+    host_address: str,
+    num_messages: int,
+    concurrency: int,
+    content_type: str,
+    batching_name: str,
+    batching: MessageBatchingConfig | None,
+) -> List[BenchmarkResult]:
+    host = GrpcWorkerAgentRuntimeHost(address=host_address, message_batching=batching)
+    host.start()
+    receiver = GrpcWorkerAgentRuntime(
+        host_address=host_address,
+        preferred_content_types=[content_type, JSON_DATA_CONTENT_TYPE],
+        message_batching=batching,
+    )
+    receiver.start()
+    receiver.add_message_serializer(try_get_known_serializers_for_type(Payload))
+    await receiver.register_factory(type=AgentType("echo"), agent_factory=EchoAgent, expected_class=EchoAgent)
+    await receiver.add_subscription(TypeSubscription("bench", "echo"))
+    sender = GrpcWorkerAgentRuntime(
+        host_address=host_address, payload_serialization_format=content_type, message_batching=batching
+    )
+    sender.start()
+    sender.add_message_serializer(try_get_known_serializers_for_type(Payload))
+
+    recipient = AgentId("echo", "default")
+    message = Payload(content="x" * 64)
+    # The first message negotiates the content type.
+    await sender.send_message(message, recipient)
+    results: List[BenchmarkResult] = []
+    name = content_type.rpartition("/")[2]
+
+    latencies: List[float] = []
+    start = time.perf_counter()
+    for _ in range(num_messages):
+        sent = time.perf_counter()
+        await sender.send_message(message, recipient)
+        latencies.append(time.perf_counter() - sent)
+    results.append(
+        BenchmarkResult(
+            name="send_roundtrip",
+            iterations=num_messages,
+            seconds=time.perf_counter() - start,
+            params={"content_type": name, "batching": batching_name, "concurrency": 1},
+            extra=percentiles(latencies),
+        )
+    )
+
+    start = time.perf_counter()
+    for _ in range(0, num_messages, concurrency):
+        await asyncio.gather(*(sender.send_message(message, recipient) for _ in range(concurrency)))
+    results.append(
+        BenchmarkResult(
+            name="send_roundtrip",
+            iterations=num_messages,
+            seconds=time.perf_counter() - start,
+            params={"content_type": name, "batching": batching_name, "concurrency": concurrency},
+        )
+    )
+
+    agent = await receiver.try_get_underlying_agent_instance(recipient, type=EchoAgent)
+    agent.expected = agent.received + num_messages
+    start = time.perf_counter()
+    for _ in range(num_messages):
+        await sender.publish_message(message, TopicId("bench", "default"))
+    await agent.done.wait()
+    results.append(
+        BenchmarkResult(
+            name="publish",
+            iterations=num_messages,
+            seconds=time.perf_counter() - start,
+            params={"content_type": name, "batching": batching_name},
+        )
+    )
+
+    await sender.stop()
+    await receiver.stop()
+    await host.stop()
+    return results
+
+
+async def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--messages", type=int, default=2_000)
+    arg_parser.add_argument("--concurrency", type=int, default=50)
+    arg_parser.add_argument("--host-address", default="localhost:50071")
+    arg_parser.add_argument("--max-delay", type=float, default=0.001, help="Seconds to wait to fill a batch.")
+    args = arg_parser.parse_args()
+
+    batching: Dict[str, MessageBatchingConfig | None] = {
+        "off": None,
+        "queued": MessageBatchingConfig(),
+        "delayed": MessageBatchingConfig(max_delay=args.max_delay),
+    }
+    content_types = [JSON_DATA_CONTENT_TYPE]
+    if importlib.util.find_spec("msgpack") is not None:
+        content_types.append(MSGPACK_DATA_CONTENT_TYPE)
+    results: List[BenchmarkResult] = []
+    for content_type in content_types:
+        for batching_name, config in batching.items():
+            results.extend(
+                await run(args.host_address, args.messages, args.concurrency, content_type, batching_name, config)
+            )
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+"""Measures how a handler that blocks affects the other agents of a runtime.
+
+A slow agent receives messages whose handler sleeps for a few milliseconds, the way a handler that calls a blocking
+library does, while a fast agent answers RPCs. The ``inline`` case blocks in an ``async`` handler, the ``thread``
+case declares the handler with ``executor="thread"``. Reports the time to handle all slow messages and the latency of
+the fast RPCs sent in the meantime.
+
+Run with ``python benchmarks/handler_executors.py``.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import List
+
+from _harness import BenchmarkResult, parser, report
+from autogen_core import AgentId, MessageContext, RoutedAgent, SingleThreadedAgentRuntime, message_handler
+
+
+@dataclass
+class Work:
+    seconds: float
+
+
+@dataclass
+class Ping:
+    pass
+
+
+class InlineAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Blocks the event loop.")
+
+    @message_handler
+    async def on_work(self, message: Work, ctx: MessageContext) -> None:
+        time.sleep(message.seconds)  # noqa: ASYNC251 - blocking the loop is what this case measures
+
+
+class ThreadAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Blocks a worker thread.")
+
+    @message_handler(executor="thread")
+    def on_work(self, message: Work, ctx: MessageContext) -> None:
+        time.sleep(message.seconds)
+
+
+class FastAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Answers right away.")
+
+    @message_handler
+    async def on_ping(self, message: Ping, ctx: MessageContext) -> None:
+        pass
+
+
+async def ping(runtime: SingleThreadedAgentRuntime, latencies: List[float], done: asyncio.Event) -> None:
+    while not done.is_set():
+        start = time.perf_counter()
+        await runtime.send_message(Ping(), AgentId("fast", "default"))
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.001)
+
+
+async def run_case(mode: str, num_messages: int, block: float, threads: int) -> BenchmarkResult:
+    runtime = SingleThreadedAgentRuntime(handler_threads=threads)
+    if mode == "inline":
+        await InlineAgent.register(runtime, "slow", InlineAgent)
+    else:
+        await ThreadAgent.register(runtime, "slow", ThreadAgent)
+    await FastAgent.register(runtime, "fast", FastAgent)
+    runtime.start()
+
+    latencies: List[float] = []
+    done = asyncio.Event()
+    pinger = asyncio.create_task(ping(runtime, latencies, done))
+    start = time.perf_counter()
+    # Each slow message goes to its own agent instance, so the thread pool can run them side by side.
+    await asyncio.gather(
+        *(runtime.send_message(Work(seconds=block), AgentId("slow", str(i))) for i in range(num_messages))
+    )
+    seconds = time.perf_counter() - start
+    done.set()
+    await pinger
+    stats = runtime.handler_executor_stats
+    await runtime.close()
+
+    latencies.sort()
+    return BenchmarkResult(
+        name="blocking",
+        iterations=num_messages,
+        seconds=seconds,
+        params={"mode": mode},
+        extra={
+            "pings": len(latencies),
+            "p50_ping_ms": round(latencies[len(latencies) // 2] * 1e3, 2),
+            "p99_ping_ms": round(latencies[int(len(latencies) * 0.99)] * 1e3, 2),
+            "max_queue_ms": round(stats.max_queue_seconds * 1e3, 2),
+        },
+    )
+
+
+async def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--messages", type=int, default=200)
+    arg_parser.add_argument("--block", type=float, default=0.005, help="Seconds each slow handler blocks.")
+    arg_parser.add_argument("--threads", type=int, default=8)
+    args = arg_parser.parse_args()
+
+    results = [await run_case(mode, args.messages, args.block, args.threads) for mode in ("inline", "thread")]
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""Measures the cost of the message deduplication window.
+
+Publishes messages to an agent where a share of them are retries that reuse the id of an earlier message, without
+deduplication and with a ``dedup_window``. Reports the throughput, how many messages the agent handled and the
+memory the window holds.
+
+Run with ``python benchmarks/message_dedup.py``.
+"""
+
+import asyncio
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import List
+
+from _harness import BenchmarkResult, parser, report
+from autogen_core import (
+    AgentId,
+    DefaultTopicId,
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    default_subscription,
+    message_handler,
+)
+from autogen_core._runtime_impl_helpers import RecentMessageIds
+
+
+@dataclass
+class Event:
+    index: int
+
+
+@default_subscription
+class CountingAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Counts the events it handles.")
+        self.handled = 0
+
+    @message_handler
+    async def on_event(self, message: Event, ctx: MessageContext) -> None:
+        self.handled += 1
+
+
+async def run_case(window: float | None, message_ids: List[str]) -> BenchmarkResult:
+    runtime = SingleThreadedAgentRuntime(dedup_window=window)
+    await CountingAgent.register(runtime, "counter", CountingAgent)
+    runtime.start()
+    start = time.perf_counter()
+    for index, message_id in enumerate(message_ids):
+        await runtime.publish_message(Event(index), DefaultTopicId(), message_id=message_id)
+    await runtime.stop_when_idle()
+    seconds = time.perf_counter() - start
+    window_kib = 0
+    if window is not None:
+        # Tracing allocations slows everything down, so the window is measured on its own.
+        tracemalloc.start()
+        recent_ids = RecentMessageIds(window, 100_000)
+        for message_id in message_ids:
+            if not recent_ids.seen(AgentId("counter", "default"), message_id):
+                recent_ids.add(AgentId("counter", "default"), message_id)
+        window_kib = round(tracemalloc.get_traced_memory()[0] / 1024)
+        tracemalloc.stop()
+    agent = await runtime.try_get_underlying_agent_instance(AgentId("counter", "default"), type=CountingAgent)
+    await runtime.close()
+    return BenchmarkResult(
+        name="publish",
+        iterations=len(message_ids),
+        seconds=seconds,
+        params={"dedup_window": window},
+        extra={
+            "handled": agent.handled,
+            "duplicates": runtime.duplicate_messages_count,
+            "window_kib": window_kib,
+        },
+    )
+
+
+async def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--messages", type=int, default=20_000)
+    arg_parser.add_argument("--retries", type=float, default=0.1, help="Share of messages that are retries.")
+    args = arg_parser.parse_args()
+
+    rng = random.Random(0)
+    message_ids: List[str] = []
+    for index in range(args.messages):
+        if message_ids and rng.random() < args.retries:
+            message_ids.append(rng.choice(message_ids[-100:]))
+        else:
+            message_ids.append(f"message-{index}")
+
+    results = [await run_case(window, message_ids) for window in (None, 60.0)]
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
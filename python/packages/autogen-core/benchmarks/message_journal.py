@@ -0,0 +1,86 @@
+"""Measures the overhead of the write-ahead message journal.
+
+Publishes messages to an agent and sends it RPCs, without a journal and with a :class:`FileMessageJournal` that
+does or does not ``fsync`` its batches. Also reports the size of the journal file after the run.
+
+Run with ``python benchmarks/message_journal.py``.
+"""
+
+import asyncio
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+from _harness import BenchmarkResult, parser, report
+from autogen_core import (
+    AgentId,
+    FileMessageJournal,
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    TopicId,
+    TypeSubscription,
+    message_handler,
+)
+
+
+@dataclass
+class Payload:
+    content: str
+
+
+class EchoAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An echo agent.")
+
+    @message_handler
+    async def on_payload(self, message: Payload, ctx: MessageContext) -> Payload:
+        return message
+
+
+async def run_case(kind: str, mode: str, num_messages: int, flush_interval: float, directory: Path) -> BenchmarkResult:
+    path = directory / f"{kind}-{mode}.jsonl"
+    journal = None if mode == "none" else FileMessageJournal(path, flush_interval=flush_interval, fsync=mode == "fsync")
+    runtime = SingleThreadedAgentRuntime(message_journal=journal)
+    await EchoAgent.register(runtime, "echo", EchoAgent)
+    await runtime.add_subscription(TypeSubscription("bench", "echo"))
+    runtime.start()
+    message = Payload(content="x" * 256)
+
+    start = time.perf_counter()
+    if kind == "publish":
+        for _ in range(num_messages):
+            await runtime.publish_message(message, TopicId("bench", "default"))
+    else:
+        await asyncio.gather(*(runtime.send_message(message, AgentId("echo", "default")) for _ in range(num_messages)))
+    await runtime.stop_when_idle()
+    seconds = time.perf_counter() - start
+    await runtime.close()
+
+    return BenchmarkResult(
+        name=kind,
+        iterations=num_messages,
+        seconds=seconds,
+        params={"journal": mode},
+        extra={"journal_kib": round(path.stat().st_size / 1024, 1) if path.exists() else 0},
+    )
+
+
+async def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--messages", type=int, default=10_000)
+    arg_parser.add_argument("--flush-interval", type=float, default=0.005)
+    args = arg_parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    with tempfile.TemporaryDirectory() as directory:
+        for kind in ("publish", "send"):
+            for mode in ("none", "no_fsync", "fsync"):
+                results.append(await run_case(kind, mode, args.messages, args.flush_interval, Path(directory)))
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
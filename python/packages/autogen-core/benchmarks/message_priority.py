@@ -0,0 +1,117 @@
+"""Measures the latency of RPCs sent while a storm of published events fans out to many agents.
+
+The RPCs are sent with each :class:`~autogen_core.MessagePriority` while a producer keeps the message queue full of
+normal priority published events.
+
+Run with ``python benchmarks/message_priority.py``.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import List
+
+from _harness import BenchmarkResult, parser, report
+from autogen_core import (
+    AgentId,
+    MessageContext,
+    MessagePriority,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    TopicId,
+    TypeSubscription,
+    message_handler,
+)
+
+
+@dataclass
+class Event:
+    sequence: int
+
+
+@dataclass
+class Ping:
+    sent_at: float
+
+
+class ListenerAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Receives the published events.")
+
+    @message_handler
+    async def on_event(self, message: Event, ctx: MessageContext) -> None:
+        pass
+
+
+class PongAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Answers RPCs.")
+
+    @message_handler
+    async def on_ping(self, message: Ping, ctx: MessageContext) -> Ping:
+        return message
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+async def run_case(priority: MessagePriority, num_rpcs: int, listeners: int, backlog: int) -> BenchmarkResult:
+    runtime = SingleThreadedAgentRuntime()
+    await PongAgent.register(runtime, "pong", PongAgent)
+    for i in range(listeners):
+        await ListenerAgent.register(runtime, f"listener{i}", ListenerAgent)
+        await runtime.add_subscription(TypeSubscription("events", f"listener{i}"))
+    runtime.start()
+    stop = asyncio.Event()
+
+    async def storm() -> None:
+        sequence = 0
+        while not stop.is_set():
+            # Keep about ``backlog`` events waiting in the queue.
+            while runtime.unprocessed_messages_count < backlog:
+                await runtime.publish_message(Event(sequence=sequence), TopicId("events", "default"))
+                sequence += 1
+            await asyncio.sleep(0)
+
+    producer = asyncio.create_task(storm())
+    latencies: List[float] = []
+    start = time.perf_counter()
+    for _ in range(num_rpcs):
+        sent_at = time.perf_counter()
+        await runtime.send_message(Ping(sent_at=sent_at), AgentId("pong", "default"), priority=priority)
+        latencies.append(time.perf_counter() - sent_at)
+    seconds = time.perf_counter() - start
+    stop.set()
+    await producer
+    await runtime.stop_when_idle()
+
+    latencies.sort()
+    return BenchmarkResult(
+        name="rpc_under_publish_storm",
+        iterations=num_rpcs,
+        seconds=seconds,
+        params={"priority": priority.name, "backlog": backlog},
+        extra={
+            "p50_ms": round(percentile(latencies, 0.5) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        },
+    )
+
+
+async def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--rpcs", type=int, default=100)
+    arg_parser.add_argument("--listeners", type=int, default=10, help="Agents that receive each published event.")
+    arg_parser.add_argument("--backlog", type=int, nargs="+", default=[100, 500])
+    args = arg_parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    for backlog in args.backlog:
+        for priority in (MessagePriority.NORMAL, MessagePriority.HIGH):
+            results.append(await run_case(priority, args.rpcs, args.listeners, backlog))
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,127 @@
+"""Measures the construction of routed agents and the dispatch of messages to their handlers.
+
+The ``construct`` case instantiates many keyed agents of a class with a dozen handlers, as a runtime does for a
+per-session agent. The ``dispatch`` cases call ``on_message`` directly, without a runtime, with a message whose
+type has a handler and with a subclass of it.
+
+Run with ``python benchmarks/routed_agent_dispatch.py``.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, List
+
+from _harness import BenchmarkResult, parser, report
+from autogen_core import (
+    AgentId,
+    AgentInstantiationContext,
+    CancellationToken,
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    message_handler,
+)
+
+
+@dataclass
+class Request:
+    content: str
+
+
+@dataclass
+class DetailedRequest(Request):
+    detail: str
+
+
+@dataclass
+class Other0: ...
+
+
+@dataclass
+class Other1: ...
+
+
+@dataclass
+class Other2: ...
+
+
+class BusyAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent with many handlers.")
+
+    @message_handler
+    async def on_request(self, message: Request, ctx: MessageContext) -> None:
+        pass
+
+    @message_handler(match=lambda message, ctx: False)  # type: ignore
+    async def on_never(self, message: Request, ctx: MessageContext) -> None:
+        pass
+
+    @message_handler
+    async def on_other0(self, message: Other0, ctx: MessageContext) -> None:
+        pass
+
+    @message_handler
+    async def on_other1(self, message: Other1, ctx: MessageContext) -> None:
+        pass
+
+    @message_handler
+    async def on_other2(self, message: Other2, ctx: MessageContext) -> None:
+        pass
+
+    async def helper0(self) -> None:
+        pass
+
+    async def helper1(self) -> None:
+        pass
+
+    async def helper2(self) -> None:
+        pass
+
+
+def construct(runtime: SingleThreadedAgentRuntime, key: str) -> BusyAgent:
+    with AgentInstantiationContext.populate_context((runtime, AgentId("busy", key))):
+        return BusyAgent()
+
+
+async def run_construct(num_agents: int) -> BenchmarkResult:
+    runtime = SingleThreadedAgentRuntime()
+    start = time.perf_counter()
+    for index in range(num_agents):
+        construct(runtime, str(index))
+    return BenchmarkResult(name="construct", iterations=num_agents, seconds=time.perf_counter() - start)
+
+
+async def run_dispatch(message: Any, num_messages: int) -> BenchmarkResult:
+    agent = construct(SingleThreadedAgentRuntime(), "default")
+    ctx = MessageContext(
+        sender=None, topic_id=None, is_rpc=False, cancellation_token=CancellationToken(), message_id="id"
+    )
+    start = time.perf_counter()
+    for _ in range(num_messages):
+        await agent.on_message(message, ctx)
+    return BenchmarkResult(
+        name="dispatch",
+        iterations=num_messages,
+        seconds=time.perf_counter() - start,
+        params={"message": type(message).__name__},
+    )
+
+
+async def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--agents", type=int, default=20_000)
+    arg_parser.add_argument("--messages", type=int, default=200_000)
+    args = arg_parser.parse_args()
+
+    results: List[BenchmarkResult] = [
+        await run_construct(args.agents),
+        await run_dispatch(Request("hello"), args.messages),
+        await run_dispatch(DetailedRequest("hello", "more"), args.messages),
+    ]
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,57 @@
+"""Runs the benchmarks in this directory and writes the results of each one as JSON into a directory.
+
+Each benchmark runs in its own process with its default arguments. A benchmark that fails, for example because it
+needs ``autogen-ext`` and that is not installed, is reported and skipped. Compare two result directories with
+``compare.py``.
+
+Run with ``python benchmarks/run_all.py --output results/main``.
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+BENCHMARK_DIR = Path(__file__).parent
+# Scripts in this directory that are not benchmarks.
+NOT_BENCHMARKS = {"run_all", "compare"}
+
+
+def benchmark_names() -> List[str]:
+    return sorted(
+        path.stem
+        for path in BENCHMARK_DIR.glob("*.py")
+        if not path.stem.startswith("_") and path.stem not in NOT_BENCHMARKS
+    )
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--output", required=True, type=Path, help="The directory to write the results to.")
+    arg_parser.add_argument("--only", nargs="+", metavar="NAME", help="Run only these benchmarks.")
+    arg_parser.add_argument("--skip", nargs="+", metavar="NAME", default=[], help="Do not run these benchmarks.")
+    args = arg_parser.parse_args()
+
+    names = [name for name in args.only or benchmark_names() if name not in args.skip]
+    args.output.mkdir(parents=True, exist_ok=True)
+    failed: List[str] = []
+    for name in names:
+        print(f"# {name}", flush=True)
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, f"{name}.py", "--json", str(args.output.resolve() / f"{name}.json")],
+            cwd=BENCHMARK_DIR,
+        )
+        if completed.returncode != 0:
+            failed.append(name)
+        print(f"# {name} took {time.perf_counter() - start:.1f}s\n", flush=True)
+
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Measures the hot paths of ``SingleThreadedAgentRuntime``.
+
+* ``send_roundtrip``: the latency of one ``send_message`` at a time to an agent that exists, and to a new agent
+  that the runtime has to create first.
+* ``publish_fanout``: published messages per second and deliveries per second as the number of subscribed agents
+  grows.
+* ``interventions``: ``send_message`` and ``publish_message`` throughput with a number of intervention handlers
+  that let every message through: handlers for all messages, handlers for another message type, and read-only
+  handlers. The ``io`` handlers wait for a millisecond, like handlers that write an audit log, and run on a tenth of
+  the messages.
+
+Run with ``python benchmarks/runtime_hot_paths.py``.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Type
+
+from _harness import BenchmarkResult, parser, report
+from autogen_core import (
+    AgentId,
+    DefaultInterventionHandler,
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    TopicId,
+    TypeSubscription,
+    message_handler,
+)
+
+
+@dataclass
+class Payload:
+    content: str
+
+
+class EchoAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An echo agent.")
+
+    @message_handler
+    async def on_payload(self, message: Payload, ctx: MessageContext) -> Payload:
+        return message
+
+
+class PassThrough(DefaultInterventionHandler):
+    async def on_send(self, message: Any, *, message_context: MessageContext, recipient: AgentId) -> Any:
+        return message
+
+    async def on_publish(self, message: Any, *, message_context: MessageContext) -> Any:
+        return message
+
+    async def on_response(self, message: Any, *, sender: AgentId, recipient: AgentId | None) -> Any:
+        return message
+
+
+class OtherTypePassThrough(PassThrough):
+    message_types = (int,)
+
+
+class ReadOnlyPassThrough(PassThrough):
+    read_only = True
+
+
+class IoPassThrough(PassThrough):
+    async def on_send(self, message: Any, *, message_context: MessageContext, recipient: AgentId) -> Any:
+        await asyncio.sleep(0.001)
+        return message
+
+    async def on_publish(self, message: Any, *, message_context: MessageContext) -> Any:
+        await asyncio.sleep(0.001)
+        return message
+
+
+class IoReadOnlyPassThrough(IoPassThrough):
+    read_only = True
+
+
+HANDLERS: Dict[str, Type[PassThrough]] = {
+    "all": PassThrough,
+    "other_type": OtherTypePassThrough,
+    "read_only": ReadOnlyPassThrough,
+    "io": IoPassThrough,
+    "io_read_only": IoReadOnlyPassThrough,
+}
+
+
+def percentiles(latencies: List[float]) -> Dict[str, Any]:
+    latencies = sorted(latencies)
+    return {
+        "p50_us": round(latencies[len(latencies) // 2] * 1e6, 1),
+        "p99_us": round(latencies[int(len(latencies) * 0.99)] * 1e6, 1),
+    }
+
+
+async def send_roundtrip(agent: str, num_messages: int) -> BenchmarkResult:
+    runtime = SingleThreadedAgentRuntime()
+    await EchoAgent.register(runtime, "echo", EchoAgent)
+    runtime.start()
+    message = Payload(content="x")
+    await runtime.send_message(message, AgentId("echo", "default"))
+
+    latencies: List[float] = []
+    start = time.perf_counter()
+    for index in range(num_messages):
+        # A new key makes the runtime create an agent for every message.
+        recipient = AgentId("echo", "default" if agent == "existing" else str(index))
+        sent = time.perf_counter()
+        await runtime.send_message(message, recipient)
+        latencies.append(time.perf_counter() - sent)
+    seconds = time.perf_counter() - start
+    await runtime.close()
+    return BenchmarkResult(
+        name="send_roundtrip",
+        iterations=num_messages,
+        seconds=seconds,
+        params={"agent": agent},
+        extra=percentiles(latencies),
+    )
+
+
+async def publish_fanout(subscribers: int, num_messages: int) -> BenchmarkResult:
+    runtime = SingleThreadedAgentRuntime()
+    for index in range(subscribers):
+        await EchoAgent.register(runtime, f"echo{index}", EchoAgent)
+        await runtime.add_subscription(TypeSubscription("fanout", f"echo{index}"))
+    runtime.start()
+    message = Payload(content="x")
+
+    start = time.perf_counter()
+    for _ in range(num_messages):
+        await runtime.publish_message(message, TopicId("fanout", "default"))
+    await runtime.stop_when_idle()
+    seconds = time.perf_counter() - start
+    await runtime.close()
+    return BenchmarkResult(
+        name="publish_fanout",
+        iterations=num_messages,
+        seconds=seconds,
+        params={"subscribers": subscribers},
+        extra={"deliveries_per_s": round(num_messages * subscribers / seconds)},
+    )
+
+
+async def interventions(kind: str, handler: str, handlers: int, num_messages: int) -> BenchmarkResult:
+    runtime = SingleThreadedAgentRuntime(
+        intervention_handlers=[HANDLERS[handler]() for _ in range(handlers)] if handlers else None
+    )
+    await EchoAgent.register(runtime, "echo", EchoAgent)
+    await runtime.add_subscription(TypeSubscription("bench", "echo"))
+    runtime.start()
+    message = Payload(content="x")
+
+    start = time.perf_counter()
+    if kind == "publish":
+        for _ in range(num_messages):
+            await runtime.publish_message(message, TopicId("bench", "default"))
+    else:
+        await asyncio.gather(*(runtime.send_message(message, AgentId("echo", "default")) for _ in range(num_messages)))
+    await runtime.stop_when_idle()
+    seconds = time.perf_counter() - start
+    await runtime.close()
+    return BenchmarkResult(
+        name=f"interventions_{kind}",
+        iterations=num_messages,
+        seconds=seconds,
+        params={"handler": handler, "handlers": handlers},
+    )
+
+
+async def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--messages", type=int, default=5_000)
+    arg_parser.add_argument("--subscribers", type=int, nargs="+", default=[1, 10, 100])
+    arg_parser.add_argument("--handlers", type=int, nargs="+", default=[0, 1, 4])
+    args = arg_parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    for agent in ("existing", "new"):
+        results.append(await send_roundtrip(agent, args.messages))
+    for subscribers in args.subscribers:
+        # Keep the number of deliveries about the same for every fan-out.
+        results.append(await publish_fanout(subscribers, max(args.messages // subscribers, 10)))
+    for kind in ("send", "publish"):
+        for handler in HANDLERS:
+            for handlers in args.handlers:
+                if handlers or handler == "all":
+                    num_messages = args.messages // 10 if handler.startswith("io") else args.messages
+                    results.append(await interventions(kind, handler, handlers, num_messages))
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""Measures the cost of the runtime's aggregate metrics.
+
+Sends and publishes short messages with the built-in counters only and with an OpenTelemetry ``MeterProvider``
+that also records them, and reports the time to take a :meth:`SingleThreadedAgentRuntime.metrics` snapshot.
+Compare the throughput with that of the previous release to see the overhead of the counters themselves.
+
+Run with ``python benchmarks/runtime_metrics.py``. The ``otel`` case needs ``opentelemetry-sdk``.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import List
+
+from _harness import BenchmarkResult, measure, parser, report
+from autogen_core import (
+    AgentId,
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    TopicId,
+    TypeSubscription,
+    message_handler,
+)
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+
+@dataclass
+class Payload:
+    content: str
+
+
+class EchoAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An echo agent.")
+
+    @message_handler
+    async def on_payload(self, message: Payload, ctx: MessageContext) -> Payload:
+        return message
+
+
+async def run_case(kind: str, meter: str, num_messages: int) -> BenchmarkResult:
+    meter_provider = MeterProvider(metric_readers=[InMemoryMetricReader()]) if meter == "otel" else None
+    runtime = SingleThreadedAgentRuntime(meter_provider=meter_provider)
+    await EchoAgent.register(runtime, "echo", EchoAgent)
+    await runtime.add_subscription(TypeSubscription("bench", "echo"))
+    runtime.start()
+    message = Payload(content="x")
+
+    start = time.perf_counter()
+    if kind == "publish":
+        for _ in range(num_messages):
+            await runtime.publish_message(message, TopicId("bench", "default"))
+    else:
+        for _ in range(num_messages):
+            await runtime.send_message(message, AgentId("echo", "default"))
+    await runtime.stop_when_idle()
+    seconds = time.perf_counter() - start
+    snapshot = measure("metrics", runtime.metrics, 1_000)
+    await runtime.close()
+
+    return BenchmarkResult(
+        name=kind,
+        iterations=num_messages,
+        seconds=seconds,
+        params={"meter": meter},
+        extra={"snapshot_us": round(snapshot.seconds / snapshot.iterations * 1e6, 1)},
+    )
+
+
+async def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--messages", type=int, default=20_000)
+    args = arg_parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    for kind in ("send", "publish"):
+        for meter in ("none", "otel"):
+            results.append(await run_case(kind, meter, args.messages))
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+"""Measures delayed messages scheduled with one sleeping task each against the runtime's timer heap.
+
+The ``tasks`` case starts a task per message that sleeps and then publishes, which is what agents do without a
+scheduler. The ``timers`` case calls ``publish_message_after``. Both schedule the messages over a window of two
+seconds and report the time and memory it takes to schedule them and the lateness of their delivery.
+
+Run with ``python benchmarks/scheduled_messages.py``.
+"""
+
+import asyncio
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import List
+
+from _harness import BenchmarkResult, parser, report
+from autogen_core import (
+    AgentId,
+    DefaultTopicId,
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    default_subscription,
+    message_handler,
+)
+
+
+@dataclass
+class Reminder:
+    due: float
+
+
+@default_subscription
+class ReminderAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Records how late reminders arrive.")
+        self.lateness: List[float] = []
+
+    @message_handler
+    async def on_reminder(self, message: Reminder, ctx: MessageContext) -> None:
+        self.lateness.append(time.perf_counter() - message.due)
+
+
+async def publish_later(runtime: SingleThreadedAgentRuntime, due: float, delay: float) -> None:
+    await asyncio.sleep(delay)
+    await runtime.publish_message(Reminder(due=due), DefaultTopicId())
+
+
+async def schedule(runtime: SingleThreadedAgentRuntime, mode: str, delays: List[float]) -> List[asyncio.Task[None]]:
+    tasks: List[asyncio.Task[None]] = []
+    start = time.perf_counter()
+    for delay in delays:
+        if mode == "tasks":
+            tasks.append(asyncio.create_task(publish_later(runtime, start + delay, delay)))
+        else:
+            await runtime.publish_message_after(Reminder(due=start + delay), DefaultTopicId(), delay)
+    return tasks
+
+
+async def run_case(mode: str, num_messages: int, window: float) -> BenchmarkResult:
+    rng = random.Random(0)
+    delays = [rng.random() * window for _ in range(num_messages)]
+
+    runtime = SingleThreadedAgentRuntime()
+    await ReminderAgent.register(runtime, "reminders", ReminderAgent)
+    runtime.start()
+    start = time.perf_counter()
+    await schedule(runtime, mode, delays)
+    seconds = time.perf_counter() - start
+    agent = await runtime.try_get_underlying_agent_instance(AgentId("reminders", "default"), type=ReminderAgent)
+    await runtime.stop_when(lambda: len(agent.lateness) == num_messages)
+    await runtime.close()
+    lateness = sorted(agent.lateness)
+
+    # Tracing allocations slows everything down, so memory is measured in a separate run.
+    runtime = SingleThreadedAgentRuntime()
+    tracemalloc.start()
+    tasks = await schedule(runtime, mode, delays)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for task in tasks:
+        task.cancel()
+    await runtime.close()
+
+    return BenchmarkResult(
+        name="schedule",
+        iterations=num_messages,
+        seconds=seconds,
+        params={"mode": mode},
+        extra={
+            "memory_kib": round(memory / 1024),
+            "p50_late_ms": round(lateness[len(lateness) // 2] * 1e3, 2),
+            "p99_late_ms": round(lateness[int(len(lateness) * 0.99)] * 1e3, 2),
+        },
+    )
+
+
+async def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--messages", type=int, default=5_000)
+    arg_parser.add_argument("--window", type=float, default=2.0, help="Seconds over which the messages are due.")
+    args = arg_parser.parse_args()
+
+    results = [await run_case(mode, args.messages, args.window) for mode in ("tasks", "timers")]
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
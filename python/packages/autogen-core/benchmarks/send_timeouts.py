@@ -0,0 +1,75 @@
+"""Measures the cost of deadlines on ``send_message``.
+
+Sends RPCs to an echo agent without a timeout and with one, and sends RPCs that time out because the handler
+answers too late. Reports the throughput and how many requests timed out.
+
+Run with ``python benchmarks/send_timeouts.py``.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import List
+
+from _harness import BenchmarkResult, parser, report
+from autogen_core import AgentId, MessageContext, RoutedAgent, SingleThreadedAgentRuntime, message_handler
+from autogen_core.exceptions import MessageTimeoutException
+
+
+@dataclass
+class Request:
+    late: bool
+
+
+class EchoAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Echoes requests, or answers them late.")
+
+    @message_handler
+    async def on_request(self, message: Request, ctx: MessageContext) -> Request:
+        if message.late:
+            await asyncio.sleep(0.05)
+        return message
+
+
+async def run_case(mode: str, num_messages: int, concurrency: int) -> BenchmarkResult:
+    runtime = SingleThreadedAgentRuntime()
+    await EchoAgent.register(runtime, "echo", EchoAgent)
+    runtime.start()
+    request = Request(late=mode == "late")
+    timeout = None if mode == "none" else 0.01 if mode == "late" else 30.0
+
+    async def send() -> None:
+        try:
+            await runtime.send_message(request, AgentId("echo", "default"), timeout=timeout)
+        except MessageTimeoutException:
+            pass
+
+    start = time.perf_counter()
+    for _ in range(num_messages // concurrency):
+        await asyncio.gather(*(send() for _ in range(concurrency)))
+    seconds = time.perf_counter() - start
+    await runtime.stop_when_idle()
+    return BenchmarkResult(
+        name="send",
+        iterations=num_messages // concurrency * concurrency,
+        seconds=seconds,
+        params={"timeout": mode},
+        extra={"timed_out": runtime.timed_out_messages_count},
+    )
+
+
+async def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--messages", type=int, default=10_000)
+    arg_parser.add_argument("--concurrency", type=int, default=100)
+    args = arg_parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    for mode in ("none", "30s", "late"):
+        results.append(await run_case(mode, args.messages, args.concurrency))
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
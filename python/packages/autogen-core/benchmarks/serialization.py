@@ -0,0 +1,137 @@
+"""Measures the cost of serializing and deserializing a message with the serializers the runtimes use.
+
+Each case registers the known serializers of a message type and then round-trips a message through the
+``SerializationRegistry``, the way the gRPC worker runtime and the message journal do: look up the type name,
+serialize, and deserialize. The message types are a flat and a nested dataclass, a flat and a nested pydantic
+model, a pydantic model with text and an image like ``MultiModalMessage``, and a protobuf ``Struct``. Every content
+type with a serializer for the message is measured: JSON, and MessagePack if ``msgpack`` is installed, or protobuf.
+Reports the time per round trip and the size of the payload, and the time of each half on its own:
+``serialize_message``, which looks up the type name and serializes in one call, and ``deserialize``.
+
+Run with ``python benchmarks/serialization.py``.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+
+from _harness import BenchmarkResult, measure, parser, report
+from autogen_core import Image, try_get_known_serializers_for_type
+from autogen_core._serialization import MessageSerializer, SerializationRegistry
+from google.protobuf import struct_pb2
+from PIL import Image as PILImage
+from pydantic import BaseModel
+
+
+@dataclass
+class FlatDataclass:
+    sender: str
+    content: str
+    count: int
+
+
+@dataclass
+class NestedDataclass:
+    sender: str
+    items: List[FlatDataclass] = field(default_factory=list)
+
+
+class FlatModel(BaseModel):
+    sender: str
+    content: str
+    count: int
+
+
+class NestedModel(BaseModel):
+    sender: str
+    items: List[FlatModel]
+
+
+class MultiModalModel(BaseModel):
+    sender: str
+    content: List[str | Image]
+
+
+def protobuf_struct(items: int) -> struct_pb2.Struct:
+    message = struct_pb2.Struct()
+    message.update(
+        {"sender": "agent", "items": [{"sender": "agent", "content": "x" * 64, "count": i} for i in range(items)]}
+    )
+    return message
+
+
+def messages(items: int, image_size: int) -> Dict[str, Any]:
+    return {
+        "dataclass": FlatDataclass(sender="agent", content="x" * 64, count=1),
+        "nested_dataclass": NestedDataclass(
+            sender="agent", items=[FlatDataclass(sender="agent", content="x" * 64, count=i) for i in range(items)]
+        ),
+        "pydantic": FlatModel(sender="agent", content="x" * 64, count=1),
+        "nested_pydantic": NestedModel(
+            sender="agent", items=[FlatModel(sender="agent", content="x" * 64, count=i) for i in range(items)]
+        ),
+        "multimodal": MultiModalModel(
+            sender="agent",
+            # Noise does not compress, like a photo.
+            content=["Describe this image.", Image(PILImage.effect_noise((image_size, image_size), 64))],
+        ),
+        "protobuf": protobuf_struct(items),
+    }
+
+
+def round_trip(
+    registry: SerializationRegistry, message: Any, serializer: MessageSerializer[Any]
+) -> Tuple[Callable[[], Any], int]:
+    type_name = registry.type_name(message)
+    content_type = serializer.data_content_type
+
+    def call() -> Any:
+        payload = registry.serialize(message, type_name=registry.type_name(message), data_content_type=content_type)
+        return registry.deserialize(payload, type_name=type_name, data_content_type=content_type)
+
+    return call, len(registry.serialize(message, type_name=type_name, data_content_type=content_type))
+
+
+def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--iterations", type=int, default=20_000)
+    arg_parser.add_argument("--items", type=int, default=10, help="Items in the nested messages.")
+    arg_parser.add_argument("--image-size", type=int, default=256, help="Width and height of the image in pixels.")
+    args = arg_parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    for kind, message in messages(args.items, args.image_size).items():
+        serializers = try_get_known_serializers_for_type(type(message))
+        registry = SerializationRegistry()
+        registry.add_serializer(serializers)
+        # Encoding an image to PNG takes milliseconds, so run those cases less often.
+        iterations = args.iterations // 100 if kind == "multimodal" else args.iterations
+        for serializer in serializers:
+            content_type = serializer.data_content_type
+            params = {"message": kind, "content_type": content_type.rpartition("/")[2]}
+            call, size = round_trip(registry, message, serializer)
+            result = measure("round_trip", call, iterations, **params)
+            result.extra["payload_bytes"] = size
+            results.append(result)
+
+            type_name, payload = registry.serialize_message(message, data_content_type=content_type)
+            results.append(
+                measure(
+                    "serialize",
+                    lambda: registry.serialize_message(message, data_content_type=content_type),  # noqa: B023
+                    iterations,
+                    **params,
+                )
+            )
+            results.append(
+                measure(
+                    "deserialize",
+                    lambda: registry.deserialize(payload, type_name=type_name, data_content_type=content_type),  # noqa: B023
+                    iterations,
+                    **params,
+                )
+            )
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    main()
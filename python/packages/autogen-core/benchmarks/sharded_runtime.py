@@ -0,0 +1,92 @@
+"""Compares the throughput of CPU-bound agents on ``SingleThreadedAgentRuntime`` and ``ShardedAgentRuntime``.
+
+Requires ``autogen-ext``. Run with ``python benchmarks/sharded_runtime.py``.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import List
+
+from _harness import BenchmarkResult, parser, report
+from autogen_core import (
+    AgentId,
+    MessageContext,
+    RoutedAgent,
+    SingleThreadedAgentRuntime,
+    message_handler,
+    try_get_known_serializers_for_type,
+)
+from autogen_ext.runtimes.sharded import ShardedAgentRuntime
+
+
+@dataclass
+class Work:
+    iterations: int
+
+
+@dataclass
+class Result:
+    value: int
+
+
+class CpuBoundAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Burns CPU for every message.")
+
+    @message_handler
+    async def on_work(self, message: Work, ctx: MessageContext) -> Result:
+        value = 0
+        for i in range(message.iterations):
+            value = (value + i * i) % 1_000_003
+        return Result(value=value)
+
+
+async def run_case(
+    name: str,
+    runtime: SingleThreadedAgentRuntime | ShardedAgentRuntime,
+    num_messages: int,
+    num_agents: int,
+    work: int,
+) -> BenchmarkResult:
+    await CpuBoundAgent.register(runtime, "worker", CpuBoundAgent)
+    runtime.add_message_serializer(try_get_known_serializers_for_type(Result))
+    runtime.start()
+    recipients = [AgentId("worker", f"agent{i}") for i in range(num_agents)]
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(runtime.send_message(Work(iterations=work), recipients[i % num_agents]) for i in range(num_messages))
+    )
+    seconds = time.perf_counter() - start
+    await runtime.stop_when_idle()
+    return BenchmarkResult(
+        name=name,
+        iterations=num_messages,
+        seconds=seconds,
+        params={"agents": num_agents, "work": work},
+    )
+
+
+async def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--messages", type=int, default=2_000)
+    arg_parser.add_argument("--agents", type=int, default=64)
+    arg_parser.add_argument("--work", type=int, default=20_000, help="Loop iterations per handler call.")
+    arg_parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, os.cpu_count() or 1])
+    args = arg_parser.parse_args()
+
+    results: List[BenchmarkResult] = [
+        await run_case("single_threaded", SingleThreadedAgentRuntime(), args.messages, args.agents, args.work)
+    ]
+    for num_shards in sorted(set(args.shards)):
+        result = await run_case(
+            "sharded", ShardedAgentRuntime(num_shards=num_shards), args.messages, args.agents, args.work
+        )
+        result.params["shards"] = num_shards
+        results.append(result)
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+"""Measures topic resolution in ``SubscriptionManager`` as the number of subscriptions grows.
+
+Run with ``python benchmarks/subscription_routing.py``.
+"""
+
+import asyncio
+import time
+from typing import List
+
+from _harness import BenchmarkResult, parser, report
+from autogen_core import TopicId, TypePrefixSubscription, TypeSubscription
+from autogen_core._runtime_impl_helpers import SubscriptionManager
+
+
+async def build_manager(num_subscriptions: int) -> SubscriptionManager:
+    manager = SubscriptionManager()
+    for i in range(num_subscriptions):
+        if i % 10 == 0:
+            await manager.add_subscription(TypePrefixSubscription(topic_type_prefix=f"prefix{i}.", agent_type=f"p{i}"))
+        else:
+            await manager.add_subscription(TypeSubscription(topic_type=f"topic{i}", agent_type=f"a{i}"))
+    return manager
+
+
+async def run_case(num_subscriptions: int, num_sources: int, iterations: int) -> List[BenchmarkResult]:
+    results: List[BenchmarkResult] = []
+
+    start = time.perf_counter()
+    manager = await build_manager(num_subscriptions)
+    results.append(
+        BenchmarkResult(
+            name="add_subscription",
+            iterations=num_subscriptions,
+            seconds=time.perf_counter() - start,
+            params={"subscriptions": num_subscriptions},
+        )
+    )
+
+    # Per-session topics: every lookup is for a source that has not been seen before.
+    topics = [
+        TopicId(type=f"topic{(i % (num_subscriptions - 1)) + 1}", source=f"session{i}") for i in range(iterations)
+    ]
+    start = time.perf_counter()
+    for topic in topics:
+        await manager.get_subscribed_recipients(topic)
+    results.append(
+        BenchmarkResult(
+            name="resolve_new_topic",
+            iterations=iterations,
+            seconds=time.perf_counter() - start,
+            params={"subscriptions": num_subscriptions},
+        )
+    )
+
+    hot_topics = [TopicId(type="topic1", source=f"session{i % num_sources}") for i in range(iterations)]
+    for topic in hot_topics[:num_sources]:
+        await manager.get_subscribed_recipients(topic)
+    start = time.perf_counter()
+    for topic in hot_topics:
+        await manager.get_subscribed_recipients(topic)
+    results.append(
+        BenchmarkResult(
+            name="resolve_cached_topic",
+            iterations=iterations,
+            seconds=time.perf_counter() - start,
+            params={"subscriptions": num_subscriptions},
+        )
+    )
+
+    churn = [TypeSubscription(topic_type="topic1", agent_type=f"churn{i}") for i in range(min(iterations, 1000))]
+    start = time.perf_counter()
+    for subscription in churn:
+        await manager.add_subscription(subscription)
+        await manager.remove_subscription(subscription.id)
+    results.append(
+        BenchmarkResult(
+            name="add_remove_subscription",
+            iterations=len(churn),
+            seconds=time.perf_counter() - start,
+            params={"subscriptions": num_subscriptions},
+        )
+    )
+    return results
+
+
+async def main() -> None:
+    arg_parser = parser(__doc__ or "")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 50_000])
+    arg_parser.add_argument("--iterations", type=int, default=10_000)
+    arg_parser.add_argument("--sources", type=int, default=100)
+    args = arg_parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    for size in args.sizes:
+        results.extend(await run_case(size, args.sources, args.iterations))
+    report(results, args.json)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
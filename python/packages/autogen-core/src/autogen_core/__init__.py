@@ -8,6 +8,12 @@
 from ._agent_metadata import AgentMetadata
 from ._agent_proxy import AgentProxy
 from ._agent_runtime import AgentRuntime
+from ._agent_state_store import (
+    AgentStateStore,
+    FileSystemAgentStateStore,
+    InMemoryAgentStateStore,
+    SqliteAgentStateStore,
+)
 from ._agent_type import AgentType
 from ._base_agent import BaseAgent
 from ._cancellation_token import CancellationToken
@@ -35,6 +41,7 @@
 )
 from ._default_subscription import DefaultSubscription, default_subscription, type_subscription
 from ._default_topic import DefaultTopicId
+from ._handler_executors import HandlerExecutor, HandlerExecutorStats
 from ._image import Image
 from ._intervention import (
     DefaultInterventionHandler,
@@ -43,10 +50,16 @@
 )
 from ._message_context import MessageContext
 from ._message_handler_context import MessageHandlerContext
+from ._message_journal import FileMessageJournal, JournalEntry, MessageJournal
+from ._message_priority import MessagePriority
 from ._routed_agent import RoutedAgent, event, message_handler, rpc
+from ._runtime_metrics import HistogramSnapshot, RuntimeMetrics
 from ._serialization import (
     JSON_DATA_CONTENT_TYPE as JSON_DATA_CONTENT_TYPE_ALIAS,
 )
+from ._serialization import (
+    MSGPACK_DATA_CONTENT_TYPE as MSGPACK_DATA_CONTENT_TYPE_ALIAS,
+)
 from ._serialization import (
     PROTOBUF_DATA_CONTENT_TYPE as PROTOBUF_DATA_CONTENT_TYPE_ALIAS,
 )
@@ -55,7 +68,7 @@
     UnknownPayload,
     try_get_known_serializers_for_type,
 )
-from ._single_threaded_agent_runtime import SingleThreadedAgentRuntime
+from ._single_threaded_agent_runtime import AgentPassivationStats, SingleThreadedAgentRuntime
 from ._subscription import Subscription
 from ._subscription_context import SubscriptionInstantiationContext
 from ._topic import TopicId
@@ -78,6 +91,9 @@
 PROTOBUF_DATA_CONTENT_TYPE = PROTOBUF_DATA_CONTENT_TYPE_ALIAS
 """The content type for Protobuf data."""
 
+MSGPACK_DATA_CONTENT_TYPE = MSGPACK_DATA_CONTENT_TYPE_ALIAS
+"""The content type for MessagePack data. Requires the ``msgpack`` extra."""
+
 __all__ = [
     "Agent",
     "AgentId",
@@ -90,6 +106,7 @@
     "TopicId",
     "Subscription",
     "MessageContext",
+    "MessagePriority",
     "AgentType",
     "SubscriptionInstantiationContext",
     "MessageHandlerContext",
@@ -112,7 +129,20 @@
     "TypePrefixSubscription",
     "JSON_DATA_CONTENT_TYPE",
     "PROTOBUF_DATA_CONTENT_TYPE",
+    "MSGPACK_DATA_CONTENT_TYPE",
     "SingleThreadedAgentRuntime",
+    "AgentPassivationStats",
+    "HandlerExecutor",
+    "HandlerExecutorStats",
+    "RuntimeMetrics",
+    "HistogramSnapshot",
+    "AgentStateStore",
+    "InMemoryAgentStateStore",
+    "FileSystemAgentStateStore",
+    "SqliteAgentStateStore",
+    "MessageJournal",
+    "FileMessageJournal",
+    "JournalEntry",
     "ROOT_LOGGER_NAME",
     "EVENT_LOGGER_NAME",
     "TRACE_LOGGER_NAME",
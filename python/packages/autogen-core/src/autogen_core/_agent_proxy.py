@@ -5,6 +5,7 @@
 from ._agent_id import AgentId
 from ._agent_metadata import AgentMetadata
 from ._cancellation_token import CancellationToken
+from ._message_priority import MessagePriority
 
 if TYPE_CHECKING:
     from ._agent_runtime import AgentRuntime
@@ -34,6 +35,8 @@ async def send_message(
         sender: AgentId,
         cancellation_token: CancellationToken | None = None,
         message_id: str | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        timeout: float | None = None,
     ) -> Any:
         return await self._runtime.send_message(
             message,
@@ -41,6 +44,8 @@ async def send_message(
             sender=sender,
             cancellation_token=cancellation_token,
             message_id=message_id,
+            priority=priority,
+            timeout=timeout,
         )
 
     async def save_state(self) -> Mapping[str, Any]:
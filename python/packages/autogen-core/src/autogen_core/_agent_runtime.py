@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
-from typing import Any, Awaitable, Callable, Mapping, Protocol, Type, TypeVar, overload, runtime_checkable
+from typing import Any, Awaitable, Callable, List, Mapping, Protocol, Type, TypeVar, overload, runtime_checkable
 
 from ._agent import Agent
 from ._agent_id import AgentId
 from ._agent_metadata import AgentMetadata
 from ._agent_type import AgentType
 from ._cancellation_token import CancellationToken
+from ._message_priority import MessagePriority
 from ._serialization import MessageSerializer
 from ._subscription import Subscription
 from ._topic import TopicId
@@ -27,6 +28,8 @@ async def send_message(
         sender: AgentId | None = None,
         cancellation_token: CancellationToken | None = None,
         message_id: str | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        timeout: float | None = None,
     ) -> Any:
         """Send a message to an agent and get a response.
 
@@ -35,10 +38,13 @@ async def send_message(
             recipient (AgentId): The agent to send the message to.
             sender (AgentId | None, optional): Agent which sent the message. Should **only** be None if this was sent from no agent, such as directly to the runtime externally. Defaults to None.
             cancellation_token (CancellationToken | None, optional): Token used to cancel an in progress . Defaults to None.
+            priority (MessagePriority, optional): The scheduling class of the message. Runtimes that do not queue messages may ignore it. Defaults to MessagePriority.NORMAL.
+            timeout (float | None, optional): Seconds to wait for the response. The recipient sees the resulting deadline in :attr:`MessageContext.deadline`. A message sent from a message handler also has to meet the deadline of the message being handled. Defaults to None, which only applies the inherited deadline.
 
         Raises:
             CantHandleException: If the recipient cannot handle the message.
             UndeliverableException: If the message cannot be delivered.
+            MessageTimeoutException: If there is no response before the deadline.
             Other: Any other exception raised by the recipient.
 
         Returns:
@@ -55,6 +61,7 @@ async def publish_message(
         sender: AgentId | None = None,
         cancellation_token: CancellationToken | None = None,
         message_id: str | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
     ) -> None:
         """Publish a message to all agents in the given namespace, or if no namespace is provided, the namespace of the sender.
 
@@ -66,18 +73,84 @@ async def publish_message(
             sender (AgentId | None, optional): The agent which sent the message. Defaults to None.
             cancellation_token (CancellationToken | None, optional): Token used to cancel an in progress. Defaults to None.
             message_id (str | None, optional): The message id. If None, a new message id will be generated. Defaults to None. This message id must be unique. and is recommended to be a UUID.
+            priority (MessagePriority, optional): The scheduling class of the message. Runtimes that do not queue messages may ignore it. Defaults to MessagePriority.NORMAL.
 
         Raises:
             UndeliverableException: If the message cannot be delivered.
         """
         ...
 
+    async def send_messages(
+        self,
+        messages: Sequence[Any],
+        recipient: AgentId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_ids: Sequence[str] | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        timeout: float | None = None,
+    ) -> List[Any]:
+        """Send a batch of messages to an agent and get the responses.
+
+        Each message is delivered and handled as if it was sent with :meth:`send_message`, with its own message id, but
+        the runtime can share the cost of tracing and queueing across the batch.
+
+        Args:
+            messages (Sequence[Any]): The messages to send.
+            recipient (AgentId): The agent to send the messages to.
+            sender (AgentId | None, optional): Agent which sent the messages. Defaults to None.
+            cancellation_token (CancellationToken | None, optional): Token used to cancel the messages in progress. Defaults to None.
+            message_ids (Sequence[str] | None, optional): One unique id per message. If None, new message ids are generated. Defaults to None.
+            priority (MessagePriority, optional): The scheduling class of the messages. Defaults to MessagePriority.NORMAL.
+            timeout (float | None, optional): Seconds to wait for all responses, like the ``timeout`` of :meth:`send_message`. Every message in the batch gets the same deadline. Defaults to None, which only applies the inherited deadline.
+
+        Raises:
+            CantHandleException: If the recipient cannot handle a message.
+            UndeliverableException: If a message cannot be delivered.
+            MessageTimeoutException: If there are not all responses before the deadline.
+            Other: Any other exception raised by the recipient. If several messages fail, the first failure is raised and the other messages are still handled.
+
+        Returns:
+            List[Any]: The responses from the agent, in the order of the messages.
+        """
+        ...
+
+    async def publish_messages(
+        self,
+        messages: Sequence[Any],
+        topic_id: TopicId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_ids: Sequence[str] | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+    ) -> None:
+        """Publish a batch of messages to a topic.
+
+        Each message is delivered as if it was published with :meth:`publish_message`, with its own message id and in
+        the order of the batch, but the runtime can share the cost of tracing and queueing across the batch.
+
+        Args:
+            messages (Sequence[Any]): The messages to publish.
+            topic_id (TopicId): The topic to publish the messages to.
+            sender (AgentId | None, optional): The agent which sent the messages. Defaults to None.
+            cancellation_token (CancellationToken | None, optional): Token used to cancel the messages in progress. Defaults to None.
+            message_ids (Sequence[str] | None, optional): One unique id per message. If None, new message ids are generated. Defaults to None.
+            priority (MessagePriority, optional): The scheduling class of the messages. Defaults to MessagePriority.NORMAL.
+
+        Raises:
+            UndeliverableException: If a message cannot be delivered.
+        """
+        ...
+
     async def register_factory(
         self,
         type: str | AgentType,
         agent_factory: Callable[[], T | Awaitable[T]],
         *,
         expected_class: type[T] | None = None,
+        max_concurrency: int | None = None,
     ) -> AgentType:
         """Register an agent factory with the runtime associated with a specific type. The type must be unique. This API does not add any subscriptions.
 
@@ -127,6 +200,7 @@ async def main() -> None:
             type (str): The type of agent this factory creates. It is not the same as agent class name. The `type` parameter is used to differentiate between different factory functions rather than agent classes.
             agent_factory (Callable[[], T]): The factory that creates the agent, where T is a concrete Agent type. Inside the factory, use `autogen_core.AgentInstantiationContext` to access variables like the current runtime and agent ID.
             expected_class (type[T] | None, optional): The expected class of the agent, used for runtime validation of the factory. Defaults to None.
+            max_concurrency (int | None, optional): The maximum number of messages that each agent of this type handles at the same time. Use 1 to handle messages one at a time, in the order they are delivered. Further messages wait in the agent's mailbox without holding up other agents. An agent with a limit of 1 must not send a message to itself, as the call would never be handled. Defaults to None, which means no limit.
         """
         ...
 
@@ -160,6 +234,23 @@ async def get(
         self, id_or_type: AgentId | AgentType | str, /, key: str = "default", *, lazy: bool = True
     ) -> AgentId: ...
 
+    async def get_many(self, type: AgentType | str, /, keys: Sequence[str], *, lazy: bool = True) -> List[AgentId]:
+        """Get the ids of many agents of the same type, like calling :meth:`get` once per key.
+
+        With ``lazy=False`` the agents are instantiated concurrently, which pre-warms them so that their first
+        message does not wait for their construction.
+
+        Args:
+            type (AgentType | str): The type of the agents.
+            keys (Sequence[str]): The keys of the agents.
+            lazy (bool, optional): Whether to wait until each agent receives its first message to instantiate it.
+                Defaults to True.
+
+        Returns:
+            List[AgentId]: The ids of the agents, in the order of ``keys``.
+        """
+        ...
+
     async def save_state(self) -> Mapping[str, Any]:
         """Save the state of the entire runtime, including all hosted agents. The only way to restore the state is to pass it to :meth:`load_state`.
 
@@ -0,0 +1,147 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Mapping
+from urllib.parse import quote
+
+from ._agent_id import AgentId
+
+__all__ = [
+    "AgentStateStore",
+    "InMemoryAgentStateStore",
+    "FileSystemAgentStateStore",
+    "SqliteAgentStateStore",
+]
+
+
+class AgentStateStore(ABC):
+    """Stores the state of agents that a runtime has passivated.
+
+    When an agent is evicted from memory, the runtime saves the result of :meth:`~autogen_core.Agent.save_state`
+    under the agent's id. The next message for the agent recreates it and passes the stored state to
+    :meth:`~autogen_core.Agent.load_state`.
+
+    States must be JSON serializable, which is already required by :meth:`~autogen_core.Agent.save_state`.
+    """
+
+    @abstractmethod
+    async def save(self, agent_id: AgentId, state: Mapping[str, Any]) -> None:
+        """Save the state of an agent, replacing any state already stored for it."""
+        ...
+
+    @abstractmethod
+    async def load(self, agent_id: AgentId) -> Mapping[str, Any] | None:
+        """Load the state of an agent, or None if no state is stored for it."""
+        ...
+
+    @abstractmethod
+    async def delete(self, agent_id: AgentId) -> None:
+        """Delete the state of an agent. Does nothing if no state is stored for it."""
+        ...
+
+
+class InMemoryAgentStateStore(AgentStateStore):
+    """Keeps agent states in a dictionary. States are serialized to JSON so that
+    evicted agents do not keep their objects alive."""
+
+    def __init__(self) -> None:
+        self._states: Dict[AgentId, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    async def save(self, agent_id: AgentId, state: Mapping[str, Any]) -> None:
+        self._states[agent_id] = json.dumps(state)
+
+    async def load(self, agent_id: AgentId) -> Mapping[str, Any] | None:
+        state = self._states.get(agent_id)
+        return None if state is None else json.loads(state)
+
+    async def delete(self, agent_id: AgentId) -> None:
+        self._states.pop(agent_id, None)
+
+
+class FileSystemAgentStateStore(AgentStateStore):
+    """Stores each agent state as a JSON file in a directory.
+
+    Args:
+        directory (str | Path): The directory to store the files in. It is created if it does not exist.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, agent_id: AgentId) -> Path:
+        return self._directory / f"{quote(str(agent_id), safe='')}.json"
+
+    def _write(self, agent_id: AgentId, data: str) -> None:
+        path = self._path(agent_id)
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_text(data, encoding="utf-8")
+        os.replace(temp_path, path)
+
+    def _read(self, agent_id: AgentId) -> str | None:
+        try:
+            return self._path(agent_id).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    async def save(self, agent_id: AgentId, state: Mapping[str, Any]) -> None:
+        await asyncio.to_thread(self._write, agent_id, json.dumps(state))
+
+    async def load(self, agent_id: AgentId) -> Mapping[str, Any] | None:
+        data = await asyncio.to_thread(self._read, agent_id)
+        return None if data is None else json.loads(data)
+
+    async def delete(self, agent_id: AgentId) -> None:
+        await asyncio.to_thread(self._path(agent_id).unlink, missing_ok=True)
+
+
+class SqliteAgentStateStore(AgentStateStore):
+    """Stores agent states as JSON in a SQLite table.
+
+    Args:
+        database (str | Path): The path of the database file, or ``":memory:"``.
+        table (str, optional): The name of the table. It is created if it does not exist. Defaults to "agent_state".
+    """
+
+    def __init__(self, database: str | Path, table: str = "agent_state") -> None:
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        self._table = table
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(database, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(f"CREATE TABLE IF NOT EXISTS {table} (agent_id TEXT PRIMARY KEY, state TEXT)")
+
+    def _execute(self, sql: str, *parameters: str) -> str | None:
+        with self._lock, self._connection:
+            row = self._connection.execute(sql, parameters).fetchone()
+        return None if row is None else str(row[0])
+
+    async def save(self, agent_id: AgentId, state: Mapping[str, Any]) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            f"INSERT OR REPLACE INTO {self._table} (agent_id, state) VALUES (?, ?)",
+            str(agent_id),
+            json.dumps(state),
+        )
+
+    async def load(self, agent_id: AgentId) -> Mapping[str, Any] | None:
+        data = await asyncio.to_thread(
+            self._execute, f"SELECT state FROM {self._table} WHERE agent_id = ?", str(agent_id)
+        )
+        return None if data is None else json.loads(data)
+
+    async def delete(self, agent_id: AgentId) -> None:
+        await asyncio.to_thread(self._execute, f"DELETE FROM {self._table} WHERE agent_id = ?", str(agent_id))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -16,6 +16,7 @@
 from ._agent_type import AgentType
 from ._cancellation_token import CancellationToken
 from ._message_context import MessageContext
+from ._message_priority import MessagePriority
 from ._serialization import MessageSerializer, try_get_known_serializers_for_type
 from ._subscription import Subscription, UnboundSubscription
 from ._subscription_context import SubscriptionInstantiationContext
@@ -122,6 +123,8 @@ async def send_message(
         *,
         cancellation_token: CancellationToken | None = None,
         message_id: str | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        timeout: float | None = None,
     ) -> Any:
         """See :py:meth:`autogen_core.AgentRuntime.send_message` for more information."""
         if cancellation_token is None:
@@ -133,6 +136,8 @@ async def send_message(
             recipient=recipient,
             cancellation_token=cancellation_token,
             message_id=message_id,
+            priority=priority,
+            timeout=timeout,
         )
 
     async def publish_message(
@@ -141,8 +146,45 @@ async def publish_message(
         topic_id: TopicId,
         *,
         cancellation_token: CancellationToken | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
     ) -> None:
-        await self._runtime.publish_message(message, topic_id, sender=self.id, cancellation_token=cancellation_token)
+        await self._runtime.publish_message(
+            message, topic_id, sender=self.id, cancellation_token=cancellation_token, priority=priority
+        )
+
+    async def send_messages(
+        self,
+        messages: Sequence[Any],
+        recipient: AgentId,
+        *,
+        cancellation_token: CancellationToken | None = None,
+        message_ids: Sequence[str] | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        timeout: float | None = None,
+    ) -> List[Any]:
+        """See :py:meth:`autogen_core.AgentRuntime.send_messages` for more information."""
+        return await self._runtime.send_messages(
+            messages,
+            recipient,
+            sender=self.id,
+            cancellation_token=cancellation_token,
+            message_ids=message_ids,
+            priority=priority,
+            timeout=timeout,
+        )
+
+    async def publish_messages(
+        self,
+        messages: Sequence[Any],
+        topic_id: TopicId,
+        *,
+        cancellation_token: CancellationToken | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+    ) -> None:
+        """See :py:meth:`autogen_core.AgentRuntime.publish_messages` for more information."""
+        await self._runtime.publish_messages(
+            messages, topic_id, sender=self.id, cancellation_token=cancellation_token, priority=priority
+        )
 
     async def save_state(self) -> Mapping[str, Any]:
         warnings.warn("save_state not implemented", stacklevel=2)
@@ -164,9 +206,12 @@ async def register(
         *,
         skip_class_subscriptions: bool = False,
         skip_direct_message_subscription: bool = False,
+        max_concurrency: int | None = None,
     ) -> AgentType:
         agent_type = AgentType(type)
-        agent_type = await runtime.register_factory(type=agent_type, agent_factory=factory, expected_class=cls)
+        agent_type = await runtime.register_factory(
+            type=agent_type, agent_factory=factory, expected_class=cls, max_concurrency=max_concurrency
+        )
         if not skip_class_subscriptions:
             with SubscriptionInstantiationContext.populate_context(agent_type):
                 subscriptions: List[Subscription] = []
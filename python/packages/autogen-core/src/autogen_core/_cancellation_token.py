@@ -1,6 +1,8 @@
 import threading
 from asyncio import Future
-from typing import Any, Callable, List
+from functools import partial
+from itertools import count
+from typing import Any, Callable, Dict, Hashable, List
 
 
 class CancellationToken:
@@ -8,39 +10,62 @@ class CancellationToken:
 
     def __init__(self) -> None:
         self._cancelled: bool = False
+        # Guards registration against a concurrent cancel. Reads of the flag do not need it.
         self._lock: threading.Lock = threading.Lock()
-        self._callbacks: List[Callable[[], None]] = []
+        # Callbacks by registration key. Linked futures are their own key.
+        self._callbacks: Dict[Hashable, Callable[[], object]] = {}
+        self._keys = count()
 
     def cancel(self) -> None:
         """Cancel pending async calls linked to this cancellation token."""
         with self._lock:
-            if not self._cancelled:
-                self._cancelled = True
-                for callback in self._callbacks:
-                    callback()
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks: List[Callable[[], object]] = list(self._callbacks.values())
+            self._callbacks.clear()
+        # Called outside of the lock so that a callback can use the token.
+        for callback in callbacks:
+            callback()
 
     def is_cancelled(self) -> bool:
         """Check if the CancellationToken has been used"""
-        with self._lock:
-            return self._cancelled
+        return self._cancelled
 
-    def add_callback(self, callback: Callable[[], None]) -> None:
-        """Attach a callback that will be called when cancel is invoked"""
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Attach a callback that will be called when cancel is invoked.
+
+        Returns a function that removes the callback again. Code that registers callbacks on a long-lived token
+        should call it once the callback is no longer needed, otherwise the token keeps the callback alive until
+        it is cancelled.
+        """
         with self._lock:
-            if self._cancelled:
-                callback()
-            else:
-                self._callbacks.append(callback)
+            if not self._cancelled:
+                key = next(self._keys)
+                self._callbacks[key] = callback
+                return partial(self._remove_callback, key)
+        callback()
+        return _noop
+
+    def _remove_callback(self, key: Hashable) -> None:
+        # A single dict operation is atomic, and removing a callback that cancel already took is harmless.
+        self._callbacks.pop(key, None)
 
     def link_future(self, future: Future[Any]) -> Future[Any]:
-        """Link a pending async call to a token to allow its cancellation"""
+        """Link a pending async call to a token to allow its cancellation.
+
+        The link is removed when the future is done, so a token can be linked to any number of futures over its
+        lifetime.
+        """
         with self._lock:
-            if self._cancelled:
-                future.cancel()
-            else:
+            if not self._cancelled:
+                if not future.done():
+                    self._callbacks[future] = future.cancel
+                    future.add_done_callback(self._remove_callback)
+                return future
+        future.cancel()
+        return future
 
-                def _cancel() -> None:
-                    future.cancel()
 
-                self._callbacks.append(_cancel)
-        return future
+def _noop() -> None:
+    pass
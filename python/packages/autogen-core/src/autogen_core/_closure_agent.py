@@ -12,6 +12,7 @@
 from ._base_agent import BaseAgent
 from ._cancellation_token import CancellationToken
 from ._message_context import MessageContext
+from ._message_priority import MessagePriority
 from ._serialization import try_get_known_serializers_for_type
 from ._subscription import Subscription
 from ._subscription_context import SubscriptionInstantiationContext
@@ -62,6 +63,8 @@ async def send_message(
         *,
         cancellation_token: CancellationToken | None = None,
         message_id: str | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        timeout: float | None = None,
     ) -> Any: ...
 
     async def publish_message(
@@ -70,6 +73,7 @@ async def publish_message(
         topic_id: TopicId,
         *,
         cancellation_token: CancellationToken | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
     ) -> None: ...
 
 
@@ -0,0 +1,138 @@
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Literal, TypeVar
+
+__all__ = [
+    "HandlerExecutor",
+    "HandlerExecutorStats",
+    "HandlerExecutors",
+]
+
+T = TypeVar("T")
+
+HandlerExecutor = Literal["thread"] | Executor
+"""Where a message handler declared with an ``executor`` runs: ``"thread"`` for the runtime's thread pool, or an
+:class:`~concurrent.futures.Executor` of your own other than a :class:`~concurrent.futures.ProcessPoolExecutor`."""
+
+
+@dataclass(frozen=True)
+class HandlerExecutorStats:
+    """A snapshot of the counters of the handlers that ran outside of the event loop."""
+
+    submitted: int
+    """Handler calls handed to an executor."""
+    started: int
+    """Handler calls that an executor has started. The difference to ``submitted`` is waiting for a worker."""
+    completed: int
+    """Handler calls that returned or raised."""
+    queue_seconds: float
+    """The total time handler calls waited for a worker."""
+    max_queue_seconds: float
+    """The longest time a handler call waited for a worker."""
+    run_seconds: float
+    """The total time handler calls ran in a worker."""
+
+
+_CURRENT_HANDLER_EXECUTORS: ContextVar["HandlerExecutors | None"] = ContextVar(
+    "_CURRENT_HANDLER_EXECUTORS", default=None
+)
+
+
+class HandlerExecutors:
+    """The executors of a runtime that run message handlers outside of the event loop.
+
+    Handlers declared with ``executor="thread"`` share a thread pool of at most ``max_threads`` threads, which is
+    created when the first of them runs. A runtime makes its executors current for the handlers it calls with
+    :meth:`set_current`. Handlers that run without a current runtime, or are called directly, use the default
+    executor of the event loop.
+
+    Args:
+        max_threads (int, optional): The size of the thread pool. Defaults to the default of
+            :class:`~concurrent.futures.ThreadPoolExecutor`.
+    """
+
+    def __init__(self, max_threads: int | None = None) -> None:
+        if max_threads is not None and max_threads < 1:
+            raise ValueError("max_threads must be at least 1")
+        self._max_threads = max_threads
+        self._thread_pool: ThreadPoolExecutor | None = None
+        # The counters are updated from the worker threads.
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._started = 0
+        self._completed = 0
+        self._queue_seconds = 0.0
+        self._max_queue_seconds = 0.0
+        self._run_seconds = 0.0
+
+    @staticmethod
+    def current() -> "HandlerExecutors | None":
+        return _CURRENT_HANDLER_EXECUTORS.get()
+
+    def set_current(self) -> None:
+        """Makes these executors current in this context and in the tasks it creates from now on."""
+        _CURRENT_HANDLER_EXECUTORS.set(self)
+
+    @property
+    def stats(self) -> HandlerExecutorStats:
+        with self._lock:
+            return HandlerExecutorStats(
+                submitted=self._submitted,
+                started=self._started,
+                completed=self._completed,
+                queue_seconds=self._queue_seconds,
+                max_queue_seconds=self._max_queue_seconds,
+                run_seconds=self._run_seconds,
+            )
+
+    def _resolve(self, executor: HandlerExecutor) -> Executor:
+        if isinstance(executor, Executor):
+            return executor
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(self._max_threads, thread_name_prefix="autogen-handler")
+        return self._thread_pool
+
+    async def run(self, executor: HandlerExecutor, func: Callable[..., T], *args: Any) -> T:
+        """Runs ``func(*args)`` in ``executor`` with a copy of the current context and returns its result."""
+        submitted = time.perf_counter()
+        with self._lock:
+            self._submitted += 1
+        context = contextvars.copy_context()
+
+        def call() -> T:
+            started = time.perf_counter()
+            with self._lock:
+                self._started += 1
+                self._queue_seconds += started - submitted
+                self._max_queue_seconds = max(self._max_queue_seconds, started - submitted)
+            try:
+                return context.run(func, *args)
+            finally:
+                with self._lock:
+                    self._completed += 1
+                    self._run_seconds += time.perf_counter() - started
+
+        return await asyncio.get_running_loop().run_in_executor(self._resolve(executor), call)
+
+    def shutdown(self) -> None:
+        """Shuts down the thread pool without waiting for running handlers. Handlers that have not started yet
+        are cancelled. A later handler creates a new pool."""
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+            self._thread_pool = None
+
+
+async def run_in_handler_executor(executor: HandlerExecutor, func: Callable[..., T], *args: Any) -> T:
+    """Runs a handler body in ``executor`` using the current runtime's executors."""
+    executors = HandlerExecutors.current()
+    if executors is not None:
+        return await executors.run(executor, func, *args)
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        executor if isinstance(executor, Executor) else None, context.run, func, *args
+    )
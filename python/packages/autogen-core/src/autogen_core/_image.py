@@ -7,7 +7,7 @@
 from typing import Any, Dict, cast
 
 from PIL import Image as PILImage
-from pydantic import GetCoreSchemaHandler, ValidationInfo
+from pydantic import GetCoreSchemaHandler, SerializationInfo, ValidationInfo
 from pydantic_core import core_schema
 from typing_extensions import Literal
 
@@ -59,11 +59,18 @@ def from_uri(cls, uri: str) -> Image:
     def from_base64(cls, base64_str: str) -> Image:
         return cls(PILImage.open(BytesIO(base64.b64decode(base64_str))))
 
-    def to_base64(self) -> str:
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Image:
+        return cls(PILImage.open(BytesIO(data)))
+
+    def to_bytes(self) -> bytes:
+        """Returns the image encoded as PNG."""
         buffered = BytesIO()
         self.image.save(buffered, format="PNG")
-        content = buffered.getvalue()
-        return base64.b64encode(content).decode("utf-8")
+        return buffered.getvalue()
+
+    def to_base64(self) -> str:
+        return base64.b64encode(self.to_bytes()).decode("utf-8")
 
     @classmethod
     def from_file(cls, file_path: Path) -> Image:
@@ -87,23 +94,28 @@ def __get_pydantic_core_schema__(cls, source_type: Any, handler: GetCoreSchemaHa
         # Custom validation
         def validate(value: Any, validation_info: ValidationInfo) -> Image:
             if isinstance(value, dict):
-                base_64 = cast(str | None, value.get("data"))  # type: ignore
-                if base_64 is None:
+                data = cast(str | bytes | None, value.get("data"))  # type: ignore
+                if data is None:
                     raise ValueError("Expected 'data' key in the dictionary")
-                return cls.from_base64(base_64)
+                # Binary serializers keep the PNG bytes raw instead of base64 encoding them.
+                return cls.from_bytes(data) if isinstance(data, bytes) else cls.from_base64(data)
             elif isinstance(value, cls):
                 return value
             else:
-                raise TypeError(f"Expected dict or {cls.__name__} instance, got {type(value)}")
+                # A ValueError, not a TypeError, so that Pydantic tries the other members of a union such as
+                # str | Image.
+                raise ValueError(f"Expected dict or {cls.__name__} instance, got {type(value)}")
 
         # Custom serialization
-        def serialize(value: Image) -> dict[str, Any]:
+        def serialize(value: Image, info: SerializationInfo) -> dict[str, Any]:
+            if isinstance(info.context, dict) and info.context.get("binary"):
+                return {"data": value.to_bytes()}
             return {"data": value.to_base64()}
 
         return core_schema.with_info_after_validator_function(
             validate,
             core_schema.any_schema(),  # Accept any type; adjust if needed
-            serialization=core_schema.plain_serializer_function_ser_schema(serialize),
+            serialization=core_schema.plain_serializer_function_ser_schema(serialize, info_arg=True),
         )
 
 
@@ -1,7 +1,10 @@
-from typing import Any, Protocol, final
+import asyncio
+import warnings
+from typing import Any, Callable, ClassVar, Coroutine, Dict, List, Literal, NamedTuple, Protocol, Sequence, Tuple, final
 
 from ._agent_id import AgentId
 from ._message_context import MessageContext
+from ._runtime_impl_helpers import create_eager_task
 
 __all__ = [
     "DropMessage",
@@ -26,6 +29,9 @@ class InterventionHandler(Protocol):
 
     Note: Returning None from any of the intervention handler methods will result in a warning being issued and treated as "no change". If you intend to drop a message, you should return :class:`DropMessage` explicitly.
 
+    The handlers are called in order, and each one receives the message returned by the previous one. Handlers that
+    subclass :class:`DefaultInterventionHandler` can narrow down the messages they are called for, see there.
+
     Example:
 
     .. code-block:: python
@@ -69,7 +75,40 @@ async def on_response(self, message: Any, *, sender: AgentId, recipient: AgentId
 class DefaultInterventionHandler(InterventionHandler):
     """Simple class that provides a default implementation for all intervention
     handler methods, that simply returns the message unchanged. Allows for easy
-    subclassing to override only the desired methods."""
+    subclassing to override only the desired methods.
+
+    The runtime only calls the methods a subclass overrides, and only for messages that are instances of
+    :attr:`message_types`. Consecutive handlers that set :attr:`read_only` run concurrently. When no handler applies
+    to a message, intervention costs a dictionary lookup.
+
+    Example:
+
+    .. code-block:: python
+
+        from autogen_core import DefaultInterventionHandler, MessageContext
+        from dataclasses import dataclass
+        from typing import Any
+
+
+        @dataclass
+        class ChatMessage:
+            content: str
+
+
+        class AuditHandler(DefaultInterventionHandler):
+            message_types = (ChatMessage,)
+            read_only = True
+
+            async def on_publish(self, message: Any, *, message_context: MessageContext) -> Any:
+                print(f"{message_context.sender} published {message.content}")
+                return message
+    """
+
+    message_types: ClassVar[Tuple[type, ...] | None] = None
+    """Only call the handler for messages that are instances of one of these types. ``None`` means all messages."""
+    read_only: ClassVar[bool] = False
+    """The handler only observes messages. What it returns is ignored, so it can neither change nor drop a message,
+    and consecutive read-only handlers run concurrently."""
 
     async def on_send(
         self, message: Any, *, message_context: MessageContext, recipient: AgentId
@@ -81,3 +120,100 @@ async def on_publish(self, message: Any, *, message_context: MessageContext) ->
 
     async def on_response(self, message: Any, *, sender: AgentId, recipient: AgentId | None) -> Any | type[DropMessage]:
         return message
+
+
+InterventionDirection = Literal["send", "publish", "response"]
+
+
+class _Step(NamedTuple):
+    handlers: Tuple[InterventionHandler, ...]
+    read_only: bool
+    # The position of the next handler in the list of handlers for the direction.
+    next_index: int
+
+
+def _overrides(handler: InterventionHandler, direction: InterventionDirection) -> bool:
+    method = f"on_{direction}"
+    # Handlers that do not build on DefaultInterventionHandler are always called.
+    return not isinstance(handler, DefaultInterventionHandler) or getattr(type(handler), method) is not getattr(
+        DefaultInterventionHandler, method
+    )
+
+
+class InterventionPipeline:
+    """Runs the intervention handlers of a runtime for a message. The handlers that apply to a direction and message
+    type are worked out once per type and cached.
+
+    :meta private:
+    """
+
+    def __init__(self, handlers: Sequence[InterventionHandler]) -> None:
+        self._handlers: Dict[InterventionDirection, List[InterventionHandler]] = {
+            direction: [handler for handler in handlers if _overrides(handler, direction)]
+            for direction in ("send", "publish", "response")
+        }
+        self._plans: Dict[Tuple[InterventionDirection, type, int], Tuple[_Step, ...]] = {}
+
+    def plan(self, direction: InterventionDirection, message_type: type, start: int = 0) -> Tuple[_Step, ...]:
+        """Returns the steps for a message of ``message_type``, starting with the handler at ``start``. Returns an
+        empty tuple when no handler applies."""
+        key = (direction, message_type, start)
+        plan = self._plans.get(key)
+        if plan is None:
+            steps: List[_Step] = []
+            group: List[InterventionHandler] = []
+            handlers = self._handlers[direction]
+            for index in range(start, len(handlers)):
+                handler = handlers[index]
+                message_types = getattr(handler, "message_types", None)
+                if message_types is not None and not issubclass(message_type, message_types):
+                    continue
+                if getattr(handler, "read_only", False):
+                    group.append(handler)
+                    continue
+                if group:
+                    steps.append(_Step(tuple(group), True, index))
+                    group = []
+                steps.append(_Step((handler,), False, index + 1))
+            if group:
+                steps.append(_Step(tuple(group), True, len(handlers)))
+            plan = self._plans[key] = tuple(steps)
+        return plan
+
+    async def run(
+        self,
+        direction: InterventionDirection,
+        plan: Tuple[_Step, ...],
+        message: Any,
+        call: Callable[[InterventionHandler, Any], Coroutine[Any, Any, Any]],
+    ) -> Any:
+        """Passes ``message`` through the handlers of ``plan`` with ``call(handler, message)`` and returns the
+        resulting message, or :class:`DropMessage`."""
+        index = 0
+        while index < len(plan):
+            step = plan[index]
+            index += 1
+            if step.read_only:
+                if len(step.handlers) == 1:
+                    await call(step.handlers[0], message)
+                else:
+                    # Handlers that finish without waiting never cost an event loop iteration.
+                    await asyncio.gather(*(create_eager_task(call(handler, message)) for handler in step.handlers))
+                continue
+            result = await call(step.handlers[0], message)
+            if result is DropMessage or isinstance(result, DropMessage):
+                return DropMessage
+            if result is None:
+                warnings.warn(
+                    f"Intervention handler on_{direction} returned None. This might be unintentional. "
+                    "Consider returning the original message or DropMessage explicitly.",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+                continue
+            if type(result) is not type(message):
+                # The remaining handlers may filter on the new type.
+                plan = self.plan(direction, type(result), step.next_index)
+                index = 0
+            message = result
+        return message
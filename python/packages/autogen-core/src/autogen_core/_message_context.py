@@ -12,3 +12,6 @@ class MessageContext:
     is_rpc: bool
     cancellation_token: CancellationToken
     message_id: str
+    deadline: float | None = None
+    """When the sender stops waiting for a response, in seconds since the epoch, or None if it waits
+    indefinitely. Messages sent while handling this message inherit the deadline."""
@@ -12,15 +12,20 @@ def __init__(self) -> None:
         )
 
     _MESSAGE_HANDLER_CONTEXT: ClassVar[ContextVar[AgentId]] = ContextVar("_MESSAGE_HANDLER_CONTEXT")
+    _MESSAGE_HANDLER_DEADLINE: ClassVar[ContextVar[float | None]] = ContextVar(
+        "_MESSAGE_HANDLER_DEADLINE", default=None
+    )
 
     @classmethod
     @contextmanager
-    def populate_context(cls, ctx: AgentId) -> Generator[None, Any, None]:
+    def populate_context(cls, ctx: AgentId, deadline: float | None = None) -> Generator[None, Any, None]:
         """:meta private:"""
         token = MessageHandlerContext._MESSAGE_HANDLER_CONTEXT.set(ctx)
+        deadline_token = MessageHandlerContext._MESSAGE_HANDLER_DEADLINE.set(deadline)
         try:
             yield
         finally:
+            MessageHandlerContext._MESSAGE_HANDLER_DEADLINE.reset(deadline_token)
             MessageHandlerContext._MESSAGE_HANDLER_CONTEXT.reset(token)
 
     @classmethod
@@ -29,3 +34,9 @@ def agent_id(cls) -> AgentId:
             return cls._MESSAGE_HANDLER_CONTEXT.get()
         except LookupError as e:
             raise RuntimeError("MessageHandlerContext.agent_id() must be called within a message handler.") from e
+
+    @classmethod
+    def deadline(cls) -> float | None:
+        """The deadline of the message being handled, in seconds since the epoch, or None outside a message
+        handler or if the message has no deadline."""
+        return cls._MESSAGE_HANDLER_DEADLINE.get()
@@ -0,0 +1,198 @@
+import asyncio
+import base64
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from asyncio import Task
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Literal, TextIO
+
+__all__ = [
+    "JournalEntry",
+    "MessageJournal",
+    "FileMessageJournal",
+]
+
+logger = logging.getLogger("autogen_core")
+
+
+@dataclass
+class JournalEntry:
+    """A sent or published message recorded in a :class:`MessageJournal`."""
+
+    message_id: str
+    kind: Literal["send", "publish"]
+    type_name: str
+    """The serializer type name of the message."""
+    data_content_type: str
+    payload: bytes
+    """The serialized message."""
+    sender: str | None
+    """The sender's :class:`~autogen_core.AgentId` as a string, if any."""
+    recipient: str | None
+    """The recipient's :class:`~autogen_core.AgentId` as a string, for sent messages."""
+    topic_type: str | None
+    topic_source: str | None
+    priority: int
+    delivered: bool = False
+    """Whether the message was handed to its handlers before the journal was read. Its handlers may have
+    partially run, so a replay delivers it again."""
+
+
+class MessageJournal(ABC):
+    """A write-ahead journal of the messages a runtime has accepted but not finished handling.
+
+    The runtime records every message when it is queued, again when it is delivered to its handlers, and once more
+    when all of its handlers have completed. After a restart, :meth:`read_pending` returns the messages that were
+    queued but never completed, in the order they were queued, so that the runtime can replay them.
+
+    Records are expected to be buffered: the ``record_*`` methods must not block, and :meth:`flush` makes
+    everything recorded so far durable.
+    """
+
+    @abstractmethod
+    def record_enqueued(self, entry: JournalEntry) -> None: ...
+
+    @abstractmethod
+    def record_delivered(self, message_id: str) -> None: ...
+
+    @abstractmethod
+    def record_completed(self, message_id: str) -> None: ...
+
+    @abstractmethod
+    async def flush(self) -> None:
+        """Write and sync everything recorded so far."""
+        ...
+
+    @abstractmethod
+    async def read_pending(self) -> List[JournalEntry]:
+        """Return the messages that were queued but not completed, in the order they were queued."""
+        ...
+
+    @abstractmethod
+    async def close(self) -> None: ...
+
+
+def _encode_entry(entry: JournalEntry) -> Dict[str, Any]:
+    record = asdict(entry)
+    record["payload"] = base64.b64encode(entry.payload).decode("ascii")
+    del record["delivered"]
+    return record
+
+
+def _decode_entry(record: Dict[str, Any]) -> JournalEntry:
+    return JournalEntry(**{**record, "payload": base64.b64decode(record["payload"])})
+
+
+class FileMessageJournal(MessageJournal):
+    """A :class:`MessageJournal` backed by an append-only file of JSON lines.
+
+    Records are buffered in memory and a background task appends them to the file, calling ``fsync`` once per
+    batch. A batch starts ``flush_interval`` seconds after the first record that is not yet written, and records
+    that arrive while a batch is being written go into the next one, so a busy runtime pays for one ``fsync`` per
+    many messages. Records from the last ``flush_interval`` seconds before a crash can be lost.
+
+    :meth:`read_pending` compacts the file down to the pending messages.
+
+    Args:
+        path (str | Path): The journal file. It is created if it does not exist.
+        flush_interval (float, optional): How long records wait in memory before they are written, in seconds.
+            Defaults to 0.005.
+        fsync (bool, optional): Whether to ``fsync`` the file after each batch. Without it, written records
+            survive a crash of the process but not of the machine. Defaults to True.
+    """
+
+    def __init__(self, path: str | Path, *, flush_interval: float = 0.005, fsync: bool = True) -> None:
+        if flush_interval < 0:
+            raise ValueError("flush_interval must not be negative")
+        self._path = Path(path)
+        self._flush_interval = flush_interval
+        self._fsync = fsync
+        self._file: TextIO | None = None
+        self._buffer: List[str] = []
+        self._flush_task: Task[None] | None = None
+        # Serializes the threads that write to the file.
+        self._lock = asyncio.Lock()
+
+    def _record(self, record: Dict[str, Any]) -> None:
+        self._buffer.append(json.dumps(record) + "\n")
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    def record_enqueued(self, entry: JournalEntry) -> None:
+        self._record({"op": "enqueued", "entry": _encode_entry(entry)})
+
+    def record_delivered(self, message_id: str) -> None:
+        self._record({"op": "delivered", "id": message_id})
+
+    def record_completed(self, message_id: str) -> None:
+        self._record({"op": "completed", "id": message_id})
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._flush_interval)
+        # Records that arrive from now on are written by the next task.
+        self._flush_task = None
+        await self.flush()
+
+    def _write(self, lines: List[str]) -> None:
+        if self._file is None:
+            self._file = open(self._path, "a", encoding="utf-8")
+        self._file.writelines(lines)
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+
+    async def flush(self) -> None:
+        async with self._lock:
+            while self._buffer:
+                lines, self._buffer = self._buffer, []
+                await asyncio.to_thread(self._write, lines)
+
+    async def read_pending(self) -> List[JournalEntry]:
+        await self.flush()
+        async with self._lock:
+            return await asyncio.to_thread(self._compact)
+
+    def _compact(self) -> List[JournalEntry]:
+        pending: Dict[str, JournalEntry] = {}
+        try:
+            with open(self._path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash while a batch was being written can leave a partial last line.
+                        logger.warning("Skipping a malformed record in message journal %s", self._path)
+                        continue
+                    if record["op"] == "enqueued":
+                        entry = _decode_entry(record["entry"])
+                        pending[entry.message_id] = entry
+                    elif record["op"] == "delivered" and record["id"] in pending:
+                        pending[record["id"]].delivered = True
+                    elif record["op"] == "completed":
+                        pending.pop(record["id"], None)
+        except FileNotFoundError:
+            return []
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        temp_path = self._path.with_suffix(self._path.suffix + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as file:
+            for entry in pending.values():
+                file.write(json.dumps({"op": "enqueued", "entry": _encode_entry(entry)}) + "\n")
+                if entry.delivered:
+                    file.write(json.dumps({"op": "delivered", "id": entry.message_id}) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self._path)
+        return list(pending.values())
+
+    async def close(self) -> None:
+        await self.flush()
+        async with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,12 @@
+from enum import IntEnum
+
+
+class MessagePriority(IntEnum):
+    """The scheduling class of a sent or published message.
+
+    Runtimes that queue messages process the messages of a higher class first, and messages of the same class in
+    the order they were sent. Responses to sent messages are processed with :attr:`HIGH` priority."""
+
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
@@ -1,10 +1,15 @@
+import inspect
 import logging
-from functools import wraps
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial, wraps
 from typing import (
     Any,
+    Awaitable,
     Callable,
+    ClassVar,
     Coroutine,
     DefaultDict,
+    Dict,
     List,
     Literal,
     Protocol,
@@ -19,6 +24,7 @@
 )
 
 from ._base_agent import BaseAgent
+from ._handler_executors import HandlerExecutor, run_in_handler_executor
 from ._message_context import MessageContext
 from ._serialization import MessageSerializer, try_get_known_serializers_for_type
 from ._type_helpers import AnyType, get_types
@@ -48,6 +54,20 @@ class MessageHandler(Protocol[AgentT, ReceivesT, ProducesT]):  # type: ignore
     async def __call__(agent_instance: AgentT, message: ReceivesT, ctx: MessageContext) -> ProducesT: ...
 
 
+def _handler_body(func: Callable[..., Any], executor: HandlerExecutor | None) -> Callable[..., Awaitable[Any]]:
+    if executor is None:
+        return func
+    if inspect.iscoroutinefunction(func):
+        raise TypeError(f"Handler {func.__qualname__} runs in an executor, so it must be a regular function.")
+    if isinstance(executor, ProcessPoolExecutor):
+        # The handler is called with the agent, which would have to be pickled for every message.
+        raise TypeError(
+            f"Handler {func.__qualname__} cannot run in a ProcessPoolExecutor, because the agent cannot be pickled. "
+            'Use executor="thread" or a thread pool, and start processes from the handler if needed.'
+        )
+    return partial(run_in_handler_executor, executor, func)
+
+
 # NOTE: this works on concrete types and not inheritance
 # TODO: Use a protocol for the outer function to check checked arg names
 
@@ -82,16 +102,34 @@ def message_handler(
 ]: ...
 
 
+@overload
+def message_handler(
+    func: None = None,
+    *,
+    match: None | Callable[[ReceivesT, MessageContext], bool] = ...,
+    strict: bool = ...,
+    executor: HandlerExecutor,
+) -> Callable[
+    [Callable[[AgentT, ReceivesT, MessageContext], ProducesT]],
+    MessageHandler[AgentT, ReceivesT, ProducesT],
+]: ...
+
+
 def message_handler(
     func: None | Callable[[AgentT, ReceivesT, MessageContext], Coroutine[Any, Any, ProducesT]] = None,
     *,
     strict: bool = True,
     match: None | Callable[[ReceivesT, MessageContext], bool] = None,
+    executor: HandlerExecutor | None = None,
 ) -> (
     Callable[
         [Callable[[AgentT, ReceivesT, MessageContext], Coroutine[Any, Any, ProducesT]]],
         MessageHandler[AgentT, ReceivesT, ProducesT],
     ]
+    | Callable[
+        [Callable[[AgentT, ReceivesT, MessageContext], ProducesT]],
+        MessageHandler[AgentT, ReceivesT, ProducesT],
+    ]
     | MessageHandler[AgentT, ReceivesT, ProducesT]
 ):
     """Decorator for generic message handlers.
@@ -99,7 +137,7 @@ def message_handler(
     Add this decorator to methods in a :class:`RoutedAgent` class that are intended to handle both event and RPC messages.
     These methods must have a specific signature that needs to be followed for it to be valid:
 
-    - The method must be an `async` method.
+    - The method must be an `async` method, unless it runs in an ``executor``.
     - The method must be decorated with the `@message_handler` decorator.
     - The method must have exactly 3 arguments:
         1. `self`
@@ -113,6 +151,7 @@ def message_handler(
         func: The function to be decorated.
         strict: If `True`, the handler will raise an exception if the message type or return type is not in the target types. If `False`, it will log a warning instead.
         match: A function that takes the message and the context as arguments and returns a boolean. This is used for secondary routing after the message type. For handlers addressing the same message type, the match function is applied in alphabetical order of the handlers and the first matching handler will be called while the rest are skipped. If `None`, the first handler in alphabetical order matching the same message type will be called.
+        executor: Run the handler outside of the event loop, so that a handler that calls blocking or CPU-bound code does not stall the other agents. ``"thread"`` runs it in a thread pool managed by the runtime, and an :class:`~concurrent.futures.Executor` runs it in that executor. The handler must then be a regular function rather than an `async` method, and it cannot await the runtime. There is intentionally no ``"process"`` option, and a :class:`~concurrent.futures.ProcessPoolExecutor` raises a `TypeError`, because the handler runs with the agent, which cannot be pickled.
     """
 
     def decorator(
@@ -129,6 +168,8 @@ def decorator(
         target_types = get_types(type_hints["message"])
         if target_types is None:
             raise AssertionError("Message type not found")
+        # Subclasses of the target types are accepted, since the agent routes them to this handler.
+        target_classes = tuple(t for t in target_types if isinstance(t, type))
 
         # print(type_hints)
         return_types = get_types(type_hints["return"])
@@ -137,16 +178,17 @@ def decorator(
             raise AssertionError("Return type not found")
 
         # Convert target_types to list and stash
+        body: Callable[[AgentT, ReceivesT, MessageContext], Awaitable[ProducesT]] = _handler_body(func, executor)
 
         @wraps(func)
         async def wrapper(self: AgentT, message: ReceivesT, ctx: MessageContext) -> ProducesT:
-            if type(message) not in target_types:
+            if not isinstance(message, target_classes):
                 if strict:
                     raise CantHandleException(f"Message type {type(message)} not in target types {target_types}")
                 else:
                     logger.warning(f"Message type {type(message)} not in target types {target_types}")
 
-            return_value = await func(self, message, ctx)
+            return_value = await body(self, message, ctx)
 
             if AnyType not in return_types and type(return_value) not in return_types:
                 if strict:
@@ -202,16 +244,34 @@ def event(
 ]: ...
 
 
+@overload
+def event(
+    func: None = None,
+    *,
+    match: None | Callable[[ReceivesT, MessageContext], bool] = ...,
+    strict: bool = ...,
+    executor: HandlerExecutor,
+) -> Callable[
+    [Callable[[AgentT, ReceivesT, MessageContext], None]],
+    MessageHandler[AgentT, ReceivesT, None],
+]: ...
+
+
 def event(
     func: None | Callable[[AgentT, ReceivesT, MessageContext], Coroutine[Any, Any, None]] = None,
     *,
     strict: bool = True,
     match: None | Callable[[ReceivesT, MessageContext], bool] = None,
+    executor: HandlerExecutor | None = None,
 ) -> (
     Callable[
         [Callable[[AgentT, ReceivesT, MessageContext], Coroutine[Any, Any, None]]],
         MessageHandler[AgentT, ReceivesT, None],
     ]
+    | Callable[
+        [Callable[[AgentT, ReceivesT, MessageContext], None]],
+        MessageHandler[AgentT, ReceivesT, None],
+    ]
     | MessageHandler[AgentT, ReceivesT, None]
 ):
     """Decorator for event message handlers.
@@ -219,7 +279,7 @@ def event(
     Add this decorator to methods in a :class:`RoutedAgent` class that are intended to handle event messages.
     These methods must have a specific signature that needs to be followed for it to be valid:
 
-    - The method must be an `async` method.
+    - The method must be an `async` method, unless it runs in an ``executor``.
     - The method must be decorated with the `@message_handler` decorator.
     - The method must have exactly 3 arguments:
         1. `self`
@@ -233,6 +293,7 @@ def event(
         func: The function to be decorated.
         strict: If `True`, the handler will raise an exception if the message type is not in the target types. If `False`, it will log a warning instead.
         match: A function that takes the message and the context as arguments and returns a boolean. This is used for secondary routing after the message type. For handlers addressing the same message type, the match function is applied in alphabetical order of the handlers and the first matching handler will be called while the rest are skipped. If `None`, the first handler in alphabetical order matching the same message type will be called.
+        executor: Run the handler outside of the event loop, so that a handler that calls blocking or CPU-bound code does not stall the other agents. ``"thread"`` runs it in a thread pool managed by the runtime, and an :class:`~concurrent.futures.Executor` runs it in that executor. The handler must then be a regular function rather than an `async` method, and it cannot await the runtime. There is intentionally no ``"process"`` option, and a :class:`~concurrent.futures.ProcessPoolExecutor` raises a `TypeError`, because the handler runs with the agent, which cannot be pickled.
     """
 
     def decorator(
@@ -249,6 +310,8 @@ def decorator(
         target_types = get_types(type_hints["message"])
         if target_types is None:
             raise AssertionError("Message type not found. Please provide a type hint for the message parameter.")
+        # Subclasses of the target types are accepted, since the agent routes them to this handler.
+        target_classes = tuple(t for t in target_types if isinstance(t, type))
 
         return_types = get_types(type_hints["return"])
 
@@ -256,16 +319,17 @@ def decorator(
             raise AssertionError("Return type not found. Please use `None` as the type hint of the return type.")
 
         # Convert target_types to list and stash
+        body = _handler_body(func, executor)
 
         @wraps(func)
         async def wrapper(self: AgentT, message: ReceivesT, ctx: MessageContext) -> None:
-            if type(message) not in target_types:
+            if not isinstance(message, target_classes):
                 if strict:
                     raise CantHandleException(f"Message type {type(message)} not in target types {target_types}")
                 else:
                     logger.warning(f"Message type {type(message)} not in target types {target_types}")
 
-            return_value = await func(self, message, ctx)  # type: ignore
+            return_value = await body(self, message, ctx)
 
             if return_value is not None:
                 if strict:
@@ -322,16 +386,34 @@ def rpc(
 ]: ...
 
 
+@overload
+def rpc(
+    func: None = None,
+    *,
+    match: None | Callable[[ReceivesT, MessageContext], bool] = ...,
+    strict: bool = ...,
+    executor: HandlerExecutor,
+) -> Callable[
+    [Callable[[AgentT, ReceivesT, MessageContext], ProducesT]],
+    MessageHandler[AgentT, ReceivesT, ProducesT],
+]: ...
+
+
 def rpc(
     func: None | Callable[[AgentT, ReceivesT, MessageContext], Coroutine[Any, Any, ProducesT]] = None,
     *,
     strict: bool = True,
     match: None | Callable[[ReceivesT, MessageContext], bool] = None,
+    executor: HandlerExecutor | None = None,
 ) -> (
     Callable[
         [Callable[[AgentT, ReceivesT, MessageContext], Coroutine[Any, Any, ProducesT]]],
         MessageHandler[AgentT, ReceivesT, ProducesT],
     ]
+    | Callable[
+        [Callable[[AgentT, ReceivesT, MessageContext], ProducesT]],
+        MessageHandler[AgentT, ReceivesT, ProducesT],
+    ]
     | MessageHandler[AgentT, ReceivesT, ProducesT]
 ):
     """Decorator for RPC message handlers.
@@ -339,7 +421,7 @@ def rpc(
     Add this decorator to methods in a :class:`RoutedAgent` class that are intended to handle RPC messages.
     These methods must have a specific signature that needs to be followed for it to be valid:
 
-    - The method must be an `async` method.
+    - The method must be an `async` method, unless it runs in an ``executor``.
     - The method must be decorated with the `@message_handler` decorator.
     - The method must have exactly 3 arguments:
         1. `self`
@@ -353,6 +435,7 @@ def rpc(
         func: The function to be decorated.
         strict: If `True`, the handler will raise an exception if the message type or return type is not in the target types. If `False`, it will log a warning instead.
         match: A function that takes the message and the context as arguments and returns a boolean. This is used for secondary routing after the message type. For handlers addressing the same message type, the match function is applied in alphabetical order of the handlers and the first matching handler will be called while the rest are skipped. If `None`, the first handler in alphabetical order matching the same message type will be called.
+        executor: Run the handler outside of the event loop, so that a handler that calls blocking or CPU-bound code does not stall the other agents. ``"thread"`` runs it in a thread pool managed by the runtime, and an :class:`~concurrent.futures.Executor` runs it in that executor. The handler must then be a regular function rather than an `async` method, and it cannot await the runtime. There is intentionally no ``"process"`` option, and a :class:`~concurrent.futures.ProcessPoolExecutor` raises a `TypeError`, because the handler runs with the agent, which cannot be pickled.
     """
 
     def decorator(
@@ -369,6 +452,8 @@ def decorator(
         target_types = get_types(type_hints["message"])
         if target_types is None:
             raise AssertionError("Message type not found")
+        # Subclasses of the target types are accepted, since the agent routes them to this handler.
+        target_classes = tuple(t for t in target_types if isinstance(t, type))
 
         # print(type_hints)
         return_types = get_types(type_hints["return"])
@@ -377,16 +462,17 @@ def decorator(
             raise AssertionError("Return type not found")
 
         # Convert target_types to list and stash
+        body: Callable[[AgentT, ReceivesT, MessageContext], Awaitable[ProducesT]] = _handler_body(func, executor)
 
         @wraps(func)
         async def wrapper(self: AgentT, message: ReceivesT, ctx: MessageContext) -> ProducesT:
-            if type(message) not in target_types:
+            if not isinstance(message, target_classes):
                 if strict:
                     raise CantHandleException(f"Message type {type(message)} not in target types {target_types}")
                 else:
                     logger.warning(f"Message type {type(message)} not in target types {target_types}")
 
-            return_value = await func(self, message, ctx)
+            return_value = await body(self, message, ctx)
 
             if AnyType not in return_types and type(return_value) not in return_types:
                 if strict:
@@ -457,34 +543,48 @@ async def handle_special_rpc_message(self, message: MessageWithContent, ctx: Mes
                 return Response()
     """
 
-    def __init__(self, description: str) -> None:
-        # Self is already bound to the handlers
-        self._handlers: DefaultDict[
-            Type[Any],
-            List[MessageHandler[RoutedAgent, Any, Any]],
-        ] = DefaultDict(list)
+    # The handlers of each class by the message type they declare. Computed once per class and shared by its
+    # instances.
+    _handler_table: ClassVar[Dict[Type[Any], List[MessageHandler[Any, Any, Any]]]] = {}
+    # The handlers that apply to a message type, including the handlers of its base classes, by message type.
+    _resolved_handlers: ClassVar[Dict[Type[Any], Tuple[MessageHandler[Any, Any, Any], ...]]] = {}
 
-        handlers = self._discover_handlers()
-        for message_handler in handlers:
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        handler_table: DefaultDict[Type[Any], List[MessageHandler[Any, Any, Any]]] = DefaultDict(list)
+        for message_handler in cls._discover_handlers():
             for target_type in message_handler.target_types:
-                self._handlers[target_type].append(message_handler)
-
-        super().__init__(description)
+                handler_table[target_type].append(message_handler)
+        cls._handler_table = dict(handler_table)
+        cls._resolved_handlers = {}
 
     async def on_message_impl(self, message: Any, ctx: MessageContext) -> Any | None:
         """Handle a message by routing it to the appropriate message handler.
         Do not override this method in subclasses. Instead, add message handlers as methods decorated with
-        either the :func:`event` or :func:`rpc` decorator."""
+        either the :func:`event` or :func:`rpc` decorator.
+
+        Handlers for the type of the message come first, followed by the handlers for its base classes in method
+        resolution order. The first handler whose router accepts the message handles it."""
         key_type: Type[Any] = type(message)  # type: ignore
-        handlers = self._handlers.get(key_type)  # type: ignore
-        if handlers is not None:
-            # Iterate over all handlers for this matching message type.
-            # Call the first handler whose router returns True and then return the result.
-            for h in handlers:
-                if h.router(message, ctx):
-                    return await h(self, message, ctx)
+        handlers = self._resolved_handlers.get(key_type)
+        if handlers is None:
+            handlers = self._resolve_handlers(key_type)
+        for h in handlers:
+            if h.router(message, ctx):
+                return await h(self, message, ctx)
         return await self.on_unhandled_message(message, ctx)  # type: ignore
 
+    @classmethod
+    def _resolve_handlers(cls, message_type: Type[Any]) -> Tuple[MessageHandler[Any, Any, Any], ...]:
+        handlers: List[MessageHandler[Any, Any, Any]] = []
+        for base in message_type.__mro__:
+            for handler in cls._handler_table.get(base, ()):
+                if handler not in handlers:
+                    handlers.append(handler)
+        result = tuple(handlers)
+        cls._resolved_handlers[message_type] = result
+        return result
+
     async def on_unhandled_message(self, message: Any, ctx: MessageContext) -> None:
         """Called when a message is received that does not have a matching message handler.
         The default implementation logs an info message."""
@@ -1,11 +1,26 @@
-from collections import defaultdict
-from typing import Awaitable, Callable, DefaultDict, List, Set
+import asyncio
+import heapq
+import itertools
+import logging
+import sys
+import time
+from asyncio import CancelledError, Future, Task
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Coroutine, Deque, Dict, Iterator, List, Sequence, Set, Tuple, TypeVar, cast
 
 from ._agent import Agent
 from ._agent_id import AgentId
 from ._agent_type import AgentType
+from ._message_handler_context import MessageHandlerContext
 from ._subscription import Subscription
 from ._topic import TopicId
+from ._type_prefix_subscription import TypePrefixSubscription
+from ._type_subscription import TypeSubscription
+
+logger = logging.getLogger("autogen_core")
+
+T = TypeVar("T")
 
 
 async def get_impl(
@@ -29,46 +44,518 @@ async def get_impl(
     return id
 
 
-class SubscriptionManager:
+async def get_many_impl(
+    *,
+    type: AgentType | str,
+    keys: Sequence[str],
+    lazy: bool,
+    instance_getter: Callable[[AgentId], Awaitable[Agent]],
+) -> List[AgentId]:
+    type_str = type if isinstance(type, str) else type.type
+    ids = [AgentId(type_str, key) for key in keys]
+    if not lazy:
+        await asyncio.gather(*(instance_getter(id) for id in ids))
+    return ids
+
+
+def create_eager_task(coro: Coroutine[Any, Any, T]) -> Task[T]:
+    """Creates a task that starts running ``coro`` right away instead of on the next event loop iteration.
+
+    The coroutine runs inside the caller until it first has to wait, and a coroutine that finishes without
+    waiting is never scheduled at all. Uses :func:`asyncio.eager_task_factory` where it exists, which is Python
+    3.12 and later. Older versions create a regular task."""
+    loop = asyncio.get_running_loop()
+    if sys.version_info >= (3, 12):
+        return asyncio.eager_task_factory(loop, coro)
+    return loop.create_task(coro)
+
+
+def resolve_deadline(timeout: float | None) -> float | None:
+    """Returns the deadline of a message sent with ``timeout``, in seconds since the epoch.
+
+    A message sent while handling another message also has to meet the deadline of that message, so that nested
+    requests give up when the request that waits for them does."""
+    inherited = MessageHandlerContext.deadline()
+    if timeout is None:
+        return inherited
+    if timeout <= 0:
+        raise ValueError("timeout must be positive")
+    deadline = time.time() + timeout
+    return deadline if inherited is None else min(deadline, inherited)
+
+
+class AgentActivations:
+    """Makes concurrent requests for an agent that is not instantiated yet share a single construction.
+
+    The first caller runs the activation, and callers that arrive while it is in progress wait for its result
+    instead of constructing the agent again. If the activation fails, they all receive the same exception. If the
+    first caller is cancelled, one of the waiting callers runs the activation again.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[AgentId, Future[Agent]] = {}
+
+    async def activate(self, agent_id: AgentId, activation: Callable[[], Awaitable[Agent]]) -> Agent:
+        while (pending := self._pending.get(agent_id)) is not None:
+            try:
+                return await asyncio.shield(pending)
+            except CancelledError:
+                if not pending.cancelled():
+                    raise
+
+        future: Future[Agent] = asyncio.get_running_loop().create_future()
+        self._pending[agent_id] = future
+        try:
+            agent = await activation()
+        except CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # The exception is raised to this caller, so it must not be reported as never retrieved.
+            future.exception()
+            raise
+        finally:
+            del self._pending[agent_id]
+        future.set_result(agent)
+        return agent
+
+
+class _PrefixTrieNode:
+    __slots__ = ("children", "subscriptions")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _PrefixTrieNode] = {}
+        self.subscriptions: Dict[str, TypePrefixSubscription] = {}
+
+
+class _PrefixTrie:
+    """A character trie of :class:`TypePrefixSubscription` keyed by ``topic_type_prefix``.
+
+    Looking up the subscriptions matching a topic type walks the trie once along the topic type, so the cost
+    is bounded by the length of the topic type instead of the number of prefix subscriptions."""
+
     def __init__(self) -> None:
-        self._subscriptions: List[Subscription] = []
-        self._seen_topics: Set[TopicId] = set()
-        self._subscribed_recipients: DefaultDict[TopicId, List[AgentId]] = defaultdict(list)
+        self._root = _PrefixTrieNode()
+
+    def add(self, subscription: TypePrefixSubscription) -> None:
+        node = self._root
+        for char in subscription.topic_type_prefix:
+            node = node.children.setdefault(char, _PrefixTrieNode())
+        node.subscriptions[subscription.id] = subscription
+
+    def remove(self, subscription: TypePrefixSubscription) -> None:
+        path: List[Tuple[_PrefixTrieNode, str]] = []
+        node = self._root
+        for char in subscription.topic_type_prefix:
+            path.append((node, char))
+            node = node.children[char]
+        del node.subscriptions[subscription.id]
+        # Prune the branches that no longer lead to any subscription.
+        for parent, char in reversed(path):
+            child = parent.children[char]
+            if child.subscriptions or child.children:
+                break
+            del parent.children[char]
+
+    def matches(self, topic_type: str) -> Iterator[TypePrefixSubscription]:
+        node = self._root
+        yield from node.subscriptions.values()
+        for char in topic_type:
+            child = node.children.get(char)
+            if child is None:
+                return
+            node = child
+            yield from node.subscriptions.values()
+
+
+@dataclass
+class _ResolvedRecipients:
+    # Parallel lists: the subscription that produced each recipient is needed to patch the entry incrementally.
+    subscription_ids: List[str]
+    recipients: List[AgentId]
+
+
+def _is_indexable(subscription: Subscription, cls: type[TypeSubscription] | type[TypePrefixSubscription]) -> bool:
+    # Subclasses that override the matching logic cannot be indexed by their topic type and fall back to a scan.
+    return (
+        isinstance(subscription, cls)
+        and type(subscription).is_match is cls.is_match
+        and type(subscription).map_to_agent is cls.map_to_agent
+    )
+
+
+class SubscriptionManager:
+    """Resolves the recipients of a topic from the registered subscriptions.
+
+    :class:`TypeSubscription` instances are indexed by their exact topic type and :class:`TypePrefixSubscription`
+    instances are stored in a prefix trie, so resolving a topic does not scan every subscription. Any other
+    :class:`Subscription` implementation is checked with :meth:`Subscription.is_match`.
+
+    Resolved recipient lists are kept in a bounded LRU cache and are updated incrementally when subscriptions
+    are added or removed. Recipients are returned in the order their subscriptions were added.
+
+    Args:
+        max_cached_topics (int, optional): The maximum number of topics whose resolved recipients are cached. Defaults to 4096.
+    """
+
+    def __init__(self, *, max_cached_topics: int = 4096) -> None:
+        if max_cached_topics < 1:
+            raise ValueError("max_cached_topics must be at least 1")
+        self._max_cached_topics = max_cached_topics
+        # Subscription id -> subscription, in insertion order.
+        self._subscriptions: Dict[str, Subscription] = {}
+        self._sequence_numbers: Dict[str, int] = {}
+        self._next_sequence_number = 0
+        # topic_type -> {subscription id -> subscription}
+        self._type_index: Dict[str, Dict[str, TypeSubscription]] = {}
+        # (topic_type, agent_type) and (topic_type_prefix, agent_type) pairs used to detect duplicates.
+        self._type_keys: Set[Tuple[str, str]] = set()
+        self._prefix_keys: Set[Tuple[str, str]] = set()
+        self._prefix_trie = _PrefixTrie()
+        self._unindexed: Dict[str, Subscription] = {}
+        # LRU cache of resolved recipients and a topic_type -> cached topics index used to patch it.
+        self._resolved: OrderedDict[TopicId, _ResolvedRecipients] = OrderedDict()
+        self._resolved_by_type: Dict[str, Set[TopicId]] = {}
+
+    @property
+    def subscriptions(self) -> List[Subscription]:
+        """The registered subscriptions in the order they were added."""
+        return list(self._subscriptions.values())
 
     async def add_subscription(self, subscription: Subscription) -> None:
         # Check if the subscription already exists
-        if any(sub == subscription for sub in self._subscriptions):
+        if self._is_duplicate(subscription):
             raise ValueError("Subscription already exists")
 
-        self._subscriptions.append(subscription)
-        self._rebuild_subscriptions(self._seen_topics)
+        self._subscriptions[subscription.id] = subscription
+        self._sequence_numbers[subscription.id] = self._next_sequence_number
+        self._next_sequence_number += 1
+
+        if _is_indexable(subscription, TypeSubscription):
+            type_subscription = cast(TypeSubscription, subscription)
+            self._type_index.setdefault(type_subscription.topic_type, {})[subscription.id] = type_subscription
+            self._type_keys.add((type_subscription.topic_type, type_subscription.agent_type))
+        elif _is_indexable(subscription, TypePrefixSubscription):
+            prefix_subscription = cast(TypePrefixSubscription, subscription)
+            self._prefix_trie.add(prefix_subscription)
+            self._prefix_keys.add((prefix_subscription.topic_type_prefix, prefix_subscription.agent_type))
+        else:
+            self._unindexed[subscription.id] = subscription
+
+        # The new subscription has the highest sequence number, so its recipient goes last.
+        for topic in self._cached_topics_matching(subscription):
+            resolved = self._resolved[topic]
+            self._resolved[topic] = _ResolvedRecipients(
+                subscription_ids=[*resolved.subscription_ids, subscription.id],
+                recipients=[*resolved.recipients, subscription.map_to_agent(topic)],
+            )
 
     async def remove_subscription(self, id: str) -> None:
         # Check if the subscription exists
-        if not any(sub.id == id for sub in self._subscriptions):
+        subscription = self._subscriptions.pop(id, None)
+        if subscription is None:
             raise ValueError("Subscription does not exist")
+        del self._sequence_numbers[id]
 
-        def is_not_sub(x: Subscription) -> bool:
-            return x.id != id
-
-        self._subscriptions = list(filter(is_not_sub, self._subscriptions))
+        if id in self._unindexed:
+            del self._unindexed[id]
+        elif isinstance(subscription, TypePrefixSubscription):
+            self._prefix_trie.remove(subscription)
+            self._prefix_keys.discard((subscription.topic_type_prefix, subscription.agent_type))
+        elif isinstance(subscription, TypeSubscription):
+            subscriptions = self._type_index[subscription.topic_type]
+            del subscriptions[id]
+            if not subscriptions:
+                del self._type_index[subscription.topic_type]
+            self._type_keys.discard((subscription.topic_type, subscription.agent_type))
 
-        # Rebuild the subscriptions
-        self._rebuild_subscriptions(self._seen_topics)
+        for topic in self._cached_topics_matching(subscription):
+            resolved = self._resolved[topic]
+            if id not in resolved.subscription_ids:
+                continue
+            index = resolved.subscription_ids.index(id)
+            # Replace rather than mutate so that callers iterating a previously returned list are unaffected.
+            self._resolved[topic] = _ResolvedRecipients(
+                subscription_ids=resolved.subscription_ids[:index] + resolved.subscription_ids[index + 1 :],
+                recipients=resolved.recipients[:index] + resolved.recipients[index + 1 :],
+            )
 
     async def get_subscribed_recipients(self, topic: TopicId) -> List[AgentId]:
-        if topic not in self._seen_topics:
-            self._build_for_new_topic(topic)
-        return self._subscribed_recipients[topic]
-
-    # TODO: optimize this...
-    def _rebuild_subscriptions(self, topics: Set[TopicId]) -> None:
-        self._subscribed_recipients.clear()
-        for topic in topics:
-            self._build_for_new_topic(topic)
-
-    def _build_for_new_topic(self, topic: TopicId) -> None:
-        self._seen_topics.add(topic)
-        for subscription in self._subscriptions:
-            if subscription.is_match(topic):
-                self._subscribed_recipients[topic].append(subscription.map_to_agent(topic))
+        resolved = self._resolved.get(topic)
+        if resolved is not None:
+            self._resolved.move_to_end(topic)
+            return resolved.recipients
+
+        resolved = self._resolve(topic)
+        self._resolved[topic] = resolved
+        self._resolved_by_type.setdefault(topic.type, set()).add(topic)
+        if len(self._resolved) > self._max_cached_topics:
+            evicted, _ = self._resolved.popitem(last=False)
+            topics = self._resolved_by_type[evicted.type]
+            topics.discard(evicted)
+            if not topics:
+                del self._resolved_by_type[evicted.type]
+        return resolved.recipients
+
+    def _resolve(self, topic: TopicId) -> _ResolvedRecipients:
+        matches: List[Subscription] = list(self._type_index.get(topic.type, {}).values())
+        matches.extend(self._prefix_trie.matches(topic.type))
+        matches.extend(sub for sub in self._unindexed.values() if sub.is_match(topic))
+        if len(matches) > 1:
+            matches.sort(key=lambda sub: self._sequence_numbers[sub.id])
+        return _ResolvedRecipients(
+            subscription_ids=[sub.id for sub in matches],
+            recipients=[sub.map_to_agent(topic) for sub in matches],
+        )
+
+    def _cached_topics_matching(self, subscription: Subscription) -> List[TopicId]:
+        if _is_indexable(subscription, TypeSubscription):
+            return list(self._resolved_by_type.get(cast(TypeSubscription, subscription).topic_type, ()))
+        if _is_indexable(subscription, TypePrefixSubscription):
+            prefix = cast(TypePrefixSubscription, subscription).topic_type_prefix
+            return [
+                topic
+                for topic_type, topics in self._resolved_by_type.items()
+                if topic_type.startswith(prefix)
+                for topic in topics
+            ]
+        return [topic for topic in self._resolved if subscription.is_match(topic)]
+
+    def _is_duplicate(self, subscription: Subscription) -> bool:
+        if subscription.id in self._subscriptions:
+            return True
+        if _is_indexable(subscription, TypeSubscription):
+            type_subscription = cast(TypeSubscription, subscription)
+            if (type_subscription.topic_type, type_subscription.agent_type) in self._type_keys:
+                return True
+            return any(sub == subscription for sub in self._unindexed.values())
+        if _is_indexable(subscription, TypePrefixSubscription):
+            prefix_subscription = cast(TypePrefixSubscription, subscription)
+            if (prefix_subscription.topic_type_prefix, prefix_subscription.agent_type) in self._prefix_keys:
+                return True
+            return any(sub == subscription for sub in self._unindexed.values())
+        return any(sub == subscription for sub in self._subscriptions.values())
+
+
+class _Mailbox:
+    __slots__ = ("pending", "running")
+
+    def __init__(self) -> None:
+        self.pending: Deque[Tuple[Callable[[], Awaitable[Any]], Future[Any]]] = deque()
+        self.running = 0
+
+
+class AgentMailboxes:
+    """Limits how many messages each agent handles at the same time.
+
+    Agent types registered with a concurrency limit get one mailbox per agent id. A delivery to such an agent
+    starts right away while fewer than the limit are running, and otherwise waits in the agent's mailbox until a
+    running delivery finishes. Deliveries to one agent start in the order they were submitted, and a backlog for
+    one agent never delays deliveries to another. Agent types without a limit are not tracked.
+    """
+
+    def __init__(self) -> None:
+        self._limits: Dict[str, int] = {}
+        # Only agents with running or waiting deliveries have a mailbox.
+        self._mailboxes: Dict[AgentId, _Mailbox] = {}
+        self._tasks: Set[Task[Any]] = set()
+
+    def set_limit(self, agent_type: str, max_concurrency: int) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._limits[agent_type] = max_concurrency
+
+    def is_limited(self, agent_id: AgentId) -> bool:
+        return agent_id.type in self._limits
+
+    def backlog(self, agent_id: AgentId) -> int:
+        """The number of deliveries to the agent that are waiting for a free slot."""
+        mailbox = self._mailboxes.get(agent_id)
+        return len(mailbox.pending) if mailbox is not None else 0
+
+    def submit(self, agent_id: AgentId, delivery: Callable[[], Awaitable[Any]]) -> Future[Any]:
+        """Schedules ``delivery`` to run once the agent has a free slot.
+
+        Returns a future that resolves to the result of the delivery. Cancelling the future before the delivery
+        starts removes it from the mailbox."""
+        future: Future[Any] = asyncio.get_running_loop().create_future()
+        mailbox = self._mailboxes.get(agent_id)
+        if mailbox is None:
+            mailbox = self._mailboxes[agent_id] = _Mailbox()
+        mailbox.pending.append((delivery, future))
+        self._dispatch(agent_id, mailbox)
+        return future
+
+    def _dispatch(self, agent_id: AgentId, mailbox: _Mailbox) -> None:
+        limit = self._limits[agent_id.type]
+        while mailbox.pending and mailbox.running < limit:
+            delivery, future = mailbox.pending.popleft()
+            if future.done():
+                continue
+            mailbox.running += 1
+            task = asyncio.create_task(self._run(agent_id, mailbox, delivery, future))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        if mailbox.running == 0 and not mailbox.pending:
+            del self._mailboxes[agent_id]
+
+    async def _run(
+        self,
+        agent_id: AgentId,
+        mailbox: _Mailbox,
+        delivery: Callable[[], Awaitable[Any]],
+        future: Future[Any],
+    ) -> None:
+        try:
+            result = await delivery()
+            if not future.done():
+                future.set_result(result)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+        finally:
+            mailbox.running -= 1
+            self._dispatch(agent_id, mailbox)
+
+
+class Timer:
+    __slots__ = ("when", "callback", "args", "pending")
+
+    def __init__(self, when: float, callback: Callable[..., None], args: Tuple[Any, ...]) -> None:
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.pending = True
+
+
+class TimerHeap:
+    """Runs callbacks at event loop times with a single event loop timer for all of them.
+
+    Pending timers are kept in a heap ordered by their deadline, and only the earliest deadline is registered with
+    the event loop. When it fires, every timer that is due runs and the next deadline is registered. Thousands of
+    pending timers cost a heap entry each instead of a sleeping task each. Cancelled timers stay in the heap until
+    they come due, unless they make up most of it.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, Timer]] = []
+        self._sequence = itertools.count()
+        self._pending = 0
+        self._handle: asyncio.TimerHandle | None = None
+        self._armed_when = 0.0
+
+    def __len__(self) -> int:
+        """The number of timers that have neither run nor been cancelled."""
+        return self._pending
+
+    def call_at(self, when: float, callback: Callable[..., None], *args: Any) -> Timer:
+        """Runs ``callback(*args)`` once the event loop time reaches ``when``."""
+        timer = Timer(when, callback, args)
+        heapq.heappush(self._heap, (when, next(self._sequence), timer))
+        self._pending += 1
+        self._arm()
+        return timer
+
+    def cancel(self, timer: Timer) -> None:
+        """Cancels a timer. Does nothing if it has already run or been cancelled."""
+        if not timer.pending:
+            return
+        timer.pending = False
+        self._pending -= 1
+        if len(self._heap) > 64 and self._pending < len(self._heap) // 2:
+            self._heap = [entry for entry in self._heap if entry[2].pending]
+            heapq.heapify(self._heap)
+        self._arm()
+
+    def clear(self) -> None:
+        """Cancels every pending timer."""
+        for _, _, timer in self._heap:
+            timer.pending = False
+        self._heap.clear()
+        self._pending = 0
+        self._arm()
+
+    def _arm(self) -> None:
+        while self._heap and not self._heap[0][2].pending:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            if self._handle is not None:
+                self._handle.cancel()
+                self._handle = None
+            return
+        when = self._heap[0][0]
+        if self._handle is not None:
+            if self._armed_when == when:
+                return
+            self._handle.cancel()
+        self._armed_when = when
+        self._handle = asyncio.get_running_loop().call_at(when, self._run_due)
+
+    def _run_due(self) -> None:
+        self._handle = None
+        # The event loop may run a timer slightly before its deadline, so the armed deadline counts as due.
+        now = max(asyncio.get_running_loop().time(), self._armed_when)
+        try:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, timer = heapq.heappop(self._heap)
+                if not timer.pending:
+                    continue
+                timer.pending = False
+                self._pending -= 1
+                try:
+                    timer.callback(*timer.args)
+                except Exception:
+                    logger.exception("Error in scheduled callback")
+        finally:
+            self._arm()
+
+
+class RecentMessageIds:
+    """Remembers the message ids each agent has recently received, to detect duplicate deliveries.
+
+    Ids are kept in two generations of sets. New ids go into the current generation, and a lookup checks both.
+    The current generation becomes the previous one, and the previous one is forgotten, once the current one is
+    ``window`` seconds old or holds ``max_ids`` ids. An id is therefore always recognized while it is among both
+    the ids of the last ``window`` seconds and the last ``max_ids`` ids, and at most ``2 * max_ids`` ids are
+    kept. Unlike a bloom filter, a message is never mistaken for a duplicate.
+    """
+
+    def __init__(self, window: float, max_ids: int) -> None:
+        if window <= 0:
+            raise ValueError("window must be positive")
+        if max_ids < 1:
+            raise ValueError("max_ids must be at least 1")
+        self._window = window
+        self._max_ids = max_ids
+        self._current: Set[Tuple[AgentId, str]] = set()
+        self._previous: Set[Tuple[AgentId, str]] = set()
+        self._started = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._current) + len(self._previous)
+
+    def seen(self, recipient: AgentId, message_id: str) -> bool:
+        """Returns whether ``recipient`` has recently received ``message_id``. It is not remembered until
+        :meth:`add` is called, so that a message that was never handled can be retried."""
+        now = time.monotonic()
+        if now - self._started >= self._window or len(self._current) >= self._max_ids:
+            # After a quiet period longer than two windows, the current generation is stale as well.
+            self._previous = self._current if now - self._started < 2 * self._window else set()
+            self._current = set()
+            self._started = now
+        key = (recipient, message_id)
+        return key in self._current or key in self._previous
+
+    def add(self, recipient: AgentId, message_id: str) -> None:
+        """Remembers that ``recipient`` received ``message_id``."""
+        self._current.add((recipient, message_id))
+
+    def discard(self, recipient: AgentId, message_id: str) -> None:
+        """Forgets that ``recipient`` received ``message_id``, because its handler did not complete."""
+        key = (recipient, message_id)
+        self._current.discard(key)
+        self._previous.discard(key)
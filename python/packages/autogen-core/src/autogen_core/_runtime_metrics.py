@@ -0,0 +1,206 @@
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Tuple
+
+from opentelemetry.metrics import CallbackOptions, MeterProvider, Observation
+
+__all__ = [
+    "HistogramSnapshot",
+    "RuntimeMetrics",
+    "RuntimeMetricsRecorder",
+]
+
+# Upper bounds of the latency buckets in seconds, doubling from 10 microseconds to about 84 seconds.
+LATENCY_BOUNDS: Tuple[float, ...] = tuple(0.00001 * 2**index for index in range(24))
+# Upper bounds of the publish fan-out buckets in recipients.
+FANOUT_BOUNDS: Tuple[float, ...] = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+@dataclass(frozen=True)
+class HistogramSnapshot:
+    """The buckets of a histogram at one point in time.
+
+    ``counts[i]`` is the number of values up to ``bounds[i]`` and above the previous bound. The last count is the
+    number of values above the last bound."""
+
+    bounds: Tuple[float, ...]
+    counts: Tuple[int, ...]
+    count: int
+    """The number of recorded values."""
+    total: float
+    """The sum of the recorded values."""
+    max: float
+    """The largest recorded value, or 0 if there is none."""
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Returns an upper bound of the ``q`` quantile (between 0 and 1): the upper bound of the bucket that holds
+        it, or :attr:`max` if that is smaller."""
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts, strict=False):
+            seen += count
+            if seen >= rank and seen > 0:
+                return min(bound, self.max)
+        return self.max
+
+
+class _Histogram:
+    __slots__ = ("_bounds", "_counts", "_count", "_total", "_max")
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def record(self, value: float) -> None:
+        self._counts[bisect_left(self._bounds, value)] += 1
+        self._count += 1
+        self._total += value
+        if value > self._max:
+            self._max = value
+
+    def snapshot(self) -> HistogramSnapshot:
+        return HistogramSnapshot(
+            bounds=self._bounds, counts=tuple(self._counts), count=self._count, total=self._total, max=self._max
+        )
+
+
+@dataclass(frozen=True)
+class RuntimeMetrics:
+    """A snapshot of the aggregate metrics of an agent runtime, returned by its ``metrics()`` method."""
+
+    seconds: float
+    """The time covered by the counters, since the runtime was created."""
+    queue_depth: int
+    """Messages waiting to be handled."""
+    active_agents: int
+    """Agent instances held in memory."""
+    queue_wait: HistogramSnapshot
+    """Seconds from queuing a sent or published message to the start of its handling."""
+    handler_duration: Mapping[Tuple[str, str], HistogramSnapshot]
+    """Seconds spent in message handlers, by agent type and message type name."""
+    publish_fanout: HistogramSnapshot
+    """The number of recipients of each published message."""
+    dropped_messages: Mapping[str, int]
+    """Messages that were not delivered, by reason: ``"queue_full"``, ``"duplicate"``, ``"intervention"`` or
+    ``"expired"``."""
+
+    def handled_messages(self, agent_type: str | None = None) -> int:
+        """The number of messages handled by agents of ``agent_type``, or by all agents."""
+        return sum(
+            histogram.count
+            for (handled_by, _), histogram in self.handler_duration.items()
+            if agent_type is None or handled_by == agent_type
+        )
+
+    def busiest_agent_types(self, limit: int = 10) -> List[Tuple[str, float]]:
+        """The agent types that spent the most time in their handlers, with that time in seconds."""
+        busy: Dict[str, float] = {}
+        for (agent_type, _), histogram in self.handler_duration.items():
+            busy[agent_type] = busy.get(agent_type, 0.0) + histogram.total
+        return sorted(busy.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+class RuntimeMetricsRecorder:
+    """Keeps the counters and histograms behind :class:`RuntimeMetrics` for a runtime.
+
+    Recording a value costs a bucket search and a few additions. When a ``meter_provider`` is given, the values are
+    also recorded to OpenTelemetry instruments, and the queue depth and active agent count are reported as
+    observable gauges using the given callbacks.
+    """
+
+    def __init__(
+        self,
+        meter_provider: MeterProvider | None,
+        name: str,
+        *,
+        queue_depth: Callable[[], int],
+        active_agents: Callable[[], int],
+    ) -> None:
+        self._started = time.perf_counter()
+        self._queue_depth = queue_depth
+        self._active_agents = active_agents
+        self._queue_wait = _Histogram(LATENCY_BOUNDS)
+        self._handler_duration: Dict[Tuple[str, str], _Histogram] = {}
+        self._publish_fanout = _Histogram(FANOUT_BOUNDS)
+        self._dropped: Dict[str, int] = {}
+        self._otel = meter_provider is not None
+        if meter_provider is None:
+            return
+        meter = meter_provider.get_meter(f"autogen {name}")
+        self._otel_queue_wait = meter.create_histogram(
+            "autogen.runtime.queue.wait", unit="s", description="Time from queuing a message to handling it."
+        )
+        self._otel_handler_duration = meter.create_histogram(
+            "autogen.runtime.handler.duration", unit="s", description="Time spent in message handlers."
+        )
+        self._otel_publish_fanout = meter.create_histogram(
+            "autogen.runtime.publish.fanout", unit="{recipient}", description="Recipients of a published message."
+        )
+        self._otel_dropped = meter.create_counter(
+            "autogen.runtime.messages.dropped", unit="{message}", description="Messages that were not delivered."
+        )
+        meter.create_observable_gauge(
+            "autogen.runtime.queue.depth",
+            callbacks=[self._observe_queue_depth],
+            unit="{message}",
+            description="Messages waiting to be handled.",
+        )
+        meter.create_observable_gauge(
+            "autogen.runtime.agents.active",
+            callbacks=[self._observe_active_agents],
+            unit="{agent}",
+            description="Agent instances held in memory.",
+        )
+
+    def _observe_queue_depth(self, options: CallbackOptions) -> Iterable[Observation]:
+        return [Observation(self._queue_depth())]
+
+    def _observe_active_agents(self, options: CallbackOptions) -> Iterable[Observation]:
+        return [Observation(self._active_agents())]
+
+    def record_queue_wait(self, seconds: float) -> None:
+        self._queue_wait.record(seconds)
+        if self._otel:
+            self._otel_queue_wait.record(seconds)
+
+    def record_handler(self, agent_type: str, message_type: str, seconds: float) -> None:
+        key = (agent_type, message_type)
+        histogram = self._handler_duration.get(key)
+        if histogram is None:
+            histogram = self._handler_duration[key] = _Histogram(LATENCY_BOUNDS)
+        histogram.record(seconds)
+        if self._otel:
+            self._otel_handler_duration.record(seconds, {"agent_type": agent_type, "message_type": message_type})
+
+    def record_fanout(self, recipients: int) -> None:
+        self._publish_fanout.record(recipients)
+        if self._otel:
+            self._otel_publish_fanout.record(recipients)
+
+    def record_dropped(self, reason: str, count: int = 1) -> None:
+        self._dropped[reason] = self._dropped.get(reason, 0) + count
+        if self._otel:
+            self._otel_dropped.add(count, {"reason": reason})
+
+    def snapshot(self) -> RuntimeMetrics:
+        return RuntimeMetrics(
+            seconds=time.perf_counter() - self._started,
+            queue_depth=self._queue_depth(),
+            active_agents=self._active_agents(),
+            queue_wait=self._queue_wait.snapshot(),
+            handler_duration={key: histogram.snapshot() for key, histogram in self._handler_duration.items()},
+            publish_fanout=self._publish_fanout.snapshot(),
+            dropped_messages=dict(self._dropped),
+        )
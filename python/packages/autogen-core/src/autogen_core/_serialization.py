@@ -1,13 +1,35 @@
 import json
 from dataclasses import asdict, dataclass, fields
-from typing import Any, ClassVar, Dict, List, Protocol, Sequence, TypeVar, cast, get_args, get_origin, runtime_checkable
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Protocol,
+    Sequence,
+    Tuple,
+    TypeVar,
+    cast,
+    get_args,
+    get_origin,
+    get_type_hints,
+    runtime_checkable,
+)
 
 from google.protobuf import any_pb2
 from google.protobuf.message import Message
 from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
 
 from ._type_helpers import is_union
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 T = TypeVar("T")
 
 
@@ -89,6 +111,36 @@ def has_nested_base_model_in_type(tp: Any) -> bool:
     return False
 
 
+JSON_NATIVE_TYPES: Tuple[type, ...] = (str, int, float, bool, type(None))
+MSGPACK_NATIVE_TYPES: Tuple[type, ...] = (*JSON_NATIVE_TYPES, bytes)
+
+
+def is_json_native_type(tp: Any, native_types: Tuple[type, ...] = JSON_NATIVE_TYPES) -> bool:
+    """Whether values of the type are their own JSON representation, so that ``asdict`` would not change them.
+
+    Containers count only if their item types are known and JSON native. ``Any``, bare containers and other types
+    could hold a dataclass, so they do not count. ``native_types`` are the scalar types the format has.
+    """
+    if isinstance(tp, type) and issubclass(tp, native_types):
+        return True
+    origin = get_origin(tp)
+    args = get_args(tp)
+    if origin is Literal:
+        return True
+    if origin in (list, tuple, dict) and args:
+        return all(arg is Ellipsis or is_json_native_type(arg, native_types) for arg in args)
+    return False
+
+
+def has_json_native_fields(cls: type[IsDataclass], native_types: Tuple[type, ...] = JSON_NATIVE_TYPES) -> bool:
+    try:
+        hints = get_type_hints(cls)
+    except Exception:
+        # Unresolvable forward references: let asdict handle whatever the fields hold.
+        return False
+    return all(is_json_native_type(hints[f.name], native_types) for f in fields(cls))
+
+
 DataclassT = TypeVar("DataclassT", bound=IsDataclass)
 
 JSON_DATA_CONTENT_TYPE = "application/json"
@@ -98,18 +150,46 @@ def has_nested_base_model_in_type(tp: Any) -> bool:
 PROTOBUF_DATA_CONTENT_TYPE = "application/x-protobuf"
 """Protobuf data content type"""
 
+MSGPACK_DATA_CONTENT_TYPE = "application/vnd.msgpack"
+"""MessagePack data content type"""
 
-class DataclassJsonMessageSerializer(MessageSerializer[DataclassT]):
-    def __init__(self, cls: type[DataclassT]) -> None:
-        if contains_a_union(cls):
-            raise ValueError("Dataclass has a union type, which is not supported. To use a union, use a Pydantic model")
+MSGPACK_IMPORT_ERROR_STR = (
+    "MessagePack serialization requires the msgpack package. Install it with: pip install autogen-core[msgpack]"
+)
 
-        if has_nested_dataclass(cls) or has_nested_base_model(cls):
-            raise ValueError(
-                "Dataclass has nested dataclasses or base models, which are not supported. To use nested types, use a Pydantic model"
-            )
+BINARY_SERIALIZATION_CONTEXT: Dict[str, Any] = {"binary": True}
+"""The context that binary serializers dump Pydantic models with.
 
+Types with a custom Pydantic serializer can check for ``binary`` in the context to return raw bytes instead of
+base64 text. :class:`~autogen_core.Image` does this.
+"""
+
+
+def _check_dataclass(cls: type[IsDataclass]) -> None:
+    if contains_a_union(cls):
+        raise ValueError("Dataclass has a union type, which is not supported. To use a union, use a Pydantic model")
+
+    if has_nested_dataclass(cls) or has_nested_base_model(cls):
+        raise ValueError(
+            "Dataclass has nested dataclasses or base models, which are not supported. To use nested types, use a Pydantic model"
+        )
+
+
+def _msgpack_default(value: Any) -> Any:
+    # Values msgpack has no type for, such as datetimes, UUIDs, enums and sets, are packed as their JSON form,
+    # which Pydantic validates back into the field type.
+    return to_jsonable_python(value)
+
+
+class DataclassJsonMessageSerializer(MessageSerializer[DataclassT]):
+    def __init__(self, cls: type[DataclassT]) -> None:
+        _check_dataclass(cls)
         self.cls = cls
+        self._type_name = _type_name(cls)
+        # For flat dataclasses a shallow dict of the fields is what asdict would return, without the deep copy.
+        self._field_names: Tuple[str, ...] | None = (
+            tuple(f.name for f in fields(cls)) if has_json_native_fields(cls) else None
+        )
 
     @property
     def data_content_type(self) -> str:
@@ -117,14 +197,16 @@ def data_content_type(self) -> str:
 
     @property
     def type_name(self) -> str:
-        return _type_name(self.cls)
+        return self._type_name
 
     def deserialize(self, payload: bytes) -> DataclassT:
-        message_str = payload.decode("utf-8")
-        return self.cls(**json.loads(message_str))
+        # json.loads accepts bytes, but detecting their encoding makes it slower than decoding them first.
+        return self.cls(**json.loads(payload.decode("utf-8")))
 
     def serialize(self, message: DataclassT) -> bytes:
-        return json.dumps(asdict(message)).encode("utf-8")
+        if self._field_names is None:
+            return json.dumps(asdict(message)).encode("utf-8")
+        return json.dumps({name: getattr(message, name) for name in self._field_names}).encode("utf-8")
 
 
 PydanticT = TypeVar("PydanticT", bound=BaseModel)
@@ -133,6 +215,9 @@ def serialize(self, message: DataclassT) -> bytes:
 class PydanticJsonMessageSerializer(MessageSerializer[PydanticT]):
     def __init__(self, cls: type[PydanticT]) -> None:
         self.cls = cls
+        self._type_name = _type_name(cls)
+        # The compiled validator that model_validate_json uses; it reads bytes directly.
+        self._validator = cls.__pydantic_validator__
 
     @property
     def data_content_type(self) -> str:
@@ -140,14 +225,79 @@ def data_content_type(self) -> str:
 
     @property
     def type_name(self) -> str:
-        return _type_name(self.cls)
+        return self._type_name
+
+    def deserialize(self, payload: bytes) -> PydanticT:
+        return cast(PydanticT, self._validator.validate_json(payload))
+
+    def serialize(self, message: PydanticT) -> bytes:
+        # What model_dump_json does, without decoding the JSON bytes to a str. The serializer of the message's own
+        # class is used so that subclasses keep their fields, as with model_dump_json.
+        return message.__pydantic_serializer__.to_json(message)
+
+
+class DataclassMsgpackMessageSerializer(MessageSerializer[DataclassT]):
+    """Serializes a dataclass to MessagePack. Fields can hold raw ``bytes``, which JSON cannot."""
+
+    def __init__(self, cls: type[DataclassT]) -> None:
+        if msgpack is None:
+            raise ImportError(MSGPACK_IMPORT_ERROR_STR)
+        _check_dataclass(cls)
+        self.cls = cls
+        self._type_name = _type_name(cls)
+        self._field_names: Tuple[str, ...] | None = (
+            tuple(f.name for f in fields(cls)) if has_json_native_fields(cls, MSGPACK_NATIVE_TYPES) else None
+        )
+
+    @property
+    def data_content_type(self) -> str:
+        return MSGPACK_DATA_CONTENT_TYPE
+
+    @property
+    def type_name(self) -> str:
+        return self._type_name
+
+    def deserialize(self, payload: bytes) -> DataclassT:
+        # Unlike JSON, MessagePack keeps the type of non-str dict keys, such as those of a ``Dict[int, str]``.
+        return self.cls(**msgpack.unpackb(payload, strict_map_key=False))
+
+    def serialize(self, message: DataclassT) -> bytes:
+        if self._field_names is None:
+            return cast(bytes, msgpack.packb(asdict(message), default=_msgpack_default))
+        return cast(
+            bytes,
+            msgpack.packb({name: getattr(message, name) for name in self._field_names}, default=_msgpack_default),
+        )
+
+
+class PydanticMsgpackMessageSerializer(MessageSerializer[PydanticT]):
+    """Serializes a Pydantic model to MessagePack.
+
+    The model is dumped in Python mode with :data:`BINARY_SERIALIZATION_CONTEXT`, so ``bytes`` fields and images stay
+    raw bytes instead of becoming base64 text.
+    """
+
+    def __init__(self, cls: type[PydanticT]) -> None:
+        if msgpack is None:
+            raise ImportError(MSGPACK_IMPORT_ERROR_STR)
+        self.cls = cls
+        self._type_name = _type_name(cls)
+        self._validator = cls.__pydantic_validator__
+
+    @property
+    def data_content_type(self) -> str:
+        return MSGPACK_DATA_CONTENT_TYPE
+
+    @property
+    def type_name(self) -> str:
+        return self._type_name
 
     def deserialize(self, payload: bytes) -> PydanticT:
-        message_str = payload.decode("utf-8")
-        return self.cls.model_validate_json(message_str)
+        return cast(PydanticT, self._validator.validate_python(msgpack.unpackb(payload, strict_map_key=False)))
 
     def serialize(self, message: PydanticT) -> bytes:
-        return message.model_dump_json().encode("utf-8")
+        value = message.__pydantic_serializer__.to_python(message, context=BINARY_SERIALIZATION_CONTEXT)
+        return cast(bytes, msgpack.packb(value, default=_msgpack_default))
 
 
 ProtobufT = TypeVar("ProtobufT", bound=Message)
@@ -157,6 +307,10 @@ def serialize(self, message: PydanticT) -> bytes:
 class ProtobufMessageSerializer(MessageSerializer[ProtobufT]):
     def __init__(self, cls: type[ProtobufT]) -> None:
         self.cls = cls
+        self._type_name = _type_name(cls)
+        # What Any.Pack would put in type_url, and what Any.Unpack checks it against.
+        self._full_name = cls.DESCRIPTOR.full_name
+        self._type_url = f"type.googleapis.com/{self._full_name}"
 
     @property
     def data_content_type(self) -> str:
@@ -164,24 +318,22 @@ def data_content_type(self) -> str:
 
     @property
     def type_name(self) -> str:
-        return _type_name(self.cls)
+        return self._type_name
 
     def deserialize(self, payload: bytes) -> ProtobufT:
         # Parse payload into a proto any
-        any_proto = any_pb2.Any()
-        any_proto.ParseFromString(payload)
-
-        destination_message = self.cls()
-
-        if not any_proto.Unpack(destination_message):  # type: ignore
+        any_proto = any_pb2.Any.FromString(payload)
+        prefix, _, full_name = any_proto.type_url.rpartition("/")
+        if not prefix or full_name != self._full_name:
             raise ValueError(f"Failed to unpack payload into {self.cls}")
 
-        return destination_message
+        return self.cls.FromString(any_proto.value)
 
     def serialize(self, message: ProtobufT) -> bytes:
-        any_proto = any_pb2.Any()
-        any_proto.Pack(message)  # type: ignore
-        return any_proto.SerializeToString()
+        type_url = (
+            self._type_url if type(message) is self.cls else f"type.googleapis.com/{message.DESCRIPTOR.full_name}"
+        )
+        return any_pb2.Any(type_url=type_url, value=message.SerializeToString()).SerializeToString()
 
 
 @dataclass
@@ -207,8 +359,12 @@ def try_get_known_serializers_for_type(cls: type[Any]) -> list[MessageSerializer
     serializers: List[MessageSerializer[Any]] = []
     if issubclass(cls, BaseModel):
         serializers.append(PydanticJsonMessageSerializer(cls))
+        if msgpack is not None:
+            serializers.append(PydanticMsgpackMessageSerializer(cls))
     elif is_dataclass(cls):
         serializers.append(DataclassJsonMessageSerializer(cls))
+        if msgpack is not None:
+            serializers.append(DataclassMsgpackMessageSerializer(cls))
     elif issubclass(cls, Message):
         serializers.append(ProtobufMessageSerializer(cls))
 
@@ -221,6 +377,8 @@ class SerializationRegistry:
     def __init__(self) -> None:
         # type_name, data_content_type -> serializer
         self._serializers: dict[tuple[str, str], MessageSerializer[Any]] = {}
+        # message class, data_content_type -> type_name, serializer; filled as messages are serialized.
+        self._by_type: dict[tuple[type, str], tuple[str, MessageSerializer[Any]]] = {}
 
     def add_serializer(self, serializer: MessageSerializer[Any] | Sequence[MessageSerializer[Any]]) -> None:
         if isinstance(serializer, Sequence):
@@ -229,6 +387,7 @@ def add_serializer(self, serializer: MessageSerializer[Any] | Sequence[MessageSe
             return
 
         self._serializers[(serializer.type_name, serializer.data_content_type)] = serializer
+        self._by_type.clear()
 
     def deserialize(self, payload: bytes, *, type_name: str, data_content_type: str) -> Any:
         serializer = self._serializers.get((type_name, data_content_type))
@@ -244,8 +403,75 @@ def serialize(self, message: Any, *, type_name: str, data_content_type: str) ->
 
         return serializer.serialize(message)
 
+    def serialize_message(self, message: Any, *, data_content_type: str) -> tuple[str, bytes]:
+        """Serializes a message under the type name of its class and returns the type name and the payload.
+
+        The same as :meth:`type_name` followed by :meth:`serialize`, with one lookup by class per message.
+        """
+        cls = type(message)
+        entry = self._by_type.get((cls, data_content_type))
+        if entry is None:
+            type_name = _type_name(message)
+            serializer = self._serializers.get((type_name, data_content_type))
+            if serializer is None:
+                raise ValueError(f"Unknown type {type_name} with content type {data_content_type}")
+            entry = (type_name, serializer)
+            # A class passed as the message is named after itself, not after its metaclass.
+            if not isinstance(message, type):
+                self._by_type[(cls, data_content_type)] = entry
+        type_name, serializer = entry
+        return type_name, serializer.serialize(message)
+
     def is_registered(self, type_name: str, data_content_type: str) -> bool:
         return (type_name, data_content_type) in self._serializers
 
     def type_name(self, message: Any) -> str:
         return _type_name(message)
+
+
+class LazyPayload:
+    """A message together with its serialized forms, each computed the first time it is needed.
+
+    The runtimes keep one per message in flight, so that event logging, the message journal and forwarding to
+    other processes share a single serialization of the message. A message received in serialized form can be
+    given its payload up front with ``payloads``. The cached payloads assume that the message is not changed
+    after it was sent.
+
+    :meta private:
+    """
+
+    __slots__ = ("message", "_registry", "_payloads", "_text")
+
+    def __init__(
+        self,
+        message: Any,
+        registry: SerializationRegistry,
+        *,
+        payloads: Mapping[str, tuple[str, bytes]] | None = None,
+    ) -> None:
+        self.message = message
+        self._registry = registry
+        # data_content_type -> type_name, payload
+        self._payloads: dict[str, tuple[str, bytes]] = {} if payloads is None else dict(payloads)
+        self._text: str | None = None
+
+    def serialize(self, data_content_type: str) -> tuple[str, bytes]:
+        """Returns the type name and the payload of the message in ``data_content_type``.
+
+        Raises:
+            ValueError: If no serializer for the message's type and ``data_content_type`` is registered.
+        """
+        payload = self._payloads.get(data_content_type)
+        if payload is None:
+            payload = self._registry.serialize_message(self.message, data_content_type=data_content_type)
+            self._payloads[data_content_type] = payload
+        return payload
+
+    def text(self) -> str:
+        """Returns the JSON payload of the message as text, for logging."""
+        if self._text is None:
+            try:
+                self._text = self.serialize(JSON_DATA_CONTENT_TYPE)[1].decode("utf-8")
+            except ValueError:
+                self._text = "Message could not be serialized"
+        return self._text
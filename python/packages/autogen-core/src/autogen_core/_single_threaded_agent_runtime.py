@@ -2,15 +2,37 @@
 
 import asyncio
 import inspect
+import itertools
 import logging
 import sys
+import time
 import uuid
 import warnings
 from asyncio import CancelledError, Future, Queue, Task
+from collections import OrderedDict, deque
 from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable, Dict, List, Mapping, ParamSpec, Set, Type, TypeVar, cast
+from datetime import datetime
+from functools import partial
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    ParamSpec,
+    Set,
+    Type,
+    TypeVar,
+    cast,
+)
 
+from opentelemetry.metrics import MeterProvider
 from opentelemetry.trace import TracerProvider
 
 from .logging import (
@@ -33,18 +55,39 @@
 from ._agent_id import AgentId
 from ._agent_instantiation import AgentInstantiationContext
 from ._agent_metadata import AgentMetadata
+from ._agent_state_store import AgentStateStore, InMemoryAgentStateStore
 from ._agent_runtime import AgentRuntime
 from ._agent_type import AgentType
 from ._cancellation_token import CancellationToken
-from ._intervention import DropMessage, InterventionHandler
+from ._handler_executors import HandlerExecutors, HandlerExecutorStats
+from ._intervention import DropMessage, InterventionHandler, InterventionPipeline
 from ._message_context import MessageContext
 from ._message_handler_context import MessageHandlerContext
-from ._runtime_impl_helpers import SubscriptionManager, get_impl
-from ._serialization import JSON_DATA_CONTENT_TYPE, MessageSerializer, SerializationRegistry
+from ._message_journal import JournalEntry, MessageJournal
+from ._message_priority import MessagePriority
+from ._runtime_impl_helpers import (
+    AgentActivations,
+    AgentMailboxes,
+    RecentMessageIds,
+    SubscriptionManager,
+    Timer,
+    TimerHeap,
+    create_eager_task,
+    get_impl,
+    get_many_impl,
+    resolve_deadline,
+)
+from ._runtime_metrics import RuntimeMetrics, RuntimeMetricsRecorder
+from ._serialization import JSON_DATA_CONTENT_TYPE, LazyPayload, MessageSerializer, SerializationRegistry
 from ._subscription import Subscription
 from ._telemetry import EnvelopeMetadata, MessageRuntimeTracingConfig, TraceHelper, get_telemetry_envelope_metadata
 from ._topic import TopicId
-from .exceptions import MessageDroppedException
+from .exceptions import (
+    MessageDroppedException,
+    MessageMutatedException,
+    MessageQueueFullException,
+    MessageTimeoutException,
+)
 
 logger = logging.getLogger("autogen_core")
 event_logger = logging.getLogger("autogen_core.events")
@@ -65,6 +108,9 @@ class PublishMessageEnvelope:
     topic_id: TopicId
     metadata: EnvelopeMetadata | None = None
     message_id: str
+    priority: MessagePriority = MessagePriority.NORMAL
+    enqueued_at: float = 0.0
+    payload: LazyPayload | None = None
 
 
 @dataclass(kw_only=True)
@@ -79,6 +125,10 @@ class SendMessageEnvelope:
     cancellation_token: CancellationToken
     metadata: EnvelopeMetadata | None = None
     message_id: str
+    priority: MessagePriority = MessagePriority.NORMAL
+    deadline: float | None = None
+    enqueued_at: float = 0.0
+    payload: LazyPayload | None = None
 
 
 @dataclass(kw_only=True)
@@ -90,6 +140,80 @@ class ResponseMessageEnvelope:
     sender: AgentId
     recipient: AgentId | None
     metadata: EnvelopeMetadata | None = None
+    priority: MessagePriority = MessagePriority.HIGH
+    enqueued_at: float = 0.0
+    payload: LazyPayload | None = None
+
+
+_Envelope = PublishMessageEnvelope | SendMessageEnvelope | ResponseMessageEnvelope
+
+# How many messages the message loop dispatches between two yields to the event loop with eager tasks.
+_EAGER_YIELD_INTERVAL = 16
+
+
+class _PriorityLanes:
+    """The storage of the runtime's message queue, with one FIFO lane per :class:`MessagePriority`.
+
+    Envelopes are taken from the highest priority lane that is not empty. A waiting envelope is taken anyway once
+    it has been passed over ``starvation_limit`` times in a row, so that a steady stream of higher priority
+    messages cannot starve the lower priority ones."""
+
+    def __init__(self, starvation_limit: int) -> None:
+        # Ordered from the highest to the lowest priority.
+        self._lanes: List[Deque[_Envelope]] = [deque() for _ in MessagePriority]
+        self._skipped = [0] * len(self._lanes)
+        self._starvation_limit = starvation_limit
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[_Envelope]:
+        return itertools.chain.from_iterable(self._lanes)
+
+    def append(self, envelope: _Envelope) -> None:
+        envelope.enqueued_at = time.perf_counter()
+        self._lanes[MessagePriority.HIGH - envelope.priority].append(envelope)
+        self._size += 1
+
+    def popleft(self) -> _Envelope:
+        chosen = -1
+        for index, lane in enumerate(self._lanes):
+            if not lane:
+                continue
+            if chosen < 0:
+                chosen = index
+            elif self._skipped[index] >= self._starvation_limit:
+                chosen = index
+                break
+        if chosen < 0:
+            raise IndexError("pop from an empty queue")
+        for index in range(chosen + 1, len(self._lanes)):
+            if self._lanes[index]:
+                self._skipped[index] += 1
+        self._skipped[chosen] = 0
+        self._size -= 1
+        return self._lanes[chosen].popleft()
+
+    def remove_oldest(self, predicate: Callable[[_Envelope], bool]) -> _Envelope | None:
+        """Removes the oldest matching envelope of the lowest priority that has one."""
+        for lane in reversed(self._lanes):
+            for index, envelope in enumerate(lane):
+                if predicate(envelope):
+                    del lane[index]
+                    self._size -= 1
+                    return envelope
+        return None
+
+
+class _PriorityMessageQueue(Queue[_Envelope]):
+    def __init__(self, starvation_limit: int) -> None:
+        super().__init__()
+        # The base class only uses append, popleft, len and iteration on its storage.
+        self._queue = _PriorityLanes(starvation_limit)  # type: ignore
+
+    def remove_oldest(self, predicate: Callable[[_Envelope], bool]) -> _Envelope | None:
+        return self._queue.remove_oldest(predicate)  # type: ignore
 
 
 P = ParamSpec("P")
@@ -103,11 +227,14 @@ def __init__(self, runtime: SingleThreadedAgentRuntime) -> None:
         self._stopped = asyncio.Event()
 
     async def _run(self) -> None:
+        # The handler tasks are created from this task, so they inherit the runtime's executors.
+        self._runtime._handler_executors.set_current()  # type: ignore
         while True:
             if self._stopped.is_set():
                 return
 
             await self._runtime._process_next()  # type: ignore
+            self._runtime._progress.set()  # type: ignore
 
     async def stop(self) -> None:
         self._stopped.set()
@@ -121,50 +248,210 @@ async def stop_when_idle(self) -> None:
         await self._run_task
 
     async def stop_when(self, condition: Callable[[], bool], check_period: float = 1.0) -> None:
-        async def check_condition() -> None:
-            while not condition():
-                await asyncio.sleep(check_period)
-            await self.stop()
+        # Conditions usually depend on what the agents did, so the condition is checked whenever a message is
+        # dispatched or a handler finishes, and every check_period seconds in case it depends on anything else.
+        progress: asyncio.Event = self._runtime._progress  # type: ignore
+        while not condition():
+            progress.clear()
+            try:
+                await asyncio.wait_for(progress.wait(), check_period)
+            except asyncio.TimeoutError:
+                pass
+        await self.stop()
 
-        await asyncio.create_task(check_condition())
 
+@dataclass(frozen=True)
+class AgentPassivationStats:
+    """A snapshot of the agent passivation counters of a :class:`SingleThreadedAgentRuntime`."""
 
-def _warn_if_none(value: Any, handler_name: str) -> None:
-    """
-    Utility function to check if the intervention handler returned None and issue a warning.
+    active_agents: int
+    """Agent instances currently held in memory."""
+    peak_active_agents: int
+    """The largest number of agent instances held in memory at once."""
+    passivated_agents: int
+    """Agents whose state is currently held in the state store instead of memory."""
+    passivations: int
+    """Agents evicted from memory so far."""
+    reactivations: int
+    """Agents recreated from a stored state so far."""
+    passivation_seconds: float
+    """Total time spent saving the state of evicted agents."""
+    reactivation_seconds: float
+    """Total time spent loading the state of recreated agents."""
+
+
+def _batch_message_types(messages: Sequence[Any]) -> str:
+    return ",".join(sorted({type(message).__name__ for message in messages}))
 
-    Args:
-        value: The return value to check
-        handler_name: Name of the intervention handler method for the warning message
-    """
-    if value is None:
-        warnings.warn(
-            f"Intervention handler {handler_name} returned None. This might be unintentional. "
-            "Consider returning the original message or DropMessage explicitly.",
-            RuntimeWarning,
-            stacklevel=2,
-        )
+
+def _batch_message_ids(messages: Sequence[Any], message_ids: Sequence[str] | None) -> Sequence[str]:
+    if message_ids is None:
+        # One random prefix per batch keeps the ids unique without generating a UUID per message.
+        batch_id = uuid.uuid4()
+        return [f"{batch_id}-{index}" for index in range(len(messages))]
+    if len(message_ids) != len(messages):
+        raise ValueError(f"Expected {len(messages)} message ids, got {len(message_ids)}.")
+    return message_ids
+
+
+def _set_result_unless_done(future: Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
 
 
 class SingleThreadedAgentRuntime(AgentRuntime):
+    """A single-threaded agent runtime that processes all messages using a single asyncio queue.
+
+    Args:
+        intervention_handlers (List[InterventionHandler], optional): A list of intervention
+            handlers that can intercept messages before they are sent or published. Defaults to None.
+        tracer_provider (TracerProvider, optional): The tracer provider to use for tracing. Defaults to None.
+        meter_provider (MeterProvider, optional): Also export the aggregate metrics of :meth:`metrics` as
+            OpenTelemetry instruments of this meter provider. Defaults to None.
+        log_events (bool, optional): Whether to emit message events to the ``autogen_core.events`` logger.
+            Events are only built when that logger is enabled for ``INFO``, and message payloads are only
+            serialized when a handler formats the event. Set to ``False`` to skip the event pipeline
+            entirely. Defaults to True.
+        max_queue_size (int, optional): The maximum number of sent and published messages waiting in the
+            message queue. Zero or less means unbounded. Responses to sent messages are always admitted, so
+            that work already in progress can complete. Defaults to 0.
+        queue_full_policy (Literal["block", "drop_oldest", "reject"], optional): What to do with a new message
+            when the queue is full. ``"block"`` makes ``send_message`` and ``publish_message`` wait for space.
+            ``"drop_oldest"`` drops the oldest queued published message of the lowest priority to make room,
+            and drops the new message if it is a published message and none is queued; sent messages are never
+            dropped. ``"reject"`` raises :class:`~autogen_core.exceptions.MessageQueueFullException`. Dropped messages are logged as
+            :class:`~autogen_core.logging.MessageDroppedEvent`. Defaults to "block".
+        starvation_limit (int, optional): Messages are processed in order of their
+            :class:`~autogen_core.MessagePriority`, and in the order they were sent within a priority. A waiting
+            message is processed anyway once messages of a higher priority have been processed ahead of it this
+            many times in a row. Defaults to 32.
+        max_active_agents (int, optional): The maximum number of agent instances kept in memory. When a new
+            agent is created beyond the limit, the least recently used agents that are not handling a message
+            are passivated: their state is saved to ``agent_state_store`` and the instance is closed and
+            dropped. The next message for a passivated agent recreates it with its factory and loads the saved
+            state. Zero or less means unlimited. Defaults to 0.
+        agent_idle_timeout (float, optional): Passivate agents that have not handled a message for this many
+            seconds. Idle agents are checked whenever the runtime fetches an agent. Defaults to None, which
+            keeps idle agents in memory.
+        agent_state_store (AgentStateStore, optional): Where passivated agents keep their state. Agents created
+            while passivation is enabled load any state the store holds for their id. Defaults to an
+            :class:`~autogen_core.InMemoryAgentStateStore`.
+        message_journal (MessageJournal, optional): A write-ahead journal that records every sent and published
+            message when it is queued, delivered and completed, so that :meth:`replay_journal` can resume the
+            undelivered work after a crash. Journaled messages must have a serializer registered with the
+            runtime. Defaults to None.
+        dedup_window (float, optional): Drop a sent or published message if its recipient has already received a
+            message with the same ``message_id`` within this many seconds, so that a sender can retry with the
+            same id without the message being handled twice. A message that an intervention handler dropped, or
+            whose handler raised an exception, does not count as received and can be retried. Dropped duplicates
+            are logged as :class:`~autogen_core.logging.MessageDroppedEvent`, and a duplicate sent message raises
+            :class:`~autogen_core.exceptions.MessageDroppedException` to its sender. Defaults to None, which
+            delivers every message.
+        dedup_max_ids (int, optional): Remember at least this many and at most twice as many recent message ids
+            when ``dedup_window`` is set. Older ids are forgotten early if more messages arrive within the window.
+            Defaults to 100000.
+        eager_tasks (bool, optional): Start handling each message eagerly. The handler runs right away, inside
+            the message loop, until it first has to wait, and a handler that finishes without waiting never costs
+            an event loop iteration. Responses to sent messages are resolved inside the message loop. This speeds
+            up agents whose handlers are short, but a handler that runs for long without waiting delays the
+            dispatch of the following messages until it waits. The message loop also yields to other tasks only
+            every few messages instead of after each one. Eager tasks need Python 3.12; older versions start
+            handlers as regular tasks. Defaults to False.
+        handler_threads (int, optional): The number of threads that run the handlers declared with
+            ``executor="thread"``, such as ``@message_handler(executor="thread")``. The pool is created when the
+            first of them runs and shut down by :meth:`close`. Defaults to the default size of a
+            :class:`~concurrent.futures.ThreadPoolExecutor`.
+        check_message_immutability (bool, optional): Raise
+            :class:`~autogen_core.exceptions.MessageMutatedException` from a handler that changes the message it
+            handled. Messages are passed to handlers by reference and serialized at most once per content type,
+            for event logging, the message journal and other processes, so they must not be changed once sent
+            or published. The check compares the JSON payload of the message before and after each handler,
+            which costs two serializations per delivery, so it is meant for tests and debugging. Messages without
+            a JSON serializer are not checked. Defaults to False.
+    """
+
     def __init__(
         self,
         *,
         intervention_handlers: List[InterventionHandler] | None = None,
         tracer_provider: TracerProvider | None = None,
+        meter_provider: MeterProvider | None = None,
+        log_events: bool = True,
+        max_queue_size: int = 0,
+        queue_full_policy: Literal["block", "drop_oldest", "reject"] = "block",
+        starvation_limit: int = 32,
+        max_active_agents: int = 0,
+        agent_idle_timeout: float | None = None,
+        agent_state_store: AgentStateStore | None = None,
+        message_journal: MessageJournal | None = None,
+        dedup_window: float | None = None,
+        dedup_max_ids: int = 100_000,
+        eager_tasks: bool = False,
+        handler_threads: int | None = None,
+        check_message_immutability: bool = False,
     ) -> None:
+        if agent_idle_timeout is not None and agent_idle_timeout <= 0:
+            raise ValueError("agent_idle_timeout must be positive")
+        if queue_full_policy not in ("block", "drop_oldest", "reject"):
+            raise ValueError(f"Unknown queue full policy: {queue_full_policy}")
+        if starvation_limit < 1:
+            raise ValueError("starvation_limit must be at least 1")
         self._tracer_helper = TraceHelper(tracer_provider, MessageRuntimeTracingConfig("SingleThreadedAgentRuntime"))
-        self._message_queue: Queue[PublishMessageEnvelope | SendMessageEnvelope | ResponseMessageEnvelope] = Queue()
+        self._starvation_limit = starvation_limit
+        self._message_queue = _PriorityMessageQueue(starvation_limit)
         # (namespace, type) -> List[AgentId]
         self._agent_factories: Dict[
             str, Callable[[], Agent | Awaitable[Agent]] | Callable[[AgentRuntime, AgentId], Agent | Awaitable[Agent]]
         ] = {}
-        self._instantiated_agents: Dict[AgentId, Agent] = {}
-        self._intervention_handlers = intervention_handlers
+        self._instantiated_agents: OrderedDict[AgentId, Agent] = OrderedDict()
+        self._agent_activations = AgentActivations()
+        self._interventions = None if intervention_handlers is None else InterventionPipeline(intervention_handlers)
         self._background_tasks: Set[Task[Any]] = set()
         self._subscription_manager = SubscriptionManager()
         self._run_context: RunContext | None = None
         self._serialization_registry = SerializationRegistry()
+        self._log_events = log_events
+        self._max_queue_size = max_queue_size
+        self._queue_full_policy = queue_full_policy
+        self._queue_space_available = asyncio.Event()
+        self._queue_high_watermark = 0
+        self._mailboxes = AgentMailboxes()
+        self._max_active_agents = max_active_agents
+        self._agent_idle_timeout = agent_idle_timeout
+        self._passivation_enabled = max_active_agents > 0 or agent_idle_timeout is not None
+        self._agent_state_store = InMemoryAgentStateStore() if agent_state_store is None else agent_state_store
+        self._agent_last_used: Dict[AgentId, float] = {}
+        self._agents_in_use: Dict[AgentId, int] = {}
+        self._passivating_agents: Set[AgentId] = set()
+        self._passivated_agents: Set[AgentId] = set()
+        self._peak_active_agents = 0
+        self._passivations = 0
+        self._reactivations = 0
+        self._passivation_seconds = 0.0
+        self._reactivation_seconds = 0.0
+        self._message_journal = message_journal
+        # Set whenever a message is dispatched or a handler finishes, so that stop_when checks its condition.
+        self._progress = asyncio.Event()
+        self._timers = TimerHeap()
+        self._due_envelopes: List[PublishMessageEnvelope] = []
+        self._due_task: Task[None] | None = None
+        self._timed_out_messages = 0
+        self._recent_message_ids = None if dedup_window is None else RecentMessageIds(dedup_window, dedup_max_ids)
+        self._duplicate_messages = 0
+        self._eager_tasks = eager_tasks
+        self._dispatched_messages = 0
+        self._handler_executors = HandlerExecutors(handler_threads)
+        self._check_message_immutability = check_message_immutability
+        self._metrics = RuntimeMetricsRecorder(
+            meter_provider,
+            "SingleThreadedAgentRuntime",
+            # Stopping the runtime replaces the queue, so look it up on every read.
+            queue_depth=lambda: self._message_queue.qsize(),
+            active_agents=lambda: len(self._instantiated_agents),
+        )
+        self._create_task: Callable[[Coroutine[Any, Any, Any]], Task[Any]] = (
+            create_eager_task if eager_tasks else asyncio.create_task
+        )
 
     @property
     def unprocessed_messages_count(
@@ -172,6 +459,55 @@ def unprocessed_messages_count(
     ) -> int:
         return self._message_queue.qsize()
 
+    @property
+    def queue_high_watermark(self) -> int:
+        """The largest number of messages that have been waiting in the message queue at once."""
+        return self._queue_high_watermark
+
+    @property
+    def timed_out_messages_count(self) -> int:
+        """The number of sent messages that got no response before their deadline."""
+        return self._timed_out_messages
+
+    @property
+    def duplicate_messages_count(self) -> int:
+        """The number of deliveries dropped because the recipient had already received the message id."""
+        return self._duplicate_messages
+
+    @property
+    def scheduled_messages_count(self) -> int:
+        """The number of scheduled messages that are not due yet. A periodic schedule counts as one message."""
+        return len(self._timers)
+
+    @property
+    def handler_executor_stats(self) -> HandlerExecutorStats:
+        """Counters of the handlers that ran outside of the event loop, including how long they waited for a
+        thread."""
+        return self._handler_executors.stats
+
+    @property
+    def passivation_stats(self) -> AgentPassivationStats:
+        """Counters that show how much memory passivation saves and how much latency it adds."""
+        return AgentPassivationStats(
+            active_agents=len(self._instantiated_agents),
+            peak_active_agents=self._peak_active_agents,
+            passivated_agents=len(self._passivated_agents),
+            passivations=self._passivations,
+            reactivations=self._reactivations,
+            passivation_seconds=self._passivation_seconds,
+            reactivation_seconds=self._reactivation_seconds,
+        )
+
+    def metrics(self) -> RuntimeMetrics:
+        """Returns a snapshot of the aggregate metrics of the runtime: the queue depth, how long messages wait in the
+        queue, how long handlers take by agent type and message type, the fan-out of published messages, dropped
+        messages and the number of active agents."""
+        return self._metrics.snapshot()
+
+    @property
+    def _event_logging_enabled(self) -> bool:
+        return self._log_events and event_logger.isEnabledFor(logging.INFO)
+
     @property
     def _known_agent_names(self) -> Set[str]:
         return set(self._agent_factories.keys())
@@ -185,22 +521,28 @@ async def send_message(
         sender: AgentId | None = None,
         cancellation_token: CancellationToken | None = None,
         message_id: str | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        timeout: float | None = None,
     ) -> Any:
+        deadline = resolve_deadline(timeout)
         if cancellation_token is None:
             cancellation_token = CancellationToken()
 
         if message_id is None:
             message_id = str(uuid.uuid4())
 
-        event_logger.info(
-            MessageEvent(
-                payload=self._try_serialize(message),
-                sender=sender,
-                receiver=recipient,
-                kind=MessageKind.DIRECT,
-                delivery_stage=DeliveryStage.SEND,
+        payload: LazyPayload | None = None
+        if self._event_logging_enabled:
+            payload = LazyPayload(message, self._serialization_registry)
+            event_logger.info(
+                MessageEvent(
+                    payload=payload.text,
+                    sender=sender,
+                    receiver=recipient,
+                    kind=MessageKind.DIRECT,
+                    delivery_stage=DeliveryStage.SEND,
+                )
             )
-        )
 
         with self._tracer_helper.trace_block(
             "create",
@@ -212,10 +554,11 @@ async def send_message(
             if recipient.type not in self._known_agent_names:
                 future.set_exception(Exception("Recipient not found"))
 
-            content = message.__dict__ if hasattr(message, "__dict__") else message
-            logger.info(f"Sending message of type {type(message).__name__} to {recipient.type}: {content}")
+            if logger.isEnabledFor(logging.INFO):
+                content = message.__dict__ if hasattr(message, "__dict__") else message
+                logger.info("Sending message of type %s to %s: %s", type(message).__name__, recipient.type, content)
 
-            await self._message_queue.put(
+            await self._enqueue(
                 SendMessageEnvelope(
                     message=message,
                     recipient=recipient,
@@ -224,8 +567,13 @@ async def send_message(
                     sender=sender,
                     metadata=get_telemetry_envelope_metadata(),
                     message_id=message_id,
+                    priority=priority,
+                    deadline=deadline,
+                    payload=payload,
                 )
             )
+            if deadline is not None and not future.done():
+                self._expire_at(future, deadline)
 
             cancellation_token.link_future(future)
 
@@ -239,24 +587,73 @@ async def publish_message(
         sender: AgentId | None = None,
         cancellation_token: CancellationToken | None = None,
         message_id: str | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
     ) -> None:
+        await self._publish(
+            message,
+            topic_id,
+            sender=sender,
+            cancellation_token=cancellation_token,
+            message_id=message_id,
+            priority=priority,
+        )
+
+    async def _publish(
+        self,
+        message: Any,
+        topic_id: TopicId,
+        *,
+        sender: AgentId | None,
+        cancellation_token: CancellationToken | None,
+        message_id: str | None,
+        priority: MessagePriority,
+        payload: LazyPayload | None = None,
+    ) -> None:
+        """Publishes ``message``, sharing ``payload`` with whoever else serializes the message."""
         with self._tracer_helper.trace_block(
             "create",
             topic_id,
             parent=None,
             extraAttributes={"message_type": type(message).__name__},
         ):
-            if cancellation_token is None:
-                cancellation_token = CancellationToken()
+            await self._enqueue(
+                self._publish_envelope(
+                    message,
+                    topic_id,
+                    sender=sender,
+                    cancellation_token=cancellation_token,
+                    message_id=message_id,
+                    priority=priority,
+                    payload=payload,
+                )
+            )
+
+    def _publish_envelope(
+        self,
+        message: Any,
+        topic_id: TopicId,
+        *,
+        sender: AgentId | None,
+        cancellation_token: CancellationToken | None,
+        message_id: str | None,
+        priority: MessagePriority,
+        payload: LazyPayload | None = None,
+    ) -> PublishMessageEnvelope:
+        if cancellation_token is None:
+            cancellation_token = CancellationToken()
+        if logger.isEnabledFor(logging.INFO):
             content = message.__dict__ if hasattr(message, "__dict__") else message
-            logger.info(f"Publishing message of type {type(message).__name__} to all subscribers: {content}")
+            logger.info("Publishing message of type %s to all subscribers: %s", type(message).__name__, content)
 
-            if message_id is None:
-                message_id = str(uuid.uuid4())
+        if message_id is None:
+            message_id = str(uuid.uuid4())
 
+        if self._event_logging_enabled:
+            if payload is None:
+                payload = LazyPayload(message, self._serialization_registry)
             event_logger.info(
                 MessageEvent(
-                    payload=self._try_serialize(message),
+                    payload=payload.text,
                     sender=sender,
                     receiver=topic_id,
                     kind=MessageKind.PUBLISH,
@@ -264,21 +661,381 @@ async def publish_message(
                 )
             )
 
-            await self._message_queue.put(
-                PublishMessageEnvelope(
-                    message=message,
-                    cancellation_token=cancellation_token,
+        return PublishMessageEnvelope(
+            message=message,
+            cancellation_token=cancellation_token,
+            sender=sender,
+            topic_id=topic_id,
+            metadata=get_telemetry_envelope_metadata(),
+            message_id=message_id,
+            priority=priority,
+            payload=payload,
+        )
+
+    async def send_messages(
+        self,
+        messages: Sequence[Any],
+        recipient: AgentId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_ids: Sequence[str] | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        timeout: float | None = None,
+    ) -> List[Any]:
+        if not messages:
+            return []
+        if cancellation_token is None:
+            cancellation_token = CancellationToken()
+        message_ids = _batch_message_ids(messages, message_ids)
+
+        with self._tracer_helper.trace_block(
+            "create",
+            recipient,
+            parent=None,
+            extraAttributes={"message_type": _batch_message_types(messages), "batch_size": len(messages)},
+        ):
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Sending %d messages of type %s to %s",
+                    len(messages),
+                    _batch_message_types(messages),
+                    recipient.type,
+                )
+            loop = asyncio.get_running_loop()
+            deadline = resolve_deadline(timeout)
+            recipient_exists = recipient.type in self._known_agent_names
+            metadata = get_telemetry_envelope_metadata()
+            futures: List[Future[Any]] = []
+            envelopes: List[_Envelope] = []
+            for index, message in enumerate(messages):
+                payload: LazyPayload | None = None
+                if self._event_logging_enabled:
+                    payload = LazyPayload(message, self._serialization_registry)
+                    event_logger.info(
+                        MessageEvent(
+                            payload=payload.text,
+                            sender=sender,
+                            receiver=recipient,
+                            kind=MessageKind.DIRECT,
+                            delivery_stage=DeliveryStage.SEND,
+                        )
+                    )
+                future = loop.create_future()
+                if not recipient_exists:
+                    future.set_exception(Exception("Recipient not found"))
+                futures.append(future)
+                envelopes.append(
+                    SendMessageEnvelope(
+                        message=message,
+                        recipient=recipient,
+                        future=future,
+                        cancellation_token=cancellation_token,
+                        sender=sender,
+                        metadata=metadata,
+                        message_id=message_ids[index],
+                        priority=priority,
+                        deadline=deadline,
+                        payload=payload,
+                    )
+                )
+
+            await self._enqueue_many(envelopes)
+            if deadline is not None:
+                for future in futures:
+                    self._expire_at(future, deadline)
+            for future in futures:
+                cancellation_token.link_future(future)
+
+            return list(await asyncio.gather(*futures))
+
+    async def publish_messages(
+        self,
+        messages: Sequence[Any],
+        topic_id: TopicId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_ids: Sequence[str] | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+    ) -> None:
+        await self._publish_many(
+            messages,
+            topic_id,
+            sender=sender,
+            cancellation_token=cancellation_token,
+            message_ids=message_ids,
+            priority=priority,
+        )
+
+    async def _publish_many(
+        self,
+        messages: Sequence[Any],
+        topic_id: TopicId,
+        *,
+        sender: AgentId | None,
+        cancellation_token: CancellationToken | None,
+        message_ids: Sequence[str] | None,
+        priority: MessagePriority,
+        payloads: Sequence[LazyPayload] | None = None,
+    ) -> None:
+        """Publishes ``messages``, sharing ``payloads`` with whoever else serializes the messages."""
+        if not messages:
+            return
+        if cancellation_token is None:
+            cancellation_token = CancellationToken()
+        message_ids = _batch_message_ids(messages, message_ids)
+
+        with self._tracer_helper.trace_block(
+            "create",
+            topic_id,
+            parent=None,
+            extraAttributes={"message_type": _batch_message_types(messages), "batch_size": len(messages)},
+        ):
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Publishing %d messages of type %s to all subscribers",
+                    len(messages),
+                    _batch_message_types(messages),
+                )
+            metadata = get_telemetry_envelope_metadata()
+            envelopes: List[_Envelope] = []
+            for index, message in enumerate(messages):
+                payload = payloads[index] if payloads is not None else None
+                if self._event_logging_enabled:
+                    if payload is None:
+                        payload = LazyPayload(message, self._serialization_registry)
+                    event_logger.info(
+                        MessageEvent(
+                            payload=payload.text,
+                            sender=sender,
+                            receiver=topic_id,
+                            kind=MessageKind.PUBLISH,
+                            delivery_stage=DeliveryStage.SEND,
+                        )
+                    )
+                envelopes.append(
+                    PublishMessageEnvelope(
+                        message=message,
+                        cancellation_token=cancellation_token,
+                        sender=sender,
+                        topic_id=topic_id,
+                        metadata=metadata,
+                        message_id=message_ids[index],
+                        priority=priority,
+                        payload=payload,
+                    )
+                )
+
+            await self._enqueue_many(envelopes)
+
+    async def publish_message_at(
+        self,
+        message: Any,
+        topic_id: TopicId,
+        when: datetime,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_id: str | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+    ) -> None:
+        """Publish a message at a given time. Returns once the message is scheduled.
+
+        The message joins the message queue when it is due, so it is subject to the queue limits and priorities
+        like any other message, and :meth:`stop_when_idle` does not wait for messages that are not due yet.
+        Cancelling ``cancellation_token`` before the message is due cancels it.
+
+        Args:
+            message (Any): The message to publish.
+            topic_id (TopicId): The topic to publish the message to.
+            when (datetime): When to publish the message. Naive datetimes are in local time. Times in the past
+                publish the message right away.
+            sender (AgentId, optional): The agent which sent the message. Defaults to None.
+            cancellation_token (CancellationToken, optional): Token used to cancel the scheduled message. Defaults to None.
+            message_id (str, optional): The message id. If None, a new message id will be generated.
+            priority (MessagePriority, optional): The priority of the message. Defaults to ``MessagePriority.NORMAL``.
+        """
+        await self.publish_message_after(
+            message,
+            topic_id,
+            when.timestamp() - time.time(),
+            sender=sender,
+            cancellation_token=cancellation_token,
+            message_id=message_id,
+            priority=priority,
+        )
+
+    async def publish_message_after(
+        self,
+        message: Any,
+        topic_id: TopicId,
+        delay: float,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_id: str | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+    ) -> None:
+        """Publish a message after ``delay`` seconds. Returns once the message is scheduled.
+
+        See :meth:`publish_message_at` for how scheduled messages are delivered and cancelled.
+        """
+        if cancellation_token is None:
+            self._timers.call_at(
+                asyncio.get_running_loop().time() + max(delay, 0.0),
+                self._publish_due,
+                message,
+                topic_id,
+                sender,
+                None,
+                message_id,
+                priority,
+            )
+            return
+        token = cancellation_token
+
+        def publish() -> None:
+            # The token may outlive the schedule, so it must not keep the timer alive.
+            remove_callback()
+            self._publish_due(message, topic_id, sender, token, message_id, priority)
+
+        timer = self._timers.call_at(asyncio.get_running_loop().time() + max(delay, 0.0), publish)
+        remove_callback = token.add_callback(partial(self._timers.cancel, timer))
+
+    async def publish_message_every(
+        self,
+        message: Any,
+        topic_id: TopicId,
+        interval: float,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        start_after: float | None = None,
+    ) -> None:
+        """Publish a message every ``interval`` seconds until ``cancellation_token`` is cancelled or the runtime is
+        closed. Returns once the first message is scheduled.
+
+        Each message gets a new message id. The schedule keeps a fixed rate: a message that is published late
+        does not delay the following ones, and messages that could not be published on time because the event
+        loop was busy are skipped rather than published in a burst.
+
+        Args:
+            message (Any): The message to publish.
+            topic_id (TopicId): The topic to publish the message to.
+            interval (float): Seconds between two messages.
+            sender (AgentId, optional): The agent which sent the message. Defaults to None.
+            cancellation_token (CancellationToken, optional): Token used to stop the schedule. Defaults to None.
+            priority (MessagePriority, optional): The priority of the messages. Defaults to ``MessagePriority.NORMAL``.
+            start_after (float, optional): Seconds until the first message. Defaults to ``interval``.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if cancellation_token is None:
+            cancellation_token = CancellationToken()
+        loop = asyncio.get_running_loop()
+        timers: List[Timer] = []
+
+        def publish() -> None:
+            if cancellation_token.is_cancelled():
+                return
+            self._publish_due(message, topic_id, sender, cancellation_token, None, priority)
+            when = timers[0].when + interval
+            now = loop.time()
+            if when < now:
+                when += (now - when) // interval * interval + interval
+            timers[0] = self._timers.call_at(when, publish)
+
+        timers.append(self._timers.call_at(loop.time() + (interval if start_after is None else start_after), publish))
+        cancellation_token.add_callback(lambda: self._timers.cancel(timers[0]))
+
+    async def send_message_after(
+        self,
+        message: Any,
+        recipient: AgentId,
+        delay: float,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_id: str | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+    ) -> Any:
+        """Send a message after ``delay`` seconds and return its response, like :meth:`send_message`.
+
+        The wait is a timer of the runtime, not a sleeping task. Cancelling ``cancellation_token`` during the
+        wait raises :class:`asyncio.CancelledError` without sending the message.
+        """
+        if cancellation_token is None:
+            cancellation_token = CancellationToken()
+        loop = asyncio.get_running_loop()
+        due: Future[None] = loop.create_future()
+        timer = self._timers.call_at(loop.time() + max(delay, 0.0), _set_result_unless_done, due)
+        due.add_done_callback(lambda _: self._timers.cancel(timer))
+        await cancellation_token.link_future(due)
+        return await self.send_message(
+            message,
+            recipient,
+            sender=sender,
+            cancellation_token=cancellation_token,
+            message_id=message_id,
+            priority=priority,
+        )
+
+    def _publish_due(
+        self,
+        message: Any,
+        topic_id: TopicId,
+        sender: AgentId | None,
+        cancellation_token: CancellationToken | None,
+        message_id: str | None,
+        priority: MessagePriority,
+    ) -> None:
+        if cancellation_token is not None and cancellation_token.is_cancelled():
+            return
+        with self._tracer_helper.trace_block(
+            "create",
+            topic_id,
+            parent=None,
+            extraAttributes={"message_type": type(message).__name__},
+        ):
+            self._due_envelopes.append(
+                self._publish_envelope(
+                    message,
+                    topic_id,
                     sender=sender,
-                    topic_id=topic_id,
-                    metadata=get_telemetry_envelope_metadata(),
+                    cancellation_token=cancellation_token,
                     message_id=message_id,
+                    priority=priority,
                 )
             )
+        # Messages that are due together are queued by one task.
+        if self._due_task is None:
+            self._due_task = asyncio.create_task(self._enqueue_due())
+
+    async def _enqueue_due(self) -> None:
+        try:
+            while self._due_envelopes:
+                message_envelopes, self._due_envelopes = self._due_envelopes, []
+                if self._max_queue_size <= 0:
+                    await self._enqueue_many(message_envelopes)
+                    continue
+                for message_envelope in message_envelopes:
+                    try:
+                        await self._enqueue(message_envelope)
+                    except MessageQueueFullException:
+                        self._log_dropped_publish(message_envelope)
+        finally:
+            self._due_task = None
 
     async def save_state(self) -> Mapping[str, Any]:
         state: Dict[str, Dict[str, Any]] = {}
-        for agent_id in self._instantiated_agents:
-            state[str(agent_id)] = dict(await (await self._get_agent(agent_id)).save_state())
+        for agent_id, agent in list(self._instantiated_agents.items()):
+            state[str(agent_id)] = dict(await agent.save_state())
+        for agent_id in list(self._passivated_agents):
+            stored_state = await self._agent_state_store.load(agent_id)
+            if stored_state is not None:
+                state[str(agent_id)] = dict(stored_state)
         return state
 
     async def load_state(self, state: Mapping[str, Any]) -> None:
@@ -287,7 +1044,225 @@ async def load_state(self, state: Mapping[str, Any]) -> None:
             if agent_id.type in self._known_agent_names:
                 await (await self._get_agent(agent_id)).load_state(state[str(agent_id)])
 
+    async def _enqueue(
+        self, message_envelope: PublishMessageEnvelope | SendMessageEnvelope | ResponseMessageEnvelope
+    ) -> None:
+        journal_entry = self._journal_entry(message_envelope)
+        if self._max_queue_size > 0 and not isinstance(message_envelope, ResponseMessageEnvelope):
+            while self._message_queue.qsize() >= self._max_queue_size:
+                if self._queue_full_policy == "reject":
+                    raise MessageQueueFullException(
+                        f"The message queue is full ({self._max_queue_size} messages waiting)."
+                    )
+                if self._queue_full_policy == "drop_oldest":
+                    if self._drop_oldest_published_message():
+                        continue
+                    if isinstance(message_envelope, PublishMessageEnvelope):
+                        self._log_dropped_publish(message_envelope)
+                        return
+                    # Sent messages are never dropped; the senders awaiting them bound their number.
+                    break
+                self._queue_space_available.clear()
+                if isinstance(message_envelope, SendMessageEnvelope) and message_envelope.deadline is not None:
+                    # The sender stops waiting for space in the queue once its deadline has passed.
+                    try:
+                        await asyncio.wait_for(
+                            self._queue_space_available.wait(), message_envelope.deadline - time.time()
+                        )
+                    except asyncio.TimeoutError:
+                        self._expire(message_envelope.future)
+                        return
+                else:
+                    await self._queue_space_available.wait()
+        self._message_queue.put_nowait(message_envelope)
+        self._queue_high_watermark = max(self._queue_high_watermark, self._message_queue.qsize())
+        if self._message_journal is not None and journal_entry is not None:
+            self._message_journal.record_enqueued(journal_entry)
+
+    async def _enqueue_many(self, message_envelopes: Sequence[_Envelope]) -> None:
+        if self._max_queue_size > 0:
+            # The queue full policy applies to each message, as if they were sent one at a time.
+            for message_envelope in message_envelopes:
+                await self._enqueue(message_envelope)
+            return
+        journal_entries = [self._journal_entry(message_envelope) for message_envelope in message_envelopes]
+        for message_envelope in message_envelopes:
+            self._message_queue.put_nowait(message_envelope)
+        self._queue_high_watermark = max(self._queue_high_watermark, self._message_queue.qsize())
+        if self._message_journal is not None:
+            for journal_entry in journal_entries:
+                if journal_entry is not None:
+                    self._message_journal.record_enqueued(journal_entry)
+
+    def _journal_entry(self, message_envelope: _Envelope) -> JournalEntry | None:
+        if self._message_journal is None or isinstance(message_envelope, ResponseMessageEnvelope):
+            return None
+        type_name, payload = self._lazy_payload(message_envelope).serialize(JSON_DATA_CONTENT_TYPE)
+        sender = None if message_envelope.sender is None else str(message_envelope.sender)
+        if isinstance(message_envelope, SendMessageEnvelope):
+            return JournalEntry(
+                message_id=message_envelope.message_id,
+                kind="send",
+                type_name=type_name,
+                data_content_type=JSON_DATA_CONTENT_TYPE,
+                payload=payload,
+                sender=sender,
+                recipient=str(message_envelope.recipient),
+                topic_type=None,
+                topic_source=None,
+                priority=message_envelope.priority,
+            )
+        return JournalEntry(
+            message_id=message_envelope.message_id,
+            kind="publish",
+            type_name=type_name,
+            data_content_type=JSON_DATA_CONTENT_TYPE,
+            payload=payload,
+            sender=sender,
+            recipient=None,
+            topic_type=message_envelope.topic_id.type,
+            topic_source=message_envelope.topic_id.source,
+            priority=message_envelope.priority,
+        )
+
+    def _journal_completed(self, message_id: str, *args: Any) -> None:
+        if self._message_journal is not None:
+            self._message_journal.record_completed(message_id)
+
+    async def replay_journal(self) -> int:
+        """Queue the messages that the ``message_journal`` recorded but that were never completed, for example
+        because the process crashed. Call it after the agents and message serializers are registered.
+
+        Replayed messages keep their message ids. Sent messages are delivered again, but their responses are
+        discarded because the original senders are gone. Messages that were delivered before the crash may
+        have been partially handled and are delivered again.
+
+        Returns:
+            int: The number of messages queued.
+        """
+        if self._message_journal is None:
+            raise RuntimeError("The runtime has no message journal.")
+        entries = await self._message_journal.read_pending()
+        for entry in entries:
+            message = self._serialization_registry.deserialize(
+                entry.payload, type_name=entry.type_name, data_content_type=entry.data_content_type
+            )
+            sender = None if entry.sender is None else AgentId.from_str(entry.sender)
+            message_envelope: _Envelope
+            if entry.kind == "send":
+                future: Future[Any] = asyncio.get_running_loop().create_future()
+                # Nobody awaits the response, so consume it to avoid warnings about unretrieved exceptions.
+                future.add_done_callback(lambda f: f.cancelled() or f.exception())
+                message_envelope = SendMessageEnvelope(
+                    message=message,
+                    recipient=AgentId.from_str(cast(str, entry.recipient)),
+                    future=future,
+                    cancellation_token=CancellationToken(),
+                    sender=sender,
+                    metadata=None,
+                    message_id=entry.message_id,
+                    priority=MessagePriority(entry.priority),
+                )
+            else:
+                message_envelope = PublishMessageEnvelope(
+                    message=message,
+                    cancellation_token=CancellationToken(),
+                    sender=sender,
+                    topic_id=TopicId(cast(str, entry.topic_type), cast(str, entry.topic_source)),
+                    metadata=None,
+                    message_id=entry.message_id,
+                    priority=MessagePriority(entry.priority),
+                )
+            # The messages are still pending in the journal, so they are not recorded again.
+            self._message_queue.put_nowait(message_envelope)
+        self._queue_high_watermark = max(self._queue_high_watermark, self._message_queue.qsize())
+        return len(entries)
+
+    def _drop_oldest_published_message(self) -> bool:
+        dropped = self._message_queue.remove_oldest(lambda envelope: isinstance(envelope, PublishMessageEnvelope))
+        if dropped is None:
+            return False
+        self._message_queue.task_done()
+        self._journal_completed(cast(PublishMessageEnvelope, dropped).message_id)
+        self._log_dropped_publish(cast(PublishMessageEnvelope, dropped))
+        return True
+
+    def _log_dropped_publish(self, message_envelope: PublishMessageEnvelope) -> None:
+        self._metrics.record_dropped("queue_full")
+        logger.warning(
+            "Message queue is full, dropping published message of type %s to %s",
+            type(message_envelope.message).__name__,
+            message_envelope.topic_id,
+        )
+        if self._event_logging_enabled:
+            event_logger.info(
+                MessageDroppedEvent(
+                    payload=self._lazy_payload(message_envelope).text,
+                    sender=message_envelope.sender,
+                    receiver=message_envelope.topic_id,
+                    kind=MessageKind.PUBLISH,
+                )
+            )
+
+    def _is_duplicate(self, message_envelope: SendMessageEnvelope | PublishMessageEnvelope, recipient: AgentId) -> bool:
+        if self._recent_message_ids is None or not self._recent_message_ids.seen(
+            recipient, message_envelope.message_id
+        ):
+            return False
+        self._duplicate_messages += 1
+        self._metrics.record_dropped("duplicate")
+        logger.info(
+            "Dropping message of type %s to %s: it already received message id %s",
+            type(message_envelope.message).__name__,
+            recipient,
+            message_envelope.message_id,
+        )
+        if self._event_logging_enabled:
+            event_logger.info(
+                MessageDroppedEvent(
+                    payload=self._lazy_payload(message_envelope).text,
+                    sender=message_envelope.sender,
+                    receiver=recipient,
+                    kind=MessageKind.DIRECT
+                    if isinstance(message_envelope, SendMessageEnvelope)
+                    else MessageKind.PUBLISH,
+                )
+            )
+        return True
+
+    def _remember_message_id(
+        self, message_envelope: SendMessageEnvelope | PublishMessageEnvelope, recipient: AgentId
+    ) -> None:
+        # An id is only remembered once the message got past the interventions, and forgotten again if the handler
+        # fails, so that a sender can retry a message that was never handled.
+        if self._recent_message_ids is not None:
+            self._recent_message_ids.add(recipient, message_envelope.message_id)
+
+    def _forget_message_id(
+        self, message_envelope: SendMessageEnvelope | PublishMessageEnvelope, recipient: AgentId
+    ) -> None:
+        if self._recent_message_ids is not None:
+            self._recent_message_ids.discard(recipient, message_envelope.message_id)
+
+    def _expire_at(self, future: Future[Any], deadline: float) -> None:
+        """Fails ``future`` with a :class:`MessageTimeoutException` unless it is resolved before ``deadline``."""
+        loop = asyncio.get_running_loop()
+        timer = self._timers.call_at(loop.time() + deadline - time.time(), self._expire, future)
+        future.add_done_callback(lambda _: self._timers.cancel(timer))
+
+    def _expire(self, future: Future[Any]) -> None:
+        if not future.done():
+            self._timed_out_messages += 1
+            future.set_exception(MessageTimeoutException("The message got no response before its deadline."))
+
     async def _process_send(self, message_envelope: SendMessageEnvelope) -> None:
+        if message_envelope.deadline is not None and time.time() >= message_envelope.deadline:
+            # The sender has stopped waiting, so the response would be discarded.
+            self._metrics.record_dropped("expired")
+            self._forget_message_id(message_envelope, message_envelope.recipient)
+            self._expire(message_envelope.future)
+            self._message_queue.task_done()
+            return
         with self._tracer_helper.trace_block("send", message_envelope.recipient, parent=message_envelope.metadata):
             recipient = message_envelope.recipient
 
@@ -297,78 +1272,110 @@ async def _process_send(self, message_envelope: SendMessageEnvelope) -> None:
             try:
                 sender_id = str(message_envelope.sender) if message_envelope.sender is not None else "Unknown"
                 logger.info(
-                    f"Calling message handler for {recipient} with message type {type(message_envelope.message).__name__} sent by {sender_id}"
+                    "Calling message handler for %s with message type %s sent by %s",
+                    recipient,
+                    type(message_envelope.message).__name__,
+                    sender_id,
                 )
-                event_logger.info(
-                    MessageEvent(
-                        payload=self._try_serialize(message_envelope.message),
-                        sender=message_envelope.sender,
-                        receiver=recipient,
-                        kind=MessageKind.DIRECT,
-                        delivery_stage=DeliveryStage.DELIVER,
+                if self._event_logging_enabled:
+                    event_logger.info(
+                        MessageEvent(
+                            payload=self._lazy_payload(message_envelope).text,
+                            sender=message_envelope.sender,
+                            receiver=recipient,
+                            kind=MessageKind.DIRECT,
+                            delivery_stage=DeliveryStage.DELIVER,
+                        )
                     )
-                )
                 recipient_agent = await self._get_agent(recipient)
-
-                message_context = MessageContext(
-                    sender=message_envelope.sender,
-                    topic_id=None,
-                    is_rpc=True,
-                    cancellation_token=message_envelope.cancellation_token,
-                    message_id=message_envelope.message_id,
-                )
-                with MessageHandlerContext.populate_context(recipient_agent.id):
-                    response = await recipient_agent.on_message(
-                        message_envelope.message,
-                        ctx=message_context,
+                self._acquire_agent(recipient)
+                try:
+                    message_context = MessageContext(
+                        sender=message_envelope.sender,
+                        topic_id=None,
+                        is_rpc=True,
+                        cancellation_token=message_envelope.cancellation_token,
+                        message_id=message_envelope.message_id,
+                        deadline=message_envelope.deadline,
                     )
+                    if self._check_message_immutability:
+                        self._snapshot_message(message_envelope)
+                    started = time.perf_counter()
+                    self._metrics.record_queue_wait(started - message_envelope.enqueued_at)
+                    try:
+                        with MessageHandlerContext.populate_context(recipient_agent.id, message_envelope.deadline):
+                            response = await recipient_agent.on_message(
+                                message_envelope.message,
+                                ctx=message_context,
+                            )
+                        if self._check_message_immutability:
+                            self._check_unchanged(message_envelope, recipient)
+                    finally:
+                        self._metrics.record_handler(
+                            recipient.type, type(message_envelope.message).__name__, time.perf_counter() - started
+                        )
+                finally:
+                    self._release_agent(recipient)
             except CancelledError as e:
-                if not message_envelope.future.cancelled():
+                self._forget_message_id(message_envelope, recipient)
+                if not message_envelope.future.done():
                     message_envelope.future.set_exception(e)
                 self._message_queue.task_done()
-                event_logger.info(
-                    MessageHandlerExceptionEvent(
-                        payload=self._try_serialize(message_envelope.message),
-                        handling_agent=recipient,
-                        exception=e,
+                if self._event_logging_enabled:
+                    event_logger.info(
+                        MessageHandlerExceptionEvent(
+                            payload=self._lazy_payload(message_envelope).text,
+                            handling_agent=recipient,
+                            exception=e,
+                        )
                     )
-                )
                 return
             except BaseException as e:
-                message_envelope.future.set_exception(e)
+                self._forget_message_id(message_envelope, recipient)
+                if not message_envelope.future.done():
+                    message_envelope.future.set_exception(e)
                 self._message_queue.task_done()
-                event_logger.info(
-                    MessageHandlerExceptionEvent(
-                        payload=self._try_serialize(message_envelope.message),
-                        handling_agent=recipient,
-                        exception=e,
+                if self._event_logging_enabled:
+                    event_logger.info(
+                        MessageHandlerExceptionEvent(
+                            payload=self._lazy_payload(message_envelope).text,
+                            handling_agent=recipient,
+                            exception=e,
+                        )
                     )
-                )
                 return
 
-            event_logger.info(
-                MessageEvent(
-                    payload=self._try_serialize(response),
-                    sender=message_envelope.recipient,
-                    receiver=message_envelope.sender,
-                    kind=MessageKind.RESPOND,
-                    delivery_stage=DeliveryStage.SEND,
+            response_payload: LazyPayload | None = None
+            if self._event_logging_enabled:
+                response_payload = LazyPayload(response, self._serialization_registry)
+                event_logger.info(
+                    MessageEvent(
+                        payload=response_payload.text,
+                        sender=message_envelope.recipient,
+                        receiver=message_envelope.sender,
+                        kind=MessageKind.RESPOND,
+                        delivery_stage=DeliveryStage.SEND,
+                    )
                 )
-            )
 
-            await self._message_queue.put(
+            await self._enqueue(
                 ResponseMessageEnvelope(
                     message=response,
                     future=message_envelope.future,
                     sender=message_envelope.recipient,
                     recipient=message_envelope.sender,
                     metadata=get_telemetry_envelope_metadata(),
+                    payload=response_payload,
                 )
             )
             self._message_queue.task_done()
 
     async def _process_publish(self, message_envelope: PublishMessageEnvelope) -> None:
         with self._tracer_helper.trace_block("publish", message_envelope.topic_id, parent=message_envelope.metadata):
+            acquired_agents: List[AgentId] = []
+            self._metrics.record_queue_wait(time.perf_counter() - message_envelope.enqueued_at)
+            if self._check_message_immutability:
+                self._snapshot_message(message_envelope)
             try:
                 responses: List[Awaitable[Any]] = []
                 recipients = await self._subscription_manager.get_subscribed_recipients(message_envelope.topic_id)
@@ -376,23 +1383,27 @@ async def _process_publish(self, message_envelope: PublishMessageEnvelope) -> No
                     # Avoid sending the message back to the sender
                     if message_envelope.sender is not None and agent_id == message_envelope.sender:
                         continue
+                    if self._is_duplicate(message_envelope, agent_id):
+                        continue
+                    self._remember_message_id(message_envelope, agent_id)
 
-                    sender_agent = (
-                        await self._get_agent(message_envelope.sender) if message_envelope.sender is not None else None
-                    )
-                    sender_name = str(sender_agent.id) if sender_agent is not None else "Unknown"
+                    sender_name = str(message_envelope.sender) if message_envelope.sender is not None else "Unknown"
                     logger.info(
-                        f"Calling message handler for {agent_id.type} with message type {type(message_envelope.message).__name__} published by {sender_name}"
+                        "Calling message handler for %s with message type %s published by %s",
+                        agent_id.type,
+                        type(message_envelope.message).__name__,
+                        sender_name,
                     )
-                    event_logger.info(
-                        MessageEvent(
-                            payload=self._try_serialize(message_envelope.message),
-                            sender=message_envelope.sender,
-                            receiver=None,
-                            kind=MessageKind.PUBLISH,
-                            delivery_stage=DeliveryStage.DELIVER,
+                    if self._event_logging_enabled:
+                        event_logger.info(
+                            MessageEvent(
+                                payload=self._lazy_payload(message_envelope).text,
+                                sender=message_envelope.sender,
+                                receiver=None,
+                                kind=MessageKind.PUBLISH,
+                                delivery_stage=DeliveryStage.DELIVER,
+                            )
                         )
-                    )
                     message_context = MessageContext(
                         sender=message_envelope.sender,
                         topic_id=message_envelope.topic_id,
@@ -400,61 +1411,124 @@ async def _process_publish(self, message_envelope: PublishMessageEnvelope) -> No
                         cancellation_token=message_envelope.cancellation_token,
                         message_id=message_envelope.message_id,
                     )
-                    agent = await self._get_agent(agent_id)
+                    try:
+                        agent = await self._get_agent(agent_id)
+                    except BaseException:
+                        # The agent never received the message, so a retry must not be dropped.
+                        self._forget_message_id(message_envelope, agent_id)
+                        raise
+                    self._acquire_agent(agent_id)
+                    acquired_agents.append(agent_id)
 
                     async def _on_message(agent: Agent, message_context: MessageContext) -> Any:
                         with self._tracer_helper.trace_block("process", agent.id, parent=None):
                             with MessageHandlerContext.populate_context(agent.id):
+                                started = time.perf_counter()
                                 try:
-                                    return await agent.on_message(
+                                    response = await agent.on_message(
                                         message_envelope.message,
                                         ctx=message_context,
                                     )
+                                    if self._check_message_immutability:
+                                        self._check_unchanged(message_envelope, agent.id)
+                                    return response
                                 except BaseException as e:
+                                    self._forget_message_id(message_envelope, agent.id)
                                     logger.error(f"Error processing publish message for {agent.id}", exc_info=True)
-                                    event_logger.info(
-                                        MessageHandlerExceptionEvent(
-                                            payload=self._try_serialize(message_envelope.message),
-                                            handling_agent=agent.id,
-                                            exception=e,
+                                    if self._event_logging_enabled:
+                                        event_logger.info(
+                                            MessageHandlerExceptionEvent(
+                                                payload=self._lazy_payload(message_envelope).text,
+                                                handling_agent=agent.id,
+                                                exception=e,
+                                            )
                                         )
-                                    )
                                     raise
+                                finally:
+                                    self._metrics.record_handler(
+                                        agent.id.type,
+                                        type(message_envelope.message).__name__,
+                                        time.perf_counter() - started,
+                                    )
 
-                    future = _on_message(agent, message_context)
-                    responses.append(future)
+                    if self._mailboxes.is_limited(agent_id):
+                        responses.append(self._mailboxes.submit(agent_id, partial(_on_message, agent, message_context)))
+                    else:
+                        responses.append(_on_message(agent, message_context))
 
-                await asyncio.gather(*responses)
+                self._metrics.record_fanout(len(responses))
+                if len(responses) == 1:
+                    # Most topics have a single subscriber, which does not need a task of its own.
+                    await responses[0]
+                else:
+                    await asyncio.gather(*responses)
             except BaseException:
                 # Ignore exceptions raised during publishing. We've already logged them above.
                 pass
             finally:
+                for agent_id in acquired_agents:
+                    self._release_agent(agent_id)
                 self._message_queue.task_done()
             # TODO if responses are given for a publish
 
     async def _process_response(self, message_envelope: ResponseMessageEnvelope) -> None:
         with self._tracer_helper.trace_block("ack", message_envelope.recipient, parent=message_envelope.metadata):
-            content = (
-                message_envelope.message.__dict__
-                if hasattr(message_envelope.message, "__dict__")
-                else message_envelope.message
-            )
-            logger.info(
-                f"Resolving response with message type {type(message_envelope.message).__name__} for recipient {message_envelope.recipient} from {message_envelope.sender.type}: {content}"
-            )
-            event_logger.info(
-                MessageEvent(
-                    payload=self._try_serialize(message_envelope.message),
-                    sender=message_envelope.sender,
-                    receiver=message_envelope.recipient,
-                    kind=MessageKind.RESPOND,
-                    delivery_stage=DeliveryStage.DELIVER,
+            if logger.isEnabledFor(logging.INFO):
+                content = (
+                    message_envelope.message.__dict__
+                    if hasattr(message_envelope.message, "__dict__")
+                    else message_envelope.message
                 )
-            )
-            if not message_envelope.future.cancelled():
+                logger.info(
+                    "Resolving response with message type %s for recipient %s from %s: %s",
+                    type(message_envelope.message).__name__,
+                    message_envelope.recipient,
+                    message_envelope.sender.type,
+                    content,
+                )
+            if self._event_logging_enabled:
+                event_logger.info(
+                    MessageEvent(
+                        payload=self._lazy_payload(message_envelope).text,
+                        sender=message_envelope.sender,
+                        receiver=message_envelope.recipient,
+                        kind=MessageKind.RESPOND,
+                        delivery_stage=DeliveryStage.DELIVER,
+                    )
+                )
+            if not message_envelope.future.done():
                 message_envelope.future.set_result(message_envelope.message)
             self._message_queue.task_done()
 
+    async def _intercept_send(
+        self,
+        message_envelope: SendMessageEnvelope,
+        message_context: MessageContext,
+        handler: InterventionHandler,
+        message: Any,
+    ) -> Any:
+        with self._tracer_helper.trace_block("intercept", handler.__class__.__name__, parent=message_envelope.metadata):
+            return await handler.on_send(message, message_context=message_context, recipient=message_envelope.recipient)
+
+    async def _intercept_publish(
+        self,
+        message_envelope: PublishMessageEnvelope,
+        message_context: MessageContext,
+        handler: InterventionHandler,
+        message: Any,
+    ) -> Any:
+        with self._tracer_helper.trace_block("intercept", handler.__class__.__name__, parent=message_envelope.metadata):
+            return await handler.on_publish(message, message_context=message_context)
+
+    async def _intercept_response(
+        self, message_envelope: ResponseMessageEnvelope, handler: InterventionHandler, message: Any
+    ) -> Any:
+        return await handler.on_response(message, sender=message_envelope.sender, recipient=message_envelope.recipient)
+
+    def _background_task_done(self, task: Future[Any]) -> None:
+        self._background_tasks.discard(task)  # type: ignore[arg-type]
+        self._progress.set()
+
     @deprecated("Manually stepping the runtime processing is deprecated. Use start() instead.")
     async def process_next(self) -> None:
         await self._process_next()
@@ -466,112 +1540,165 @@ async def _process_next(self) -> None:
             message_envelope = await self._message_queue.get()
         except QueueShutDown:
             return
+        self._queue_space_available.set()
 
         match message_envelope:
             case SendMessageEnvelope(message=message, sender=sender, recipient=recipient, future=future):
-                if self._intervention_handlers is not None:
-                    for handler in self._intervention_handlers:
-                        with self._tracer_helper.trace_block(
-                            "intercept", handler.__class__.__name__, parent=message_envelope.metadata
-                        ):
-                            try:
-                                message_context = MessageContext(
-                                    sender=sender,
-                                    topic_id=None,
-                                    is_rpc=True,
-                                    cancellation_token=message_envelope.cancellation_token,
-                                    message_id=message_envelope.message_id,
-                                )
-                                temp_message = await handler.on_send(
-                                    message, message_context=message_context, recipient=recipient
-                                )
-                                _warn_if_none(temp_message, "on_send")
-                            except BaseException as e:
+                if self._is_duplicate(message_envelope, recipient):
+                    if not future.done():
+                        future.set_exception(MessageDroppedException("The recipient already received this message id."))
+                    self._message_queue.task_done()
+                    self._journal_completed(message_envelope.message_id)
+                    return
+                if self._interventions is not None:
+                    plan = self._interventions.plan("send", type(message))
+                    if plan:
+                        message_context = MessageContext(
+                            sender=sender,
+                            topic_id=None,
+                            is_rpc=True,
+                            cancellation_token=message_envelope.cancellation_token,
+                            message_id=message_envelope.message_id,
+                        )
+                        try:
+                            temp_message = await self._interventions.run(
+                                "send", plan, message, partial(self._intercept_send, message_envelope, message_context)
+                            )
+                        except BaseException as e:
+                            if not future.done():
                                 future.set_exception(e)
-                                return
-                            if temp_message is DropMessage or isinstance(temp_message, DropMessage):
+                            self._message_queue.task_done()
+                            self._journal_completed(message_envelope.message_id)
+                            return
+                        # The handlers may have changed the message, so serialize it again if needed.
+                        message_envelope.payload = None
+                        if temp_message is DropMessage:
+                            self._metrics.record_dropped("intervention")
+                            if self._event_logging_enabled:
                                 event_logger.info(
                                     MessageDroppedEvent(
-                                        payload=self._try_serialize(message),
+                                        payload=self._lazy_payload(message_envelope).text,
                                         sender=sender,
                                         receiver=recipient,
                                         kind=MessageKind.DIRECT,
                                     )
                                 )
+                            if not future.done():
                                 future.set_exception(MessageDroppedException())
-                                return
-
+                            self._message_queue.task_done()
+                            self._journal_completed(message_envelope.message_id)
+                            return
                         message_envelope.message = temp_message
-                task = asyncio.create_task(self._process_send(message_envelope))
-                self._background_tasks.add(task)
-                task.add_done_callback(self._background_tasks.discard)
+                self._remember_message_id(message_envelope, recipient)
+                if self._message_journal is not None:
+                    self._message_journal.record_delivered(message_envelope.message_id)
+                if self._mailboxes.is_limited(recipient):
+                    # The message waits in the recipient's mailbox until the agent has a free slot.
+                    delivery = self._mailboxes.submit(recipient, partial(self._process_send, message_envelope))
+                    delivery.add_done_callback(self._background_task_done)
+                    if self._message_journal is not None:
+                        delivery.add_done_callback(partial(self._journal_completed, message_envelope.message_id))
+                else:
+                    task = self._create_task(self._process_send(message_envelope))
+                    self._background_tasks.add(task)
+                    task.add_done_callback(self._background_task_done)
+                    if self._message_journal is not None:
+                        task.add_done_callback(partial(self._journal_completed, message_envelope.message_id))
             case PublishMessageEnvelope(
                 message=message,
                 sender=sender,
                 topic_id=topic_id,
             ):
-                if self._intervention_handlers is not None:
-                    for handler in self._intervention_handlers:
-                        with self._tracer_helper.trace_block(
-                            "intercept", handler.__class__.__name__, parent=message_envelope.metadata
-                        ):
-                            try:
-                                message_context = MessageContext(
-                                    sender=sender,
-                                    topic_id=topic_id,
-                                    is_rpc=False,
-                                    cancellation_token=message_envelope.cancellation_token,
-                                    message_id=message_envelope.message_id,
-                                )
-                                temp_message = await handler.on_publish(message, message_context=message_context)
-                                _warn_if_none(temp_message, "on_publish")
-                            except BaseException as e:
-                                # TODO: we should raise the intervention exception to the publisher.
-                                logger.error(f"Exception raised in in intervention handler: {e}", exc_info=True)
-                                return
-                            if temp_message is DropMessage or isinstance(temp_message, DropMessage):
+                if self._interventions is not None:
+                    plan = self._interventions.plan("publish", type(message))
+                    if plan:
+                        message_context = MessageContext(
+                            sender=sender,
+                            topic_id=topic_id,
+                            is_rpc=False,
+                            cancellation_token=message_envelope.cancellation_token,
+                            message_id=message_envelope.message_id,
+                        )
+                        try:
+                            temp_message = await self._interventions.run(
+                                "publish",
+                                plan,
+                                message,
+                                partial(self._intercept_publish, message_envelope, message_context),
+                            )
+                        except BaseException as e:
+                            # TODO: we should raise the intervention exception to the publisher.
+                            logger.error(f"Exception raised in in intervention handler: {e}", exc_info=True)
+                            self._message_queue.task_done()
+                            self._journal_completed(message_envelope.message_id)
+                            return
+                        message_envelope.payload = None
+                        if temp_message is DropMessage:
+                            self._metrics.record_dropped("intervention")
+                            if self._event_logging_enabled:
                                 event_logger.info(
                                     MessageDroppedEvent(
-                                        payload=self._try_serialize(message),
+                                        payload=self._lazy_payload(message_envelope).text,
                                         sender=sender,
                                         receiver=topic_id,
                                         kind=MessageKind.PUBLISH,
                                     )
                                 )
-                                return
-
+                            self._message_queue.task_done()
+                            self._journal_completed(message_envelope.message_id)
+                            return
                         message_envelope.message = temp_message
-                task = asyncio.create_task(self._process_publish(message_envelope))
+                if self._message_journal is not None:
+                    self._message_journal.record_delivered(message_envelope.message_id)
+                task = self._create_task(self._process_publish(message_envelope))
                 self._background_tasks.add(task)
-                task.add_done_callback(self._background_tasks.discard)
+                task.add_done_callback(self._background_task_done)
+                if self._message_journal is not None:
+                    task.add_done_callback(partial(self._journal_completed, message_envelope.message_id))
             case ResponseMessageEnvelope(message=message, sender=sender, recipient=recipient, future=future):
-                if self._intervention_handlers is not None:
-                    for handler in self._intervention_handlers:
+                if self._interventions is not None:
+                    plan = self._interventions.plan("response", type(message))
+                    if plan:
                         try:
-                            temp_message = await handler.on_response(message, sender=sender, recipient=recipient)
-                            _warn_if_none(temp_message, "on_response")
+                            temp_message = await self._interventions.run(
+                                "response", plan, message, partial(self._intercept_response, message_envelope)
+                            )
                         except BaseException as e:
                             # TODO: should we raise the exception to sender of the response instead?
-                            future.set_exception(e)
+                            if not future.done():
+                                future.set_exception(e)
+                            self._message_queue.task_done()
                             return
-                        if temp_message is DropMessage or isinstance(temp_message, DropMessage):
-                            event_logger.info(
-                                MessageDroppedEvent(
-                                    payload=self._try_serialize(message),
-                                    sender=sender,
-                                    receiver=recipient,
-                                    kind=MessageKind.RESPOND,
+                        message_envelope.payload = None
+                        if temp_message is DropMessage:
+                            self._metrics.record_dropped("intervention")
+                            if self._event_logging_enabled:
+                                event_logger.info(
+                                    MessageDroppedEvent(
+                                        payload=self._lazy_payload(message_envelope).text,
+                                        sender=sender,
+                                        receiver=recipient,
+                                        kind=MessageKind.RESPOND,
+                                    )
                                 )
-                            )
-                            future.set_exception(MessageDroppedException())
+                            if not future.done():
+                                future.set_exception(MessageDroppedException())
+                            self._message_queue.task_done()
                             return
                         message_envelope.message = temp_message
-                task = asyncio.create_task(self._process_response(message_envelope))
-                self._background_tasks.add(task)
-                task.add_done_callback(self._background_tasks.discard)
+                if self._eager_tasks:
+                    # Resolving a response never waits, so it does not need a task of its own.
+                    await self._process_response(message_envelope)
+                else:
+                    task = asyncio.create_task(self._process_response(message_envelope))
+                    self._background_tasks.add(task)
+                    task.add_done_callback(self._background_task_done)
 
-        # Yield control to the message loop to allow other tasks to run
-        await asyncio.sleep(0)
+        # Yield control to the message loop to allow other tasks to run. Eager handlers have already run until
+        # they had to wait, so the loop only needs to let the other tasks in every few messages.
+        self._dispatched_messages += 1
+        if not self._eager_tasks or self._dispatched_messages % _EAGER_YIELD_INTERVAL == 0:
+            await asyncio.sleep(0)
 
     def start(self) -> None:
         """Start the runtime message processing loop. This runs in a background task.
@@ -591,14 +1718,18 @@ def start(self) -> None:
         self._run_context = RunContext(self)
 
     async def close(self) -> None:
-        """Calls :meth:`stop` if applicable and the :meth:`Agent.close` method on all instantiated agents"""
+        """Calls :meth:`stop` if applicable and the :meth:`Agent.close` method on all instantiated agents.
+        Scheduled messages that are not due yet are cancelled."""
+        self._timers.clear()
         # stop the runtime if it hasn't been stopped yet
         if self._run_context is not None:
             await self.stop()
         # close all the agents that have been instantiated
-        for agent_id in self._instantiated_agents:
-            agent = await self._get_agent(agent_id)
+        for agent in list(self._instantiated_agents.values()):
             await agent.close()
+        self._handler_executors.shutdown()
+        if self._message_journal is not None:
+            await self._message_journal.close()
 
     async def stop(self) -> None:
         """Immediately stop the runtime message processing loop. The currently processing message will be completed, but all others following it will be discarded."""
@@ -607,7 +1738,10 @@ async def stop(self) -> None:
 
         await self._run_context.stop()
         self._run_context = None
-        self._message_queue = Queue()
+        self._message_queue = _PriorityMessageQueue(self._starvation_limit)
+        self._queue_space_available.set()
+        if self._message_journal is not None:
+            await self._message_journal.flush()
 
     async def stop_when_idle(self) -> None:
         """Stop the runtime message processing loop when there is
@@ -617,20 +1751,23 @@ async def stop_when_idle(self) -> None:
         await self._run_context.stop_when_idle()
 
         self._run_context = None
-        self._message_queue = Queue()
+        self._message_queue = _PriorityMessageQueue(self._starvation_limit)
+        self._queue_space_available.set()
+        if self._message_journal is not None:
+            await self._message_journal.flush()
 
     async def stop_when(self, condition: Callable[[], bool]) -> None:
         """Stop the runtime message processing loop when the condition is met.
 
+        The condition is checked whenever a message is dispatched or a message handler finishes, and at least
+        once a second in case it depends on something other than the agents.
+
         .. caution::
 
-            This method is not recommended to be used, and is here for legacy
-            reasons. It will spawn a busy loop to continually check the
-            condition. It is much more efficient to call `stop_when_idle` or
-            `stop` instead. If you need to stop the runtime based on a
-            condition, consider using a background task and asyncio.Event to
-            signal when the condition is met and the background task should call
-            stop.
+            This method is here for legacy reasons. It is more efficient to
+            call `stop_when_idle` or `stop` instead. If you need to stop the
+            runtime based on a condition, consider using an asyncio.Event to
+            signal when the condition is met and calling stop.
 
         """
         if self._run_context is None:
@@ -638,7 +1775,10 @@ async def stop_when(self, condition: Callable[[], bool]) -> None:
         await self._run_context.stop_when(condition)
 
         self._run_context = None
-        self._message_queue = Queue()
+        self._message_queue = _PriorityMessageQueue(self._starvation_limit)
+        self._queue_space_available.set()
+        if self._message_journal is not None:
+            await self._message_journal.flush()
 
     async def agent_metadata(self, agent: AgentId) -> AgentMetadata:
         return (await self._get_agent(agent)).metadata
@@ -655,12 +1795,15 @@ async def register_factory(
         agent_factory: Callable[[], T | Awaitable[T]],
         *,
         expected_class: type[T] | None = None,
+        max_concurrency: int | None = None,
     ) -> AgentType:
         if isinstance(type, str):
             type = AgentType(type)
 
         if type.type in self._agent_factories:
             raise ValueError(f"Agent with type {type} already exists.")
+        if max_concurrency is not None:
+            self._mailboxes.set_limit(type.type, max_concurrency)
 
         async def factory_wrapper() -> T:
             maybe_agent_instance = agent_factory()
@@ -704,27 +1847,113 @@ async def _invoke_agent_factory(
                 return agent
 
             except BaseException as e:
-                event_logger.info(
-                    AgentConstructionExceptionEvent(
-                        agent_id=agent_id,
-                        exception=e,
+                if self._event_logging_enabled:
+                    event_logger.info(
+                        AgentConstructionExceptionEvent(
+                            agent_id=agent_id,
+                            exception=e,
+                        )
                     )
-                )
                 logger.error(f"Error constructing agent {agent_id}", exc_info=True)
                 raise
 
     async def _get_agent(self, agent_id: AgentId) -> Agent:
         if agent_id in self._instantiated_agents:
-            return self._instantiated_agents[agent_id]
+            agent = self._instantiated_agents[agent_id]
+            if self._passivation_enabled:
+                self._touch_agent(agent_id)
+                await self._passivate_agents(keep=agent_id)
+            return agent
 
         if agent_id.type not in self._agent_factories:
             raise LookupError(f"Agent with name {agent_id.type} not found.")
 
+        agent = await self._agent_activations.activate(agent_id, partial(self._activate_agent, agent_id))
+        if self._passivation_enabled:
+            await self._passivate_agents(keep=agent_id)
+        return agent
+
+    async def _activate_agent(self, agent_id: AgentId) -> Agent:
         agent_factory = self._agent_factories[agent_id.type]
         agent = await self._invoke_agent_factory(agent_factory, agent_id)
+        if not self._passivation_enabled:
+            self._instantiated_agents[agent_id] = agent
+            return agent
+
+        start = time.perf_counter()
+        state = await self._agent_state_store.load(agent_id)
+        if state is not None:
+            await agent.load_state(state)
         self._instantiated_agents[agent_id] = agent
+        self._touch_agent(agent_id)
+        self._peak_active_agents = max(self._peak_active_agents, len(self._instantiated_agents))
+        if state is not None:
+            await self._agent_state_store.delete(agent_id)
+            self._passivated_agents.discard(agent_id)
+            self._reactivations += 1
+            self._reactivation_seconds += time.perf_counter() - start
         return agent
 
+    def _touch_agent(self, agent_id: AgentId) -> None:
+        self._instantiated_agents.move_to_end(agent_id)
+        self._agent_last_used[agent_id] = time.monotonic()
+
+    def _acquire_agent(self, agent_id: AgentId) -> None:
+        if self._passivation_enabled:
+            self._agents_in_use[agent_id] = self._agents_in_use.get(agent_id, 0) + 1
+
+    def _release_agent(self, agent_id: AgentId) -> None:
+        if not self._passivation_enabled:
+            return
+        in_use = self._agents_in_use.pop(agent_id) - 1
+        if in_use > 0:
+            self._agents_in_use[agent_id] = in_use
+        if agent_id in self._instantiated_agents:
+            self._touch_agent(agent_id)
+
+    async def _passivate_agents(self, keep: AgentId) -> None:
+        """Passivate the agents that are over the ``max_active_agents`` limit or idle for too long,
+        except ``keep``, which is about to handle a message."""
+        now = time.monotonic()
+        excess = len(self._instantiated_agents) - self._max_active_agents if self._max_active_agents > 0 else 0
+        candidates: List[AgentId] = []
+        # The least recently used agents come first.
+        for agent_id in self._instantiated_agents:
+            idle = (
+                self._agent_idle_timeout is not None
+                and now - self._agent_last_used[agent_id] >= self._agent_idle_timeout
+            )
+            if excess <= 0 and not idle:
+                break
+            if agent_id == keep or agent_id in self._agents_in_use or agent_id in self._passivating_agents:
+                continue
+            candidates.append(agent_id)
+            excess -= 1
+        for agent_id in candidates:
+            await self._passivate_agent(agent_id)
+
+    async def _passivate_agent(self, agent_id: AgentId) -> None:
+        agent = self._instantiated_agents[agent_id]
+        last_used = self._agent_last_used[agent_id]
+        self._passivating_agents.add(agent_id)
+        start = time.perf_counter()
+        try:
+            await self._agent_state_store.save(agent_id, await agent.save_state())
+            if agent_id in self._agents_in_use or self._agent_last_used.get(agent_id) != last_used:
+                # The agent was used while its state was being saved, so keep it in memory.
+                await self._agent_state_store.delete(agent_id)
+                return
+            del self._instantiated_agents[agent_id]
+            del self._agent_last_used[agent_id]
+            self._passivated_agents.add(agent_id)
+            self._passivations += 1
+            self._passivation_seconds += time.perf_counter() - start
+            await agent.close()
+        except Exception:
+            logger.error(f"Error passivating agent {agent_id}", exc_info=True)
+        finally:
+            self._passivating_agents.discard(agent_id)
+
     # TODO: uncomment out the following type ignore when this is fixed in mypy: https://github.com/python/mypy/issues/3737
     async def try_get_underlying_agent_instance(self, id: AgentId, type: Type[T] = Agent) -> T:  # type: ignore[assignment]
         if id.type not in self._agent_factories:
@@ -756,14 +1985,40 @@ async def get(
             instance_getter=self._get_agent,
         )
 
+    async def get_many(self, type: AgentType | str, /, keys: Sequence[str], *, lazy: bool = True) -> List[AgentId]:
+        return await get_many_impl(type=type, keys=keys, lazy=lazy, instance_getter=self._get_agent)
+
     def add_message_serializer(self, serializer: MessageSerializer[Any] | Sequence[MessageSerializer[Any]]) -> None:
         self._serialization_registry.add_serializer(serializer)
 
-    def _try_serialize(self, message: Any) -> str:
+    def _lazy_payload(self, message_envelope: _Envelope) -> LazyPayload:
+        """Returns the serialized forms of the envelope's message, which are shared by everything that logs,
+        journals or forwards the message."""
+        if message_envelope.payload is None:
+            message_envelope.payload = LazyPayload(message_envelope.message, self._serialization_registry)
+        return message_envelope.payload
+
+    def _snapshot_message(self, message_envelope: SendMessageEnvelope | PublishMessageEnvelope) -> None:
         try:
-            type_name = self._serialization_registry.type_name(message)
-            return self._serialization_registry.serialize(
-                message, type_name=type_name, data_content_type=JSON_DATA_CONTENT_TYPE
-            ).decode("utf-8")
+            self._lazy_payload(message_envelope).serialize(JSON_DATA_CONTENT_TYPE)
         except ValueError:
-            return "Message could not be serialized"
+            # Messages without a JSON serializer are not checked.
+            pass
+
+    def _check_unchanged(
+        self, message_envelope: SendMessageEnvelope | PublishMessageEnvelope, agent_id: AgentId
+    ) -> None:
+        """Raises :class:`MessageMutatedException` if the message no longer serializes to its snapshot."""
+        try:
+            _, expected = self._lazy_payload(message_envelope).serialize(JSON_DATA_CONTENT_TYPE)
+        except ValueError:
+            return
+        _, actual = self._serialization_registry.serialize_message(
+            message_envelope.message, data_content_type=JSON_DATA_CONTENT_TYPE
+        )
+        if actual != expected:
+            raise MessageMutatedException(
+                f"The message of type {type(message_envelope.message).__name__} was changed after it was sent or "
+                f"published; the change was found after {agent_id} handled it. Messages are shared by reference and "
+                "must not be changed once sent or published."
+            )
@@ -1,4 +1,12 @@
-__all__ = ["CantHandleException", "UndeliverableException", "MessageDroppedException", "NotAccessibleError"]
+__all__ = [
+    "CantHandleException",
+    "UndeliverableException",
+    "MessageDroppedException",
+    "MessageQueueFullException",
+    "MessageTimeoutException",
+    "MessageMutatedException",
+    "NotAccessibleError",
+]
 
 
 class CantHandleException(Exception):
@@ -13,5 +21,17 @@ class MessageDroppedException(Exception):
     """Raised when a message is dropped."""
 
 
+class MessageQueueFullException(Exception):
+    """Raised when a message is rejected because the runtime's message queue is full."""
+
+
+class MessageTimeoutException(TimeoutError):
+    """Raised when a sent message gets no response before its deadline."""
+
+
+class MessageMutatedException(Exception):
+    """Raised when a message handler changes a message that the runtime shares with other handlers."""
+
+
 class NotAccessibleError(Exception):
     """Tried to access a value that is not accessible. For example if it is remote cannot be accessed locally."""
@@ -0,0 +1,37 @@
+from pathlib import Path
+
+import pytest
+from autogen_core import (
+    AgentId,
+    AgentStateStore,
+    FileSystemAgentStateStore,
+    InMemoryAgentStateStore,
+    SqliteAgentStateStore,
+)
+
+
+@pytest.fixture(params=["memory", "filesystem", "sqlite"])
+def store(request: pytest.FixtureRequest, tmp_path: Path) -> AgentStateStore:
+    if request.param == "filesystem":
+        return FileSystemAgentStateStore(tmp_path / "states")
+    if request.param == "sqlite":
+        return SqliteAgentStateStore(tmp_path / "states.db")
+    return InMemoryAgentStateStore()
+
+
+@pytest.mark.asyncio
+async def test_save_load_delete(store: AgentStateStore) -> None:
+    agent_id = AgentId("type", "key/with:odd chars")
+    assert await store.load(agent_id) is None
+
+    await store.save(agent_id, {"messages": ["hello"], "count": 1})
+    await store.save(AgentId("type", "other"), {"count": 2})
+    assert await store.load(agent_id) == {"messages": ["hello"], "count": 1}
+
+    await store.save(agent_id, {"count": 3})
+    assert await store.load(agent_id) == {"count": 3}
+
+    await store.delete(agent_id)
+    await store.delete(agent_id)
+    assert await store.load(agent_id) is None
+    assert await store.load(AgentId("type", "other")) == {"count": 2}
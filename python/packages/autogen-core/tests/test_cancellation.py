@@ -1,4 +1,6 @@
 import asyncio
+import sys
+import weakref
 from dataclasses import dataclass
 
 import pytest
@@ -158,3 +160,45 @@ async def test_nested_cancellation_inner_called() -> None:
     long_running_agent = await runtime.try_get_underlying_agent_instance(long_running_id, type=LongRunningAgent)
     assert long_running_agent.called
     assert long_running_agent.cancelled
+
+
+@pytest.mark.asyncio
+async def test_callbacks_can_be_removed() -> None:
+    token = CancellationToken()
+    called: list[str] = []
+    remove = token.add_callback(lambda: called.append("removed"))
+    token.add_callback(lambda: called.append("kept"))
+    remove()
+    remove()
+    token.cancel()
+    token.cancel()
+    assert called == ["kept"]
+    assert token.is_cancelled()
+
+    # Callbacks added after the cancellation run right away.
+    token.add_callback(lambda: called.append("late"))
+    assert called == ["kept", "late"]
+
+
+@pytest.mark.asyncio
+async def test_linked_futures_do_not_leak() -> None:
+    loop = asyncio.get_running_loop()
+    token = CancellationToken()
+    pending = token.link_future(loop.create_future())
+    first: weakref.ref[asyncio.Future[None]] | None = None
+
+    # A long-lived token, like the one passed to a team's run_stream, is linked to a future per streamed message.
+    for _ in range(100):
+        futures: list[asyncio.Future[None]] = [token.link_future(loop.create_future()) for _ in range(10_000)]
+        first = first or weakref.ref(futures[0])
+        for future in futures:
+            future.set_result(None)
+        del futures
+        # Let the done callbacks run.
+        await asyncio.sleep(0)
+
+    assert first is not None and first() is None
+    assert len(token._callbacks) == 1  # type: ignore[reportPrivateUsage]
+    assert sys.getsizeof(token._callbacks) < 1024 * 1024  # type: ignore[reportPrivateUsage]
+    token.cancel()
+    assert pending.cancelled()
@@ -1,4 +1,6 @@
-from typing import Any
+import asyncio
+from dataclasses import dataclass
+from typing import Any, List
 
 import pytest
 from autogen_core import (
@@ -11,7 +13,7 @@
     SingleThreadedAgentRuntime,
 )
 from autogen_core.exceptions import MessageDroppedException
-from autogen_test_utils import LoopbackAgent, MessageType
+from autogen_test_utils import ContentMessage, LoopbackAgent, MessageType
 
 
 @pytest.mark.asyncio
@@ -155,3 +157,64 @@ async def on_response(
 
     long_running_agent = await runtime.try_get_underlying_agent_instance(loopback, type=LoopbackAgent)
     assert long_running_agent.num_calls == 1
+
+
+@dataclass
+class Secret:
+    content: str
+
+
+@pytest.mark.asyncio
+async def test_intervention_handlers_filter_by_type_and_run_read_only_concurrently() -> None:
+    calls: List[str] = []
+    running = 0
+    max_running = 0
+
+    class Redact(DefaultInterventionHandler):
+        message_types = (Secret,)
+
+        async def on_send(self, message: Any, *, message_context: MessageContext, recipient: AgentId) -> Any:
+            calls.append(f"redact:{type(message).__name__}")
+            return ContentMessage(content="***")
+
+    class AuditRedacted(DefaultInterventionHandler):
+        message_types = (ContentMessage,)
+        read_only = True
+
+        async def on_send(self, message: Any, *, message_context: MessageContext, recipient: AgentId) -> Any:
+            nonlocal running, max_running
+            calls.append(f"audit:{type(message).__name__}")
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            # Read-only handlers cannot change the message.
+            return DropMessage
+
+    class DropPublished(DefaultInterventionHandler):
+        async def on_publish(self, message: Any, *, message_context: MessageContext) -> Any:
+            return DropMessage
+
+    runtime = SingleThreadedAgentRuntime(
+        intervention_handlers=[Redact(), AuditRedacted(), AuditRedacted(), DropPublished()]
+    )
+    await LoopbackAgent.register(runtime, "name", LoopbackAgent)
+    await runtime.add_subscription(DefaultSubscription(agent_type="name"))
+    loopback = AgentId("name", key="default")
+    runtime.start()
+
+    # The audit handlers see the message after it was redacted, and run at the same time.
+    assert await runtime.send_message(Secret(content="secret"), recipient=loopback) == ContentMessage(content="***")
+    assert calls == ["redact:Secret", "audit:ContentMessage", "audit:ContentMessage"]
+    assert max_running == 2
+
+    # No handler applies to MessageType when it is sent.
+    calls.clear()
+    await runtime.send_message(MessageType(), recipient=loopback)
+    assert calls == []
+
+    await runtime.publish_message(MessageType(), topic_id=DefaultTopicId())
+    # A dropped message is done, so the runtime becomes idle.
+    await runtime.stop_when_idle()
+    loopback_agent = await runtime.try_get_underlying_agent_instance(loopback, type=LoopbackAgent)
+    assert loopback_agent.num_calls == 2
@@ -0,0 +1,91 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from autogen_core import (
+    AgentId,
+    DefaultTopicId,
+    FileMessageJournal,
+    JournalEntry,
+    MessagePriority,
+    SingleThreadedAgentRuntime,
+)
+from autogen_test_utils import ContentMessage, LoopbackAgent, LoopbackAgentWithDefaultSubscription
+
+
+def _entry(message_id: str) -> JournalEntry:
+    return JournalEntry(
+        message_id=message_id,
+        kind="publish",
+        type_name="ContentMessage",
+        data_content_type="application/json",
+        payload=b'{"content": "hello"}',
+        sender=None,
+        recipient=None,
+        topic_type="default",
+        topic_source="default",
+        priority=MessagePriority.NORMAL,
+    )
+
+
+@pytest.mark.asyncio
+async def test_file_journal_returns_pending_entries(tmp_path: Path) -> None:
+    path = tmp_path / "journal.jsonl"
+    journal = FileMessageJournal(path)
+    for message_id in ["a", "b", "c"]:
+        journal.record_enqueued(_entry(message_id))
+    journal.record_delivered("b")
+    journal.record_completed("a")
+    await journal.close()
+    # A crash in the middle of a write leaves a partial line behind.
+    path.write_text(path.read_text() + '{"op": "compl')
+
+    journal = FileMessageJournal(path)
+    pending = await journal.read_pending()
+    assert [(entry.message_id, entry.delivered) for entry in pending] == [("b", True), ("c", False)]
+    assert pending[1] == _entry("c")
+    # The file is compacted to the pending entries.
+    assert len(path.read_text().splitlines()) == 3
+
+    journal.record_completed("b")
+    journal.record_completed("c")
+    assert await journal.read_pending() == []
+    await journal.close()
+
+
+@pytest.mark.asyncio
+async def test_runtime_replays_undelivered_messages(tmp_path: Path) -> None:
+    path = tmp_path / "journal.jsonl"
+    runtime = SingleThreadedAgentRuntime(message_journal=FileMessageJournal(path))
+    await LoopbackAgentWithDefaultSubscription.register(runtime, "listener", LoopbackAgentWithDefaultSubscription)
+    await LoopbackAgent.register(runtime, "loopback", LoopbackAgent)
+    runtime.start()
+    await runtime.publish_message(ContentMessage(content="handled"), DefaultTopicId())
+    await runtime.stop_when_idle()
+
+    # Queue messages without processing them, then lose the runtime as if the process crashed.
+    await runtime.publish_messages([ContentMessage(content=f"pending{i}") for i in range(3)], DefaultTopicId())
+    rpc = asyncio.create_task(runtime.send_message(ContentMessage(content="rpc"), AgentId("loopback", "default")))
+    await asyncio.sleep(0.1)
+    rpc.cancel()
+
+    runtime = SingleThreadedAgentRuntime(message_journal=FileMessageJournal(path))
+    await LoopbackAgentWithDefaultSubscription.register(runtime, "listener", LoopbackAgentWithDefaultSubscription)
+    await LoopbackAgent.register(runtime, "loopback", LoopbackAgent)
+    assert await runtime.replay_journal() == 4
+    runtime.start()
+    await runtime.stop_when_idle()
+
+    listener = await runtime.try_get_underlying_agent_instance(
+        AgentId("listener", "default"), type=LoopbackAgentWithDefaultSubscription
+    )
+    assert listener.received_messages == [ContentMessage(content=f"pending{i}") for i in range(3)]
+    loopback = await runtime.try_get_underlying_agent_instance(AgentId("loopback", "default"), type=LoopbackAgent)
+    assert loopback.received_messages == [ContentMessage(content="rpc")]
+
+    # Everything was completed, so there is nothing left to replay.
+    assert await runtime.replay_journal() == 0
+    await runtime.close()
+
+    with pytest.raises(RuntimeError):
+        await SingleThreadedAgentRuntime().replay_journal()
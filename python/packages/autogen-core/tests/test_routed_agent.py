@@ -1,11 +1,14 @@
 import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Callable, cast
+from typing import Callable, List, cast
 
 import pytest
 from autogen_core import (
     AgentId,
     MessageContext,
+    MessageHandlerContext,
     RoutedAgent,
     SingleThreadedAgentRuntime,
     TopicId,
@@ -219,3 +222,117 @@ async def test_rpc() -> None:
     agent = await runtime.try_get_underlying_agent_instance(agent_id, type=RPCAgent)
     assert agent.num_calls[0] == 1
     assert agent.num_calls[1] == 1
+
+
+@dataclass
+class BaseMessage:
+    content: str
+
+
+@dataclass
+class DerivedMessage(BaseMessage): ...
+
+
+@dataclass
+class SpecialMessage(BaseMessage): ...
+
+
+class HierarchyAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent that handles a hierarchy of messages.")
+        self.handled: list[str] = []
+
+    @rpc
+    async def on_base(self, message: BaseMessage, ctx: MessageContext) -> str:
+        self.handled.append(f"base:{message.content}")
+        return "base"
+
+    @rpc(match=lambda message, ctx: message.content == "special")  # type: ignore
+    async def on_special(self, message: SpecialMessage, ctx: MessageContext) -> str:
+        self.handled.append(f"special:{message.content}")
+        return "special"
+
+
+class DerivedHierarchyAgent(HierarchyAgent):
+    @rpc
+    async def on_derived(self, message: DerivedMessage, ctx: MessageContext) -> str:
+        self.handled.append(f"derived:{message.content}")
+        return "derived"
+
+
+@pytest.mark.asyncio
+async def test_handlers_resolve_message_subclasses() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    await HierarchyAgent.register(runtime, "hierarchy", HierarchyAgent)
+    await DerivedHierarchyAgent.register(runtime, "derived", DerivedHierarchyAgent)
+    runtime.start()
+
+    hierarchy = AgentId("hierarchy", "default")
+    # A subclass without its own handler goes to the handler of its base class.
+    assert await runtime.send_message(DerivedMessage("a"), hierarchy) == "base"
+    assert await runtime.send_message(SpecialMessage("special"), hierarchy) == "special"
+    # The handler of the exact type did not match, so the handler of the base class gets the message.
+    assert await runtime.send_message(SpecialMessage("b"), hierarchy) == "base"
+
+    derived = AgentId("derived", "default")
+    assert await runtime.send_message(DerivedMessage("c"), derived) == "derived"
+    assert await runtime.send_message(BaseMessage("d"), derived) == "base"
+    await runtime.stop_when_idle()
+
+    agent = await runtime.try_get_underlying_agent_instance(derived, type=DerivedHierarchyAgent)
+    assert agent.handled == ["derived:c", "base:d"]
+    # The tables belong to the classes, not to their instances.
+    assert "_handler_table" not in vars(agent)
+    assert set(DerivedHierarchyAgent._handler_table) == {BaseMessage, SpecialMessage, DerivedMessage}  # type: ignore[reportPrivateUsage]
+    assert set(HierarchyAgent._handler_table) == {BaseMessage, SpecialMessage}  # type: ignore[reportPrivateUsage]
+    await runtime.close()
+
+
+_custom_executor = ThreadPoolExecutor(1, thread_name_prefix="custom")
+
+
+class BlockingAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent with handlers that block.")
+        self.threads: List[str] = []
+
+    @message_handler(executor="thread")
+    def on_base(self, message: BaseMessage, ctx: MessageContext) -> str:
+        self.threads.append(threading.current_thread().name)
+        return f"{MessageHandlerContext.agent_id()}:{message.content}"
+
+    @event(executor=_custom_executor)
+    def on_message_type(self, message: MessageType, ctx: MessageContext) -> None:
+        self.threads.append(threading.current_thread().name)
+
+
+@pytest.mark.asyncio
+async def test_handlers_run_in_executors() -> None:
+    runtime = SingleThreadedAgentRuntime(handler_threads=2)
+    await BlockingAgent.register(runtime, "blocking", BlockingAgent)
+    await runtime.add_subscription(TypeSubscription("events", "blocking"))
+    runtime.start()
+
+    agent_id = AgentId("blocking", "default")
+    assert await runtime.send_message(BaseMessage("a"), agent_id) == "blocking/default:a"
+    await runtime.publish_message(MessageType(), TopicId("events", "default"))
+    await runtime.stop_when_idle()
+
+    agent = await runtime.try_get_underlying_agent_instance(agent_id, type=BlockingAgent)
+    assert agent.threads[0].startswith("autogen-handler")
+    assert agent.threads[1].startswith("custom")
+    stats = runtime.handler_executor_stats
+    assert (stats.submitted, stats.started, stats.completed) == (2, 2, 2)
+    await runtime.close()
+
+    with pytest.raises(TypeError):
+
+        class AsyncInExecutor(RoutedAgent):  # pyright: ignore[reportUnusedClass]
+            @message_handler(executor="thread")  # type: ignore[call-overload]
+            async def on_async(self, message: MessageType, ctx: MessageContext) -> None: ...
+
+    with pytest.raises(TypeError):
+
+        class InProcessPool(RoutedAgent):  # pyright: ignore[reportUnusedClass]
+            @message_handler(executor=ProcessPoolExecutor(1))
+            def on_base(self, message: BaseMessage, ctx: MessageContext) -> None: ...
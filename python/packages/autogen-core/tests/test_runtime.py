@@ -1,20 +1,52 @@
+import asyncio
+import json
 import logging
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Mapping
 
 import pytest
 from autogen_core import (
+    EVENT_LOGGER_NAME,
     AgentId,
     AgentInstantiationContext,
+    AgentPassivationStats,
     AgentType,
+    CancellationToken,
+    DefaultInterventionHandler,
     DefaultTopicId,
+    DropMessage,
+    InMemoryAgentStateStore,
+    MessageContext,
+    MessagePriority,
+    RoutedAgent,
     SingleThreadedAgentRuntime,
+    SqliteAgentStateStore,
     TopicId,
     TypeSubscription,
+    default_subscription,
+    message_handler,
     try_get_known_serializers_for_type,
     type_subscription,
 )
+from autogen_core.exceptions import (
+    MessageDroppedException,
+    MessageMutatedException,
+    MessageQueueFullException,
+    MessageTimeoutException,
+)
+from autogen_core.logging import (
+    DeliveryStage,
+    MessageDroppedEvent,
+    MessageEvent,
+    MessageHandlerExceptionEvent,
+    MessageKind,
+)
 from autogen_test_utils import (
     CascadingAgent,
     CascadingMessageType,
+    ContentMessage,
     LoopbackAgent,
     LoopbackAgentWithDefaultSubscription,
     MessageType,
@@ -26,6 +58,65 @@
 test_exporter = MyTestExporter()
 
 
+@default_subscription
+class ConcurrencyTrackingAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Tracks how many messages it handles at the same time.")
+        self.active = 0
+        self.max_active = 0
+        self.received: list[str] = []
+        self.release = asyncio.Event()
+        self.release.set()
+        self.started = asyncio.Event()
+
+    @message_handler
+    async def on_content(self, message: ContentMessage, ctx: MessageContext) -> None:
+        self.received.append(message.content)
+        self.started.set()
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await self.release.wait()
+        await asyncio.sleep(0.01)
+        self.active -= 1
+
+
+class ForwardingAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Forwards messages to another agent and records the deadlines it sees.")
+        self.deadlines: list[float | None] = []
+
+    @message_handler
+    async def on_content(self, message: ContentMessage, ctx: MessageContext) -> ContentMessage:
+        self.deadlines.append(ctx.deadline)
+        if message.content == "forward":
+            response = await self.send_message(ContentMessage(content="stop"), AgentId("forwarder", "next"))
+            assert isinstance(response, ContentMessage)
+            return response
+        await asyncio.sleep(1)
+        return message
+
+
+class CounterAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Counts the messages it receives.")
+        self.count = 0
+        self.closed = False
+
+    @message_handler
+    async def on_content(self, message: ContentMessage, ctx: MessageContext) -> int:
+        self.count += 1
+        return self.count
+
+    async def save_state(self) -> Mapping[str, Any]:
+        return {"count": self.count}
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        self.count = state["count"]
+
+    async def close(self) -> None:
+        self.closed = True
+
+
 @pytest.fixture
 def tracer_provider() -> TracerProvider:
     test_exporter.clear()
@@ -113,7 +204,8 @@ async def agent_factory() -> LoopbackAgent:
 
 
 @pytest.mark.asyncio
-async def test_register_receives_publish_cascade() -> None:
+@pytest.mark.parametrize("eager_tasks", [False, True])
+async def test_register_receives_publish_cascade(eager_tasks: bool) -> None:
     num_agents = 5
     num_initial_messages = 5
     max_rounds = 5
@@ -121,7 +213,7 @@ async def test_register_receives_publish_cascade() -> None:
     for i in range(0, max_rounds):
         total_num_calls_expected += num_initial_messages * ((num_agents - 1) ** i)
 
-    runtime = SingleThreadedAgentRuntime()
+    runtime = SingleThreadedAgentRuntime(eager_tasks=eager_tasks)
 
     # Register agents
     for i in range(num_agents):
@@ -243,3 +335,795 @@ async def test_default_subscription_publish_to_other_source() -> None:
     assert other_long_running_agent.num_calls == 1
 
     await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_message_events_serialize_payload_lazily(caplog: pytest.LogCaptureFixture) -> None:
+    runtime = SingleThreadedAgentRuntime()
+    runtime.add_message_serializer(try_get_known_serializers_for_type(ContentMessage))
+    await LoopbackAgent.register(runtime, "name", LoopbackAgent)
+
+    registry = runtime._serialization_registry  # type: ignore[reportPrivateUsage]
+    num_serialized = 0
+    serialize_message = registry.serialize_message
+
+    def counting_serialize(message: Any, *, data_content_type: str) -> tuple[str, bytes]:
+        nonlocal num_serialized
+        num_serialized += 1
+        return serialize_message(message, data_content_type=data_content_type)
+
+    registry.serialize_message = counting_serialize  # type: ignore
+
+    # The events logger is not enabled for INFO, so no event should be built.
+    runtime.start()
+    await runtime.send_message(ContentMessage(content="hello"), AgentId("name", "default"))
+    await runtime.stop_when_idle()
+    assert num_serialized == 0
+
+    with caplog.at_level(logging.INFO, logger=EVENT_LOGGER_NAME):
+        runtime.start()
+        await runtime.send_message(ContentMessage(content="hello"), AgentId("name", "default"))
+        await runtime.stop_when_idle()
+
+    events = [record.msg for record in caplog.records if isinstance(record.msg, MessageEvent)]
+    assert len(events) == 4
+    assert all(json.loads(event.kwargs["payload"]) == {"content": "hello"} for event in events)
+    # The events of the message and of its response each share one serialization.
+    assert num_serialized == 2
+
+    await runtime.close()
+
+
+def test_message_event_kwargs_can_be_replaced() -> None:
+    events = [
+        MessageEvent(
+            payload=lambda: "hello",
+            sender=None,
+            receiver=AgentId("name", "default"),
+            kind=MessageKind.DIRECT,
+            delivery_stage=DeliveryStage.SEND,
+        ),
+        MessageDroppedEvent(payload=lambda: "hello", sender=None, receiver=None, kind=MessageKind.PUBLISH),
+        MessageHandlerExceptionEvent(
+            payload=lambda: "hello", handling_agent=AgentId("name", "default"), exception=ValueError()
+        ),
+    ]
+    for event in events:
+        assert event.kwargs["payload"] == "hello"
+        event.kwargs = {**event.kwargs, "payload": "redacted"}
+        assert json.loads(str(event))["payload"] == "redacted"
+
+
+@pytest.mark.asyncio
+async def test_published_message_is_serialized_once(caplog: pytest.LogCaptureFixture) -> None:
+    runtime = SingleThreadedAgentRuntime()
+    runtime.add_message_serializer(try_get_known_serializers_for_type(ContentMessage))
+    for index in range(3):
+        await LoopbackAgent.register(runtime, f"name{index}", LoopbackAgent)
+        await runtime.add_subscription(TypeSubscription("topic", f"name{index}"))
+
+    registry = runtime._serialization_registry  # type: ignore[reportPrivateUsage]
+    num_serialized = 0
+    serialize_message = registry.serialize_message
+
+    def counting_serialize(message: Any, *, data_content_type: str) -> tuple[str, bytes]:
+        nonlocal num_serialized
+        num_serialized += 1
+        return serialize_message(message, data_content_type=data_content_type)
+
+    registry.serialize_message = counting_serialize  # type: ignore
+
+    with caplog.at_level(logging.INFO, logger=EVENT_LOGGER_NAME):
+        runtime.start()
+        await runtime.publish_message(ContentMessage(content="hello"), TopicId("topic", "default"))
+        await runtime.stop_when_idle()
+
+    events = [record.msg for record in caplog.records if isinstance(record.msg, MessageEvent)]
+    # One event when the message is published and one per subscriber it is delivered to.
+    assert len(events) == 4
+    assert all(json.loads(event.kwargs["payload"]) == {"content": "hello"} for event in events)
+    assert num_serialized == 1
+
+    await runtime.close()
+
+
+class MutatingAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("An agent that changes the messages it handles.")
+
+    @message_handler
+    async def on_content(self, message: ContentMessage, ctx: MessageContext) -> None:
+        message.content += "!"
+
+
+@pytest.mark.asyncio
+async def test_check_message_immutability() -> None:
+    runtime = SingleThreadedAgentRuntime(check_message_immutability=True)
+    runtime.add_message_serializer(try_get_known_serializers_for_type(ContentMessage))
+    await LoopbackAgent.register(runtime, "loopback", LoopbackAgent)
+    await MutatingAgent.register(runtime, "mutating", MutatingAgent)
+    runtime.start()
+
+    message = ContentMessage(content="hello")
+    assert await runtime.send_message(message, AgentId("loopback", "default")) is message
+    with pytest.raises(MessageMutatedException):
+        await runtime.send_message(message, AgentId("mutating", "default"))
+
+    await runtime.close()
+
+    # The check is off by default.
+    runtime = SingleThreadedAgentRuntime()
+    await MutatingAgent.register(runtime, "mutating", MutatingAgent)
+    runtime.start()
+    await runtime.send_message(message, AgentId("mutating", "default"))
+    assert message.content == "hello!!"
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_log_events_disabled(caplog: pytest.LogCaptureFixture) -> None:
+    runtime = SingleThreadedAgentRuntime(log_events=False)
+    await LoopbackAgent.register(runtime, "name", LoopbackAgent)
+
+    with caplog.at_level(logging.INFO, logger=EVENT_LOGGER_NAME):
+        runtime.start()
+        await runtime.send_message(ContentMessage(content="hello"), AgentId("name", "default"))
+        await runtime.stop_when_idle()
+
+    assert not any(record.name == EVENT_LOGGER_NAME for record in caplog.records)
+
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_blocks_producer() -> None:
+    runtime = SingleThreadedAgentRuntime(max_queue_size=2)
+    await LoopbackAgentWithDefaultSubscription.register(runtime, "name", LoopbackAgentWithDefaultSubscription)
+
+    # The runtime is not started, so nothing is consumed.
+    await runtime.publish_message(MessageType(), topic_id=DefaultTopicId())
+    await runtime.publish_message(MessageType(), topic_id=DefaultTopicId())
+    blocked = asyncio.create_task(runtime.publish_message(MessageType(), topic_id=DefaultTopicId()))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+    assert runtime.unprocessed_messages_count == 2
+
+    runtime.start()
+    await blocked
+    await runtime.stop_when_idle()
+
+    agent = await runtime.try_get_underlying_agent_instance(
+        AgentId("name", "default"), type=LoopbackAgentWithDefaultSubscription
+    )
+    assert agent.num_calls == 3
+    assert runtime.queue_high_watermark == 2
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_rejects() -> None:
+    runtime = SingleThreadedAgentRuntime(max_queue_size=1, queue_full_policy="reject")
+    await LoopbackAgentWithDefaultSubscription.register(runtime, "name", LoopbackAgentWithDefaultSubscription)
+
+    await runtime.publish_message(MessageType(), topic_id=DefaultTopicId())
+    with pytest.raises(MessageQueueFullException):
+        await runtime.publish_message(MessageType(), topic_id=DefaultTopicId())
+    with pytest.raises(MessageQueueFullException):
+        await runtime.send_message(MessageType(), AgentId("name", "default"))
+    assert runtime.unprocessed_messages_count == 1
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_drops_oldest_published_message() -> None:
+    runtime = SingleThreadedAgentRuntime(max_queue_size=2, queue_full_policy="drop_oldest")
+    await LoopbackAgentWithDefaultSubscription.register(runtime, "name", LoopbackAgentWithDefaultSubscription)
+    agent_id = AgentId("name", "default")
+
+    await runtime.publish_message(ContentMessage(content="first"), topic_id=DefaultTopicId())
+    await runtime.publish_message(ContentMessage(content="second"), topic_id=DefaultTopicId())
+    # Drops "first".
+    await runtime.publish_message(ContentMessage(content="third"), topic_id=DefaultTopicId())
+    # Drops "second" and then "third".
+    sends = [asyncio.create_task(runtime.send_message(ContentMessage(content="rpc1"), agent_id))]
+    await asyncio.sleep(0)
+    sends.append(asyncio.create_task(runtime.send_message(ContentMessage(content="rpc2"), agent_id)))
+    await asyncio.sleep(0)
+    # Only sent messages are queued, so the new published message is dropped and the sent message is admitted.
+    await runtime.publish_message(ContentMessage(content="fourth"), topic_id=DefaultTopicId())
+    sends.append(asyncio.create_task(runtime.send_message(ContentMessage(content="rpc3"), agent_id)))
+    await asyncio.sleep(0)
+    assert runtime.unprocessed_messages_count == 3
+
+    runtime.start()
+    await asyncio.gather(*sends)
+    await runtime.stop_when_idle()
+
+    agent = await runtime.try_get_underlying_agent_instance(agent_id, type=LoopbackAgentWithDefaultSubscription)
+    assert agent.received_messages == [
+        ContentMessage(content="rpc1"),
+        ContentMessage(content="rpc2"),
+        ContentMessage(content="rpc3"),
+    ]
+    assert runtime.queue_high_watermark == 3
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_duplicate_message_ids_are_dropped() -> None:
+    runtime = SingleThreadedAgentRuntime(dedup_window=60, dedup_max_ids=2)
+    await LoopbackAgentWithDefaultSubscription.register(runtime, "name", LoopbackAgentWithDefaultSubscription)
+    await LoopbackAgentWithDefaultSubscription.register(runtime, "other", LoopbackAgentWithDefaultSubscription)
+    agent_id = AgentId("name", "default")
+    runtime.start()
+
+    assert await runtime.send_message(ContentMessage(content="rpc"), agent_id, message_id="a") == ContentMessage(
+        content="rpc"
+    )
+    with pytest.raises(MessageDroppedException):
+        await runtime.send_message(ContentMessage(content="retry"), agent_id, message_id="a")
+    # Ids are per recipient: only the agent that has not received the id yet handles the published message.
+    await runtime.publish_message(ContentMessage(content="event"), DefaultTopicId(), message_id="a")
+    await runtime.publish_message(ContentMessage(content="retry"), DefaultTopicId(), message_id="a")
+    await runtime.stop_when_idle()
+
+    agent = await runtime.try_get_underlying_agent_instance(agent_id, type=LoopbackAgentWithDefaultSubscription)
+    other = await runtime.try_get_underlying_agent_instance(
+        AgentId("other", "default"), type=LoopbackAgentWithDefaultSubscription
+    )
+    assert agent.received_messages == [ContentMessage(content="rpc")]
+    assert other.received_messages == [ContentMessage(content="event")]
+    assert runtime.duplicate_messages_count == 4
+
+    # Only the most recent ids are remembered.
+    runtime.start()
+    for message_id in ["b", "c", "d", "a"]:
+        await runtime.send_message(ContentMessage(content=message_id), agent_id, message_id=message_id)
+    await runtime.stop_when_idle()
+    assert agent.received_messages[-1] == ContentMessage(content="a")
+    await runtime.close()
+
+
+class FailOnceAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Fails on the first message it receives.")
+        self.received: list[str] = []
+
+    @message_handler
+    async def on_content(self, message: ContentMessage, ctx: MessageContext) -> str:
+        self.received.append(message.content)
+        if len(self.received) == 1:
+            raise ValueError("first attempt")
+        return message.content
+
+
+class DropOnceHandler(DefaultInterventionHandler):
+    def __init__(self) -> None:
+        self.dropped = False
+
+    async def on_send(
+        self, message: Any, *, message_context: MessageContext, recipient: AgentId
+    ) -> Any | type[DropMessage]:
+        if not self.dropped:
+            self.dropped = True
+            return DropMessage
+        return message
+
+
+@pytest.mark.asyncio
+async def test_duplicate_message_ids_can_be_retried_after_failure() -> None:
+    runtime = SingleThreadedAgentRuntime(dedup_window=60, intervention_handlers=[DropOnceHandler()])
+    await FailOnceAgent.register(runtime, "name", FailOnceAgent)
+    agent_id = AgentId("name", "default")
+    runtime.start()
+
+    # A message dropped by an intervention handler never reached the agent, so it can be retried.
+    with pytest.raises(MessageDroppedException):
+        await runtime.send_message(ContentMessage(content="dropped"), agent_id, message_id="a")
+    # So can a message whose handler raised an exception.
+    with pytest.raises(ValueError):
+        await runtime.send_message(ContentMessage(content="failed"), agent_id, message_id="a")
+    assert await runtime.send_message(ContentMessage(content="retry"), agent_id, message_id="a") == "retry"
+    # Once it was handled, the id is remembered.
+    with pytest.raises(MessageDroppedException):
+        await runtime.send_message(ContentMessage(content="duplicate"), agent_id, message_id="a")
+    await runtime.stop_when_idle()
+
+    agent = await runtime.try_get_underlying_agent_instance(agent_id, type=FailOnceAgent)
+    assert agent.received == ["failed", "retry"]
+    assert runtime.duplicate_messages_count == 1
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_published_message_can_be_retried_after_factory_failure() -> None:
+    runtime = SingleThreadedAgentRuntime(dedup_window=60)
+    attempts = 0
+
+    def factory() -> LoopbackAgentWithDefaultSubscription:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("Construction failed")
+        return LoopbackAgentWithDefaultSubscription()
+
+    await LoopbackAgentWithDefaultSubscription.register(runtime, "name", factory)
+    runtime.start()
+    await runtime.publish_message(ContentMessage(content="failed"), DefaultTopicId(), message_id="a")
+    await runtime.stop_when_idle()
+    runtime.start()
+    await runtime.publish_message(ContentMessage(content="retry"), DefaultTopicId(), message_id="a")
+    await runtime.stop_when_idle()
+
+    agent = await runtime.try_get_underlying_agent_instance(
+        AgentId("name", "default"), type=LoopbackAgentWithDefaultSubscription
+    )
+    assert agent.received_messages == [ContentMessage(content="retry")]
+    assert runtime.duplicate_messages_count == 0
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_limits_handlers_per_agent() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    await ConcurrencyTrackingAgent.register(runtime, "sequential", ConcurrencyTrackingAgent, max_concurrency=1)
+    await ConcurrencyTrackingAgent.register(runtime, "parallel", ConcurrencyTrackingAgent, max_concurrency=2)
+    await ConcurrencyTrackingAgent.register(runtime, "unlimited", ConcurrencyTrackingAgent)
+    runtime.start()
+
+    contents = [f"message{i}" for i in range(5)]
+    for agent_type in ("sequential", "parallel", "unlimited"):
+        await asyncio.gather(
+            *(runtime.send_message(ContentMessage(content=content), AgentId(agent_type, "a")) for content in contents)
+        )
+    await runtime.stop_when_idle()
+
+    sequential = await runtime.try_get_underlying_agent_instance(
+        AgentId("sequential", "a"), type=ConcurrencyTrackingAgent
+    )
+    parallel = await runtime.try_get_underlying_agent_instance(AgentId("parallel", "a"), type=ConcurrencyTrackingAgent)
+    unlimited = await runtime.try_get_underlying_agent_instance(
+        AgentId("unlimited", "a"), type=ConcurrencyTrackingAgent
+    )
+    assert sequential.max_active == 1
+    assert sequential.received == contents
+    assert parallel.max_active == 2
+    assert unlimited.max_active == 5
+
+    with pytest.raises(ValueError):
+        await ConcurrencyTrackingAgent.register(runtime, "invalid", ConcurrencyTrackingAgent, max_concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_backlog_does_not_block_other_agents() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    await ConcurrencyTrackingAgent.register(runtime, "worker", ConcurrencyTrackingAgent, max_concurrency=1)
+    runtime.start()
+
+    hot = await runtime.try_get_underlying_agent_instance(AgentId("worker", "hot"), type=ConcurrencyTrackingAgent)
+    hot.release.clear()
+    hot_sends = [
+        asyncio.create_task(runtime.send_message(ContentMessage(content=f"hot{i}"), AgentId("worker", "hot")))
+        for i in range(10)
+    ]
+    # The cold agent is served while the hot agent's backlog waits in its mailbox.
+    await asyncio.wait_for(runtime.send_message(ContentMessage(content="cold"), AgentId("worker", "cold")), 1)
+    assert hot.received == ["hot0"]
+
+    hot.release.set()
+    await asyncio.gather(*hot_sends)
+    assert hot.received == [f"hot{i}" for i in range(10)]
+    assert hot.max_active == 1
+    await runtime.stop_when_idle()
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_applies_to_published_messages() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    await ConcurrencyTrackingAgent.register(runtime, "sequential", ConcurrencyTrackingAgent, max_concurrency=1)
+    runtime.start()
+
+    contents = [f"message{i}" for i in range(5)]
+    for content in contents:
+        await runtime.publish_message(ContentMessage(content=content), topic_id=DefaultTopicId())
+    await runtime.stop_when_idle()
+
+    agent = await runtime.try_get_underlying_agent_instance(
+        AgentId("sequential", "default"), type=ConcurrencyTrackingAgent
+    )
+    assert agent.max_active == 1
+    assert agent.received == contents
+
+
+@pytest.mark.asyncio
+async def test_messages_are_processed_by_priority() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    await ConcurrencyTrackingAgent.register(runtime, "name", ConcurrencyTrackingAgent, max_concurrency=1)
+    await runtime.get("name", lazy=False)
+
+    # The runtime is not started, so the messages wait in the queue.
+    for content, priority in [
+        ("low", MessagePriority.LOW),
+        ("normal1", MessagePriority.NORMAL),
+        ("high1", MessagePriority.HIGH),
+        ("normal2", MessagePriority.NORMAL),
+        ("high2", MessagePriority.HIGH),
+    ]:
+        await runtime.publish_message(ContentMessage(content=content), topic_id=DefaultTopicId(), priority=priority)
+    runtime.start()
+    await runtime.stop_when_idle()
+
+    agent = await runtime.try_get_underlying_agent_instance(AgentId("name", "default"), type=ConcurrencyTrackingAgent)
+    assert agent.received == ["high1", "high2", "normal1", "normal2", "low"]
+
+
+@pytest.mark.asyncio
+async def test_low_priority_messages_are_not_starved() -> None:
+    runtime = SingleThreadedAgentRuntime(starvation_limit=2)
+    await ConcurrencyTrackingAgent.register(runtime, "name", ConcurrencyTrackingAgent, max_concurrency=1)
+    await runtime.get("name", lazy=False)
+
+    await runtime.publish_message(
+        ContentMessage(content="low"), topic_id=DefaultTopicId(), priority=MessagePriority.LOW
+    )
+    for i in range(5):
+        await runtime.publish_message(
+            ContentMessage(content=f"high{i}"), topic_id=DefaultTopicId(), priority=MessagePriority.HIGH
+        )
+    runtime.start()
+    await runtime.stop_when_idle()
+
+    agent = await runtime.try_get_underlying_agent_instance(AgentId("name", "default"), type=ConcurrencyTrackingAgent)
+    assert agent.received == ["high0", "high1", "low", "high2", "high3", "high4"]
+
+    with pytest.raises(ValueError):
+        SingleThreadedAgentRuntime(starvation_limit=0)
+
+
+@pytest.mark.asyncio
+async def test_publish_messages_delivers_batch_in_order(tracer_provider: TracerProvider) -> None:
+    runtime = SingleThreadedAgentRuntime(tracer_provider=tracer_provider)
+    await ConcurrencyTrackingAgent.register(runtime, "name", ConcurrencyTrackingAgent, max_concurrency=1)
+    runtime.start()
+    await runtime.publish_messages([ContentMessage(content=f"message{i}") for i in range(5)], DefaultTopicId())
+    await runtime.stop_when_idle()
+
+    agent = await runtime.try_get_underlying_agent_instance(AgentId("name", "default"), type=ConcurrencyTrackingAgent)
+    assert agent.received == [f"message{i}" for i in range(5)]
+
+    # The whole batch is created under a single span.
+    span_names = [span.name for span in test_exporter.get_exported_spans()]
+    assert span_names.count("autogen create default.(default)-T") == 1
+    assert span_names.count("autogen process name.(default)-A") == 5
+
+    with pytest.raises(ValueError):
+        await runtime.publish_messages([ContentMessage(content="a")], DefaultTopicId(), message_ids=["a", "b"])
+
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_send_messages_returns_responses_in_order() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    await LoopbackAgent.register(runtime, "name", LoopbackAgent)
+    runtime.start()
+    messages = [ContentMessage(content=f"message{i}") for i in range(5)]
+    responses = await runtime.send_messages(messages, AgentId("name", "default"))
+    assert responses == messages
+    assert await runtime.send_messages([], AgentId("name", "default")) == []
+
+    with pytest.raises(ValueError):
+        await runtime.send_messages(messages, AgentId("name", "default"), message_ids=["a"])
+
+    await runtime.stop_when_idle()
+    agent = await runtime.try_get_underlying_agent_instance(AgentId("name", "default"), type=LoopbackAgent)
+    assert agent.num_calls == 5
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_agents_are_passivated() -> None:
+    store = InMemoryAgentStateStore()
+    runtime = SingleThreadedAgentRuntime(max_active_agents=2, agent_state_store=store)
+    await CounterAgent.register(runtime, "counter", CounterAgent)
+    runtime.start()
+
+    first = await runtime.try_get_underlying_agent_instance(AgentId("counter", "first"), type=CounterAgent)
+    assert await runtime.send_message(ContentMessage(content="a"), AgentId("counter", "first")) == 1
+    assert await runtime.send_message(ContentMessage(content="a"), AgentId("counter", "first")) == 2
+    assert await runtime.send_message(ContentMessage(content="a"), AgentId("counter", "second")) == 1
+    assert await runtime.send_message(ContentMessage(content="a"), AgentId("counter", "third")) == 1
+
+    # The first agent was the least recently used, so it was closed and its state saved.
+    assert first.closed
+    assert len(store) == 1
+    assert await runtime.save_state() == {
+        "counter/first": {"count": 2},
+        "counter/second": {"count": 1},
+        "counter/third": {"count": 1},
+    }
+
+    # The next message recreates the first agent with its state and passivates the second one.
+    assert await runtime.send_message(ContentMessage(content="a"), AgentId("counter", "first")) == 3
+    stats = runtime.passivation_stats
+    assert stats == AgentPassivationStats(
+        active_agents=2,
+        peak_active_agents=3,
+        passivated_agents=1,
+        passivations=2,
+        reactivations=1,
+        passivation_seconds=stats.passivation_seconds,
+        reactivation_seconds=stats.reactivation_seconds,
+    )
+    await runtime.stop_when_idle()
+
+
+@pytest.mark.asyncio
+async def test_idle_agents_are_passivated() -> None:
+    runtime = SingleThreadedAgentRuntime(agent_idle_timeout=0.05)
+    await CounterAgent.register(runtime, "counter", CounterAgent)
+    runtime.start()
+
+    await runtime.send_message(ContentMessage(content="a"), AgentId("counter", "idle"))
+    await asyncio.sleep(0.1)
+    await runtime.send_message(ContentMessage(content="a"), AgentId("counter", "busy"))
+    assert runtime.passivation_stats.passivated_agents == 1
+    assert runtime.passivation_stats.active_agents == 1
+
+    assert await runtime.send_message(ContentMessage(content="a"), AgentId("counter", "idle")) == 2
+    await runtime.stop_when_idle()
+
+    with pytest.raises(ValueError):
+        SingleThreadedAgentRuntime(agent_idle_timeout=0)
+
+
+@pytest.mark.asyncio
+async def test_agents_handling_messages_are_not_passivated() -> None:
+    runtime = SingleThreadedAgentRuntime(max_active_agents=1)
+    await ConcurrencyTrackingAgent.register(runtime, "name", ConcurrencyTrackingAgent)
+    runtime.start()
+
+    busy = await runtime.try_get_underlying_agent_instance(AgentId("name", "default"), type=ConcurrencyTrackingAgent)
+    busy.release.clear()
+    await runtime.publish_message(ContentMessage(content="a"), topic_id=DefaultTopicId())
+    await busy.started.wait()
+    await runtime.send_message(ContentMessage(content="b"), AgentId("name", "other"))
+
+    # The busy agent is kept over the limit until it finishes handling its message.
+    assert runtime.passivation_stats.active_agents == 2
+    busy.release.set()
+    await runtime.stop_when_idle()
+    assert busy.received == ["a"]
+    assert runtime.passivation_stats.passivations == 0
+
+
+@pytest.mark.asyncio
+async def test_agents_are_reactivated_from_a_persistent_store(tmp_path: Path) -> None:
+    runtime = SingleThreadedAgentRuntime(
+        max_active_agents=1, agent_state_store=SqliteAgentStateStore(tmp_path / "states.db")
+    )
+    await CounterAgent.register(runtime, "counter", CounterAgent)
+    runtime.start()
+    await runtime.send_message(ContentMessage(content="a"), AgentId("counter", "first"))
+    await runtime.send_message(ContentMessage(content="a"), AgentId("counter", "second"))
+    await runtime.stop_when_idle()
+
+    # A new runtime finds the state of the passivated agent in the same database.
+    runtime = SingleThreadedAgentRuntime(
+        max_active_agents=1, agent_state_store=SqliteAgentStateStore(tmp_path / "states.db")
+    )
+    await CounterAgent.register(runtime, "counter", CounterAgent)
+    runtime.start()
+    assert await runtime.send_message(ContentMessage(content="a"), AgentId("counter", "first")) == 2
+    assert runtime.passivation_stats.reactivations == 1
+    await runtime.stop_when_idle()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_messages_construct_an_agent_once() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    constructed: list[AgentId] = []
+
+    async def agent_factory() -> LoopbackAgent:
+        constructed.append(AgentInstantiationContext.current_agent_id())
+        await asyncio.sleep(0.01)
+        return LoopbackAgent()
+
+    await runtime.register_factory(type=AgentType("name"), agent_factory=agent_factory, expected_class=LoopbackAgent)
+    runtime.start()
+    agent_id = AgentId("name", "default")
+    await asyncio.gather(*(runtime.send_message(ContentMessage(content=str(i)), agent_id) for i in range(5)))
+    await runtime.stop_when_idle()
+
+    assert constructed == [agent_id]
+    agent = await runtime.try_get_underlying_agent_instance(agent_id, type=LoopbackAgent)
+    assert agent.num_calls == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_construction_is_shared_and_retried() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    attempts = 0
+
+    async def agent_factory() -> LoopbackAgent:
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0.01)
+        if attempts == 1:
+            raise RuntimeError("Construction failed")
+        return LoopbackAgent()
+
+    await runtime.register_factory(type=AgentType("name"), agent_factory=agent_factory, expected_class=LoopbackAgent)
+    results = await asyncio.gather(
+        *(runtime.get("name", lazy=False) for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert attempts == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    assert await runtime.get("name", lazy=False) == AgentId("name", "default")
+    assert attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_get_many_prewarms_agents_concurrently() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    constructed = 0
+    constructing = 0
+    max_constructing = 0
+
+    async def agent_factory() -> LoopbackAgent:
+        nonlocal constructed, constructing, max_constructing
+        constructed += 1
+        constructing += 1
+        max_constructing = max(max_constructing, constructing)
+        await asyncio.sleep(0.01)
+        constructing -= 1
+        return LoopbackAgent()
+
+    await runtime.register_factory(type=AgentType("name"), agent_factory=agent_factory, expected_class=LoopbackAgent)
+    keys = [f"key{i}" for i in range(10)]
+
+    assert await runtime.get_many("name", keys) == [AgentId("name", key) for key in keys]
+    assert max_constructing == 0
+
+    assert await runtime.get_many(AgentType("name"), keys, lazy=False) == [AgentId("name", key) for key in keys]
+    assert max_constructing == 10
+
+    # The agents already exist, so they are not constructed again.
+    await runtime.get_many("name", keys, lazy=False)
+    assert constructed == 10
+
+
+@pytest.mark.asyncio
+async def test_scheduled_messages_are_published_when_due() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    await LoopbackAgentWithDefaultSubscription.register(runtime, "name", LoopbackAgentWithDefaultSubscription)
+    runtime.start()
+
+    cancelled = CancellationToken()
+    await runtime.publish_message_after(
+        ContentMessage(content="cancelled"), DefaultTopicId(), 0.01, cancellation_token=cancelled
+    )
+    await runtime.publish_message_after(ContentMessage(content="second"), DefaultTopicId(), 0.05)
+    await runtime.publish_message_at(
+        ContentMessage(content="first"), DefaultTopicId(), datetime.now() + timedelta(seconds=0.02)
+    )
+    cancelled.cancel()
+    assert runtime.scheduled_messages_count == 2
+
+    agent = await runtime.try_get_underlying_agent_instance(AgentId("name", "default"), type=LoopbackAgent)
+    await runtime.stop_when(lambda: agent.num_calls == 2)
+    assert agent.received_messages == [ContentMessage(content="first"), ContentMessage(content="second")]
+    assert runtime.scheduled_messages_count == 0
+
+
+@pytest.mark.asyncio
+async def test_periodic_messages_until_cancelled() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    await LoopbackAgentWithDefaultSubscription.register(runtime, "name", LoopbackAgentWithDefaultSubscription)
+    runtime.start()
+
+    token = CancellationToken()
+    await runtime.publish_message_every(
+        ContentMessage(content="tick"), DefaultTopicId(), 0.01, cancellation_token=token, start_after=0
+    )
+    agent = await runtime.try_get_underlying_agent_instance(AgentId("name", "default"), type=LoopbackAgent)
+    started = time.perf_counter()
+    await runtime.stop_when(lambda: agent.num_calls >= 3)
+    # The condition is checked as soon as a handler finishes, not once a second.
+    assert time.perf_counter() - started < 0.5
+
+    token.cancel()
+    assert runtime.scheduled_messages_count == 0
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_send_message_after() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    await LoopbackAgent.register(runtime, "name", LoopbackAgent)
+    runtime.start()
+
+    response = await runtime.send_message_after(MessageType(), AgentId("name", "default"), 0.01)
+    assert isinstance(response, MessageType)
+
+    token = CancellationToken()
+    pending = asyncio.create_task(
+        runtime.send_message_after(MessageType(), AgentId("name", "default"), 10, cancellation_token=token)
+    )
+    await asyncio.sleep(0.01)
+    assert runtime.scheduled_messages_count == 1
+    token.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+    assert runtime.scheduled_messages_count == 0
+
+    await runtime.stop_when_idle()
+    agent = await runtime.try_get_underlying_agent_instance(AgentId("name", "default"), type=LoopbackAgent)
+    assert agent.num_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_send_message_timeout() -> None:
+    runtime = SingleThreadedAgentRuntime()
+    await ConcurrencyTrackingAgent.register(runtime, "sequential", ConcurrencyTrackingAgent, max_concurrency=1)
+    agent_id = AgentId("sequential", "default")
+    agent = await runtime.try_get_underlying_agent_instance(agent_id, type=ConcurrencyTrackingAgent)
+    agent.release.clear()
+    runtime.start()
+
+    results = await asyncio.gather(
+        runtime.send_message(ContentMessage(content="first"), agent_id, timeout=0.05),
+        runtime.send_message(ContentMessage(content="second"), agent_id, timeout=0.05),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, MessageTimeoutException) for result in results)
+    assert runtime.timed_out_messages_count == 2
+    # A batch shares one deadline.
+    with pytest.raises(MessageTimeoutException):
+        await runtime.send_messages(
+            [ContentMessage(content="third"), ContentMessage(content="fourth")], agent_id, timeout=0.05
+        )
+    assert runtime.timed_out_messages_count == 4
+
+    agent.release.set()
+    await runtime.stop_when_idle()
+    # The second message expired while it waited for the first one, so it was never handled.
+    assert agent.received == ["first"]
+
+    with pytest.raises(ValueError):
+        await runtime.send_message(ContentMessage(content="first"), agent_id, timeout=0)
+
+
+@pytest.mark.asyncio
+async def test_send_message_timeout_while_queue_is_full() -> None:
+    runtime = SingleThreadedAgentRuntime(max_queue_size=1, queue_full_policy="block")
+    await LoopbackAgentWithDefaultSubscription.register(runtime, "name", LoopbackAgentWithDefaultSubscription)
+    await runtime.publish_message(MessageType(), topic_id=DefaultTopicId())
+
+    # The runtime is not started, so the queue stays full until the deadline.
+    with pytest.raises(MessageTimeoutException):
+        await asyncio.wait_for(runtime.send_message(MessageType(), AgentId("name", "default"), timeout=0.05), timeout=2)
+    assert runtime.timed_out_messages_count == 1
+    assert runtime.unprocessed_messages_count == 1
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("eager_tasks", [False, True])
+async def test_nested_messages_inherit_the_deadline(eager_tasks: bool) -> None:
+    runtime = SingleThreadedAgentRuntime(eager_tasks=eager_tasks)
+    await ForwardingAgent.register(runtime, "forwarder", ForwardingAgent)
+    runtime.start()
+
+    sent_at = time.time()
+    with pytest.raises(MessageTimeoutException):
+        await runtime.send_message(ContentMessage(content="forward"), AgentId("forwarder", "default"), timeout=0.05)
+    assert time.time() - sent_at < 0.5
+
+    first = await runtime.try_get_underlying_agent_instance(AgentId("forwarder", "default"), type=ForwardingAgent)
+    second = await runtime.try_get_underlying_agent_instance(AgentId("forwarder", "next"), type=ForwardingAgent)
+    assert first.deadlines[0] is not None
+    assert second.deadlines == first.deadlines
+    assert first.deadlines[0] == pytest.approx(sent_at + 0.05, abs=0.01)
+    await runtime.stop()
@@ -0,0 +1,86 @@
+from typing import Any, Dict
+
+import pytest
+from autogen_core import (
+    AgentId,
+    DefaultTopicId,
+    SingleThreadedAgentRuntime,
+)
+from autogen_test_utils import ContentMessage, LoopbackAgent, LoopbackAgentWithDefaultSubscription
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+
+@pytest.mark.asyncio
+async def test_runtime_metrics() -> None:
+    reader = InMemoryMetricReader()
+    runtime = SingleThreadedAgentRuntime(dedup_window=60, meter_provider=MeterProvider(metric_readers=[reader]))
+    await LoopbackAgentWithDefaultSubscription.register(runtime, "listener", LoopbackAgentWithDefaultSubscription)
+    await LoopbackAgent.register(runtime, "loopback", LoopbackAgent)
+    runtime.start()
+    for message_id in ["a", "b", "a"]:
+        await runtime.publish_message(ContentMessage(content=message_id), DefaultTopicId(), message_id=message_id)
+    await runtime.send_message(ContentMessage(content="rpc"), AgentId("loopback", "default"))
+    await runtime.stop_when_idle()
+
+    metrics = runtime.metrics()
+    assert metrics.queue_depth == 0
+    assert metrics.active_agents == 2
+    assert metrics.queue_wait.count == 4
+    assert metrics.handled_messages() == 3
+    assert metrics.handled_messages("listener") == 2
+    listener = metrics.handler_duration[("listener", "ContentMessage")]
+    assert listener.count == 2
+    assert 0 < listener.quantile(0.5) <= listener.quantile(1.0) == listener.max
+    assert [agent_type for agent_type, _ in metrics.busiest_agent_types()] in (
+        ["listener", "loopback"],
+        ["loopback", "listener"],
+    )
+    # The duplicate reached no recipient.
+    assert metrics.publish_fanout.counts[:2] == (1, 2)
+    assert metrics.dropped_messages == {"duplicate": 1}
+
+    data = reader.get_metrics_data()
+    assert data is not None
+    # The data points of histograms, counters and gauges have different types.
+    values: Dict[str, Any] = {
+        metric.name: metric.data.data_points
+        for resource_metrics in data.resource_metrics
+        for scope_metrics in resource_metrics.scope_metrics
+        for metric in scope_metrics.metrics
+    }
+    assert sum(point.count for point in values["autogen.runtime.handler.duration"]) == 3
+    assert [point.value for point in values["autogen.runtime.messages.dropped"]] == [1]
+    assert [point.value for point in values["autogen.runtime.agents.active"]] == [2]
+    await runtime.close()
+
+
+@pytest.mark.asyncio
+async def test_queue_depth_after_restart() -> None:
+    reader = InMemoryMetricReader()
+    runtime = SingleThreadedAgentRuntime(meter_provider=MeterProvider(metric_readers=[reader]))
+    await LoopbackAgentWithDefaultSubscription.register(runtime, "listener", LoopbackAgentWithDefaultSubscription)
+    runtime.start()
+    await runtime.publish_message(ContentMessage(content="first"), DefaultTopicId())
+    await runtime.stop_when_idle()
+
+    # Stopping replaced the queue, and the metrics read the new one.
+    for content in ["second", "third"]:
+        await runtime.publish_message(ContentMessage(content=content), DefaultTopicId())
+    assert runtime.metrics().queue_depth == 2
+    data = reader.get_metrics_data()
+    assert data is not None
+    depths = [
+        point.value
+        for resource_metrics in data.resource_metrics
+        for scope_metrics in resource_metrics.scope_metrics
+        for metric in scope_metrics.metrics
+        if metric.name == "autogen.runtime.queue.depth"
+        for point in metric.data.data_points
+    ]
+    assert depths == [2]
+
+    runtime.start()
+    await runtime.stop_when_idle()
+    assert runtime.metrics().queue_depth == 0
+    await runtime.close()
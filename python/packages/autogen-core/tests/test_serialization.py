@@ -1,17 +1,24 @@
-from dataclasses import dataclass
-from typing import Union
+import json as json_module
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Union
 
 import pytest
 from autogen_core import Image
 from autogen_core._serialization import (
     JSON_DATA_CONTENT_TYPE,
+    MSGPACK_DATA_CONTENT_TYPE,
     PROTOBUF_DATA_CONTENT_TYPE,
     DataclassJsonMessageSerializer,
+    DataclassMsgpackMessageSerializer,
     MessageSerializer,
+    ProtobufMessageSerializer,
     PydanticJsonMessageSerializer,
+    PydanticMsgpackMessageSerializer,
     SerializationRegistry,
+    has_json_native_fields,
     try_get_known_serializers_for_type,
 )
+from google.protobuf import any_pb2
 from PIL import Image as PILImage
 from protos.serialization_test_pb2 import NestingProtoMessage, ProtoMessage
 from pydantic import BaseModel
@@ -80,6 +87,72 @@ def test_dataclass() -> None:
     assert deserialized == message
 
 
+@dataclass
+class FlatDataclassMessage:
+    message: str
+    count: int = 0
+    tags: List[str] = field(default_factory=list)
+    scores: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class ListOfDataclassesMessage:
+    message: str
+    items: List[DataclassMessage] = field(default_factory=list)
+
+
+@dataclass
+class AnyFieldMessage:
+    message: Any
+
+
+def test_dataclass_shallow_serialization_matches_asdict() -> None:
+    assert has_json_native_fields(FlatDataclassMessage)
+    assert not has_json_native_fields(ListOfDataclassesMessage)
+    assert not has_json_native_fields(AnyFieldMessage)
+
+    messages: List[Any] = [
+        FlatDataclassMessage(message="hello", count=2, tags=["a"], scores={"a": 0.5}),
+        ListOfDataclassesMessage(message="hello", items=[DataclassMessage(message="world")]),
+        AnyFieldMessage(message=DataclassMessage(message="world")),
+    ]
+    for message in messages:
+        serializer = DataclassJsonMessageSerializer(type(message))
+        payload = serializer.serialize(message)
+        assert json_module.loads(payload) == asdict(message)
+    serializer = DataclassJsonMessageSerializer(FlatDataclassMessage)
+    assert serializer.deserialize(serializer.serialize(messages[0])) == messages[0]
+
+
+def test_proto_payload_is_a_packed_any() -> None:
+    message = ProtoMessage(message="hello")
+    serializer = ProtobufMessageSerializer(ProtoMessage)
+    packed = any_pb2.Any()
+    packed.Pack(message)  # type: ignore
+    assert serializer.serialize(message) == packed.SerializeToString()
+
+    packed.Pack(NestingProtoMessage(message="hello"))  # type: ignore
+    with pytest.raises(ValueError):
+        serializer.deserialize(packed.SerializeToString())
+
+
+def test_serialize_message() -> None:
+    serde = SerializationRegistry()
+    serde.add_serializer(try_get_known_serializers_for_type(DataclassMessage))
+    serde.add_serializer(try_get_known_serializers_for_type(PydanticMessage))
+
+    for message in [DataclassMessage(message="hello"), PydanticMessage(message="hello")] * 2:
+        name = serde.type_name(message)
+        assert serde.serialize_message(message, data_content_type=JSON_DATA_CONTENT_TYPE) == (
+            name,
+            serde.serialize(message, type_name=name, data_content_type=JSON_DATA_CONTENT_TYPE),
+        )
+    with pytest.raises(ValueError):
+        serde.serialize_message(DataclassMessage(message="hello"), data_content_type=PROTOBUF_DATA_CONTENT_TYPE)
+    with pytest.raises(ValueError):
+        serde.serialize_message(FlatDataclassMessage(message="hello"), data_content_type=JSON_DATA_CONTENT_TYPE)
+
+
 def test_nesting_dataclass_dataclass() -> None:
     serde = SerializationRegistry()
     with pytest.raises(ValueError):
@@ -186,3 +259,66 @@ class PydanticImageMessage(BaseModel):
     assert deserialized.image.image.size == (100, 100)
     assert deserialized.image.image.mode == "RGB"
     assert deserialized.image.image == image.image
+
+
+@dataclass
+class BinaryDataclassMessage:
+    message: str
+    data: bytes
+    counts: List[int] = field(default_factory=list)
+
+
+class MultiModalPydanticMessage(BaseModel):
+    content: List[str | Image]
+    data: bytes = b""
+
+
+@dataclass
+class IntKeyDataclassMessage:
+    names: Dict[int, str]
+
+
+class IntKeyPydanticMessage(BaseModel):
+    names: Dict[int, str]
+
+
+def test_msgpack() -> None:
+    serde = SerializationRegistry()
+    serde.add_serializer(try_get_known_serializers_for_type(BinaryDataclassMessage))
+    serde.add_serializer(try_get_known_serializers_for_type(MultiModalPydanticMessage))
+    assert serde.is_registered("BinaryDataclassMessage", MSGPACK_DATA_CONTENT_TYPE)
+    assert serde.is_registered("MultiModalPydanticMessage", MSGPACK_DATA_CONTENT_TYPE)
+
+    # Raw bytes, which JSON cannot hold.
+    dataclass_message = BinaryDataclassMessage(message="hello", data=b"\x00\xff", counts=[1, 2])
+    payload = serde.serialize(
+        dataclass_message, type_name="BinaryDataclassMessage", data_content_type=MSGPACK_DATA_CONTENT_TYPE
+    )
+    assert DataclassMsgpackMessageSerializer(BinaryDataclassMessage).deserialize(payload) == dataclass_message
+
+    image = Image(PILImage.effect_noise((64, 64), 64))
+    message = MultiModalPydanticMessage(content=["look", image], data=b"\x00\xff")
+    serializer = PydanticMsgpackMessageSerializer(MultiModalPydanticMessage)
+    payload = serializer.serialize(message)
+    deserialized = serializer.deserialize(payload)
+    assert deserialized.content[0] == "look"
+    assert isinstance(deserialized.content[1], Image)
+    assert deserialized.content[1].image == image.image
+    assert deserialized.data == b"\x00\xff"
+
+    # The image is raw PNG bytes instead of base64 text.
+    json_payload = PydanticJsonMessageSerializer(MultiModalPydanticMessage).serialize(
+        MultiModalPydanticMessage(content=["look", image])
+    )
+    assert len(payload) < len(json_payload) * 0.8
+    assert PydanticJsonMessageSerializer(MultiModalPydanticMessage).deserialize(json_payload).content[0] == "look"
+
+
+def test_msgpack_non_str_dict_keys() -> None:
+    dataclass_message = IntKeyDataclassMessage(names={1: "one", 2: "two"})
+    dataclass_serializer = DataclassMsgpackMessageSerializer(IntKeyDataclassMessage)
+    assert dataclass_serializer.deserialize(dataclass_serializer.serialize(dataclass_message)) == dataclass_message
+
+    pydantic_message = IntKeyPydanticMessage(names={1: "one", 2: "two"})
+    pydantic_serializer = PydanticMsgpackMessageSerializer(IntKeyPydanticMessage)
+    assert pydantic_serializer.deserialize(pydantic_serializer.serialize(pydantic_message)) == pydantic_message
@@ -5,8 +5,10 @@
     DefaultTopicId,
     SingleThreadedAgentRuntime,
     TopicId,
+    TypePrefixSubscription,
     TypeSubscription,
 )
+from autogen_core._runtime_impl_helpers import SubscriptionManager
 from autogen_core.exceptions import CantHandleException
 from autogen_test_utils import LoopbackAgent, MessageType
 
@@ -120,3 +122,88 @@ async def test_subscription_deduplication() -> None:
     default_subscription = DefaultSubscription(agent_type=agent_type)
     with pytest.raises(ValueError, match="Subscription already exists"):
         await runtime.add_subscription(default_subscription)
+
+
+@pytest.mark.asyncio
+async def test_subscription_manager_resolves_type_and_prefix_subscriptions() -> None:
+    manager = SubscriptionManager()
+    await manager.add_subscription(TypePrefixSubscription(topic_type_prefix="chat.", agent_type="logger"))
+    await manager.add_subscription(TypeSubscription(topic_type="chat.user", agent_type="assistant"))
+    await manager.add_subscription(TypePrefixSubscription(topic_type_prefix="", agent_type="audit"))
+    await manager.add_subscription(TypeSubscription(topic_type="other", agent_type="assistant"))
+
+    # Recipients are returned in the order their subscriptions were added.
+    assert await manager.get_subscribed_recipients(TopicId(type="chat.user", source="s1")) == [
+        AgentId("logger", "s1"),
+        AgentId("assistant", "s1"),
+        AgentId("audit", "s1"),
+    ]
+    assert await manager.get_subscribed_recipients(TopicId(type="chat", source="s1")) == [AgentId("audit", "s1")]
+    assert await manager.get_subscribed_recipients(TopicId(type="other", source="s2")) == [
+        AgentId("audit", "s2"),
+        AgentId("assistant", "s2"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_subscription_manager_updates_cached_topics() -> None:
+    manager = SubscriptionManager()
+    topic = TopicId(type="t1", source="s1")
+    type_subscription = TypeSubscription(topic_type="t1", agent_type="a1")
+    prefix_subscription = TypePrefixSubscription(topic_type_prefix="t", agent_type="a2")
+
+    assert await manager.get_subscribed_recipients(topic) == []
+    await manager.add_subscription(type_subscription)
+    await manager.add_subscription(prefix_subscription)
+    recipients = await manager.get_subscribed_recipients(topic)
+    assert recipients == [AgentId("a1", "s1"), AgentId("a2", "s1")]
+
+    await manager.remove_subscription(type_subscription.id)
+    assert await manager.get_subscribed_recipients(topic) == [AgentId("a2", "s1")]
+    # Previously returned lists are not mutated.
+    assert recipients == [AgentId("a1", "s1"), AgentId("a2", "s1")]
+
+    await manager.remove_subscription(prefix_subscription.id)
+    assert await manager.get_subscribed_recipients(topic) == []
+    assert manager.subscriptions == []
+
+    with pytest.raises(ValueError, match="Subscription does not exist"):
+        await manager.remove_subscription(prefix_subscription.id)
+
+
+@pytest.mark.asyncio
+async def test_subscription_manager_custom_subscription() -> None:
+    class SuffixSubscription(TypeSubscription):
+        def is_match(self, topic_id: TopicId) -> bool:
+            return topic_id.type.endswith(self.topic_type)
+
+    manager = SubscriptionManager()
+    topic = TopicId(type="chat.events", source="s1")
+    assert await manager.get_subscribed_recipients(topic) == []
+
+    subscription = SuffixSubscription(topic_type="events", agent_type="a1")
+    await manager.add_subscription(subscription)
+    assert await manager.get_subscribed_recipients(topic) == [AgentId("a1", "s1")]
+    with pytest.raises(ValueError, match="Subscription already exists"):
+        await manager.add_subscription(TypeSubscription(topic_type="events", agent_type="a1"))
+
+    await manager.remove_subscription(subscription.id)
+    assert await manager.get_subscribed_recipients(topic) == []
+
+
+@pytest.mark.asyncio
+async def test_subscription_manager_bounded_cache() -> None:
+    manager = SubscriptionManager(max_cached_topics=2)
+    await manager.add_subscription(TypeSubscription(topic_type="t1", agent_type="a1"))
+
+    for source in ["s1", "s2", "s3"]:
+        assert await manager.get_subscribed_recipients(TopicId(type="t1", source=source)) == [AgentId("a1", source)]
+    assert len(manager._resolved) == 2  # type: ignore[reportPrivateUsage]
+    assert TopicId(type="t1", source="s1") not in manager._resolved  # type: ignore[reportPrivateUsage]
+
+    # Evicted topics are resolved again on demand.
+    await manager.add_subscription(TypeSubscription(topic_type="t1", agent_type="a2"))
+    assert await manager.get_subscribed_recipients(TopicId(type="t1", source="s1")) == [
+        AgentId("a1", "s1"),
+        AgentId("a2", "s1"),
+    ]
@@ -1,3 +1,4 @@
+from ._batching import MessageBatchingConfig
 from ._worker_runtime import GrpcWorkerAgentRuntime
 from ._worker_runtime_host import GrpcWorkerAgentRuntimeHost
 from ._worker_runtime_host_servicer import GrpcWorkerAgentRuntimeHostServicer
@@ -13,4 +14,5 @@
     "GrpcWorkerAgentRuntime",
     "GrpcWorkerAgentRuntimeHost",
     "GrpcWorkerAgentRuntimeHostServicer",
+    "MessageBatchingConfig",
 ]
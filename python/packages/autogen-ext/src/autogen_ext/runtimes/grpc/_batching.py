@@ -0,0 +1,101 @@
+import asyncio
+from dataclasses import dataclass
+from typing import List
+
+from .protos import agent_worker_pb2
+
+
+@dataclass(frozen=True)
+class MessageBatchingConfig:
+    """Controls how :class:`~autogen_ext.runtimes.grpc.GrpcWorkerAgentRuntime` and
+    :class:`~autogen_ext.runtimes.grpc.GrpcWorkerAgentRuntimeHost` coalesce the messages they send on a channel.
+
+    When the channel is ready for the next message, all messages that are already queued are sent together as one
+    ``MessageBatch``, up to ``max_messages`` messages and ``max_bytes`` bytes. A message that does not fit into the
+    batch anymore starts the next one, and a message larger than ``max_bytes`` is sent on its own, so that batching
+    never makes a message exceed the channel's maximum message size as long as ``max_bytes`` is below it. With a
+    ``max_delay`` above zero, a batch that is not full yet also waits up to ``max_delay`` seconds for more messages,
+    which saves more frames under load at the cost of that much latency. The default of zero adds no latency: a
+    message that is sent on its own goes out at once.
+
+    Batches are only sent to a peer that announced that it accepts them, so workers and hosts without batching keep
+    working.
+
+    Args:
+        max_messages (int): The most messages in one batch.
+        max_bytes (int): The largest serialized size of a batch.
+        max_delay (float): How long, in seconds, a batch that is not full waits for more messages.
+    """
+
+    max_messages: int = 64
+    max_bytes: int = 64 * 1024
+    max_delay: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.max_messages < 1:
+            raise ValueError("max_messages must be at least 1")
+        if self.max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        if self.max_delay < 0:
+            raise ValueError("max_delay must not be negative")
+
+
+DEFAULT_MESSAGE_BATCHING_CONFIG = MessageBatchingConfig()
+
+
+def _varint_size(value: int) -> int:
+    size = 1
+    while value >= 0x80:
+        value >>= 7
+        size += 1
+    return size
+
+
+def _field_size(payload_size: int) -> int:
+    """The size of a length-delimited field with a one-byte tag, such as a message in a ``MessageBatch``."""
+    return 1 + _varint_size(payload_size) + payload_size
+
+
+class MessageBatcher:
+    """Takes the messages to send on a channel from ``queue`` and batches each with the messages queued after it."""
+
+    def __init__(self, queue: asyncio.Queue[agent_worker_pb2.Message]) -> None:
+        self._queue = queue
+        # A message that did not fit into the previous batch, which starts the next one.
+        self._carried: agent_worker_pb2.Message | None = None
+
+    async def next_message(self, config: MessageBatchingConfig | None) -> agent_worker_pb2.Message:
+        """Waits for the next message and, with a ``config``, batches it with the messages after it."""
+        if self._carried is not None:
+            message, self._carried = self._carried, None
+        else:
+            message = await self._queue.get()
+        if config is None or config.max_messages == 1:
+            return message
+        messages: List[agent_worker_pb2.Message] = [message]
+        size = _field_size(message.ByteSize())
+        deadline: float | None = None
+        loop = asyncio.get_running_loop()
+        while len(messages) < config.max_messages and _field_size(size) < config.max_bytes:
+            if not self._queue.empty():
+                message = self._queue.get_nowait()
+            elif config.max_delay > 0:
+                if deadline is None:
+                    deadline = loop.time() + config.max_delay
+                try:
+                    message = await asyncio.wait_for(self._queue.get(), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    break
+            else:
+                break
+            message_size = _field_size(message.ByteSize())
+            if _field_size(size + message_size) > config.max_bytes:
+                self._carried = message
+                break
+            messages.append(message)
+            size += message_size
+        if len(messages) == 1:
+            return messages[0]
+        batch = agent_worker_pb2.Message()
+        batch.batch.messages.extend(messages)
+        return batch
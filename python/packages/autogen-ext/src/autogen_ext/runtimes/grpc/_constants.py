@@ -11,3 +11,12 @@
 MESSAGE_KIND_VALUE_RPC_REQUEST = "rpc_request"
 MESSAGE_KIND_VALUE_RPC_RESPONSE = "rpc_response"
 MESSAGE_KIND_VALUE_RPC_ERROR = "error"
+# The seconds that the sender of a request still waits for the response, like gRPC's own grpc-timeout. The receiver
+# resolves it against its own clock on arrival, so clock skew between hosts does not change the budget.
+TIMEOUT_METADATA_KEY = "agtimeout"
+# The content types a worker accepts, most preferred first, as a comma-separated list. A sender asks for the list of
+# an agent type with its first request to that type, and sends in the first listed type it can serialize to after.
+ACCEPT_CONTENT_TYPES_METADATA_KEY = "agaccept"
+# Announces in the metadata of OpenChannel, from a worker, or in the initial metadata, from the host, that the peer
+# accepts MessageBatch messages on the channel.
+MESSAGE_BATCH_METADATA_KEY = "agbatch"
@@ -1,12 +1,15 @@
 import asyncio
+import importlib.util
 import inspect
 import json
 import logging
 import signal
+import time
 import uuid
 import warnings
 from asyncio import Future, Task
 from collections import defaultdict
+from functools import partial
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -15,6 +18,7 @@
     Awaitable,
     Callable,
     ClassVar,
+    Coroutine,
     DefaultDict,
     Dict,
     List,
@@ -30,6 +34,7 @@
 
 from autogen_core import (
     JSON_DATA_CONTENT_TYPE,
+    MSGPACK_DATA_CONTENT_TYPE,
     PROTOBUF_DATA_CONTENT_TYPE,
     Agent,
     AgentId,
@@ -39,6 +44,7 @@
     AgentType,
     CancellationToken,
     MessageContext,
+    MessagePriority,
     MessageHandlerContext,
     MessageSerializer,
     Subscription,
@@ -46,16 +52,28 @@
     TypePrefixSubscription,
     TypeSubscription,
 )
-from autogen_core._runtime_impl_helpers import SubscriptionManager, get_impl
+from autogen_core._runtime_impl_helpers import (
+    AgentActivations,
+    AgentMailboxes,
+    SubscriptionManager,
+    get_impl,
+    get_many_impl,
+    resolve_deadline,
+)
+from autogen_core._runtime_metrics import RuntimeMetrics, RuntimeMetricsRecorder
 from autogen_core._serialization import (
+    MSGPACK_IMPORT_ERROR_STR,
     SerializationRegistry,
 )
 from autogen_core._telemetry import MessageRuntimeTracingConfig, TraceHelper, get_telemetry_grpc_metadata
+from autogen_core.exceptions import MessageTimeoutException
 from google.protobuf import any_pb2
+from opentelemetry.metrics import MeterProvider
 from opentelemetry.trace import TracerProvider
 from typing_extensions import Self
 
 from . import _constants
+from ._batching import DEFAULT_MESSAGE_BATCHING_CONFIG, MessageBatcher, MessageBatchingConfig
 from ._constants import GRPC_IMPORT_ERROR_STR
 from ._type_helpers import ChannelArgumentType
 from .protos import agent_worker_pb2, agent_worker_pb2_grpc, cloudevent_pb2
@@ -80,10 +98,12 @@
 
 class QueueAsyncIterable(AsyncIterator[Any], AsyncIterable[Any]):
     def __init__(self, queue: asyncio.Queue[Any]) -> None:
-        self._queue = queue
+        self._batcher = MessageBatcher(queue)
+        # Set once the host has announced that it accepts batches.
+        self.batching: MessageBatchingConfig | None = None
 
     async def __anext__(self) -> Any:
-        return await self._queue.get()
+        return await self._batcher.next_message(self.batching)
 
     def __aiter__(self) -> AsyncIterator[Any]:
         return self
@@ -119,7 +139,12 @@ def __init__(self, channel: grpc.aio.Channel) -> None:  # type: ignore
         self._connection_task: Task[None] | None = None
 
     @classmethod
-    def from_host_address(cls, host_address: str, extra_grpc_config: ChannelArgumentType = DEFAULT_GRPC_CONFIG) -> Self:
+    def from_host_address(
+        cls,
+        host_address: str,
+        extra_grpc_config: ChannelArgumentType = DEFAULT_GRPC_CONFIG,
+        message_batching: MessageBatchingConfig | None = None,
+    ) -> Self:
         logger.info("Connecting to %s", host_address)
         #  Always use DEFAULT_GRPC_CONFIG and override it with provided grpc_config
         merged_options = [
@@ -132,7 +157,7 @@ def from_host_address(cls, host_address: str, extra_grpc_config: ChannelArgument
         )
         instance = cls(channel)
         instance._connection_task = asyncio.create_task(
-            instance._connect(channel, instance._send_queue, instance._recv_queue)
+            instance._connect(channel, instance._send_queue, instance._recv_queue, message_batching)
         )
         return instance
 
@@ -147,16 +172,25 @@ async def _connect(  # type: ignore
         channel: grpc.aio.Channel,
         send_queue: asyncio.Queue[agent_worker_pb2.Message],
         receive_queue: asyncio.Queue[agent_worker_pb2.Message],
+        message_batching: MessageBatchingConfig | None = None,
     ) -> None:
         stub: AgentRpcAsyncStub = agent_worker_pb2_grpc.AgentRpcStub(channel)  # type: ignore
 
         from grpc.aio import StreamStreamCall
 
         # TODO: where do exceptions from reading the iterable go? How do we recover from those?
+        send_stream = QueueAsyncIterable(send_queue)
+        metadata = [(_constants.MESSAGE_BATCH_METADATA_KEY, "1")] if message_batching is not None else None
         recv_stream: StreamStreamCall[agent_worker_pb2.Message, agent_worker_pb2.Message] = stub.OpenChannel(  # type: ignore
-            QueueAsyncIterable(send_queue)
+            send_stream, metadata=metadata
         )  # type: ignore
 
+        if message_batching is not None:
+            # Messages are sent one by one until the host has announced that it accepts batches.
+            initial_metadata = await recv_stream.initial_metadata()  # type: ignore
+            if any(key == _constants.MESSAGE_BATCH_METADATA_KEY for key, _ in initial_metadata):  # type: ignore
+                send_stream.batching = message_batching
+
         while True:
             logger.info("Waiting for message from host")
             message = await recv_stream.read()  # type: ignore
@@ -165,7 +199,11 @@ async def _connect(  # type: ignore
                 break
             message = cast(agent_worker_pb2.Message, message)
             logger.info(f"Received a message from host: {message}")
-            await receive_queue.put(message)
+            if message.WhichOneof("message") == "batch":
+                for item in message.batch.messages:
+                    receive_queue.put_nowait(item)
+            else:
+                await receive_queue.put(message)
             logger.info("Put message in receive queue")
 
     async def send(self, message: agent_worker_pb2.Message) -> None:
@@ -173,6 +211,11 @@ async def send(self, message: agent_worker_pb2.Message) -> None:
         await self._send_queue.put(message)
         logger.info("Put message in send queue")
 
+    async def send_many(self, messages: Sequence[agent_worker_pb2.Message]) -> None:
+        logger.info("Send %d messages to host", len(messages))
+        for message in messages:
+            self._send_queue.put_nowait(message)
+
     async def recv(self) -> agent_worker_pb2.Message:
         logger.info("Getting message from queue")
         return await self._recv_queue.get()
@@ -202,6 +245,21 @@ class GrpcWorkerAgentRuntime(AgentRuntime):
 
     .. _cloudevent.proto: https://github.com/microsoft/autogen/blob/main/protos/cloudevent.proto
 
+    Pass a ``meter_provider`` to also export the aggregate metrics of :meth:`metrics` as OpenTelemetry instruments.
+
+    RPC payloads are negotiated per agent type. ``preferred_content_types`` lists the content types that this worker
+    wants to receive, most preferred first, and is sent back with the response to the first request for each agent
+    type. The first request is sent as JSON, or in ``payload_serialization_format`` if its message has no JSON
+    serializer. The sender then serializes later requests to that agent type in the first listed content type that
+    it has a serializer for, and falls back to JSON. Responses use the content type of the request. For example, with the
+    ``msgpack`` extra installed, ``preferred_content_types=[MSGPACK_DATA_CONTENT_TYPE, JSON_DATA_CONTENT_TYPE]``
+    makes dataclass and Pydantic messages travel as MessagePack, with images and ``bytes`` fields as raw bytes rather
+    than base64 text. Published messages are fanned out to many agent types, so they use
+    ``payload_serialization_format`` instead.
+
+    Messages that are queued for the host at the same time are sent together in one stream message, as configured by
+    ``message_batching``, if the host accepts batches. Pass ``None`` to send every message on its own.
+
     """
 
     # TODO: Needs to handle agent close() call
@@ -211,6 +269,9 @@ def __init__(
         tracer_provider: TracerProvider | None = None,
         extra_grpc_config: ChannelArgumentType | None = None,
         payload_serialization_format: str = JSON_DATA_CONTENT_TYPE,
+        meter_provider: MeterProvider | None = None,
+        preferred_content_types: Sequence[str] = (JSON_DATA_CONTENT_TYPE,),
+        message_batching: MessageBatchingConfig | None = DEFAULT_MESSAGE_BATCHING_CONFIG,
     ) -> None:
         self._host_address = host_address
         self._trace_helper = TraceHelper(tracer_provider, MessageRuntimeTracingConfig("Worker Runtime"))
@@ -219,6 +280,7 @@ def __init__(
             str, Callable[[], Agent | Awaitable[Agent]] | Callable[[AgentRuntime, AgentId], Agent | Awaitable[Agent]]
         ] = {}
         self._instantiated_agents: Dict[AgentId, Agent] = {}
+        self._agent_activations = AgentActivations()
         self._known_namespaces: set[str] = set()
         self._read_task: None | Task[None] = None
         self._running = False
@@ -228,13 +290,34 @@ def __init__(
         self._host_connection: HostConnection | None = None
         self._background_tasks: Set[Task[Any]] = set()
         self._subscription_manager = SubscriptionManager()
+        self._mailboxes = AgentMailboxes()
         self._serialization_registry = SerializationRegistry()
         self._extra_grpc_config = extra_grpc_config or []
+        self._message_batching = message_batching
+        self._timed_out_messages = 0
+        self._metrics = RuntimeMetricsRecorder(
+            meter_provider,
+            "Worker Runtime",
+            queue_depth=lambda: len(self._background_tasks),
+            active_agents=lambda: len(self._instantiated_agents),
+        )
 
-        if payload_serialization_format not in {JSON_DATA_CONTENT_TYPE, PROTOBUF_DATA_CONTENT_TYPE}:
+        supported = {JSON_DATA_CONTENT_TYPE, PROTOBUF_DATA_CONTENT_TYPE, MSGPACK_DATA_CONTENT_TYPE}
+        if payload_serialization_format not in supported:
             raise ValueError(f"Unsupported payload serialization format: {payload_serialization_format}")
+        for content_type in preferred_content_types:
+            if content_type not in supported:
+                raise ValueError(f"Unsupported content type: {content_type}")
+        if MSGPACK_DATA_CONTENT_TYPE in {payload_serialization_format, *preferred_content_types}:
+            if importlib.util.find_spec("msgpack") is None:
+                raise ImportError(MSGPACK_IMPORT_ERROR_STR)
 
         self._payload_serialization_format = payload_serialization_format
+        self._preferred_content_types = ",".join(preferred_content_types)
+        # Agent type -> the content types its worker accepts, most preferred first.
+        self._accepted_content_types: Dict[str, Sequence[str]] = {}
+        # Request id -> agent type, for the requests that ask for the content types of their recipient.
+        self._negotiating_requests: Dict[str, str] = {}
 
     def start(self) -> None:
         """Start the runtime in a background task."""
@@ -242,7 +325,7 @@ def start(self) -> None:
             raise ValueError("Runtime is already running.")
         logger.info(f"Connecting to host: {self._host_address}")
         self._host_connection = HostConnection.from_host_address(
-            self._host_address, extra_grpc_config=self._extra_grpc_config
+            self._host_address, extra_grpc_config=self._extra_grpc_config, message_batching=self._message_batching
         )
         logger.info("Connection established")
         if self._read_task is None:
@@ -265,7 +348,7 @@ async def _run_read_loop(self) -> None:
                     case "registerAgentTypeRequest" | "addSubscriptionRequest":
                         logger.warning(f"Cant handle {oneofcase}, skipping.")
                     case "request":
-                        task = asyncio.create_task(self._process_request(message.request))
+                        task = asyncio.create_task(self._process_request(message.request, time.perf_counter()))
                         self._background_tasks.add(task)
                         task.add_done_callback(self._raise_on_exception)
                         task.add_done_callback(self._background_tasks.discard)
@@ -277,7 +360,7 @@ async def _run_read_loop(self) -> None:
                     case "cloudEvent":
                         # The proto typing doesnt resolve this one
                         cloud_event = cast(cloudevent_pb2.CloudEvent, message.cloudEvent)  # type: ignore
-                        task = asyncio.create_task(self._process_event(cloud_event))
+                        task = asyncio.create_task(self._process_event(cloud_event, time.perf_counter()))
                         self._background_tasks.add(task)
                         task.add_done_callback(self._raise_on_exception)
                         task.add_done_callback(self._background_tasks.discard)
@@ -346,17 +429,136 @@ def signal_handler() -> None:
     def _known_agent_names(self) -> Set[str]:
         return set(self._agent_factories.keys())
 
-    async def _send_message(
+    @property
+    def timed_out_messages_count(self) -> int:
+        """The number of sent messages that got no response before their deadline."""
+        return self._timed_out_messages
+
+    def metrics(self) -> RuntimeMetrics:
+        """Returns a snapshot of the aggregate metrics of the runtime: how long received messages wait before their
+        handler starts, how long handlers take by agent type and message type, the fan-out of events, dropped
+        messages and the number of active agents. The queue depth is the number of received messages that are still
+        being handled."""
+        return self._metrics.snapshot()
+
+    async def _send_messages(
         self,
-        runtime_message: agent_worker_pb2.Message,
+        runtime_messages: Sequence[agent_worker_pb2.Message],
         send_type: Literal["send", "publish"],
         recipient: AgentId | TopicId,
         telemetry_metadata: Mapping[str, str],
     ) -> None:
         if self._host_connection is None:
             raise RuntimeError("Host connection is not set.")
-        with self._trace_helper.trace_block(send_type, recipient, parent=telemetry_metadata):
-            await self._host_connection.send(runtime_message)
+        with self._trace_helper.trace_block(
+            send_type, recipient, parent=telemetry_metadata, extraAttributes={"batch_size": len(runtime_messages)}
+        ):
+            await self._host_connection.send_many(runtime_messages)
+
+    def _spawn_send(self, coroutine: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(coroutine)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._raise_on_exception)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def _build_rpc_request(
+        self,
+        message: Any,
+        data_type: str,
+        recipient: AgentId,
+        sender: AgentId | None,
+        request_id: str,
+        telemetry_metadata: Mapping[str, str],
+        deadline: float | None,
+    ) -> agent_worker_pb2.Message:
+        metadata = dict(telemetry_metadata)
+        accepted = self._accepted_content_types.get(recipient.type)
+        content_type = JSON_DATA_CONTENT_TYPE
+        if accepted is None:
+            metadata[_constants.ACCEPT_CONTENT_TYPES_METADATA_KEY] = self._preferred_content_types
+            self._negotiating_requests[request_id] = recipient.type
+            if not self._serialization_registry.is_registered(data_type, JSON_DATA_CONTENT_TYPE):
+                # Messages that only have binary serializers, such as Protobuf ones, negotiate in the format this
+                # worker publishes in.
+                content_type = self._payload_serialization_format
+        else:
+            for accepted_type in accepted:
+                if self._serialization_registry.is_registered(data_type, accepted_type):
+                    content_type = accepted_type
+                    break
+        serialized_message = self._serialization_registry.serialize(
+            message, type_name=data_type, data_content_type=content_type
+        )
+        if deadline is not None:
+            metadata[_constants.TIMEOUT_METADATA_KEY] = repr(deadline - time.time())
+        return agent_worker_pb2.Message(
+            request=agent_worker_pb2.RpcRequest(
+                request_id=request_id,
+                target=agent_worker_pb2.AgentId(type=recipient.type, key=recipient.key),
+                source=agent_worker_pb2.AgentId(type=sender.type, key=sender.key) if sender is not None else None,
+                metadata=metadata,
+                payload=agent_worker_pb2.Payload(
+                    data_type=data_type,
+                    data=serialized_message,
+                    data_content_type=content_type,
+                ),
+            )
+        )
+
+    def _build_cloud_event(
+        self, message: Any, message_type: str, topic_id: TopicId, sender: AgentId | None, message_id: str
+    ) -> agent_worker_pb2.Message:
+        serialized_message = self._serialization_registry.serialize(
+            message, type_name=message_type, data_content_type=self._payload_serialization_format
+        )
+
+        sender_id = sender or AgentId("unknown", "unknown")
+        attributes = {
+            _constants.DATA_CONTENT_TYPE_ATTR: cloudevent_pb2.CloudEvent.CloudEventAttributeValue(
+                ce_string=self._payload_serialization_format
+            ),
+            _constants.DATA_SCHEMA_ATTR: cloudevent_pb2.CloudEvent.CloudEventAttributeValue(ce_string=message_type),
+            _constants.AGENT_SENDER_TYPE_ATTR: cloudevent_pb2.CloudEvent.CloudEventAttributeValue(
+                ce_string=sender_id.type
+            ),
+            _constants.AGENT_SENDER_KEY_ATTR: cloudevent_pb2.CloudEvent.CloudEventAttributeValue(
+                ce_string=sender_id.key
+            ),
+            _constants.MESSAGE_KIND_ATTR: cloudevent_pb2.CloudEvent.CloudEventAttributeValue(
+                ce_string=_constants.MESSAGE_KIND_VALUE_PUBLISH
+            ),
+        }
+
+        # If sending JSON or MessagePack we fill binary_data with the serialized message
+        # If sending Protobuf we fill proto_data with the serialized message
+        # TODO: add an encoding field for serializer
+
+        if self._payload_serialization_format != PROTOBUF_DATA_CONTENT_TYPE:
+            return agent_worker_pb2.Message(
+                cloudEvent=cloudevent_pb2.CloudEvent(
+                    id=message_id,
+                    spec_version="1.0",
+                    type=topic_id.type,
+                    source=topic_id.source,
+                    attributes=attributes,
+                    # TODO: use text, or proto fields appropriately
+                    binary_data=serialized_message,
+                )
+            )
+        # We need to unpack the serialized proto back into an Any
+        # TODO: find a way to prevent the roundtrip serialization
+        any_proto = any_pb2.Any()
+        any_proto.ParseFromString(serialized_message)
+        return agent_worker_pb2.Message(
+            cloudEvent=cloudevent_pb2.CloudEvent(
+                id=message_id,
+                spec_version="1.0",
+                type=topic_id.type,
+                source=topic_id.source,
+                attributes=attributes,
+                proto_data=any_proto,
+            )
+        )
 
     async def send_message(
         self,
@@ -366,12 +568,16 @@ async def send_message(
         sender: AgentId | None = None,
         cancellation_token: CancellationToken | None = None,
         message_id: str | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        timeout: float | None = None,
     ) -> Any:
         # TODO: use message_id
+        # Messages are handed to the host connection as they are sent, so there is no local queue to prioritize.
         if not self._running:
             raise ValueError("Runtime must be running when sending message.")
         if self._host_connection is None:
             raise RuntimeError("Host connection is not set.")
+        deadline = resolve_deadline(timeout)
         data_type = self._serialization_registry.type_name(message)
         with self._trace_helper.trace_block(
             "create", recipient, parent=None, extraAttributes={"message_type": data_type}
@@ -380,30 +586,73 @@ async def send_message(
             future = asyncio.get_event_loop().create_future()
             request_id = await self._get_new_request_id()
             self._pending_requests[request_id] = future
-            serialized_message = self._serialization_registry.serialize(
-                message, type_name=data_type, data_content_type=JSON_DATA_CONTENT_TYPE
-            )
             telemetry_metadata = get_telemetry_grpc_metadata()
-            runtime_message = agent_worker_pb2.Message(
-                request=agent_worker_pb2.RpcRequest(
-                    request_id=request_id,
-                    target=agent_worker_pb2.AgentId(type=recipient.type, key=recipient.key),
-                    source=agent_worker_pb2.AgentId(type=sender.type, key=sender.key) if sender is not None else None,
-                    metadata=telemetry_metadata,
-                    payload=agent_worker_pb2.Payload(
-                        data_type=data_type,
-                        data=serialized_message,
-                        data_content_type=JSON_DATA_CONTENT_TYPE,
-                    ),
-                )
+            runtime_message = self._build_rpc_request(
+                message, data_type, recipient, sender, request_id, telemetry_metadata, deadline
             )
 
-            # TODO: Find a way to handle timeouts/errors
-            task = asyncio.create_task(self._send_message(runtime_message, "send", recipient, telemetry_metadata))
-            self._background_tasks.add(task)
-            task.add_done_callback(self._raise_on_exception)
-            task.add_done_callback(self._background_tasks.discard)
-            return await future
+            self._spawn_send(self._send_messages([runtime_message], "send", recipient, telemetry_metadata))
+            if deadline is None:
+                return await future
+            return (await self._wait_for_responses([request_id], [future], deadline))[0]
+
+    async def send_messages(
+        self,
+        messages: Sequence[Any],
+        recipient: AgentId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_ids: Sequence[str] | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        timeout: float | None = None,
+    ) -> List[Any]:
+        # TODO: use message_ids
+        if not self._running:
+            raise ValueError("Runtime must be running when sending message.")
+        if self._host_connection is None:
+            raise RuntimeError("Host connection is not set.")
+        if not messages:
+            return []
+        deadline = resolve_deadline(timeout)
+        data_types = [self._serialization_registry.type_name(message) for message in messages]
+        with self._trace_helper.trace_block(
+            "create",
+            recipient,
+            parent=None,
+            extraAttributes={"message_type": ",".join(sorted(set(data_types))), "batch_size": len(messages)},
+        ):
+            loop = asyncio.get_event_loop()
+            request_ids = await self._get_new_request_ids(len(messages))
+            futures: List[Future[Any]] = []
+            for request_id in request_ids:
+                future = loop.create_future()
+                self._pending_requests[request_id] = future
+                futures.append(future)
+            telemetry_metadata = get_telemetry_grpc_metadata()
+            runtime_messages = [
+                self._build_rpc_request(message, data_type, recipient, sender, request_id, telemetry_metadata, deadline)
+                for message, data_type, request_id in zip(messages, data_types, request_ids, strict=True)
+            ]
+
+            self._spawn_send(self._send_messages(runtime_messages, "send", recipient, telemetry_metadata))
+            if deadline is None:
+                return list(await asyncio.gather(*futures))
+            return await self._wait_for_responses(request_ids, futures, deadline)
+
+    async def _wait_for_responses(
+        self, request_ids: Sequence[str], futures: Sequence[Future[Any]], deadline: float
+    ) -> List[Any]:
+        """Waits for the responses until ``deadline``, and forgets the requests that are still pending then."""
+        try:
+            return list(await asyncio.wait_for(asyncio.gather(*futures), deadline - time.time()))
+        except asyncio.TimeoutError:
+            self._timed_out_messages += sum(1 for future in futures if future.cancelled())
+            raise MessageTimeoutException("The message got no response before its deadline.") from None
+        finally:
+            for request_id in request_ids:
+                self._pending_requests.pop(request_id, None)
+                self._negotiating_requests.pop(request_id, None)
 
     async def publish_message(
         self,
@@ -413,6 +662,7 @@ async def publish_message(
         sender: AgentId | None = None,
         cancellation_token: CancellationToken | None = None,
         message_id: str | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
     ) -> None:
         if not self._running:
             raise ValueError("Runtime must be running when publishing message.")
@@ -425,64 +675,45 @@ async def publish_message(
         with self._trace_helper.trace_block(
             "create", topic_id, parent=None, extraAttributes={"message_type": message_type}
         ):
-            serialized_message = self._serialization_registry.serialize(
-                message, type_name=message_type, data_content_type=self._payload_serialization_format
-            )
+            runtime_message = self._build_cloud_event(message, message_type, topic_id, sender, message_id)
+            telemetry_metadata = get_telemetry_grpc_metadata()
+            self._spawn_send(self._send_messages([runtime_message], "publish", topic_id, telemetry_metadata))
 
-            sender_id = sender or AgentId("unknown", "unknown")
-            attributes = {
-                _constants.DATA_CONTENT_TYPE_ATTR: cloudevent_pb2.CloudEvent.CloudEventAttributeValue(
-                    ce_string=self._payload_serialization_format
-                ),
-                _constants.DATA_SCHEMA_ATTR: cloudevent_pb2.CloudEvent.CloudEventAttributeValue(ce_string=message_type),
-                _constants.AGENT_SENDER_TYPE_ATTR: cloudevent_pb2.CloudEvent.CloudEventAttributeValue(
-                    ce_string=sender_id.type
-                ),
-                _constants.AGENT_SENDER_KEY_ATTR: cloudevent_pb2.CloudEvent.CloudEventAttributeValue(
-                    ce_string=sender_id.key
-                ),
-                _constants.MESSAGE_KIND_ATTR: cloudevent_pb2.CloudEvent.CloudEventAttributeValue(
-                    ce_string=_constants.MESSAGE_KIND_VALUE_PUBLISH
-                ),
-            }
-
-            # If sending JSON we fill text_data with the serialized message
-            # If sending Protobuf we fill proto_data with the serialized message
-            # TODO: add an encoding field for serializer
-
-            if self._payload_serialization_format == JSON_DATA_CONTENT_TYPE:
-                runtime_message = agent_worker_pb2.Message(
-                    cloudEvent=cloudevent_pb2.CloudEvent(
-                        id=message_id,
-                        spec_version="1.0",
-                        type=topic_id.type,
-                        source=topic_id.source,
-                        attributes=attributes,
-                        # TODO: use text, or proto fields appropriately
-                        binary_data=serialized_message,
-                    )
-                )
-            else:
-                # We need to unpack the serialized proto back into an Any
-                # TODO: find a way to prevent the roundtrip serialization
-                any_proto = any_pb2.Any()
-                any_proto.ParseFromString(serialized_message)
-                runtime_message = agent_worker_pb2.Message(
-                    cloudEvent=cloudevent_pb2.CloudEvent(
-                        id=message_id,
-                        spec_version="1.0",
-                        type=topic_id.type,
-                        source=topic_id.source,
-                        attributes=attributes,
-                        proto_data=any_proto,
-                    )
-                )
+    async def publish_messages(
+        self,
+        messages: Sequence[Any],
+        topic_id: TopicId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_ids: Sequence[str] | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+    ) -> None:
+        if not self._running:
+            raise ValueError("Runtime must be running when publishing message.")
+        if self._host_connection is None:
+            raise RuntimeError("Host connection is not set.")
+        if not messages:
+            return
+        if message_ids is None:
+            batch_id = uuid.uuid4()
+            message_ids = [f"{batch_id}-{index}" for index in range(len(messages))]
+        elif len(message_ids) != len(messages):
+            raise ValueError(f"Expected {len(messages)} message ids, got {len(message_ids)}.")
 
+        message_types = [self._serialization_registry.type_name(message) for message in messages]
+        with self._trace_helper.trace_block(
+            "create",
+            topic_id,
+            parent=None,
+            extraAttributes={"message_type": ",".join(sorted(set(message_types))), "batch_size": len(messages)},
+        ):
+            runtime_messages = [
+                self._build_cloud_event(message, message_type, topic_id, sender, message_id)
+                for message, message_type, message_id in zip(messages, message_types, message_ids, strict=True)
+            ]
             telemetry_metadata = get_telemetry_grpc_metadata()
-            task = asyncio.create_task(self._send_message(runtime_message, "publish", topic_id, telemetry_metadata))
-            self._background_tasks.add(task)
-            task.add_done_callback(self._raise_on_exception)
-            task.add_done_callback(self._background_tasks.discard)
+            self._spawn_send(self._send_messages(runtime_messages, "publish", topic_id, telemetry_metadata))
 
     async def save_state(self) -> Mapping[str, Any]:
         raise NotImplementedError("Saving state is not yet implemented.")
@@ -504,7 +735,13 @@ async def _get_new_request_id(self) -> str:
             self._next_request_id += 1
             return str(self._next_request_id)
 
-    async def _process_request(self, request: agent_worker_pb2.RpcRequest) -> None:
+    async def _get_new_request_ids(self, count: int) -> List[str]:
+        async with self._pending_requests_lock:
+            first = self._next_request_id + 1
+            self._next_request_id += count
+            return [str(request_id) for request_id in range(first, first + count)]
+
+    async def _process_request(self, request: agent_worker_pb2.RpcRequest, received: float) -> None:
         assert self._host_connection is not None
         recipient = AgentId(request.target.type, request.target.key)
         sender: AgentId | None = None
@@ -521,6 +758,23 @@ async def _process_request(self, request: agent_worker_pb2.RpcRequest) -> None:
             data_content_type=request.payload.data_content_type,
         )
 
+        deadline: float | None = None
+        if _constants.TIMEOUT_METADATA_KEY in request.metadata:
+            deadline = time.time() + float(request.metadata[_constants.TIMEOUT_METADATA_KEY])
+            if time.time() >= deadline:
+                # The sender has stopped waiting, so the response would be discarded.
+                self._metrics.record_dropped("expired")
+                await self._host_connection.send(
+                    agent_worker_pb2.Message(
+                        response=agent_worker_pb2.RpcResponse(
+                            request_id=request.request_id,
+                            error="The message expired before it was handled.",
+                            metadata=get_telemetry_grpc_metadata(),
+                        ),
+                    )
+                )
+                return
+
         # Get the receiving agent and prepare the message context.
         rec_agent = await self._get_agent(recipient)
         message_context = MessageContext(
@@ -529,11 +783,11 @@ async def _process_request(self, request: agent_worker_pb2.RpcRequest) -> None:
             is_rpc=True,
             cancellation_token=CancellationToken(),
             message_id=request.request_id,
+            deadline=deadline,
         )
 
-        # Call the receiving agent.
-        try:
-            with MessageHandlerContext.populate_context(rec_agent.id):
+        async def call_agent() -> Any:
+            with MessageHandlerContext.populate_context(rec_agent.id, deadline):
                 with self._trace_helper.trace_block(
                     "process",
                     rec_agent.id,
@@ -541,7 +795,21 @@ async def _process_request(self, request: agent_worker_pb2.RpcRequest) -> None:
                     attributes={"request_id": request.request_id},
                     extraAttributes={"message_type": request.payload.data_type},
                 ):
-                    result = await rec_agent.on_message(message, ctx=message_context)
+                    started = time.perf_counter()
+                    self._metrics.record_queue_wait(started - received)
+                    try:
+                        return await rec_agent.on_message(message, ctx=message_context)
+                    finally:
+                        self._metrics.record_handler(
+                            recipient.type, type(message).__name__, time.perf_counter() - started
+                        )
+
+        # Call the receiving agent.
+        try:
+            if self._mailboxes.is_limited(recipient):
+                result = await self._mailboxes.submit(recipient, call_agent)
+            else:
+                result = await call_agent()
         except BaseException as e:
             response_message = agent_worker_pb2.Message(
                 response=agent_worker_pb2.RpcResponse(
@@ -554,10 +822,22 @@ async def _process_request(self, request: agent_worker_pb2.RpcRequest) -> None:
             await self._host_connection.send(response_message)
             return
 
-        # Serialize the result.
+        # Serialize the result, in the content type of the request if possible.
+        metadata = get_telemetry_grpc_metadata()
+        if _constants.ACCEPT_CONTENT_TYPES_METADATA_KEY in request.metadata:
+            # The sender asks which content types this worker accepts, and says which ones it accepts.
+            metadata[_constants.ACCEPT_CONTENT_TYPES_METADATA_KEY] = self._preferred_content_types
+            candidates = request.metadata[_constants.ACCEPT_CONTENT_TYPES_METADATA_KEY].split(",")
+        else:
+            candidates = [request.payload.data_content_type]
+        content_type = JSON_DATA_CONTENT_TYPE
         result_type = self._serialization_registry.type_name(result)
-        serialized_result = self._serialization_registry.serialize(
-            result, type_name=result_type, data_content_type=JSON_DATA_CONTENT_TYPE
+        for candidate in candidates:
+            if self._serialization_registry.is_registered(result_type, candidate):
+                content_type = candidate
+                break
+        result_type, serialized_result = self._serialization_registry.serialize_message(
+            result, data_content_type=content_type
         )
 
         # Create the response message.
@@ -567,9 +847,9 @@ async def _process_request(self, request: agent_worker_pb2.RpcRequest) -> None:
                 payload=agent_worker_pb2.Payload(
                     data_type=result_type,
                     data=serialized_result,
-                    data_content_type=JSON_DATA_CONTENT_TYPE,
+                    data_content_type=content_type,
                 ),
-                metadata=get_telemetry_grpc_metadata(),
+                metadata=metadata,
             )
         )
 
@@ -590,14 +870,22 @@ async def _process_response(self, response: agent_worker_pb2.RpcResponse) -> Non
                 type_name=response.payload.data_type,
                 data_content_type=response.payload.data_content_type,
             )
+            agent_type = self._negotiating_requests.pop(response.request_id, None)
+            if agent_type is not None and len(response.error) == 0:
+                # Workers that do not negotiate send no list back, and accept JSON.
+                accepted = response.metadata.get(_constants.ACCEPT_CONTENT_TYPES_METADATA_KEY, JSON_DATA_CONTENT_TYPE)
+                self._accepted_content_types[agent_type] = accepted.split(",")
             # Get the future and set the result.
-            future = self._pending_requests.pop(response.request_id)
+            future = self._pending_requests.pop(response.request_id, None)
+            if future is None or future.done():
+                # The sender stopped waiting for the response, for example because its deadline passed.
+                return
             if len(response.error) > 0:
                 future.set_exception(Exception(response.error))
             else:
                 future.set_result(result)
 
-    async def _process_event(self, event: cloudevent_pb2.CloudEvent) -> None:
+    async def _process_event(self, event: cloudevent_pb2.CloudEvent, received: float) -> None:
         event_attributes = event.attributes
         sender: AgentId | None = None
         if (
@@ -615,7 +903,7 @@ async def _process_event(self, event: cloudevent_pb2.CloudEvent) -> None:
         message_content_type = event_attributes[_constants.DATA_CONTENT_TYPE_ATTR].ce_string
         message_type = event_attributes[_constants.DATA_SCHEMA_ATTR].ce_string
 
-        if message_content_type == JSON_DATA_CONTENT_TYPE:
+        if message_content_type in (JSON_DATA_CONTENT_TYPE, MSGPACK_DATA_CONTENT_TYPE):
             message = self._serialization_registry.deserialize(
                 event.binary_data, type_name=message_type, data_content_type=message_content_type
             )
@@ -687,10 +975,20 @@ async def send_message(agent: Agent, message_context: MessageContext) -> Any:
                         parent=stringify_attributes(event.attributes),
                         extraAttributes={"message_type": message_type},
                     ):
-                        await agent.on_message(message, ctx=message_context)
+                        started = time.perf_counter()
+                        try:
+                            await agent.on_message(message, ctx=message_context)
+                        finally:
+                            self._metrics.record_handler(
+                                agent.id.type, type(message).__name__, time.perf_counter() - started
+                            )
 
-                future = send_message(agent, message_context)
-            responses.append(future)
+                if self._mailboxes.is_limited(agent_id):
+                    responses.append(self._mailboxes.submit(agent_id, partial(send_message, agent, message_context)))
+                else:
+                    responses.append(send_message(agent, message_context))
+        self._metrics.record_queue_wait(time.perf_counter() - received)
+        self._metrics.record_fanout(len(responses))
         # Wait for all responses.
         try:
             await asyncio.gather(*responses)
@@ -703,6 +1001,7 @@ async def register_factory(
         agent_factory: Callable[[], T | Awaitable[T]],
         *,
         expected_class: type[T] | None = None,
+        max_concurrency: int | None = None,
     ) -> AgentType:
         if isinstance(type, str):
             type = AgentType(type)
@@ -711,6 +1010,8 @@ async def register_factory(
             raise ValueError(f"Agent with type {type} already exists.")
         if self._host_connection is None:
             raise RuntimeError("Host connection is not set.")
+        if max_concurrency is not None:
+            self._mailboxes.set_limit(type.type, max_concurrency)
 
         async def factory_wrapper() -> T:
             maybe_agent_instance = agent_factory()
@@ -780,6 +1081,9 @@ async def _get_agent(self, agent_id: AgentId) -> Agent:
         if agent_id.type not in self._agent_factories:
             raise ValueError(f"Agent with name {agent_id.type} not found.")
 
+        return await self._agent_activations.activate(agent_id, partial(self._activate_agent, agent_id))
+
+    async def _activate_agent(self, agent_id: AgentId) -> Agent:
         agent_factory = self._agent_factories[agent_id.type]
         agent = await self._invoke_agent_factory(agent_factory, agent_id)
         self._instantiated_agents[agent_id] = agent
@@ -864,5 +1168,8 @@ async def get(
             instance_getter=self._get_agent,
         )
 
+    async def get_many(self, type: AgentType | str, /, keys: Sequence[str], *, lazy: bool = True) -> List[AgentId]:
+        return await get_many_impl(type=type, keys=keys, lazy=lazy, instance_getter=self._get_agent)
+
     def add_message_serializer(self, serializer: MessageSerializer[Any] | Sequence[MessageSerializer[Any]]) -> None:
         self._serialization_registry.add_serializer(serializer)
@@ -3,6 +3,7 @@
 import signal
 from typing import Optional, Sequence
 
+from ._batching import DEFAULT_MESSAGE_BATCHING_CONFIG, MessageBatchingConfig
 from ._constants import GRPC_IMPORT_ERROR_STR
 from ._type_helpers import ChannelArgumentType
 from ._worker_runtime_host_servicer import GrpcWorkerAgentRuntimeHostServicer
@@ -17,9 +18,14 @@
 
 
 class GrpcWorkerAgentRuntimeHost:
-    def __init__(self, address: str, extra_grpc_config: Optional[ChannelArgumentType] = None) -> None:
+    def __init__(
+        self,
+        address: str,
+        extra_grpc_config: Optional[ChannelArgumentType] = None,
+        message_batching: MessageBatchingConfig | None = DEFAULT_MESSAGE_BATCHING_CONFIG,
+    ) -> None:
         self._server = grpc.aio.server(options=extra_grpc_config)
-        self._servicer = GrpcWorkerAgentRuntimeHostServicer()
+        self._servicer = GrpcWorkerAgentRuntimeHostServicer(message_batching=message_batching)
         agent_worker_pb2_grpc.add_AgentRpcServicer_to_server(self._servicer, self._server)
         self._server.add_insecure_port(address)
         self._address = address
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import time
 from _collections_abc import AsyncIterator, Iterator
 from asyncio import Future, Task
 from typing import Any, Dict, Set, cast
@@ -7,7 +8,8 @@
 from autogen_core import Subscription, TopicId, TypePrefixSubscription, TypeSubscription
 from autogen_core._runtime_impl_helpers import SubscriptionManager
 
-from ._constants import GRPC_IMPORT_ERROR_STR
+from ._batching import DEFAULT_MESSAGE_BATCHING_CONFIG, MessageBatcher, MessageBatchingConfig
+from ._constants import GRPC_IMPORT_ERROR_STR, MESSAGE_BATCH_METADATA_KEY, TIMEOUT_METADATA_KEY
 
 try:
     import grpc
@@ -21,9 +23,15 @@
 
 
 class GrpcWorkerAgentRuntimeHostServicer(agent_worker_pb2_grpc.AgentRpcServicer):
-    """A gRPC servicer that hosts message delivery service for agents."""
+    """A gRPC servicer that hosts message delivery service for agents.
 
-    def __init__(self) -> None:
+    Args:
+        message_batching (MessageBatchingConfig | None): How to coalesce the messages sent to a worker that accepts
+            batches. Pass ``None`` to send every message on its own.
+    """
+
+    def __init__(self, message_batching: MessageBatchingConfig | None = DEFAULT_MESSAGE_BATCHING_CONFIG) -> None:
+        self._message_batching = message_batching
         self._client_id = 0
         self._client_id_lock = asyncio.Lock()
         self._send_queues: Dict[int, asyncio.Queue[agent_worker_pb2.Message]] = {}
@@ -49,14 +57,21 @@ async def OpenChannel(  # type: ignore
         self._send_queues[client_id] = send_queue
         logger.info(f"Client {client_id} connected.")
 
+        batching: MessageBatchingConfig | None = None
+        if self._message_batching is not None:
+            await context.send_initial_metadata([(MESSAGE_BATCH_METADATA_KEY, "1")])
+            if any(key == MESSAGE_BATCH_METADATA_KEY for key, _ in context.invocation_metadata() or ()):
+                batching = self._message_batching
+
         try:
             # Concurrently handle receiving messages from the client and sending messages to the client.
             # This task will receive messages from the client.
             receiving_task = asyncio.create_task(self._receive_messages(client_id, request_iterator))
 
             # Return an async generator that will yield messages from the send queue to the client.
+            batcher = MessageBatcher(send_queue)
             while True:
-                message = await send_queue.get()
+                message = await batcher.next_message(batching)
                 # Yield the message to the client.
                 try:
                     yield message
@@ -98,45 +113,50 @@ async def _receive_messages(
         # Receive messages from the client and process them.
         async for message in request_iterator:
             logger.info(f"Received message from client {client_id}: {message}")
-            oneofcase = message.WhichOneof("message")
-            match oneofcase:
-                case "request":
-                    request: agent_worker_pb2.RpcRequest = message.request
-                    task = asyncio.create_task(self._process_request(request, client_id))
-                    self._background_tasks.add(task)
-                    task.add_done_callback(self._raise_on_exception)
-                    task.add_done_callback(self._background_tasks.discard)
-                case "response":
-                    response: agent_worker_pb2.RpcResponse = message.response
-                    task = asyncio.create_task(self._process_response(response, client_id))
-                    self._background_tasks.add(task)
-                    task.add_done_callback(self._raise_on_exception)
-                    task.add_done_callback(self._background_tasks.discard)
-                case "cloudEvent":
-                    # The proto typing doesnt resolve this one
-                    event = cast(cloudevent_pb2.CloudEvent, message.cloudEvent)  # type: ignore
-                    task = asyncio.create_task(self._process_event(event))
-                    self._background_tasks.add(task)
-                    task.add_done_callback(self._raise_on_exception)
-                    task.add_done_callback(self._background_tasks.discard)
-                case "registerAgentTypeRequest":
-                    register_agent_type: agent_worker_pb2.RegisterAgentTypeRequest = message.registerAgentTypeRequest
-                    task = asyncio.create_task(
-                        self._process_register_agent_type_request(register_agent_type, client_id)
-                    )
-                    self._background_tasks.add(task)
-                    task.add_done_callback(self._raise_on_exception)
-                    task.add_done_callback(self._background_tasks.discard)
-                case "addSubscriptionRequest":
-                    add_subscription: agent_worker_pb2.AddSubscriptionRequest = message.addSubscriptionRequest
-                    task = asyncio.create_task(self._process_add_subscription_request(add_subscription, client_id))
-                    self._background_tasks.add(task)
-                    task.add_done_callback(self._raise_on_exception)
-                    task.add_done_callback(self._background_tasks.discard)
-                case "registerAgentTypeResponse" | "addSubscriptionResponse":
-                    logger.warning(f"Received unexpected message type: {oneofcase}")
-                case None:
-                    logger.warning("Received empty message")
+            if message.WhichOneof("message") == "batch":
+                for item in message.batch.messages:
+                    self._dispatch_message(item, client_id)
+            else:
+                self._dispatch_message(message, client_id)
+
+    def _dispatch_message(self, message: agent_worker_pb2.Message, client_id: int) -> None:
+        oneofcase = message.WhichOneof("message")
+        match oneofcase:
+            case "request":
+                request: agent_worker_pb2.RpcRequest = message.request
+                task = asyncio.create_task(self._process_request(request, client_id))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._raise_on_exception)
+                task.add_done_callback(self._background_tasks.discard)
+            case "response":
+                response: agent_worker_pb2.RpcResponse = message.response
+                task = asyncio.create_task(self._process_response(response, client_id))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._raise_on_exception)
+                task.add_done_callback(self._background_tasks.discard)
+            case "cloudEvent":
+                # The proto typing doesnt resolve this one
+                event = cast(cloudevent_pb2.CloudEvent, message.cloudEvent)  # type: ignore
+                task = asyncio.create_task(self._process_event(event))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._raise_on_exception)
+                task.add_done_callback(self._background_tasks.discard)
+            case "registerAgentTypeRequest":
+                register_agent_type: agent_worker_pb2.RegisterAgentTypeRequest = message.registerAgentTypeRequest
+                task = asyncio.create_task(self._process_register_agent_type_request(register_agent_type, client_id))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._raise_on_exception)
+                task.add_done_callback(self._background_tasks.discard)
+            case "addSubscriptionRequest":
+                add_subscription: agent_worker_pb2.AddSubscriptionRequest = message.addSubscriptionRequest
+                task = asyncio.create_task(self._process_add_subscription_request(add_subscription, client_id))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._raise_on_exception)
+                task.add_done_callback(self._background_tasks.discard)
+            case "registerAgentTypeResponse" | "addSubscriptionResponse":
+                logger.warning(f"Received unexpected message type: {oneofcase}")
+            case None:
+                logger.warning("Received empty message")
 
     async def _process_request(self, request: agent_worker_pb2.RpcRequest, client_id: int) -> None:
         # Deliver the message to a client given the target agent type.
@@ -156,13 +176,34 @@ async def _process_request(self, request: agent_worker_pb2.RpcRequest, client_id
         self._pending_responses.setdefault(target_client_id, {})[request.request_id] = future
 
         # Create a task to wait for the response and send it back to the client.
-        send_response_task = asyncio.create_task(self._wait_and_send_response(future, client_id))
+        deadline: float | None = None
+        if TIMEOUT_METADATA_KEY in request.metadata:
+            # The worker that handles the request gets the same timeout and resolves it against its own clock.
+            deadline = time.time() + float(request.metadata[TIMEOUT_METADATA_KEY])
+        send_response_task = asyncio.create_task(
+            self._wait_and_send_response(future, client_id, target_client_id, request.request_id, deadline)
+        )
         self._background_tasks.add(send_response_task)
         send_response_task.add_done_callback(self._raise_on_exception)
         send_response_task.add_done_callback(self._background_tasks.discard)
 
-    async def _wait_and_send_response(self, future: Future[agent_worker_pb2.RpcResponse], client_id: int) -> None:
-        response = await future
+    async def _wait_and_send_response(
+        self,
+        future: Future[agent_worker_pb2.RpcResponse],
+        client_id: int,
+        target_client_id: int,
+        request_id: str,
+        deadline: float | None,
+    ) -> None:
+        if deadline is None:
+            response = await future
+        else:
+            try:
+                response = await asyncio.wait_for(future, deadline - time.time())
+            except asyncio.TimeoutError:
+                # The sender has stopped waiting, so forget the request instead of waiting for a stuck handler.
+                self._pending_responses.get(target_client_id, {}).pop(request_id, None)
+                return
         message = agent_worker_pb2.Message(response=response)
         send_queue = self._send_queues.get(client_id)
         if send_queue is None:
@@ -172,7 +213,10 @@ async def _wait_and_send_response(self, future: Future[agent_worker_pb2.RpcRespo
 
     async def _process_response(self, response: agent_worker_pb2.RpcResponse, client_id: int) -> None:
         # Setting the result of the future will send the response back to the original sender.
-        future = self._pending_responses[client_id].pop(response.request_id)
+        future = self._pending_responses.get(client_id, {}).pop(response.request_id, None)
+        if future is None:
+            # The request was forgotten because its deadline passed.
+            return
         future.set_result(response)
 
     async def _process_event(self, event: cloudevent_pb2.CloudEvent) -> None:
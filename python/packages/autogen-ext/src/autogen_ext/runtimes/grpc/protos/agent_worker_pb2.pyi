@@ -431,6 +431,26 @@ class SaveStateResponse(google.protobuf.message.Message):
 
 global___SaveStateResponse = SaveStateResponse
 
+@typing.final
+class MessageBatch(google.protobuf.message.Message):
+    """Messages that a peer sends together in one stream message. A worker announces that it accepts batches with the
+    "agbatch" key in the metadata of OpenChannel, and the host with the same key in its initial metadata.
+    """
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    MESSAGES_FIELD_NUMBER: builtins.int
+    @property
+    def messages(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___Message]: ...
+    def __init__(
+        self,
+        *,
+        messages: collections.abc.Iterable[global___Message] | None = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing.Literal["messages", b"messages"]) -> None: ...
+
+global___MessageBatch = MessageBatch
+
 @typing.final
 class Message(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
@@ -442,6 +462,7 @@ class Message(google.protobuf.message.Message):
     REGISTERAGENTTYPERESPONSE_FIELD_NUMBER: builtins.int
     ADDSUBSCRIPTIONREQUEST_FIELD_NUMBER: builtins.int
     ADDSUBSCRIPTIONRESPONSE_FIELD_NUMBER: builtins.int
+    BATCH_FIELD_NUMBER: builtins.int
     @property
     def request(self) -> global___RpcRequest: ...
     @property
@@ -456,6 +477,8 @@ class Message(google.protobuf.message.Message):
     def addSubscriptionRequest(self) -> global___AddSubscriptionRequest: ...
     @property
     def addSubscriptionResponse(self) -> global___AddSubscriptionResponse: ...
+    @property
+    def batch(self) -> global___MessageBatch: ...
     def __init__(
         self,
         *,
@@ -466,9 +489,10 @@ class Message(google.protobuf.message.Message):
         registerAgentTypeResponse: global___RegisterAgentTypeResponse | None = ...,
         addSubscriptionRequest: global___AddSubscriptionRequest | None = ...,
         addSubscriptionResponse: global___AddSubscriptionResponse | None = ...,
+        batch: global___MessageBatch | None = ...,
     ) -> None: ...
-    def HasField(self, field_name: typing.Literal["addSubscriptionRequest", b"addSubscriptionRequest", "addSubscriptionResponse", b"addSubscriptionResponse", "cloudEvent", b"cloudEvent", "message", b"message", "registerAgentTypeRequest", b"registerAgentTypeRequest", "registerAgentTypeResponse", b"registerAgentTypeResponse", "request", b"request", "response", b"response"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing.Literal["addSubscriptionRequest", b"addSubscriptionRequest", "addSubscriptionResponse", b"addSubscriptionResponse", "cloudEvent", b"cloudEvent", "message", b"message", "registerAgentTypeRequest", b"registerAgentTypeRequest", "registerAgentTypeResponse", b"registerAgentTypeResponse", "request", b"request", "response", b"response"]) -> None: ...
-    def WhichOneof(self, oneof_group: typing.Literal["message", b"message"]) -> typing.Literal["request", "response", "cloudEvent", "registerAgentTypeRequest", "registerAgentTypeResponse", "addSubscriptionRequest", "addSubscriptionResponse"] | None: ...
+    def HasField(self, field_name: typing.Literal["addSubscriptionRequest", b"addSubscriptionRequest", "addSubscriptionResponse", b"addSubscriptionResponse", "batch", b"batch", "cloudEvent", b"cloudEvent", "message", b"message", "registerAgentTypeRequest", b"registerAgentTypeRequest", "registerAgentTypeResponse", b"registerAgentTypeResponse", "request", b"request", "response", b"response"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing.Literal["addSubscriptionRequest", b"addSubscriptionRequest", "addSubscriptionResponse", b"addSubscriptionResponse", "batch", b"batch", "cloudEvent", b"cloudEvent", "message", b"message", "registerAgentTypeRequest", b"registerAgentTypeRequest", "registerAgentTypeResponse", b"registerAgentTypeResponse", "request", b"request", "response", b"response"]) -> None: ...
+    def WhichOneof(self, oneof_group: typing.Literal["message", b"message"]) -> typing.Literal["request", "response", "cloudEvent", "registerAgentTypeRequest", "registerAgentTypeResponse", "addSubscriptionRequest", "addSubscriptionResponse", "batch"] | None: ...
 
 global___Message = Message
@@ -0,0 +1,5 @@
+from ._sharded_runtime import ShardedAgentRuntime
+
+__all__ = [
+    "ShardedAgentRuntime",
+]
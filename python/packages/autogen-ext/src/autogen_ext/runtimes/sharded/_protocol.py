@@ -0,0 +1,225 @@
+import asyncio
+import pickle
+import queue
+import threading
+import zlib
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+
+from autogen_core import JSON_DATA_CONTENT_TYPE, AgentId, MessagePriority, TopicId
+from autogen_core._serialization import LazyPayload, SerializationRegistry
+
+# The shard index used for messages that originate in the parent process.
+PARENT = -1
+
+
+def shard_of(agent_id: AgentId, num_shards: int) -> int:
+    """Returns the shard that hosts ``agent_id``. The hash is stable across processes."""
+    return zlib.crc32(f"{agent_id.type}/{agent_id.key}".encode("utf-8")) % num_shards
+
+
+@dataclass(kw_only=True)
+class Payload:
+    """A message serialized with a :class:`~autogen_core._serialization.SerializationRegistry`."""
+
+    type_name: str
+    data_content_type: str
+    data: bytes
+
+
+def serialize_payload(registry: SerializationRegistry, message: Any) -> Payload:
+    # Handlers that return nothing are common, and NoneType has no registered serializer.
+    if message is None:
+        return Payload(type_name="", data_content_type="", data=b"")
+    type_name, data = registry.serialize_message(message, data_content_type=JSON_DATA_CONTENT_TYPE)
+    return Payload(type_name=type_name, data_content_type=JSON_DATA_CONTENT_TYPE, data=data)
+
+
+def deserialize_payload(registry: SerializationRegistry, payload: Payload) -> Any:
+    if payload.type_name == "":
+        return None
+    return registry.deserialize(payload.data, type_name=payload.type_name, data_content_type=payload.data_content_type)
+
+
+def shared_payload(message: LazyPayload) -> Payload:
+    """Like :func:`serialize_payload`, but reuses the payload if the message was already serialized to JSON."""
+    if message.message is None:
+        return Payload(type_name="", data_content_type="", data=b"")
+    type_name, data = message.serialize(JSON_DATA_CONTENT_TYPE)
+    return Payload(type_name=type_name, data_content_type=JSON_DATA_CONTENT_TYPE, data=data)
+
+
+def received_payload(registry: SerializationRegistry, payload: Payload) -> LazyPayload:
+    """Like :func:`deserialize_payload`, but keeps the received payload so that the message is not serialized
+    again on this side."""
+    message = deserialize_payload(registry, payload)
+    if payload.type_name == "":
+        return LazyPayload(message, registry)
+    return LazyPayload(message, registry, payloads={payload.data_content_type: (payload.type_name, payload.data)})
+
+
+def check_picklable_factory(agent_factory: Callable[[], Any]) -> None:
+    """Agent types registered after the shards were forked are sent to them, so their factory must be picklable."""
+    try:
+        pickle.dumps(agent_factory)
+    except Exception as e:
+        raise ValueError(
+            "Agent types registered after the sharded runtime has started must have a picklable factory, such as "
+            "the agent class or a module-level function. Register the agent type before calling start() to use "
+            "any other factory."
+        ) from e
+
+
+def picklable_exception(exception: BaseException) -> BaseException:
+    try:
+        pickle.dumps(exception)
+        return exception
+    except Exception:
+        return RuntimeError(f"{type(exception).__name__}: {exception}")
+
+
+@dataclass(kw_only=True)
+class SendRequest:
+    origin: int
+    request_id: int
+    sender: AgentId | None
+    recipient: AgentId
+    payload: Payload
+    message_id: str
+    priority: MessagePriority
+    deadline: float | None = None
+    """When the sender stops waiting for the response, in seconds since the epoch."""
+
+
+@dataclass(kw_only=True)
+class SendResponse:
+    origin: int
+    request_id: int
+    payload: Payload | None
+    error: BaseException | None
+
+
+@dataclass(kw_only=True)
+class PublishRequest:
+    origin: int
+    sender: AgentId | None
+    topic_id: TopicId
+    payload: Payload
+    message_id: str
+    priority: MessagePriority
+
+
+@dataclass(kw_only=True)
+class ControlRequest:
+    """Runs a runtime method, such as ``agent_save_state``, on the target shard."""
+
+    origin: int
+    request_id: int
+    target: int
+    method: str
+    args: Tuple[Any, ...]
+
+
+@dataclass(kw_only=True)
+class ControlResponse:
+    origin: int
+    request_id: int
+    result: Any
+    error: BaseException | None
+
+
+@dataclass(kw_only=True)
+class RegistryUpdate:
+    """Registers an agent type, adds or removes a subscription, or adds a serializer, on every shard."""
+
+    origin: int
+    method: str
+    args: Tuple[Any, ...]
+
+
+@dataclass(kw_only=True)
+class IdleProbe:
+    request_id: int
+
+
+@dataclass(kw_only=True)
+class IdleReport:
+    request_id: int
+    sent: int
+    received: int
+
+
+@dataclass(kw_only=True)
+class Shutdown:
+    pass
+
+
+# Messages that represent work for agents. They are counted to detect when all shards are idle.
+WORK_MESSAGES = (SendRequest, SendResponse, PublishRequest)
+
+
+class Channel:
+    """One end of a pipe between the parent process and a shard process.
+
+    Messages are received through the event loop's reader callbacks and written by a background thread, so that
+    a full pipe never blocks the event loop while the other side is also writing."""
+
+    def __init__(
+        self, connection: Connection, on_message: Callable[[Any], None], on_closed: Callable[[], None]
+    ) -> None:
+        self._connection = connection
+        self._on_message = on_message
+        self._on_closed = on_closed
+        self._outbox: queue.SimpleQueue[bytes | None] = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.sent = 0
+        self.received = 0
+
+    def open(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(self._connection.fileno(), self._read)
+        self._writer.start()
+
+    def send(self, message: Any) -> None:
+        if isinstance(message, WORK_MESSAGES):
+            self.sent += 1
+        self._outbox.put(pickle.dumps(message))
+
+    async def close(self) -> None:
+        if self._loop is not None:
+            self._loop.remove_reader(self._connection.fileno())
+            self._outbox.put(None)
+            await asyncio.to_thread(self._writer.join)
+            self._loop = None
+        self._connection.close()
+
+    def _write_loop(self) -> None:
+        while True:
+            data = self._outbox.get()
+            if data is None:
+                return
+            try:
+                self._connection.send_bytes(data)
+            except OSError:
+                return
+
+    def _read(self) -> None:
+        try:
+            while self._connection.poll():
+                message = pickle.loads(self._connection.recv_bytes())
+                if isinstance(message, WORK_MESSAGES):
+                    self.received += 1
+                self._on_message(message)
+        except (EOFError, OSError):
+            assert self._loop is not None
+            self._loop.remove_reader(self._connection.fileno())
+            self._on_closed()
+
+
+def merge_states(states: List[Mapping[str, Any]]) -> Dict[str, Any]:
+    result: Dict[str, Any] = {}
+    for state in states:
+        result.update(state)
+    return result
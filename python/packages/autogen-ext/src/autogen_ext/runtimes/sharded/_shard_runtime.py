@@ -0,0 +1,511 @@
+import asyncio
+import signal
+import time
+import uuid
+from asyncio import Future, Task
+from collections.abc import Sequence
+from multiprocessing.connection import Connection
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Set, TypeVar
+
+from autogen_core import (
+    Agent,
+    AgentId,
+    AgentMetadata,
+    AgentType,
+    CancellationToken,
+    MessagePriority,
+    MessageSerializer,
+    SingleThreadedAgentRuntime,
+    Subscription,
+    TopicId,
+)
+from autogen_core._runtime_impl_helpers import SubscriptionManager, resolve_deadline
+from autogen_core._serialization import LazyPayload
+from autogen_core.exceptions import MessageTimeoutException
+
+from ._protocol import (
+    PARENT,
+    Channel,
+    ControlRequest,
+    ControlResponse,
+    IdleProbe,
+    IdleReport,
+    PublishRequest,
+    RegistryUpdate,
+    SendRequest,
+    SendResponse,
+    Shutdown,
+    check_picklable_factory,
+    deserialize_payload,
+    picklable_exception,
+    received_payload,
+    serialize_payload,
+    shared_payload,
+    shard_of,
+)
+
+T = TypeVar("T", bound=Agent)
+
+# Methods that a shard runs on behalf of another process.
+_CONTROL_METHODS = {"activate", "agent_metadata", "agent_save_state", "agent_load_state", "save_state", "load_state"}
+
+
+class _LocalSubscriptionManager(SubscriptionManager):
+    """Resolves only the recipients that are hosted by the owning shard."""
+
+    def __init__(self, runtime: "ShardRuntime") -> None:
+        super().__init__()
+        self._runtime = runtime
+
+    async def get_subscribed_recipients(self, topic: TopicId) -> List[AgentId]:
+        recipients = await super().get_subscribed_recipients(topic)
+        return [recipient for recipient in recipients if self._runtime.is_local(recipient)]
+
+
+class ShardRuntime(SingleThreadedAgentRuntime):
+    """The runtime that runs inside each shard process of a :class:`ShardedAgentRuntime`.
+
+    It hosts the agents whose ids hash to its shard and forwards everything else to the parent process. Before it
+    is attached to a shard it acts as the registry of agent factories, subscriptions and serializers that every
+    shard process inherits when it is forked.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._subscription_manager = _LocalSubscriptionManager(self)
+        self._shard_index = PARENT
+        self._num_shards = 1
+        self._channel: Channel | None = None
+        self._next_request_id = 0
+        self._pending_sends: Dict[int, Future[Any]] = {}
+        self._pending_controls: Dict[int, Future[Any]] = {}
+        # Tasks handling work received from other shards. The shard is not idle until they finish.
+        self._inbound_tasks: Set[Task[Any]] = set()
+        self._shutdown: asyncio.Event | None = None
+
+    def is_local(self, agent_id: AgentId) -> bool:
+        return self._channel is None or shard_of(agent_id, self._num_shards) == self._shard_index
+
+    async def serve(self, shard_index: int, num_shards: int, connection: Connection) -> None:
+        """Processes messages for this shard until the parent process asks it to shut down."""
+        self._shard_index = shard_index
+        self._num_shards = num_shards
+        self._shutdown = asyncio.Event()
+        self._channel = Channel(connection, self._on_message, self._shutdown.set)
+        self._channel.open()
+        self.start()
+        await self._shutdown.wait()
+        await self.close()
+        await self._channel.close()
+
+    async def send_message(
+        self,
+        message: Any,
+        recipient: AgentId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_id: str | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        timeout: float | None = None,
+    ) -> Any:
+        if self.is_local(recipient):
+            return await super().send_message(
+                message,
+                recipient,
+                sender=sender,
+                cancellation_token=cancellation_token,
+                message_id=message_id,
+                priority=priority,
+                timeout=timeout,
+            )
+
+        assert self._channel is not None
+        deadline = resolve_deadline(timeout)
+        request_id = self._new_request_id()
+        future = asyncio.get_running_loop().create_future()
+        self._pending_sends[request_id] = future
+        if cancellation_token is not None:
+            cancellation_token.link_future(future)
+        if deadline is not None:
+            self._expire_at(future, deadline)
+        try:
+            self._channel.send(
+                SendRequest(
+                    origin=self._shard_index,
+                    request_id=request_id,
+                    sender=sender,
+                    recipient=recipient,
+                    payload=serialize_payload(self._serialization_registry, message),
+                    message_id=message_id if message_id is not None else str(uuid.uuid4()),
+                    priority=priority,
+                    deadline=deadline,
+                )
+            )
+            return await future
+        finally:
+            self._pending_sends.pop(request_id, None)
+
+    async def publish_message(
+        self,
+        message: Any,
+        topic_id: TopicId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_id: str | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+    ) -> None:
+        if message_id is None:
+            message_id = str(uuid.uuid4())
+        # The local delivery and the other shards share one serialization of the message.
+        payload = LazyPayload(message, self._serialization_registry)
+        await self._publish(
+            message,
+            topic_id,
+            sender=sender,
+            cancellation_token=cancellation_token,
+            message_id=message_id,
+            priority=priority,
+            payload=payload,
+        )
+        if self._channel is not None:
+            self._channel.send(
+                PublishRequest(
+                    origin=self._shard_index,
+                    sender=sender,
+                    topic_id=topic_id,
+                    payload=shared_payload(payload),
+                    message_id=message_id,
+                    priority=priority,
+                )
+            )
+
+    async def send_messages(
+        self,
+        messages: Sequence[Any],
+        recipient: AgentId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_ids: Sequence[str] | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        timeout: float | None = None,
+    ) -> List[Any]:
+        if self.is_local(recipient):
+            return await super().send_messages(
+                messages,
+                recipient,
+                sender=sender,
+                cancellation_token=cancellation_token,
+                message_ids=message_ids,
+                priority=priority,
+                timeout=timeout,
+            )
+        return list(
+            await asyncio.gather(
+                *(
+                    self.send_message(
+                        message,
+                        recipient,
+                        sender=sender,
+                        cancellation_token=cancellation_token,
+                        message_id=message_ids[index] if message_ids is not None else None,
+                        priority=priority,
+                        timeout=timeout,
+                    )
+                    for index, message in enumerate(messages)
+                )
+            )
+        )
+
+    async def publish_messages(
+        self,
+        messages: Sequence[Any],
+        topic_id: TopicId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_ids: Sequence[str] | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+    ) -> None:
+        if message_ids is None:
+            message_ids = [str(uuid.uuid4()) for _ in messages]
+        # Like in publish_message, the local delivery and the other shards share one serialization of each message.
+        payloads = [LazyPayload(message, self._serialization_registry) for message in messages]
+        await self._publish_many(
+            messages,
+            topic_id,
+            sender=sender,
+            cancellation_token=cancellation_token,
+            message_ids=message_ids,
+            priority=priority,
+            payloads=payloads,
+        )
+        if self._channel is not None:
+            for payload, message_id in zip(payloads, message_ids, strict=True):
+                self._channel.send(
+                    PublishRequest(
+                        origin=self._shard_index,
+                        sender=sender,
+                        topic_id=topic_id,
+                        payload=shared_payload(payload),
+                        message_id=message_id,
+                        priority=priority,
+                    )
+                )
+
+    async def agent_metadata(self, agent: AgentId) -> AgentMetadata:
+        if self.is_local(agent):
+            return await super().agent_metadata(agent)
+        return await self._control(agent, "agent_metadata", agent)  # type: ignore[no-any-return]
+
+    async def agent_save_state(self, agent: AgentId) -> Mapping[str, Any]:
+        if self.is_local(agent):
+            return await super().agent_save_state(agent)
+        return await self._control(agent, "agent_save_state", agent)  # type: ignore[no-any-return]
+
+    async def agent_load_state(self, agent: AgentId, state: Mapping[str, Any]) -> None:
+        if self.is_local(agent):
+            await super().agent_load_state(agent, state)
+        else:
+            await self._control(agent, "agent_load_state", agent, state)
+
+    async def get(
+        self, id_or_type: AgentId | AgentType | str, /, key: str = "default", *, lazy: bool = True
+    ) -> AgentId:
+        agent_id = _to_agent_id(id_or_type, key)
+        if not lazy:
+            await self.activate(agent_id)
+        return agent_id
+
+    async def get_many(self, type: AgentType | str, /, keys: Sequence[str], *, lazy: bool = True) -> List[AgentId]:
+        agent_ids = [_to_agent_id(type, key) for key in keys]
+        if not lazy:
+            await asyncio.gather(*(self.activate(agent_id) for agent_id in agent_ids))
+        return agent_ids
+
+    async def activate(self, agent_id: AgentId) -> None:
+        """Instantiates the agent on the shard that hosts it."""
+        if self.is_local(agent_id):
+            await self._get_agent(agent_id)
+        else:
+            await self._control(agent_id, "activate", agent_id)
+
+    async def _get_agent(self, agent_id: AgentId) -> Agent:
+        if not self.is_local(agent_id):
+            raise LookupError(
+                f"Agent {agent_id} is hosted by shard {shard_of(agent_id, self._num_shards)}, not shard {self._shard_index}."
+            )
+        return await super()._get_agent(agent_id)
+
+    async def register_factory(
+        self,
+        type: str | AgentType,
+        agent_factory: Callable[[], T | Awaitable[T]],
+        *,
+        expected_class: type[T] | None = None,
+        max_concurrency: int | None = None,
+    ) -> AgentType:
+        if self._channel is not None:
+            check_picklable_factory(agent_factory)
+        agent_type = await super().register_factory(
+            type, agent_factory, expected_class=expected_class, max_concurrency=max_concurrency
+        )
+        if self._channel is not None:
+            self._channel.send(
+                RegistryUpdate(
+                    origin=self._shard_index,
+                    method="register_factory",
+                    args=(agent_type.type, agent_factory, expected_class, max_concurrency),
+                )
+            )
+        return agent_type
+
+    async def add_subscription(self, subscription: Subscription) -> None:
+        await super().add_subscription(subscription)
+        if self._channel is not None:
+            self._channel.send(
+                RegistryUpdate(origin=self._shard_index, method="add_subscription", args=(subscription,))
+            )
+
+    async def remove_subscription(self, id: str) -> None:
+        await super().remove_subscription(id)
+        if self._channel is not None:
+            self._channel.send(RegistryUpdate(origin=self._shard_index, method="remove_subscription", args=(id,)))
+
+    def add_message_serializer(self, serializer: MessageSerializer[Any] | Sequence[MessageSerializer[Any]]) -> None:
+        super().add_message_serializer(serializer)
+        if self._channel is not None:
+            self._channel.send(
+                RegistryUpdate(origin=self._shard_index, method="add_message_serializer", args=(serializer,))
+            )
+
+    async def apply_registry_update(self, update: RegistryUpdate) -> None:
+        """Applies an update that was made on another shard, without forwarding it again."""
+        match update.method:
+            case "register_factory":
+                type, agent_factory, expected_class, max_concurrency = update.args
+                await SingleThreadedAgentRuntime.register_factory(
+                    self, type, agent_factory, expected_class=expected_class, max_concurrency=max_concurrency
+                )
+            case "add_subscription":
+                await SingleThreadedAgentRuntime.add_subscription(self, *update.args)
+            case "remove_subscription":
+                await SingleThreadedAgentRuntime.remove_subscription(self, *update.args)
+            case "add_message_serializer":
+                SingleThreadedAgentRuntime.add_message_serializer(self, *update.args)
+            case _:
+                raise ValueError(f"Unknown registry update: {update.method}")
+
+    def _new_request_id(self) -> int:
+        self._next_request_id += 1
+        return self._next_request_id
+
+    async def _control(self, agent_id: AgentId, method: str, *args: Any) -> Any:
+        assert self._channel is not None
+        request_id = self._new_request_id()
+        future = asyncio.get_running_loop().create_future()
+        self._pending_controls[request_id] = future
+        try:
+            self._channel.send(
+                ControlRequest(
+                    origin=self._shard_index,
+                    request_id=request_id,
+                    target=shard_of(agent_id, self._num_shards),
+                    method=method,
+                    args=args,
+                )
+            )
+            return await future
+        finally:
+            self._pending_controls.pop(request_id, None)
+
+    def _on_message(self, message: Any) -> None:
+        match message:
+            case SendRequest():
+                self._spawn_inbound(self._process_send_request(message))
+            case PublishRequest():
+                self._spawn_inbound(self._process_publish_request(message))
+            case ControlRequest():
+                self._spawn_inbound(self._process_control_request(message))
+            case RegistryUpdate():
+                self._spawn_inbound(self.apply_registry_update(message))
+            case SendResponse(request_id=request_id, error=error):
+                future = self._pending_sends.get(request_id)
+                if future is not None and not future.done():
+                    if error is not None:
+                        future.set_exception(error)
+                    else:
+                        assert message.payload is not None
+                        future.set_result(deserialize_payload(self._serialization_registry, message.payload))
+            case ControlResponse(request_id=request_id, result=result, error=error):
+                future = self._pending_controls.get(request_id)
+                if future is not None and not future.done():
+                    if error is not None:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(result)
+            case IdleProbe():
+                # Not an inbound task: the probe waits for the inbound tasks to finish.
+                task = asyncio.create_task(self._process_idle_probe(message))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
+            case Shutdown():
+                assert self._shutdown is not None
+                self._shutdown.set()
+            case _:
+                raise ValueError(f"Unexpected message from the parent process: {message}")
+
+    def _spawn_inbound(self, coroutine: Awaitable[Any]) -> None:
+        task = asyncio.ensure_future(coroutine)
+        self._inbound_tasks.add(task)
+        task.add_done_callback(self._inbound_tasks.discard)
+
+    async def _process_send_request(self, request: SendRequest) -> None:
+        assert self._channel is not None
+        try:
+            timeout = None
+            if request.deadline is not None:
+                timeout = request.deadline - time.time()
+                if timeout <= 0:
+                    raise MessageTimeoutException("The message expired before it was handled.")
+            message = deserialize_payload(self._serialization_registry, request.payload)
+            result = await SingleThreadedAgentRuntime.send_message(
+                self,
+                message,
+                request.recipient,
+                sender=request.sender,
+                message_id=request.message_id,
+                priority=request.priority,
+                timeout=timeout,
+            )
+            response = SendResponse(
+                origin=request.origin,
+                request_id=request.request_id,
+                payload=serialize_payload(self._serialization_registry, result),
+                error=None,
+            )
+        except BaseException as e:
+            response = SendResponse(
+                origin=request.origin, request_id=request.request_id, payload=None, error=picklable_exception(e)
+            )
+        self._channel.send(response)
+
+    async def _process_publish_request(self, request: PublishRequest) -> None:
+        payload = received_payload(self._serialization_registry, request.payload)
+        # Publish locally only: the request has already been forwarded to every shard.
+        await self._publish(
+            payload.message,
+            request.topic_id,
+            sender=request.sender,
+            cancellation_token=None,
+            message_id=request.message_id,
+            priority=request.priority,
+            payload=payload,
+        )
+
+    async def _process_control_request(self, request: ControlRequest) -> None:
+        assert self._channel is not None
+        try:
+            if request.method not in _CONTROL_METHODS:
+                raise ValueError(f"Unknown control method: {request.method}")
+            result = await getattr(self, request.method)(*request.args)
+            response = ControlResponse(origin=request.origin, request_id=request.request_id, result=result, error=None)
+        except BaseException as e:
+            response = ControlResponse(
+                origin=request.origin, request_id=request.request_id, result=None, error=picklable_exception(e)
+            )
+        self._channel.send(response)
+
+    async def _process_idle_probe(self, probe: IdleProbe) -> None:
+        assert self._channel is not None
+        while True:
+            if self._inbound_tasks:
+                await asyncio.wait(set(self._inbound_tasks))
+                continue
+            await self._message_queue.join()
+            if not self._inbound_tasks:
+                break
+        self._channel.send(
+            IdleReport(request_id=probe.request_id, sent=self._channel.sent, received=self._channel.received)
+        )
+
+
+def _to_agent_id(id_or_type: AgentId | AgentType | str, key: str) -> AgentId:
+    if isinstance(id_or_type, AgentId):
+        return id_or_type
+    return AgentId(id_or_type if isinstance(id_or_type, str) else id_or_type.type, key)
+
+
+def run_shard(
+    runtime: ShardRuntime, shard_index: int, num_shards: int, connection: Connection, inherited: List[Connection]
+) -> None:
+    """The entry point of a forked shard process."""
+    # The parent process handles interrupts and shuts the shards down.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for other in inherited:
+        other.close()
+    # asyncio forgets the parent's running loop in a forked child, so this runs a new event loop. The inherited loop
+    # is left alone rather than closed, because its selector is shared with the parent process.
+    asyncio.run(runtime.serve(shard_index, num_shards, connection))
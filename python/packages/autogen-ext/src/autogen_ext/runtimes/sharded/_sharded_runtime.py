@@ -0,0 +1,527 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+import uuid
+from asyncio import Future, Task
+from collections.abc import Sequence
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Any, Awaitable, Callable, Coroutine, Dict, List, Mapping, Set, Tuple, Type, TypeVar
+
+from autogen_core import (
+    Agent,
+    AgentId,
+    AgentMetadata,
+    AgentRuntime,
+    AgentType,
+    CancellationToken,
+    InterventionHandler,
+    MessagePriority,
+    MessageSerializer,
+    Subscription,
+    TopicId,
+)
+from autogen_core._runtime_impl_helpers import resolve_deadline
+from autogen_core.exceptions import MessageTimeoutException, NotAccessibleError
+from opentelemetry.trace import TracerProvider
+
+from ._protocol import (
+    PARENT,
+    Channel,
+    ControlRequest,
+    ControlResponse,
+    IdleProbe,
+    IdleReport,
+    PublishRequest,
+    RegistryUpdate,
+    SendRequest,
+    SendResponse,
+    Shutdown,
+    check_picklable_factory,
+    deserialize_payload,
+    merge_states,
+    serialize_payload,
+    shard_of,
+)
+from ._shard_runtime import ShardRuntime, _to_agent_id, run_shard
+
+logger = logging.getLogger("autogen_core")
+
+T = TypeVar("T", bound=Agent)
+
+
+class ShardedAgentRuntime(AgentRuntime):
+    """An agent runtime that spreads agent instances over several worker processes.
+
+    Each agent instance lives in exactly one shard process, chosen by a stable hash of its
+    :class:`~autogen_core.AgentId` type and key, and every shard runs its own
+    :class:`~autogen_core.SingleThreadedAgentRuntime` event loop. This lets CPU-bound message handlers use more
+    than one core while callers keep using the :class:`~autogen_core.AgentRuntime` interface unchanged.
+
+    Messages that cross a process boundary are serialized with the runtime's serialization registry, so their
+    types must have serializers, as for :class:`~autogen_ext.runtimes.grpc.GrpcWorkerAgentRuntime`. Agents
+    registered through :meth:`~autogen_core.BaseAgent.register` add the serializers for the types they handle.
+    Published messages are delivered by every shard to the subscribed recipients it hosts.
+
+    Shard processes are forked when the runtime starts and inherit the agent types, subscriptions and serializers
+    registered so far. Registrations made later, in the parent process or in a shard, are sent to every shard.
+
+    .. note::
+
+        Unlike :class:`~autogen_core.SingleThreadedAgentRuntime`, this runtime asks a few things of its callers:
+
+        * It forks its shard processes, so it only runs on POSIX platforms.
+        * Agent types registered after :meth:`start` are sent to the shards, so their factory must be picklable,
+          such as the agent class or a module-level function rather than a lambda. Register agent types before
+          :meth:`start` to use any factory.
+        * Cancellation tokens are not propagated to other processes.
+        * Agent instances live in the shard processes, so :meth:`try_get_underlying_agent_instance` raises
+          :class:`~autogen_core.exceptions.NotAccessibleError`.
+
+    Args:
+        num_shards (int, optional): The number of shard processes. Defaults to the number of CPUs.
+        intervention_handlers (List[InterventionHandler], optional): Intervention handlers that every shard runs
+            for the messages it processes. Defaults to None.
+        tracer_provider (TracerProvider, optional): The tracer provider used by every shard. Defaults to None.
+
+    Example:
+
+        .. code-block:: python
+
+            import asyncio
+
+            from autogen_ext.runtimes.sharded import ShardedAgentRuntime
+
+
+            async def main() -> None:
+                runtime = ShardedAgentRuntime(num_shards=4)
+                await MyAgent.register(runtime, "my_agent", lambda: MyAgent())
+                runtime.start()
+                await runtime.send_message(MyMessage(), AgentId("my_agent", "default"))
+                await runtime.stop_when_idle()
+
+
+            asyncio.run(main())
+    """
+
+    def __init__(
+        self,
+        *,
+        num_shards: int | None = None,
+        intervention_handlers: List[InterventionHandler] | None = None,
+        tracer_provider: TracerProvider | None = None,
+    ) -> None:
+        if num_shards is None:
+            num_shards = os.cpu_count() or 1
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        self._num_shards = num_shards
+        # Holds the registrations that the shard processes inherit when they are forked.
+        self._template = ShardRuntime(intervention_handlers=intervention_handlers, tracer_provider=tracer_provider)
+        self._processes: List[BaseProcess] = []
+        self._channels: List[Channel] = []
+        self._next_request_id = 0
+        # request id -> (target shard, future)
+        self._pending_requests: Dict[int, Tuple[int, Future[Any]]] = {}
+        self._stopping = False
+        # Set whenever a shard sends the parent a message, so that stop_when checks its condition.
+        self._progress = asyncio.Event()
+        self._timed_out_messages = 0
+        self._background_tasks: Set[Task[Any]] = set()
+
+    @property
+    def num_shards(self) -> int:
+        return self._num_shards
+
+    @property
+    def timed_out_messages_count(self) -> int:
+        """The number of messages sent from the parent process that got no response before their deadline."""
+        return self._timed_out_messages
+
+    def start(self) -> None:
+        """Fork the shard processes and start routing messages between them."""
+        if self._channels:
+            raise RuntimeError("Runtime is already started")
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("ShardedAgentRuntime forks its shard processes, which is only supported on POSIX.")
+        context = multiprocessing.get_context("fork")
+        parent_connections: List[Connection] = []
+        for shard_index in range(self._num_shards):
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(
+                target=run_shard,
+                args=(self._template, shard_index, self._num_shards, child_connection, list(parent_connections)),
+                name=f"ShardedAgentRuntime-{shard_index}",
+                daemon=True,
+            )
+            process.start()
+            child_connection.close()
+            parent_connections.append(parent_connection)
+            self._processes.append(process)
+        self._stopping = False
+        for shard_index, connection in enumerate(parent_connections):
+            channel = Channel(
+                connection,
+                self._make_message_handler(shard_index),
+                self._make_closed_handler(shard_index),
+            )
+            channel.open()
+            self._channels.append(channel)
+
+    async def stop(self) -> None:
+        """Stop all shard processes. Messages that have not been processed yet are discarded."""
+        if not self._channels:
+            raise RuntimeError("Runtime is not started")
+        self._stopping = True
+        for channel in self._channels:
+            channel.send(Shutdown())
+        for process in self._processes:
+            await asyncio.to_thread(process.join)
+        for channel in self._channels:
+            await channel.close()
+        for _, future in self._pending_requests.values():
+            if not future.done():
+                future.set_exception(RuntimeError("Runtime was stopped."))
+        self._pending_requests.clear()
+        self._processes = []
+        self._channels = []
+
+    async def stop_when_idle(self) -> None:
+        """Stop the shards when none of them has a message being processed or queued, and no message is in transit
+        between processes."""
+        if not self._channels:
+            raise RuntimeError("Runtime is not started")
+        await self._wait_until_idle()
+        await self.stop()
+
+    async def stop_when(self, condition: Callable[[], bool], check_period: float = 1.0) -> None:
+        """Stop the shards when the condition is met. The condition is checked in the parent process whenever
+        a shard sends it a message, and every ``check_period`` seconds in case it depends on anything else."""
+        if not self._channels:
+            raise RuntimeError("Runtime is not started")
+        while not condition():
+            self._progress.clear()
+            try:
+                await asyncio.wait_for(self._progress.wait(), check_period)
+            except asyncio.TimeoutError:
+                pass
+        await self.stop()
+
+    async def close(self) -> None:
+        """Stop the shards if they are running. Each shard closes the agents it has instantiated."""
+        if self._channels:
+            await self.stop()
+
+    async def send_message(
+        self,
+        message: Any,
+        recipient: AgentId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_id: str | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        timeout: float | None = None,
+    ) -> Any:
+        self._check_started()
+        deadline = resolve_deadline(timeout)
+        payload = serialize_payload(self._template._serialization_registry, message)  # type: ignore[reportPrivateUsage]
+        result = await self._request(
+            shard_of(recipient, self._num_shards),
+            lambda request_id: SendRequest(
+                origin=PARENT,
+                request_id=request_id,
+                sender=sender,
+                recipient=recipient,
+                payload=payload,
+                message_id=message_id if message_id is not None else str(uuid.uuid4()),
+                priority=priority,
+                deadline=deadline,
+            ),
+            cancellation_token,
+            deadline,
+        )
+        return deserialize_payload(self._template._serialization_registry, result)  # type: ignore[reportPrivateUsage]
+
+    async def publish_message(
+        self,
+        message: Any,
+        topic_id: TopicId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_id: str | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+    ) -> None:
+        self._check_started()
+        request = PublishRequest(
+            origin=PARENT,
+            sender=sender,
+            topic_id=topic_id,
+            payload=serialize_payload(self._template._serialization_registry, message),  # type: ignore[reportPrivateUsage]
+            message_id=message_id if message_id is not None else str(uuid.uuid4()),
+            priority=priority,
+        )
+        for channel in self._channels:
+            channel.send(request)
+
+    async def send_messages(
+        self,
+        messages: Sequence[Any],
+        recipient: AgentId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_ids: Sequence[str] | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+        timeout: float | None = None,
+    ) -> List[Any]:
+        return list(
+            await asyncio.gather(
+                *(
+                    self.send_message(
+                        message,
+                        recipient,
+                        sender=sender,
+                        cancellation_token=cancellation_token,
+                        message_id=message_ids[index] if message_ids is not None else None,
+                        priority=priority,
+                        timeout=timeout,
+                    )
+                    for index, message in enumerate(messages)
+                )
+            )
+        )
+
+    async def publish_messages(
+        self,
+        messages: Sequence[Any],
+        topic_id: TopicId,
+        *,
+        sender: AgentId | None = None,
+        cancellation_token: CancellationToken | None = None,
+        message_ids: Sequence[str] | None = None,
+        priority: MessagePriority = MessagePriority.NORMAL,
+    ) -> None:
+        for index, message in enumerate(messages):
+            await self.publish_message(
+                message,
+                topic_id,
+                sender=sender,
+                cancellation_token=cancellation_token,
+                message_id=message_ids[index] if message_ids is not None else None,
+                priority=priority,
+            )
+
+    async def register_factory(
+        self,
+        type: str | AgentType,
+        agent_factory: Callable[[], T | Awaitable[T]],
+        *,
+        expected_class: type[T] | None = None,
+        max_concurrency: int | None = None,
+    ) -> AgentType:
+        if self._channels:
+            check_picklable_factory(agent_factory)
+        agent_type = await self._template.register_factory(
+            type, agent_factory, expected_class=expected_class, max_concurrency=max_concurrency
+        )
+        self._broadcast(
+            RegistryUpdate(
+                origin=PARENT,
+                method="register_factory",
+                args=(agent_type.type, agent_factory, expected_class, max_concurrency),
+            )
+        )
+        return agent_type
+
+    async def try_get_underlying_agent_instance(self, id: AgentId, type: Type[T] = Agent) -> T:  # type: ignore[assignment]
+        if id.type not in self._template._known_agent_names:  # type: ignore[reportPrivateUsage]
+            raise LookupError(f"Agent with name {id.type} not found.")
+        raise NotAccessibleError(
+            f"Agent {id} lives in shard {shard_of(id, self._num_shards)} and cannot be accessed from the parent process."
+        )
+
+    async def get(
+        self, id_or_type: AgentId | AgentType | str, /, key: str = "default", *, lazy: bool = True
+    ) -> AgentId:
+        agent_id = _to_agent_id(id_or_type, key)
+        if agent_id.type not in self._template._known_agent_names:  # type: ignore[reportPrivateUsage]
+            raise LookupError(f"Agent with name {agent_id.type} not found.")
+        if not lazy:
+            await self._control(shard_of(agent_id, self._num_shards), "activate", agent_id)
+        return agent_id
+
+    async def get_many(self, type: AgentType | str, /, keys: Sequence[str], *, lazy: bool = True) -> List[AgentId]:
+        agent_ids = [_to_agent_id(type, key) for key in keys]
+        if agent_ids and agent_ids[0].type not in self._template._known_agent_names:  # type: ignore[reportPrivateUsage]
+            raise LookupError(f"Agent with name {agent_ids[0].type} not found.")
+        if not lazy:
+            await asyncio.gather(
+                *(self._control(shard_of(agent_id, self._num_shards), "activate", agent_id) for agent_id in agent_ids)
+            )
+        return agent_ids
+
+    async def save_state(self) -> Mapping[str, Any]:
+        self._check_started()
+        states = await asyncio.gather(
+            *(self._control(shard_index, "save_state") for shard_index in range(self._num_shards))
+        )
+        return merge_states(states)
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        self._check_started()
+        shard_states: List[Dict[str, Any]] = [{} for _ in range(self._num_shards)]
+        for agent_id_str, agent_state in state.items():
+            shard_states[shard_of(AgentId.from_str(agent_id_str), self._num_shards)][agent_id_str] = agent_state
+        await asyncio.gather(
+            *(
+                self._control(shard_index, "load_state", shard_state)
+                for shard_index, shard_state in enumerate(shard_states)
+                if shard_state
+            )
+        )
+
+    async def agent_metadata(self, agent: AgentId) -> AgentMetadata:
+        return await self._control(shard_of(agent, self._num_shards), "agent_metadata", agent)  # type: ignore[no-any-return]
+
+    async def agent_save_state(self, agent: AgentId) -> Mapping[str, Any]:
+        return await self._control(shard_of(agent, self._num_shards), "agent_save_state", agent)  # type: ignore[no-any-return]
+
+    async def agent_load_state(self, agent: AgentId, state: Mapping[str, Any]) -> None:
+        await self._control(shard_of(agent, self._num_shards), "agent_load_state", agent, state)
+
+    async def add_subscription(self, subscription: Subscription) -> None:
+        await self._template.add_subscription(subscription)
+        self._broadcast(RegistryUpdate(origin=PARENT, method="add_subscription", args=(subscription,)))
+
+    async def remove_subscription(self, id: str) -> None:
+        await self._template.remove_subscription(id)
+        self._broadcast(RegistryUpdate(origin=PARENT, method="remove_subscription", args=(id,)))
+
+    def add_message_serializer(self, serializer: MessageSerializer[Any] | Sequence[MessageSerializer[Any]]) -> None:
+        self._template.add_message_serializer(serializer)
+        self._broadcast(RegistryUpdate(origin=PARENT, method="add_message_serializer", args=(serializer,)))
+
+    async def _wait_until_idle(self) -> None:
+        # Every shard reports how many messages it sent and received once it is idle. All shards are idle at the
+        # same time when the totals balance and do not change between two consecutive rounds.
+        previous: Tuple[int, int] | None = None
+        while True:
+            reports: List[IdleReport] = await asyncio.gather(
+                *(self._request(shard_index, _make_idle_probe) for shard_index in range(self._num_shards))
+            )
+            sent = sum(report.sent for report in reports) + sum(channel.sent for channel in self._channels)
+            received = sum(report.received for report in reports) + sum(channel.received for channel in self._channels)
+            if sent == received and previous == (sent, received):
+                return
+            previous = (sent, received)
+
+    def _check_started(self) -> None:
+        if not self._channels:
+            raise RuntimeError("Runtime is not started")
+
+    def _broadcast(self, message: Any, *, exclude: int = PARENT) -> None:
+        for shard_index, channel in enumerate(self._channels):
+            if shard_index != exclude:
+                channel.send(message)
+
+    async def _request(
+        self,
+        shard_index: int,
+        make_request: Callable[[int], Any],
+        cancellation_token: CancellationToken | None = None,
+        deadline: float | None = None,
+    ) -> Any:
+        self._next_request_id += 1
+        request_id = self._next_request_id
+        future: Future[Any] = asyncio.get_running_loop().create_future()
+        self._pending_requests[request_id] = (shard_index, future)
+        if cancellation_token is not None:
+            cancellation_token.link_future(future)
+        try:
+            self._channels[shard_index].send(make_request(request_id))
+            if deadline is None:
+                return await future
+            # The shard gives up at the deadline too, but a shard that is stuck would never respond.
+            return await asyncio.wait_for(future, deadline - time.time())
+        except (asyncio.TimeoutError, MessageTimeoutException):
+            if deadline is None:
+                raise
+            self._timed_out_messages += 1
+            raise MessageTimeoutException("The message got no response before its deadline.") from None
+        finally:
+            self._pending_requests.pop(request_id, None)
+
+    async def _control(self, shard_index: int, method: str, *args: Any) -> Any:
+        self._check_started()
+        return await self._request(
+            shard_index,
+            lambda request_id: ControlRequest(
+                origin=PARENT, request_id=request_id, target=shard_index, method=method, args=args
+            ),
+        )
+
+    def _resolve(self, request_id: int, result: Any, error: BaseException | None) -> None:
+        entry = self._pending_requests.get(request_id)
+        if entry is None or entry[1].done():
+            return
+        if error is not None:
+            entry[1].set_exception(error)
+        else:
+            entry[1].set_result(result)
+
+    def _make_message_handler(self, shard_index: int) -> Callable[[Any], None]:
+        def on_message(message: Any) -> None:
+            self._progress.set()
+            match message:
+                case SendRequest(recipient=recipient):
+                    self._channels[shard_of(recipient, self._num_shards)].send(message)
+                case PublishRequest(origin=origin):
+                    self._broadcast(message, exclude=origin)
+                case RegistryUpdate(origin=origin):
+                    self._broadcast(message, exclude=origin)
+                    # Keep the template up to date, so that the parent knows the agent types registered by shards.
+                    self._spawn(self._apply_registry_update(message))
+                case ControlRequest(target=target):
+                    self._channels[target].send(message)
+                case SendResponse(origin=origin) | ControlResponse(origin=origin) if origin != PARENT:
+                    self._channels[origin].send(message)
+                case SendResponse(request_id=request_id, payload=payload, error=error):
+                    self._resolve(request_id, payload, error)
+                case ControlResponse(request_id=request_id, result=result, error=error):
+                    self._resolve(request_id, result, error)
+                case IdleReport(request_id=request_id):
+                    self._resolve(request_id, message, None)
+                case _:
+                    logger.warning(f"Unexpected message from shard {shard_index}: {message}")
+
+        return on_message
+
+    def _spawn(self, coroutine: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(coroutine)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _apply_registry_update(self, update: RegistryUpdate) -> None:
+        try:
+            await self._template.apply_registry_update(update)
+        except Exception as e:
+            logger.error(f"Failed to apply {update.method} from a shard to the parent process.", exc_info=e)
+
+    def _make_closed_handler(self, shard_index: int) -> Callable[[], None]:
+        def on_closed() -> None:
+            if self._stopping:
+                return
+            logger.error(f"Shard {shard_index} exited unexpectedly.")
+            for target, future in self._pending_requests.values():
+                if target == shard_index and not future.done():
+                    future.set_exception(RuntimeError(f"Shard {shard_index} exited unexpectedly."))
+
+        return on_closed
+
+
+def _make_idle_probe(request_id: int) -> IdleProbe:
+    return IdleProbe(request_id=request_id)
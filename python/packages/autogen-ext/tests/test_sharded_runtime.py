@@ -0,0 +1,282 @@
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, List, Mapping
+
+import pytest
+from autogen_core import (
+    EVENT_LOGGER_NAME,
+    AgentId,
+    DefaultTopicId,
+    MessageContext,
+    RoutedAgent,
+    TopicId,
+    TypeSubscription,
+    default_subscription,
+    message_handler,
+    try_get_known_serializers_for_type,
+)
+from autogen_core.exceptions import MessageTimeoutException, NotAccessibleError
+from autogen_ext.runtimes.sharded import ShardedAgentRuntime
+from autogen_ext.runtimes.sharded._protocol import PublishRequest, shard_of
+from autogen_ext.runtimes.sharded._shard_runtime import ShardRuntime
+from autogen_test_utils import ContentMessage, LoopbackAgent, MessageType
+
+
+@dataclass
+class ProcessInfo:
+    pid: int
+    num_calls: int
+
+
+@dataclass
+class Forward:
+    target_key: str
+
+
+@dataclass
+class Sleep:
+    seconds: float
+
+
+class ProcessReportingAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Reports the process it runs in.")
+        self.num_calls = 0
+
+    @message_handler
+    async def on_content(self, message: ContentMessage, ctx: MessageContext) -> ProcessInfo:
+        self.num_calls += 1
+        return ProcessInfo(pid=os.getpid(), num_calls=self.num_calls)
+
+    @message_handler
+    async def on_forward(self, message: Forward, ctx: MessageContext) -> ProcessInfo:
+        # Calls another agent that may live in a different shard.
+        return await self.send_message(ContentMessage(content="forwarded"), AgentId(self.id.type, message.target_key))
+
+    @message_handler
+    async def on_sleep(self, message: Sleep, ctx: MessageContext) -> ProcessInfo:
+        await asyncio.sleep(message.seconds)
+        return ProcessInfo(pid=os.getpid(), num_calls=self.num_calls)
+
+    async def save_state(self) -> Mapping[str, Any]:
+        return {"num_calls": self.num_calls}
+
+    async def load_state(self, state: Mapping[str, Any]) -> None:
+        self.num_calls = state["num_calls"]
+
+
+@default_subscription
+class CountingAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Counts published messages.")
+        self.num_calls = 0
+
+    @message_handler
+    async def on_message_type(self, message: MessageType, ctx: MessageContext) -> None:
+        self.num_calls += 1
+        if ctx.sender is None and self.id.type == "counter":
+            # Republish from inside a shard so that the message fans out to the other shards.
+            await self.publish_message(MessageType(), DefaultTopicId(source=self.id.key))
+
+    async def save_state(self) -> Mapping[str, Any]:
+        return {"num_calls": self.num_calls}
+
+
+def _keys_on_different_shards(agent_type: str, num_shards: int) -> tuple[str, str]:
+    keys = [f"key{i}" for i in range(100)]
+    first = keys[0]
+    second = next(
+        key
+        for key in keys
+        if shard_of(AgentId(agent_type, key), num_shards) != shard_of(AgentId(agent_type, first), num_shards)
+    )
+    return first, second
+
+
+@pytest.mark.asyncio
+async def test_send_message_across_shards() -> None:
+    runtime = ShardedAgentRuntime(num_shards=2)
+    await ProcessReportingAgent.register(runtime, "reporter", ProcessReportingAgent)
+    runtime.add_message_serializer(try_get_known_serializers_for_type(ProcessInfo))
+    runtime.start()
+
+    first, second = _keys_on_different_shards("reporter", 2)
+    first_info = await runtime.send_message(ContentMessage(content="hello"), AgentId("reporter", first))
+    second_info = await runtime.send_message(ContentMessage(content="hello"), AgentId("reporter", second))
+    assert isinstance(first_info, ProcessInfo) and isinstance(second_info, ProcessInfo)
+    assert first_info.pid != second_info.pid
+    assert os.getpid() not in (first_info.pid, second_info.pid)
+
+    # The agent is kept alive in its shard between calls.
+    first_info = await runtime.send_message(ContentMessage(content="hello"), AgentId("reporter", first))
+    assert first_info.num_calls == 2
+
+    # An agent in one shard calls an agent in the other shard.
+    forwarded = await runtime.send_message(Forward(target_key=second), AgentId("reporter", first))
+    assert forwarded.pid == second_info.pid
+    assert forwarded.num_calls == 2
+
+    await runtime.stop_when_idle()
+
+
+@pytest.mark.asyncio
+async def test_send_message_timeout() -> None:
+    runtime = ShardedAgentRuntime(num_shards=2)
+    await ProcessReportingAgent.register(runtime, "reporter", ProcessReportingAgent)
+    runtime.add_message_serializer(try_get_known_serializers_for_type(ProcessInfo))
+    runtime.start()
+
+    with pytest.raises(MessageTimeoutException):
+        await runtime.send_message(Sleep(seconds=5), AgentId("reporter", "default"), timeout=0.1)
+    assert runtime.timed_out_messages_count == 1
+    info = await runtime.send_message(Sleep(seconds=0), AgentId("reporter", "default"), timeout=5)
+    assert isinstance(info, ProcessInfo)
+
+    await runtime.stop()
+
+
+@pytest.mark.asyncio
+async def test_publish_fans_out_to_all_shards() -> None:
+    runtime = ShardedAgentRuntime(num_shards=3)
+    await CountingAgent.register(runtime, "counter", CountingAgent)
+    await CountingAgent.register(runtime, "listener", CountingAgent)
+    runtime.start()
+
+    keys = [f"session{i}" for i in range(10)]
+    for key in keys:
+        await runtime.publish_message(MessageType(), DefaultTopicId(source=key))
+    await runtime._wait_until_idle()  # type: ignore[reportPrivateUsage]
+
+    # Listeners receive the external message and the counter's republished one, wherever the counter lives.
+    # The counter does not receive its own republished message.
+    state = await runtime.save_state()
+    assert state == {
+        **{f"counter/{key}": {"num_calls": 1} for key in keys},
+        **{f"listener/{key}": {"num_calls": 2} for key in keys},
+    }
+    await runtime.stop()
+
+
+@pytest.mark.asyncio
+async def test_save_and_load_state() -> None:
+    runtime = ShardedAgentRuntime(num_shards=2)
+    await ProcessReportingAgent.register(runtime, "reporter", ProcessReportingAgent)
+    runtime.add_message_serializer(try_get_known_serializers_for_type(ProcessInfo))
+    runtime.start()
+
+    first, second = _keys_on_different_shards("reporter", 2)
+    await runtime.send_message(ContentMessage(content="hello"), AgentId("reporter", first))
+    await runtime.send_message(ContentMessage(content="hello"), AgentId("reporter", second))
+    await runtime.send_message(ContentMessage(content="hello"), AgentId("reporter", second))
+    state = await runtime.save_state()
+    assert state == {f"reporter/{first}": {"num_calls": 1}, f"reporter/{second}": {"num_calls": 2}}
+    assert await runtime.agent_save_state(AgentId("reporter", second)) == {"num_calls": 2}
+    assert (await runtime.agent_metadata(AgentId("reporter", second)))["type"] == "reporter"
+    await runtime.stop()
+
+    runtime.start()
+    await runtime.load_state(state)
+    info = await runtime.send_message(ContentMessage(content="hello"), AgentId("reporter", second))
+    assert info.num_calls == 3
+    await runtime.stop()
+
+
+@dataclass
+class RegisterType:
+    type: str
+
+
+class RegisteringAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Registers agent types from inside a shard.")
+
+    @message_handler
+    async def on_register_type(self, message: RegisterType, ctx: MessageContext) -> None:
+        await ProcessReportingAgent.register(self.runtime, message.type, ProcessReportingAgent)
+
+
+@pytest.mark.asyncio
+async def test_register_after_start() -> None:
+    runtime = ShardedAgentRuntime(num_shards=2)
+    await LoopbackAgent.register(runtime, "loopback", LoopbackAgent)
+    await RegisteringAgent.register(runtime, "registering", RegisteringAgent)
+    runtime.add_message_serializer(try_get_known_serializers_for_type(ProcessInfo))
+    runtime.add_message_serializer(try_get_known_serializers_for_type(RegisterType))
+    runtime.start()
+
+    # The factory is sent to the shards, so it must be picklable.
+    with pytest.raises(ValueError):
+        await LoopbackAgent.register(runtime, "lambda", lambda: LoopbackAgent())
+    await ProcessReportingAgent.register(runtime, "late", ProcessReportingAgent)
+    pids = {
+        (await runtime.send_message(ContentMessage(content="hello"), AgentId("late", str(key)))).pid
+        for key in range(10)
+    }
+    assert os.getpid() not in pids
+    assert len(pids) == 2
+
+    # An agent type registered by a shard reaches the other shards and the parent.
+    await runtime.send_message(RegisterType(type="from_shard"), AgentId("registering", "default"))
+    agent_ids = await runtime.get_many("from_shard", keys=[str(key) for key in range(10)])
+    pids = {(await runtime.send_message(ContentMessage(content="hello"), agent_id)).pid for agent_id in agent_ids}
+    assert len(pids) == 2
+
+    response = await runtime.send_message(ContentMessage(content="hello"), AgentId("loopback", "default"))
+    assert response == ContentMessage(content="hello")
+    await runtime.add_subscription(TypeSubscription("late", "loopback"))
+    await runtime.publish_message(MessageType(), TopicId("late", "default"))
+    await runtime.stop_when_idle()
+
+
+@pytest.mark.asyncio
+async def test_agent_instances_are_not_accessible() -> None:
+    runtime = ShardedAgentRuntime(num_shards=1)
+    await LoopbackAgent.register(runtime, "loopback", LoopbackAgent)
+    runtime.start()
+    with pytest.raises(NotAccessibleError):
+        await runtime.try_get_underlying_agent_instance(AgentId("loopback", "default"))
+    with pytest.raises(LookupError):
+        await runtime.try_get_underlying_agent_instance(AgentId("unknown", "default"))
+    await runtime.stop()
+
+
+class RecordingChannel:
+    def __init__(self) -> None:
+        self.sent: List[Any] = []
+
+    def send(self, message: Any) -> None:
+        self.sent.append(message)
+
+
+@pytest.mark.asyncio
+async def test_shard_publish_serializes_each_message_once(caplog: pytest.LogCaptureFixture) -> None:
+    runtime = ShardRuntime()
+    runtime.add_message_serializer(try_get_known_serializers_for_type(ContentMessage))
+    registry = runtime._serialization_registry  # type: ignore[reportPrivateUsage]
+    num_serialized = 0
+    serialize_message = registry.serialize_message
+
+    def counting_serialize(message: Any, *, data_content_type: str) -> tuple[str, bytes]:
+        nonlocal num_serialized
+        num_serialized += 1
+        return serialize_message(message, data_content_type=data_content_type)
+
+    registry.serialize_message = counting_serialize  # type: ignore
+    # Act as shard 0 of 2, whose publishes are forwarded to the parent process.
+    channel = RecordingChannel()
+    runtime._channel = channel  # type: ignore
+    runtime._shard_index = 0  # type: ignore[reportPrivateUsage]
+    runtime._num_shards = 2  # type: ignore[reportPrivateUsage]
+
+    with caplog.at_level(logging.INFO, logger=EVENT_LOGGER_NAME):
+        await runtime.publish_messages(
+            [ContentMessage(content="first"), ContentMessage(content="second")], DefaultTopicId()
+        )
+        await runtime.publish_message(ContentMessage(content="third"), DefaultTopicId())
+
+    # The event log and the forwarded requests share one serialization of each message.
+    assert [type(message) for message in channel.sent] == [PublishRequest] * 3
+    assert num_serialized == 3
+    await runtime.close()
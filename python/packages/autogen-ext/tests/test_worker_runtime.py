@@ -1,14 +1,21 @@
 import asyncio
 import logging
 import os
+import time
 from typing import Any, List
 
 import pytest
+from autogen_agentchat.messages import TextMessage, ToolCallRequestEvent
+from autogen_agentchat.serialization import get_protobuf_serializers
+from autogen_agentchat.teams._group_chat._events import GroupChatMessage
 from autogen_core import (
+    JSON_DATA_CONTENT_TYPE,
+    MSGPACK_DATA_CONTENT_TYPE,
     PROTOBUF_DATA_CONTENT_TYPE,
     AgentId,
     AgentType,
     DefaultTopicId,
+    FunctionCall,
     MessageContext,
     RoutedAgent,
     Subscription,
@@ -16,10 +23,20 @@
     TypeSubscription,
     default_subscription,
     event,
+    message_handler,
     try_get_known_serializers_for_type,
     type_subscription,
 )
-from autogen_ext.runtimes.grpc import GrpcWorkerAgentRuntime, GrpcWorkerAgentRuntimeHost
+from autogen_core.exceptions import MessageTimeoutException
+from autogen_core.models import RequestUsage
+from autogen_ext.runtimes.grpc import (
+    GrpcWorkerAgentRuntime,
+    GrpcWorkerAgentRuntimeHost,
+    MessageBatchingConfig,
+)
+from autogen_ext.runtimes.grpc._batching import MessageBatcher
+from autogen_ext.runtimes.grpc._constants import TIMEOUT_METADATA_KEY
+from autogen_ext.runtimes.grpc.protos import agent_worker_pb2, cloudevent_pb2
 from autogen_test_utils import (
     CascadingAgent,
     CascadingMessageType,
@@ -112,6 +129,10 @@ async def test_register_receives_publish() -> None:
     assert worker1_agent.num_calls == 1
     worker2_agent = await worker2.try_get_underlying_agent_instance(AgentId("name2", "default"), LoopbackAgent)
     assert worker2_agent.num_calls == 1
+    metrics = worker2.metrics()
+    assert metrics.handled_messages("name2") == 1
+    assert metrics.publish_fanout.count == 1
+    assert metrics.active_agents == 1
 
     # Agents in other topic source should not have received the message.
     worker1_agent = await worker1.try_get_underlying_agent_instance(AgentId("name1", "other"), LoopbackAgent)
@@ -352,7 +373,7 @@ async def test_disconnected_agent() -> None:
     # to some private properties. This needs to be updated once they are available publicly
 
     def get_current_subscriptions() -> List[Subscription]:
-        return host._servicer._subscription_manager._subscriptions  # type: ignore[reportPrivateUsage]
+        return host._servicer._subscription_manager.subscriptions  # type: ignore[reportPrivateUsage]
 
     async def get_subscribed_recipients() -> List[AgentId]:
         return await host._servicer._subscription_manager.get_subscribed_recipients(DefaultTopicId())  # type: ignore[reportPrivateUsage]
@@ -458,6 +479,349 @@ async def test_proto_payloads() -> None:
     await host.stop()
 
 
+class SequentialCheckingAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Records how many messages it handles at the same time.")
+        self.active = 0
+        self.max_active = 0
+
+    @message_handler
+    async def on_content(self, message: ContentMessage, ctx: MessageContext) -> ContentMessage:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return message
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency() -> None:
+    host_address = "localhost:50062"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host.start()
+    worker = GrpcWorkerAgentRuntime(host_address=host_address)
+    worker.start()
+
+    await SequentialCheckingAgent.register(worker, "sequential", SequentialCheckingAgent, max_concurrency=1)
+    agent_id = AgentId("sequential", "default")
+    responses = await asyncio.gather(*(worker.send_message(ContentMessage(content=str(i)), agent_id) for i in range(5)))
+    assert responses == [ContentMessage(content=str(i)) for i in range(5)]
+    agent = await worker.try_get_underlying_agent_instance(agent_id, type=SequentialCheckingAgent)
+    assert agent.max_active == 1
+
+    await worker.stop()
+    await host.stop()
+
+
+@pytest.mark.asyncio
+async def test_batch_send_and_publish() -> None:
+    host_address = "localhost:50063"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host.start()
+    worker = GrpcWorkerAgentRuntime(host_address=host_address)
+    worker.start()
+
+    await LoopbackAgentWithDefaultSubscription.register(worker, "name", LoopbackAgentWithDefaultSubscription)
+    messages = [ContentMessage(content=str(i)) for i in range(5)]
+    responses = await worker.send_messages(messages, AgentId("name", "direct"))
+    assert responses == messages
+
+    await worker.publish_messages(messages, DefaultTopicId())
+    await asyncio.sleep(2)
+    agent = await worker.try_get_underlying_agent_instance(
+        AgentId("name", "default"), type=LoopbackAgentWithDefaultSubscription
+    )
+    assert agent.received_messages == messages
+
+    await worker.stop()
+    await host.stop()
+
+
+class SleepingAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Sleeps for the number of seconds in the message.")
+        self.deadlines: List[float | None] = []
+
+    @message_handler
+    async def on_content(self, message: ContentMessage, ctx: MessageContext) -> ContentMessage:
+        self.deadlines.append(ctx.deadline)
+        await asyncio.sleep(float(message.content))
+        return message
+
+
+@pytest.mark.asyncio
+async def test_send_message_timeout() -> None:
+    host_address = "localhost:50064"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host.start()
+    worker = GrpcWorkerAgentRuntime(host_address=host_address)
+    worker.start()
+
+    await SleepingAgent.register(worker, "sleeper", SleepingAgent)
+    with pytest.raises(MessageTimeoutException):
+        await worker.send_message(ContentMessage(content="2"), AgentId("sleeper", "default"), timeout=0.5)
+    assert worker.timed_out_messages_count == 1
+    with pytest.raises(MessageTimeoutException):
+        await worker.send_messages([ContentMessage(content="2")] * 2, AgentId("sleeper", "default"), timeout=0.5)
+    assert worker.timed_out_messages_count == 3
+    # The requests are forgotten, and their late responses are ignored.
+    assert worker._pending_requests == {}  # type: ignore[reportPrivateUsage]
+    await asyncio.sleep(2)
+
+    response = await worker.send_message(ContentMessage(content="0"), AgentId("sleeper", "default"), timeout=5)
+    assert response == ContentMessage(content="0")
+    agent = await worker.try_get_underlying_agent_instance(AgentId("sleeper", "default"), type=SleepingAgent)
+    assert all(deadline is not None for deadline in agent.deadlines)
+
+    await worker.stop()
+    await host.stop()
+
+
+def test_rpc_request_carries_remaining_timeout() -> None:
+    # The deadline travels as the remaining seconds, so the clocks of the sender and the receiver need not agree.
+    worker = GrpcWorkerAgentRuntime(host_address="localhost:50068")
+    worker.add_message_serializer(try_get_known_serializers_for_type(ContentMessage))
+    message = worker._build_rpc_request(  # type: ignore[reportPrivateUsage]
+        ContentMessage(content="0"), "ContentMessage", AgentId("echo", "default"), None, "1", {}, time.time() + 5
+    )
+    assert 4 < float(message.request.metadata[TIMEOUT_METADATA_KEY]) <= 5
+
+
+class EchoAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Returns the messages it receives.")
+
+    @message_handler
+    async def on_content(self, message: ContentMessage, ctx: MessageContext) -> ContentMessage:
+        return message
+
+
+@pytest.mark.asyncio
+async def test_content_type_negotiation() -> None:
+    host_address = "localhost:50065"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host.start()
+    msgpack_worker = GrpcWorkerAgentRuntime(
+        host_address=host_address, preferred_content_types=[MSGPACK_DATA_CONTENT_TYPE, JSON_DATA_CONTENT_TYPE]
+    )
+    msgpack_worker.start()
+    json_worker = GrpcWorkerAgentRuntime(host_address=host_address)
+    json_worker.start()
+    sender = GrpcWorkerAgentRuntime(host_address=host_address)
+    sender.add_message_serializer(try_get_known_serializers_for_type(ContentMessage))
+    sender.start()
+
+    await EchoAgent.register(msgpack_worker, "msgpack_echo", EchoAgent)
+    await EchoAgent.register(json_worker, "json_echo", EchoAgent)
+    received: List[str] = []
+    deserialize = msgpack_worker._serialization_registry.deserialize  # type: ignore[reportPrivateUsage]
+
+    def record(payload: bytes, *, type_name: str, data_content_type: str) -> Any:
+        received.append(data_content_type)
+        return deserialize(payload, type_name=type_name, data_content_type=data_content_type)
+
+    msgpack_worker._serialization_registry.deserialize = record  # type: ignore
+
+    for recipient in (AgentId("msgpack_echo", "default"), AgentId("json_echo", "default")):
+        for index in range(3):
+            response = await sender.send_message(ContentMessage(content=str(index)), recipient)
+            assert response == ContentMessage(content=str(index))
+
+    # The first request asks for the accepted content types, the later ones use the preferred one.
+    assert received == [JSON_DATA_CONTENT_TYPE, MSGPACK_DATA_CONTENT_TYPE, MSGPACK_DATA_CONTENT_TYPE]
+    assert sender._accepted_content_types == {  # type: ignore[reportPrivateUsage]
+        "msgpack_echo": [MSGPACK_DATA_CONTENT_TYPE, JSON_DATA_CONTENT_TYPE],
+        "json_echo": [JSON_DATA_CONTENT_TYPE],
+    }
+
+    await sender.stop()
+    await json_worker.stop()
+    await msgpack_worker.stop()
+    await host.stop()
+
+
+class AgentChatEchoAgent(RoutedAgent):
+    def __init__(self) -> None:
+        super().__init__("Echoes agentchat messages and records group chat messages.")
+        self.received: List[GroupChatMessage] = []
+        self.received_event = asyncio.Event()
+
+    @message_handler
+    async def on_text_message(self, message: TextMessage, ctx: MessageContext) -> TextMessage:
+        return message
+
+    @message_handler
+    async def on_group_chat_message(self, message: GroupChatMessage, ctx: MessageContext) -> None:
+        self.received.append(message)
+        self.received_event.set()
+
+
+@pytest.mark.asyncio
+async def test_agentchat_protobuf_payloads() -> None:
+    host_address = "localhost:50066"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host.start()
+    workers = [
+        GrpcWorkerAgentRuntime(
+            host_address=host_address,
+            payload_serialization_format=PROTOBUF_DATA_CONTENT_TYPE,
+            preferred_content_types=[PROTOBUF_DATA_CONTENT_TYPE],
+        )
+        for _ in range(2)
+    ]
+    for worker in workers:
+        worker.add_message_serializer(get_protobuf_serializers())
+        worker.start()
+    receiver, sender = workers
+    await AgentChatEchoAgent.register(receiver, "echo", AgentChatEchoAgent)
+    await receiver.add_subscription(TypeSubscription("group", "echo"))
+    received: List[str] = []
+    deserialize = receiver._serialization_registry.deserialize  # type: ignore[reportPrivateUsage]
+
+    def record(payload: bytes, *, type_name: str, data_content_type: str) -> Any:
+        received.append(data_content_type)
+        return deserialize(payload, type_name=type_name, data_content_type=data_content_type)
+
+    receiver._serialization_registry.deserialize = record  # type: ignore
+
+    recipient = AgentId("echo", "default")
+    message = TextMessage(
+        source="user", content="hello", models_usage=RequestUsage(prompt_tokens=1, completion_tokens=2)
+    )
+    for _ in range(2):
+        assert await sender.send_message(message, recipient) == message
+    event = GroupChatMessage(
+        message=ToolCallRequestEvent(source="assistant", content=[FunctionCall(id="1", arguments="{}", name="add")])
+    )
+    await sender.publish_message(event, TopicId("group", "default"))
+    agent = await receiver.try_get_underlying_agent_instance(recipient, type=AgentChatEchoAgent)
+    await asyncio.wait_for(agent.received_event.wait(), timeout=10)
+
+    assert agent.received == [event]
+    assert received == [PROTOBUF_DATA_CONTENT_TYPE] * 3
+
+    await sender.stop()
+    await receiver.stop()
+    await host.stop()
+
+
+def make_event(content: str) -> agent_worker_pb2.Message:
+    return agent_worker_pb2.Message(cloudEvent=cloudevent_pb2.CloudEvent(id=content, binary_data=content.encode()))
+
+
+@pytest.mark.asyncio
+async def test_next_message_batches_queued_messages() -> None:
+    queue: asyncio.Queue[agent_worker_pb2.Message] = asyncio.Queue()
+    batcher = MessageBatcher(queue)
+    for i in range(5):
+        queue.put_nowait(make_event(str(i)))
+
+    message = await batcher.next_message(MessageBatchingConfig(max_messages=3))
+    assert [item.cloudEvent.id for item in message.batch.messages] == ["0", "1", "2"]
+    message = await batcher.next_message(MessageBatchingConfig(max_messages=3))
+    assert [item.cloudEvent.id for item in message.batch.messages] == ["3", "4"]
+
+    # A single message is sent as it is, and without a config nothing is batched.
+    queue.put_nowait(make_event("5"))
+    assert (await batcher.next_message(MessageBatchingConfig())).WhichOneof("message") == "cloudEvent"
+    queue.put_nowait(make_event("6"))
+    queue.put_nowait(make_event("7"))
+    assert (await batcher.next_message(None)).cloudEvent.id == "6"
+    assert (await batcher.next_message(None)).cloudEvent.id == "7"
+
+    # A batch never exceeds max_bytes. A message that does not fit starts the next batch, and a message larger than
+    # max_bytes is sent on its own.
+    config = MessageBatchingConfig(max_bytes=600)
+    contents = ["a" * 100, "b" * 100, "c" * 100, "d" * 1000, "e" * 100]
+    for content in contents:
+        queue.put_nowait(make_event(content))
+    batches: List[List[str]] = []
+    while sum(len(batch) for batch in batches) < len(contents):
+        message = await batcher.next_message(config)
+        if message.WhichOneof("message") == "batch":
+            assert message.ByteSize() <= config.max_bytes
+            batches.append([item.cloudEvent.id for item in message.batch.messages])
+        else:
+            batches.append([message.cloudEvent.id])
+    assert batches == [contents[:2], contents[2:3], contents[3:4], contents[4:]]
+    assert queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_next_message_waits_up_to_max_delay() -> None:
+    queue: asyncio.Queue[agent_worker_pb2.Message] = asyncio.Queue()
+
+    async def put_later() -> None:
+        await asyncio.sleep(0.01)
+        queue.put_nowait(make_event("1"))
+
+    batcher = MessageBatcher(queue)
+    queue.put_nowait(make_event("0"))
+    task = asyncio.create_task(put_later())
+    message = await batcher.next_message(MessageBatchingConfig(max_delay=1))
+    assert [item.cloudEvent.id for item in message.batch.messages] == ["0", "1"]
+    await task
+
+    queue.put_nowait(make_event("2"))
+    message = await batcher.next_message(MessageBatchingConfig(max_delay=0.01))
+    assert message.cloudEvent.id == "2"
+
+    with pytest.raises(ValueError):
+        MessageBatchingConfig(max_messages=0)
+
+
+@pytest.mark.asyncio
+async def test_message_batching(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Record the messages that the host and the workers put on their streams.
+    sent: List[str | None] = []
+
+    next_message = MessageBatcher.next_message
+
+    async def recording_next_message(
+        batcher: MessageBatcher, config: MessageBatchingConfig | None
+    ) -> agent_worker_pb2.Message:
+        message = await next_message(batcher, config)
+        sent.append(message.WhichOneof("message"))
+        return message
+
+    monkeypatch.setattr(MessageBatcher, "next_message", recording_next_message)
+
+    host_address = "localhost:50067"
+    host = GrpcWorkerAgentRuntimeHost(address=host_address)
+    host.start()
+    batching_worker = GrpcWorkerAgentRuntime(
+        host_address=host_address, message_batching=MessageBatchingConfig(max_delay=0.01)
+    )
+    batching_worker.start()
+    # A worker without batching still gets every message on its own.
+    plain_worker = GrpcWorkerAgentRuntime(host_address=host_address, message_batching=None)
+    plain_worker.start()
+
+    await LoopbackAgent.register(batching_worker, "batching", LoopbackAgent)
+    await batching_worker.add_subscription(TypeSubscription("to_batching", "batching"))
+    await LoopbackAgent.register(plain_worker, "plain", LoopbackAgent)
+    await plain_worker.add_subscription(TypeSubscription("to_plain", "plain"))
+
+    messages = [MessageType() for _ in range(50)]
+    await batching_worker.publish_messages(messages, TopicId("to_plain", "default"))
+    await plain_worker.publish_messages(messages, TopicId("to_batching", "default"))
+    responses = await batching_worker.send_messages(messages, AgentId("plain", "direct"))
+    assert responses == messages
+    await asyncio.sleep(2)
+
+    plain_agent = await plain_worker.try_get_underlying_agent_instance(AgentId("plain", "default"), type=LoopbackAgent)
+    batching_agent = await batching_worker.try_get_underlying_agent_instance(
+        AgentId("batching", "default"), type=LoopbackAgent
+    )
+    assert plain_agent.num_calls == len(messages)
+    assert batching_agent.num_calls == len(messages)
+    assert "batch" in sent
+
+    await batching_worker.stop()
+    await plain_worker.stop()
+    await host.stop()
+
+
 # TODO add tests for failure to deserialize
 
 